@@ -0,0 +1,157 @@
+from django.core.exceptions import ValidationError
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse
+import json
+import os
+from main.apps.simulation_data_mgt.services.analyzeGsoResult import COLUMNS_TO_ANALYZE as GSO_COLUMNS
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import COLUMNS_TO_ANALYZE as HANDOVER_COLUMNS
+from main.apps.simulation_data_mgt.services.cellMetricsTable import (
+    DEFAULT_PAGE_SIZE, cell_ut_rows, get_cell_metrics
+)
+from main.apps.simulation_data_mgt.services.simJobTypes import SIM_JOB_TYPES
+from main.utils.logger import log_trigger, log_writer
+
+# 分析函式沒有寫出 cell_metrics.npz 時，依模擬類型以對應的欄位建立逐 cell 結果
+CELL_COLUMNS = {
+    'handover': HANDOVER_COLUMNS,
+    'gso': GSO_COLUMNS,
+}
+
+
+def _result_dir(data):
+    """
+    由請求取得模擬的結果目錄。
+
+    :return: (模擬類型, 結果目錄, 模擬是否已完成, 錯誤回應)，錯誤回應為 None 時前三者有值。
+    """
+    sim_type = data.get('sim_type')
+    target_uid = data.get('target_uid')
+    if not sim_type or not target_uid:
+        return None, None, None, JsonResponse({
+            'status': 'error',
+            'message': 'sim_type and target_uid are required'
+        }, status=400)
+    if sim_type not in CELL_COLUMNS:
+        # 只有 handover、gso 等逐 cell 輸出結果的模擬有逐 cell 的數值
+        return None, None, None, JsonResponse({
+            'status': 'error',
+            'message': f'Per-cell results are not available for simulation type: {sim_type}'
+        }, status=400)
+    sim_type = SIM_JOB_TYPES[sim_type]
+    try:
+        obj = sim_type.get_target(target_uid)
+    except (sim_type.model.DoesNotExist, ValidationError, ValueError):
+        return None, None, None, JsonResponse({
+            'status': 'error',
+            'message': 'Simulation not found'
+        }, status=404)
+    # data_path 在模擬完成時才設為結果目錄，執行中或部分完成的模擬以預設的結果目錄查詢
+    simulation_result_dir = sim_type.get_field(obj, 'data_path')
+    if not simulation_result_dir or not os.path.isdir(simulation_result_dir):
+        simulation_result_dir = sim_type.result_dir(obj)
+    return sim_type.name, simulation_result_dir, sim_type.get_field(obj, 'status') == 'completed', None
+
+
+class simCellResultManager:
+    """
+    提供 handover、gso 模擬的逐 cell 結果查詢（ideal 與 actual 每個 cell 的平均，可篩選、排序與分頁），
+    以及單一 cell 每個 UT 的數值，不必為了查看個別 cell 而重新執行模擬。
+    """
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_cell_results(request):
+        try:
+            data = json.loads(request.body)
+            sim_type, simulation_result_dir, completed, error = _result_dir(data)
+            if error is not None:
+                return error
+
+            # 執行中或部分完成的模擬之後還會新增 cell，只在記憶體中建立，不寫出
+            table = get_cell_metrics(simulation_result_dir, CELL_COLUMNS[sim_type], persist=completed)
+            if table is None:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'No per-cell results found for this simulation'
+                }, status=404)
+
+            try:
+                result = table.query(
+                    situation=data.get('situation'),
+                    cells=data.get('cells'),
+                    filters=data.get('filters'),
+                    metrics=data.get('metrics'),
+                    sort_by=data.get('sort_by'),
+                    descending=data.get('order') == 'desc',
+                    page=data.get('page', 1),
+                    page_size=data.get('page_size', DEFAULT_PAGE_SIZE)
+                )
+            except (ValueError, TypeError, AttributeError) as e:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': str(e)
+                }, status=400)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation per-cell results retrieved successfully',
+                'data': result
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_cell_ut_results(request):
+        try:
+            data = json.loads(request.body)
+            sim_type, simulation_result_dir, _, error = _result_dir(data)
+            if error is not None:
+                return error
+
+            try:
+                result = cell_ut_rows(
+                    simulation_result_dir,
+                    data.get('situation'),
+                    str(data.get('cell') or ''),
+                    page=data.get('page', 1),
+                    page_size=data.get('page_size', DEFAULT_PAGE_SIZE)
+                )
+            except (ValueError, TypeError) as e:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': str(e)
+                }, status=400)
+            if result is None:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'Cell not found'
+                }, status=404)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation per-UT results retrieved successfully',
+                'data': result
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
@@ -0,0 +1,257 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse, HttpResponse
+import json
+from django.db import transaction
+from main.apps.simulation_data_mgt.services.simJobExecutor import get_sim_job_executor
+from main.apps.simulation_data_mgt.services.simJobTypes import SIM_JOB_TYPES, get_sim_job_type
+from main.utils.logger import log_trigger, log_writer
+import os
+import shutil
+
+
+def run_sim_job(sim_type, request):
+    name = sim_type.name
+    display_name = sim_type.display_name
+    try:
+        data = json.loads(request.body)
+        target_uid = data.get(f'{name}_uid')
+        if not target_uid:
+            return JsonResponse({
+                'status': 'error',
+                'message': f'缺少 {name}_uid 參數'
+            }, status=400)
+
+        # 鎖定 meta 資料列直到排入佇列為止，同時送出的執行請求會依序檢查，只有一個會排入佇列
+        with transaction.atomic():
+            try:
+                obj = sim_type.model.objects.select_for_update().get(**{f'{name}_uid': target_uid})
+            except sim_type.model.DoesNotExist:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'找不到對應的 {display_name}'
+                }, status=404)
+
+            parameter = sim_type.get_field(obj, 'parameter')
+            if not parameter:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'{display_name} 缺少參數 {name}_parameter'
+                }, status=400)
+
+            current_sim_job = sim_type.open_sim_jobs(obj).first()
+            if current_sim_job:
+                return JsonResponse({
+                    'status': 'info',
+                    'message': f'此 {display_name} 正在執行模擬作業中',
+                    'data': {
+                        f'{name}SimJob_uid': str(getattr(current_sim_job, f'{name}SimJob_uid')),
+                        f'{name}_uid': str(target_uid),
+                        f'{name}_status': sim_type.get_field(obj, 'status')
+                    }
+                })
+
+            queue_position = get_sim_job_executor().queue_position(name, target_uid)
+            if queue_position is not None:
+                return JsonResponse({
+                    'status': 'info',
+                    'message': f'此 {display_name} 已在佇列中等待執行模擬作業',
+                    'data': {
+                        f'{name}_uid': str(target_uid),
+                        f'{name}_status': sim_type.get_field(obj, 'status'),
+                        'queue_position': queue_position
+                    }
+                })
+
+            if sim_type.get_field(obj, 'status') == "completed":
+                data_path = sim_type.get_field(obj, 'data_path')
+                if data_path and os.path.exists(data_path):
+                    return JsonResponse({
+                        'status': 'success',
+                        'message': '模擬已經執行完成，結果可供使用',
+                        'data': {
+                            f'{name}_uid': str(target_uid),
+                            f'{name}_status': sim_type.get_field(obj, 'status'),
+                            f'{name}_data_path': data_path
+                        }
+                    })
+                else:
+                    sim_type.set_field(obj, 'status', "simulation_failed")
+                    obj.save()
+
+            sim_type.set_field(obj, 'status', "queued")
+            obj.save()
+            queue_position = get_sim_job_executor().submit(name, target_uid, obj.f_user_uid_id, parameter)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': '模擬作業已成功啟動' if queue_position == 0 else '模擬作業已加入佇列，等待執行',
+                'data': {
+                    f'{name}_uid': str(target_uid),
+                    f'{name}_status': 'processing' if queue_position == 0 else 'queued',
+                    'queue_position': queue_position,
+                    f'{name}_parameter': parameter,
+                    f'{name}_data_path': sim_type.get_field(obj, 'data_path')
+                }
+            })
+
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': '無效的 JSON 資料'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=500)
+
+
+def delete_sim_result(sim_type, request):
+    name = sim_type.name
+    display_name = sim_type.display_name
+    try:
+        data = json.loads(request.body)
+        target_uid = data.get(f'{name}_uid')
+        if not target_uid:
+            return JsonResponse({
+                'status': 'error',
+                'message': f'{name}_uid is required'
+            }, status=400)
+
+        try:
+            obj = sim_type.get_target(target_uid)
+        except sim_type.model.DoesNotExist:
+            return JsonResponse({
+                'status': 'error',
+                'message': f'{display_name} not found'
+            }, status=404)
+
+        sim_type.sim_job_model.objects.filter(**{f'f_{name}_uid': obj}).delete()
+
+        data_path = sim_type.get_field(obj, 'data_path')
+        if not data_path:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'No simulation result path found'
+            }, status=404)
+
+        full_path = os.path.join('./', data_path)
+        if not os.path.exists(full_path):
+            return JsonResponse({
+                'status': 'error',
+                'message': f'Simulation result directory not found: {data_path}'
+            }, status=404)
+
+        shutil.rmtree(full_path)
+
+        sim_type.set_field(obj, 'status', "None")
+        obj.save()
+
+        return JsonResponse({
+            'status': 'success',
+            'message': f'{display_name} simulation result and related jobs deleted successfully'
+        })
+
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid JSON format'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=500)
+
+
+def download_sim_result(sim_type, request):
+    name = sim_type.name
+    display_name = sim_type.display_name
+    try:
+        data = json.loads(request.body)
+        target_uid = data.get(f'{name}_uid')
+        if not target_uid:
+            return JsonResponse({
+                'status': 'error',
+                'message': f'{name}_uid is required'
+            }, status=400)
+
+        try:
+            obj = sim_type.get_target(target_uid)
+        except sim_type.model.DoesNotExist:
+            return JsonResponse({
+                'status': 'error',
+                'message': f'{display_name} not found'
+            }, status=404)
+
+        data_path = sim_type.get_field(obj, 'data_path')
+        if not data_path:
+            return JsonResponse({
+                'status': 'error',
+                'message': f'{display_name} data path not found'
+            }, status=404)
+
+        pdf_path = os.path.join(data_path, sim_type.report_file_name)
+        print(f"Attempting to download PDF from path: {pdf_path}")
+
+        if not os.path.exists(pdf_path):
+            return JsonResponse({
+                'status': 'error',
+                'message': 'PDF file not found'
+            }, status=404)
+
+        try:
+            with open(pdf_path, 'rb') as pdf_file:
+                response = HttpResponse(pdf_file.read(), content_type='application/pdf')
+                response['Content-Disposition'] = f'attachment; filename="{sim_type.report_file_name}"'
+                return response
+        except IOError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Error reading PDF file'
+            }, status=500)
+
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid JSON format'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=500)
+
+
+ACTIONS = (
+    ('run_{name}_sim_job', run_sim_job),
+    ('delete_{name}_sim_result', delete_sim_result),
+    ('download_{name}_sim_result', download_sim_result),
+)
+
+
+def sim_job_manager(sim_type_name):
+    """
+    依模擬類型設定建立 <name>SimJobManager，提供 run_<name>_sim_job、delete_<name>_sim_result、
+    download_<name>_sim_result 三個 API，取代原本每個模擬類型各自複製的 SimJobManager 模組。
+    log 中的 actor 名稱維持原本的 <name>SimJobManager。
+    """
+    sim_type = get_sim_job_type(sim_type_name)
+    manager_name = f'{sim_type.name}SimJobManager'
+
+    def make_view(action, handler):
+        def view(request):
+            return handler(sim_type, request)
+        view.__name__ = view.__qualname__ = action
+        view.__module__ = f'{__name__.rsplit(".", 1)[0]}.{manager_name}'
+        return staticmethod(log_trigger('INFO')(require_http_methods(["POST"])(csrf_exempt(view))))
+
+    views = {
+        action.format(name=sim_type.name): make_view(action.format(name=sim_type.name), handler)
+        for action, handler in ACTIONS
+    }
+    return type(manager_name, (), dict(views, __doc__=f'{sim_type.display_name} 模擬作業的執行、結果刪除與報告下載。'))
+
+
+SIM_JOB_MANAGERS = {name: sim_job_manager(name) for name in SIM_JOB_TYPES}
@@ -0,0 +1,227 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse
+import json
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.simJobCanceller import cancel_target, cancel_user_jobs
+from main.apps.simulation_data_mgt.services.simJobExecutor import get_sim_job_executor
+from main.apps.simulation_data_mgt.services.simJobProgress import job_progress
+from main.apps.simulation_data_mgt.services.simJobTypes import SIM_JOB_TYPES
+from main.apps.simulation_data_mgt.services.warmContainerPool import get_warm_container_pool
+from main.utils.logger import log_trigger, log_writer
+
+
+class simJobQueueManager:
+    """
+    提供模擬作業執行器的佇列狀態查詢，包含執行中作業數量、排隊深度與暖容器池的使用狀況，
+    單一模擬在執行中已讀取的部分結果、輕量的進度與預估完成時間查詢，
+    以及不等待容器停止、立即回傳的取消（單一模擬或某使用者的所有模擬）。
+    """
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_job_queue_status(request):
+        try:
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation job queue status retrieved successfully',
+                'data': dict(get_sim_job_executor().status(), warm_pool=get_warm_container_pool().status())
+            })
+
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_job_partial_result(request):
+        try:
+            data = json.loads(request.body)
+            sim_type = data.get('sim_type')
+            target_uid = data.get('target_uid')
+            if not sim_type or not target_uid:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'sim_type and target_uid are required'
+                }, status=400)
+            if sim_type not in SIM_JOB_TYPES:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'Unknown simulation type: {sim_type}'
+                }, status=400)
+
+            queue_job = SimJobQueue.objects.filter(
+                simJobQueue_sim_type=sim_type,
+                simJobQueue_target_uid=target_uid
+            ).order_by('-simJobQueue_enqueue_time').first()
+            if queue_job is None:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'Simulation job not found'
+                }, status=404)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation partial result retrieved successfully',
+                'data': {
+                    'sim_type': sim_type,
+                    'target_uid': str(queue_job.simJobQueue_target_uid),
+                    'job_status': queue_job.simJobQueue_status,
+                    'incremental': SIM_JOB_TYPES[sim_type].ingester is not None,
+                    'partial_result': queue_job.simJobQueue_partial_result
+                }
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_job_progress(request):
+        """
+        查詢模擬的進度與預估完成時間，只回傳狀態與進度，不含模擬結果。
+        可用 target_uid 查詢單筆，或以 target_uids 一次查詢同類型的多筆模擬。
+        """
+        try:
+            data = json.loads(request.body)
+            sim_type = data.get('sim_type')
+            target_uid = data.get('target_uid')
+            target_uids = data.get('target_uids')
+            if not sim_type or not (target_uid or target_uids):
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'sim_type and target_uid or target_uids are required'
+                }, status=400)
+            if sim_type not in SIM_JOB_TYPES:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'Unknown simulation type: {sim_type}'
+                }, status=400)
+            if target_uids is not None and not isinstance(target_uids, list):
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'target_uids must be a list'
+                }, status=400)
+
+            if target_uids is not None:
+                progress = [job_progress(sim_type, uid) for uid in target_uids]
+                return JsonResponse({
+                    'status': 'success',
+                    'message': 'Simulation progress retrieved successfully',
+                    'data': [item for item in progress if item is not None]
+                })
+
+            progress = job_progress(sim_type, target_uid)
+            if progress is None:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'Simulation not found'
+                }, status=404)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation progress retrieved successfully',
+                'data': progress
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def cancel_sim_job(request):
+        try:
+            data = json.loads(request.body)
+            sim_type = data.get('sim_type')
+            target_uid = data.get('target_uid')
+            if not sim_type or not target_uid:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'sim_type and target_uid are required'
+                }, status=400)
+            if sim_type not in SIM_JOB_TYPES:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'Unknown simulation type: {sim_type}'
+                }, status=400)
+
+            result = cancel_target(sim_type, target_uid)
+            if not result['cancelled'] and not result['cancelling']:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'No queued or running simulation job found'
+                }, status=404)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation job cancellation requested',
+                'data': result
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def cancel_user_sim_jobs(request):
+        try:
+            data = json.loads(request.body)
+            f_user_uid = data.get('f_user_uid')
+            if not f_user_uid:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'f_user_uid is required'
+                }, status=400)
+            if not User.objects.filter(user_uid=f_user_uid).exists():
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'User not found'
+                }, status=404)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation job cancellation requested',
+                'data': cancel_user_jobs(f_user_uid)
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
@@ -0,0 +1,90 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse
+import json
+from main.apps.simulation_data_mgt.services.simJobTelemetry import job_telemetry, telemetry_summary
+from main.apps.simulation_data_mgt.services.simJobTypes import SIM_JOB_TYPES
+from main.utils.logger import log_trigger, log_writer
+
+
+class simJobTelemetryManager:
+    """
+    提供模擬容器的資源用量查詢：依模擬類型（與參數）彙總的記憶體峰值、CPU 秒數、區塊讀寫量與執行時間，
+    以及單一模擬每次執行的時間序列，作為容量規劃與記憶體預留的依據。
+    """
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_job_telemetry_summary(request):
+        try:
+            data = json.loads(request.body) if request.body else {}
+            sim_type = data.get('sim_type')
+            if sim_type and sim_type not in SIM_JOB_TYPES:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'Unknown simulation type: {sim_type}'
+                }, status=400)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation resource usage summary retrieved successfully',
+                'data': telemetry_summary(
+                    sim_type,
+                    group_by_parameter=bool(data.get('group_by_parameter', False)),
+                    status=data.get('run_status', 'completed')
+                )
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_job_telemetry(request):
+        try:
+            data = json.loads(request.body)
+            sim_type = data.get('sim_type')
+            target_uid = data.get('target_uid')
+            if not sim_type or not target_uid:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'sim_type and target_uid are required'
+                }, status=400)
+            if sim_type not in SIM_JOB_TYPES:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'Unknown simulation type: {sim_type}'
+                }, status=400)
+
+            runs = job_telemetry(sim_type, target_uid)
+            if not runs:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'No resource usage recorded for this simulation'
+                }, status=404)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation resource usage retrieved successfully',
+                'data': runs
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
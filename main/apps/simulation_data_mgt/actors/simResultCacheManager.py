@@ -0,0 +1,27 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse
+from main.apps.simulation_data_mgt.services.simResultCache import cache_status
+from main.utils.logger import log_trigger, log_writer
+
+
+class simResultCacheManager:
+    """
+    提供模擬結果快取的使用狀況查詢，包含快取大小與各模擬類型的命中 / 未命中 / 淘汰次數。
+    """
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_result_cache_status(request):
+        try:
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation result cache status retrieved successfully',
+                'data': cache_status()
+            })
+
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
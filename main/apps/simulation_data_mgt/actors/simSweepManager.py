@@ -0,0 +1,140 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse
+import json
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimSweepModel import SimSweep
+from main.apps.simulation_data_mgt.services.simJobCanceller import cancel_sweep
+from main.apps.simulation_data_mgt.services.simSweep import create_sweep, sweep_progress
+from main.utils.logger import log_trigger, log_writer
+
+
+class simSweepManager:
+    """
+    參數掃描的批次送出與進度查詢：一次建立整個參數網格的模擬，並以 sweep_uid 查詢整體進度與合併結果表，
+    或一次取消整個 sweep 尚未完成的模擬。
+    """
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def create_sim_sweep(request):
+        try:
+            data = json.loads(request.body)
+            sim_type = data.get('sim_type')
+            sweep_name = data.get('sweep_name')
+            base_parameter = data.get('base_parameter')
+            axes = data.get('axes')
+            f_user_uid = data.get('f_user_uid')
+
+            if not all([sim_type, sweep_name, base_parameter is not None, axes, f_user_uid]):
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'sim_type, sweep_name, base_parameter, axes and f_user_uid are required'
+                }, status=400)
+
+            if not User.objects.filter(user_uid=f_user_uid).exists():
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'User not found'
+                }, status=404)
+
+            try:
+                sweep = create_sweep(sim_type, sweep_name, base_parameter, axes, f_user_uid)
+            except ValueError as e:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': str(e)
+                }, status=400)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation sweep created and queued successfully',
+                'data': sweep_progress(sweep)
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def query_sim_sweep(request):
+        try:
+            data = json.loads(request.body)
+            sweep_uid = data.get('sweep_uid')
+            if not sweep_uid:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'sweep_uid is required'
+                }, status=400)
+
+            try:
+                sweep = SimSweep.objects.get(simSweep_uid=sweep_uid)
+            except SimSweep.DoesNotExist:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'Simulation sweep not found'
+                }, status=404)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation sweep progress retrieved successfully',
+                'data': sweep_progress(sweep)
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+    @log_trigger('INFO')
+    @require_http_methods(["POST"])
+    @csrf_exempt
+    def cancel_sim_sweep(request):
+        try:
+            data = json.loads(request.body)
+            sweep_uid = data.get('sweep_uid')
+            if not sweep_uid:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'sweep_uid is required'
+                }, status=400)
+
+            try:
+                sweep = SimSweep.objects.get(simSweep_uid=sweep_uid)
+            except SimSweep.DoesNotExist:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'Simulation sweep not found'
+                }, status=404)
+
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Simulation sweep cancellation requested',
+                'data': cancel_sweep(sweep)
+            })
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid JSON format'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
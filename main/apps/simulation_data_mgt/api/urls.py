@@ -3,120 +3,46 @@
 定義 simulation_data_mgt 應用的 API 路由，負責將 HTTP 請求導向對應的 view 處理函式。
 """
 from django.urls import path
-from main.apps.simulation_data_mgt.actors.handoverSimJobManager import handoverSimJobManager
-from main.apps.simulation_data_mgt.actors.coverageSimJobManager import coverageSimJobManager
-from main.apps.simulation_data_mgt.actors.connectedDurationSimJobManager import connectedDurationSimJobManager
-from main.apps.simulation_data_mgt.actors.phaseSimJobManager import phaseSimJobManager
-from main.apps.simulation_data_mgt.actors.constellationStrategySimJobManager import constellationStrategySimJobManager
-from main.apps.simulation_data_mgt.actors.islHoppingSimJobManager import islHoppingSimJobManager
-from main.apps.simulation_data_mgt.actors.modifyRegenRoutingSimJobManager import modifyRegenRoutingSimJobManager
-from main.apps.simulation_data_mgt.actors.oneToMultiSimJobManager import oneToMultiSimJobManager
-from main.apps.simulation_data_mgt.actors.multiToMultiSimJobManager import multiToMultiSimJobManager
-from main.apps.simulation_data_mgt.actors.saveErRoutingSimJobManager import saveErRoutingSimJobManager
-from main.apps.simulation_data_mgt.actors.endToEndRoutingSimJobManager import endToEndRoutingSimJobManager
-from main.apps.simulation_data_mgt.actors.singleBeamSimJobManager import singleBeamSimJobManager
-from main.apps.simulation_data_mgt.actors.gsoSimJobManager import gsoSimJobManager
-
+from main.apps.simulation_data_mgt.actors.simCellResultManager import simCellResultManager
+from main.apps.simulation_data_mgt.actors.simJobManager import ACTIONS, SIM_JOB_MANAGERS
+from main.apps.simulation_data_mgt.actors.simJobQueueManager import simJobQueueManager
+from main.apps.simulation_data_mgt.actors.simJobTelemetryManager import simJobTelemetryManager
+from main.apps.simulation_data_mgt.actors.simResultCacheManager import simResultCacheManager
+from main.apps.simulation_data_mgt.actors.simSweepManager import simSweepManager
+
+# 各模擬類型的 run / delete / download API 由 SIM_JOB_TYPES 產生，
+# 例如 simulation_data_mgt/coverageSimJobManager/run_coverage_sim_job
 urlpatterns = [
-    path('simulation_data_mgt/handoverSimJobManager/run_handover_sim_job',
-         handoverSimJobManager.run_handover_sim_job, name="run_handover_sim_job"),
-    path('simulation_data_mgt/handoverSimJobManager/delete_handover_sim_result',
-         handoverSimJobManager.delete_handover_sim_result, name="delete_handover_sim_result"),
-    path('simulation_data_mgt/handoverSimJobManager/download_handover_sim_result',
-         handoverSimJobManager.download_handover_sim_result, name="download_handover_sim_result"),
-    
-    path('simulation_data_mgt/coverageSimJobManager/run_coverage_sim_job',
-         coverageSimJobManager.run_coverage_sim_job, name='run_coverage_sim_job'),
-    path('simulation_data_mgt/coverageSimJobManager/delete_coverage_sim_result',
-         coverageSimJobManager.delete_coverage_sim_result, name='delete_coverage_sim_result'),
-    path('simulation_data_mgt/coverageSimJobManager/download_coverage_sim_result',
-         coverageSimJobManager.download_coverage_sim_result, name='download_coverage_sim_result'),
-
-
-    path('simulation_data_mgt/connectedDurationSimJobManager/run_connectedDuration_sim_job',
-         connectedDurationSimJobManager.run_connectedDuration_sim_job, name='run_connectedDuration_sim_job'),
-    path('simulation_data_mgt/connectedDurationSimJobManager/delete_connectedDuration_sim_result',
-         connectedDurationSimJobManager.delete_connectedDuration_sim_result, name='delete_connectedDuration_sim_result'),
-    path('simulation_data_mgt/connectedDurationSimJobManager/download_connectedDuration_sim_result',
-         connectedDurationSimJobManager.download_connectedDuration_sim_result, name='download_connectedDuration_sim_result'),
-
-
-    path('simulation_data_mgt/phaseSimJobManager/run_phase_sim_job',
-         phaseSimJobManager.run_phase_sim_job, name='run_phase_sim_job'),
-    path('simulation_data_mgt/phaseSimJobManager/delete_phase_sim_result',
-         phaseSimJobManager.delete_phase_sim_result, name='delete_phase_sim_result'),
-    path('simulation_data_mgt/phaseSimJobManager/download_phase_sim_result',
-         phaseSimJobManager.download_phase_sim_result, name='download_phase_sim_result'),
-
-
-    path('simulation_data_mgt/constellationStrategySimJobManager/run_constellationStrategy_sim_job',
-         constellationStrategySimJobManager.run_constellationStrategy_sim_job, name='run_constellationStrategy_sim_job'),
-    path('simulation_data_mgt/constellationStrategySimJobManager/delete_constellationStrategy_sim_result',
-         constellationStrategySimJobManager.delete_constellationStrategy_sim_result, name='delete_constellationStrategy_sim_result'),
-    path('simulation_data_mgt/constellationStrategySimJobManager/download_constellationStrategy_sim_result',
-         constellationStrategySimJobManager.download_constellationStrategy_sim_result, name='download_constellationStrategy_sim_result'),
-
-
-    path('simulation_data_mgt/islHoppingSimJobManager/run_islHopping_sim_job',
-         islHoppingSimJobManager.run_islHopping_sim_job, name='run_islHopping_sim_job'),
-    path('simulation_data_mgt/islHoppingSimJobManager/delete_islHopping_sim_result',
-         islHoppingSimJobManager.delete_islHopping_sim_result, name='delete_islHopping_sim_result'),
-    path('simulation_data_mgt/islHoppingSimJobManager/download_islHopping_sim_result',
-         islHoppingSimJobManager.download_islHopping_sim_result, name='download_islHopping_sim_result'),
-
-
-    path('simulation_data_mgt/modifyRegenRoutingSimJobManager/run_modifyRegenRouting_sim_job',
-         modifyRegenRoutingSimJobManager.run_modifyRegenRouting_sim_job, name='run_modifyRegenRouting_sim_job'),
-    path('simulation_data_mgt/modifyRegenRoutingSimJobManager/delete_modifyRegenRouting_sim_result',
-         modifyRegenRoutingSimJobManager.delete_modifyRegenRouting_sim_result, name='delete_modifyRegenRouting_sim_result'),
-    path('simulation_data_mgt/modifyRegenRoutingSimJobManager/download_modifyRegenRouting_sim_result',
-         modifyRegenRoutingSimJobManager.download_modifyRegenRouting_sim_result, name='download_modifyRegenRouting_sim_result'),
-
-
-    path('simulation_data_mgt/oneToMultiSimJobManager/run_oneToMulti_sim_job',
-         oneToMultiSimJobManager.run_oneToMulti_sim_job, name='run_oneToMulti_sim_job'),
-    path('simulation_data_mgt/oneToMultiSimJobManager/delete_oneToMulti_sim_result',
-         oneToMultiSimJobManager.delete_oneToMulti_sim_result, name='delete_oneToMulti_sim_result'),
-    path('simulation_data_mgt/oneToMultiSimJobManager/download_oneToMulti_sim_result',
-         oneToMultiSimJobManager.download_oneToMulti_sim_result, name='download_oneToMulti_sim_result'),
-
-
-    path('simulation_data_mgt/multiToMultiSimJobManager/run_multiToMulti_sim_job',
-         multiToMultiSimJobManager.run_multiToMulti_sim_job, name='run_multiToMulti_sim_job'),
-    path('simulation_data_mgt/multiToMultiSimJobManager/delete_multiToMulti_sim_result',
-         multiToMultiSimJobManager.delete_multiToMulti_sim_result, name='delete_multiToMulti_sim_result'),
-    path('simulation_data_mgt/multiToMultiSimJobManager/download_multiToMulti_sim_result',
-         multiToMultiSimJobManager.download_multiToMulti_sim_result, name='download_multiToMulti_sim_result'),
-
-
-    path('simulation_data_mgt/saveErRoutingSimJobManager/run_saveErRouting_sim_job',
-         saveErRoutingSimJobManager.run_saveErRouting_sim_job, name='run_saveErRouting_sim_job'),
-    path('simulation_data_mgt/saveErRoutingSimJobManager/delete_saveErRouting_sim_result',
-         saveErRoutingSimJobManager.delete_saveErRouting_sim_result, name='delete_saveErRouting_sim_result'),
-    path('simulation_data_mgt/saveErRoutingSimJobManager/download_saveErRouting_sim_result',
-         saveErRoutingSimJobManager.download_saveErRouting_sim_result, name='download_saveErRouting_sim_result'),
-
-
-    path('simulation_data_mgt/endToEndRoutingSimJobManager/run_endToEndRouting_sim_job',
-         endToEndRoutingSimJobManager.run_endToEndRouting_sim_job, name='run_endToEndRouting_sim_job'),
-    path('simulation_data_mgt/endToEndRoutingSimJobManager/delete_endToEndRouting_sim_result',
-         endToEndRoutingSimJobManager.delete_endToEndRouting_sim_result, name='delete_endToEndRouting_sim_result'),
-    path('simulation_data_mgt/endToEndRoutingSimJobManager/download_endToEndRouting_sim_result',
-         endToEndRoutingSimJobManager.download_endToEndRouting_sim_result, name='download_endToEndRouting_sim_result'),
-
-
-    path('simulation_data_mgt/singleBeamSimJobManager/run_singleBeam_sim_job',
-         singleBeamSimJobManager.run_singleBeam_sim_job, name='run_singleBeam_sim_job'),
-    path('simulation_data_mgt/singleBeamSimJobManager/delete_singleBeam_sim_result',
-         singleBeamSimJobManager.delete_singleBeam_sim_result, name='delete_singleBeam_sim_result'),
-    path('simulation_data_mgt/singleBeamSimJobManager/download_singleBeam_sim_result',
-         singleBeamSimJobManager.download_singleBeam_sim_result, name='download_singleBeam_sim_result'),
-
-
-    path('simulation_data_mgt/gsoSimJobManager/run_gso_sim_job',
-         gsoSimJobManager.run_gso_sim_job, name='run_gso_sim_job'),
-    path('simulation_data_mgt/gsoSimJobManager/delete_gso_sim_result',
-         gsoSimJobManager.delete_gso_sim_result, name='delete_gso_sim_result'),
-    path('simulation_data_mgt/gsoSimJobManager/download_gso_sim_result',
-         gsoSimJobManager.download_gso_sim_result, name='download_gso_sim_result')
+    path(f'simulation_data_mgt/{manager.__name__}/{action.format(name=name)}',
+         getattr(manager, action.format(name=name)), name=action.format(name=name))
+    for name, manager in SIM_JOB_MANAGERS.items()
+    for action, _ in ACTIONS
+] + [
+    path('simulation_data_mgt/simJobQueueManager/query_sim_job_queue_status',
+         simJobQueueManager.query_sim_job_queue_status, name='query_sim_job_queue_status'),
+    path('simulation_data_mgt/simJobQueueManager/query_sim_job_partial_result',
+         simJobQueueManager.query_sim_job_partial_result, name='query_sim_job_partial_result'),
+    path('simulation_data_mgt/simJobQueueManager/query_sim_job_progress',
+         simJobQueueManager.query_sim_job_progress, name='query_sim_job_progress'),
+    path('simulation_data_mgt/simJobQueueManager/cancel_sim_job',
+         simJobQueueManager.cancel_sim_job, name='cancel_sim_job'),
+    path('simulation_data_mgt/simJobQueueManager/cancel_user_sim_jobs',
+         simJobQueueManager.cancel_user_sim_jobs, name='cancel_user_sim_jobs'),
+    path('simulation_data_mgt/simResultCacheManager/query_sim_result_cache_status',
+         simResultCacheManager.query_sim_result_cache_status, name='query_sim_result_cache_status'),
+
+    path('simulation_data_mgt/simSweepManager/create_sim_sweep',
+         simSweepManager.create_sim_sweep, name='create_sim_sweep'),
+    path('simulation_data_mgt/simSweepManager/query_sim_sweep',
+         simSweepManager.query_sim_sweep, name='query_sim_sweep'),
+    path('simulation_data_mgt/simSweepManager/cancel_sim_sweep',
+         simSweepManager.cancel_sim_sweep, name='cancel_sim_sweep'),
+    path('simulation_data_mgt/simJobTelemetryManager/query_sim_job_telemetry_summary',
+         simJobTelemetryManager.query_sim_job_telemetry_summary, name='query_sim_job_telemetry_summary'),
+    path('simulation_data_mgt/simJobTelemetryManager/query_sim_job_telemetry',
+         simJobTelemetryManager.query_sim_job_telemetry, name='query_sim_job_telemetry'),
+    path('simulation_data_mgt/simCellResultManager/query_sim_cell_results',
+         simCellResultManager.query_sim_cell_results, name='query_sim_cell_results'),
+    path('simulation_data_mgt/simCellResultManager/query_sim_cell_ut_results',
+         simCellResultManager.query_sim_cell_ut_results, name='query_sim_cell_ut_results')
 ]
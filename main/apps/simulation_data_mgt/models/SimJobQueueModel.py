@@ -0,0 +1,64 @@
+from django.db import models
+import uuid
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.UserModel import User
+
+# 仍佔用模擬容器名稱的狀態；同一個模擬同時只能有一筆這些狀態的佇列紀錄
+UNFINISHED_STATUSES = ('queued', 'running', 'cancelling')
+
+
+class SimJobQueue(models.Model):
+    """
+    模擬作業佇列，記錄每個模擬作業的排程狀態，讓 Django 行程重啟後仍能接手執行中的容器。
+
+    simJobQueue_status: queued -> running -> completed / failed
+    同一個模擬（sim_type + target_uid）最多只有一筆未結束的紀錄，由資料庫的部分唯一索引保證，
+    重複的執行請求因此不會啟動第二個同名容器。
+    """
+    id = models.AutoField(primary_key=True)
+    simJobQueue_uid = models.UUIDField(default=uuid.uuid4, unique=True)
+    simJobQueue_sim_type = models.CharField(max_length=50)
+    simJobQueue_target_uid = models.UUIDField()
+    simJobQueue_status = models.CharField(max_length=50, default='queued')
+    simJobQueue_container_name = models.CharField(max_length=255, blank=True, default='')
+    simJobQueue_result_dir = models.CharField(max_length=255, blank=True, default='')
+    simJobQueue_exec_id = models.CharField(max_length=64, blank=True, default='')  # 在暖容器中以 docker exec 執行時的 exec id
+    simJobQueue_worker = models.CharField(max_length=255, blank=True, default='')  # 負責監控的行程 "<hostname>:<pid>"
+    simJobQueue_host = models.CharField(max_length=100, blank=True, default='')  # 執行容器的模擬主機（SIM_JOB_HOSTS 的名稱），空字串為本機
+    simJobQueue_heartbeat_time = models.DateTimeField(null=True, blank=True)
+    simJobQueue_enqueue_time = models.DateTimeField(default=timezone.now)
+    simJobQueue_start_time = models.DateTimeField(null=True, blank=True)
+    simJobQueue_end_time = models.DateTimeField(null=True, blank=True)
+    simJobQueue_message = models.TextField(blank=True, default='')
+    simJobQueue_parameter_key = models.CharField(max_length=64, blank=True, default='')  # 參數雜湊，用於記憶體估計與結果快取
+    simJobQueue_image_digest = models.CharField(max_length=255, blank=True, default='')  # 實際執行的模擬器映像檔 digest
+    simJobQueue_memory_limit = models.BigIntegerField(default=0)  # 領取時預留的記憶體（bytes），也是容器的 -m 上限
+    simJobQueue_peak_memory = models.BigIntegerField(default=0)  # 執行期間量測到的記憶體峰值（bytes）
+    simJobQueue_oom_count = models.IntegerField(default=0)
+    simJobQueue_expected_runtime = models.FloatField(null=True, blank=True)  # 排隊時預測的執行秒數，用於短作業優先排程
+    simJobQueue_timeout = models.IntegerField(default=0)  # 開始執行時依預測決定的逾時秒數，0 表示使用類型預設值
+    simJobQueue_partial_result = models.JSONField(default=dict, blank=True)  # 執行中已讀取的部分分析結果
+    simJobQueue_shard_count = models.IntegerField(default=1)  # 依 cell 拆分的分片數，1 表示以單一容器執行
+    simJobQueue_shards = models.JSONField(default=list, blank=True)  # 各分片的 cell、容器名稱、結果目錄與執行狀態
+
+    f_user_uid = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        to_field='user_uid',
+        db_column='f_user_uid'
+    )
+
+    class Meta:
+        db_table = 'simJobQueue'
+        indexes = [
+            models.Index(fields=['simJobQueue_status', 'simJobQueue_enqueue_time']),
+            models.Index(fields=['simJobQueue_sim_type', 'simJobQueue_target_uid']),
+            models.Index(fields=['simJobQueue_sim_type', 'simJobQueue_parameter_key']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['simJobQueue_sim_type', 'simJobQueue_target_uid'],
+                condition=models.Q(simJobQueue_status__in=UNFINISHED_STATUSES),
+                name='simJobQueue_one_unfinished_run'
+            ),
+        ]
@@ -0,0 +1,35 @@
+from django.db import models
+import uuid
+from django.utils import timezone
+
+class SimJobTelemetry(models.Model):
+    """
+    單次模擬執行（一筆 <name>SimJob）的容器資源用量，供容量規劃與記憶體預留使用。
+
+    simJobTelemetry_samples: [[距開始秒數, 記憶體用量 bytes, 累計 CPU 秒數, 累計讀取 bytes, 累計寫入 bytes], ...]
+    取樣點超過上限時降低解析度，摘要欄位不受影響。
+    """
+    id = models.AutoField(primary_key=True)
+    simJobTelemetry_uid = models.UUIDField(default=uuid.uuid4, unique=True)
+    simJobTelemetry_sim_type = models.CharField(max_length=50)
+    simJobTelemetry_target_uid = models.UUIDField()
+    simJobTelemetry_sim_job_uid = models.UUIDField(unique=True)  # 對應 <name>SimJob_uid
+    simJobTelemetry_parameter_key = models.CharField(max_length=64, blank=True, default='')
+    simJobTelemetry_container_name = models.CharField(max_length=255, blank=True, default='')
+    simJobTelemetry_status = models.CharField(max_length=50, default='running')  # 結束時佇列作業的狀態
+    simJobTelemetry_start_time = models.DateTimeField(default=timezone.now)
+    simJobTelemetry_end_time = models.DateTimeField(null=True, blank=True)
+    simJobTelemetry_wall_seconds = models.FloatField(default=0)
+    simJobTelemetry_peak_memory = models.BigIntegerField(default=0)  # bytes
+    simJobTelemetry_cpu_seconds = models.FloatField(default=0)
+    simJobTelemetry_block_read_bytes = models.BigIntegerField(default=0)
+    simJobTelemetry_block_write_bytes = models.BigIntegerField(default=0)
+    simJobTelemetry_oom_killed = models.BooleanField(default=False)
+    simJobTelemetry_samples = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        db_table = 'simJobTelemetry'
+        indexes = [
+            models.Index(fields=['simJobTelemetry_sim_type', 'simJobTelemetry_parameter_key']),
+            models.Index(fields=['simJobTelemetry_sim_type', 'simJobTelemetry_target_uid']),
+        ]
@@ -0,0 +1,41 @@
+from django.db import models
+import uuid
+from django.utils import timezone
+
+class SimResultCache(models.Model):
+    """
+    模擬結果快取，以模擬類型、參數雜湊與模擬器映像檔 digest 作為內容位址，
+    讓不同使用者以相同參數執行模擬時直接重用已完成的結果目錄與分析結果。
+    """
+    id = models.AutoField(primary_key=True)
+    simResultCache_uid = models.UUIDField(default=uuid.uuid4, unique=True)
+    simResultCache_cache_key = models.CharField(max_length=64, unique=True)
+    simResultCache_sim_type = models.CharField(max_length=50)
+    simResultCache_parameter_key = models.CharField(max_length=64)
+    simResultCache_image_digest = models.CharField(max_length=255)
+    simResultCache_result_dir = models.CharField(max_length=255)
+    simResultCache_simulation_result = models.JSONField(null=True, blank=True)
+    simResultCache_size_bytes = models.BigIntegerField(default=0)
+    simResultCache_hit_count = models.IntegerField(default=0)
+    simResultCache_create_time = models.DateTimeField(default=timezone.now)
+    simResultCache_last_access_time = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'simResultCache'
+        indexes = [
+            models.Index(fields=['simResultCache_last_access_time']),
+        ]
+
+
+class SimResultCacheCounter(models.Model):
+    """
+    各模擬類型的結果快取命中 / 未命中次數。
+    """
+    id = models.AutoField(primary_key=True)
+    simResultCacheCounter_sim_type = models.CharField(max_length=50, unique=True)
+    simResultCacheCounter_hit_count = models.BigIntegerField(default=0)
+    simResultCacheCounter_miss_count = models.BigIntegerField(default=0)
+    simResultCacheCounter_eviction_count = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'simResultCacheCounter'
@@ -0,0 +1,29 @@
+from django.db import models
+import uuid
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.UserModel import User
+
+class SimSweep(models.Model):
+    """
+    參數掃描（sweep），記錄一次批次送出的基礎參數、掃描軸，以及每個掃描點對應的 meta 資料 uid。
+
+    simSweep_points: [{"target_uid": "...", "values": {"<軸名稱>": <值>, ...}}, ...]
+    """
+    id = models.AutoField(primary_key=True)
+    simSweep_uid = models.UUIDField(default=uuid.uuid4, unique=True)
+    simSweep_name = models.CharField(max_length=255)
+    simSweep_sim_type = models.CharField(max_length=50)
+    simSweep_base_parameter = models.JSONField()
+    simSweep_axes = models.JSONField()
+    simSweep_points = models.JSONField(default=list)
+    simSweep_create_time = models.DateTimeField(default=timezone.now)
+
+    f_user_uid = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        to_field='user_uid',
+        db_column='f_user_uid'
+    )
+
+    class Meta:
+        db_table = 'simSweep'
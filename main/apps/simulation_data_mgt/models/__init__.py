@@ -1 +1,5 @@
 from .handoverSimJobModel import HandoverSimJob
+from .SimJobQueueModel import SimJobQueue
+from .SimJobTelemetryModel import SimJobTelemetry
+from .SimResultCacheModel import SimResultCache, SimResultCacheCounter
+from .SimSweepModel import SimSweep
@@ -3,8 +3,8 @@
 分析 ConnectedDuration（連線時長）模組的模擬結果，提供統計、視覺化等功能。
 """
 from main.utils.logger import log_trigger, log_writer
-import pandas as pd
 import os
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 
 @log_trigger('INFO')
 def analyzeConnectedDurationResult(simulation_result_dir):
@@ -28,7 +28,7 @@ def analyzeConnectedDurationResult(simulation_result_dir):
     simulation_result_file = csv_files_fullpath[0]
 
     try:
-        df = pd.read_csv(simulation_result_file)
+        df = read_result_csv(simulation_result_file)
 
         required_cols = ['time', 'coverSatCount']
         for col in required_cols:
@@ -4,7 +4,7 @@
 """
 from main.utils.logger import log_trigger, log_writer
 import os
-import pandas as pd
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 
 @log_trigger('INFO')
 def analyzeConstellationStrategyResult(simulation_result_dir):
@@ -42,7 +42,7 @@ def analyzeConstellationStrategyResult(simulation_result_dir):
             continue  # 找不到檔案就跳過
 
         try:
-            df = pd.read_csv(csv_path)
+            df = read_result_csv(csv_path)
         except Exception as e:
             print(f"[ERROR] Exception reading CSV ({csv_filename}): {str(e)}")
             continue
@@ -4,7 +4,7 @@
 """
 from main.utils.logger import log_trigger, log_writer
 import os
-import pandas as pd
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 
 @log_trigger('INFO')
 def analyzeCoverageAnalysisResult(simulation_result_dir):
@@ -36,7 +36,7 @@ def analyzeCoverageAnalysisResult(simulation_result_dir):
     simulation_result_file = csv_files_fullpath[0]
 
     try:
-        df = pd.read_csv(simulation_result_file)
+        df = read_result_csv(simulation_result_file)
         required_columns = ['latitude', 'coverage']
         if not all(col in df.columns for col in required_columns):
             print(f"CSV should contain columns: {required_columns}")
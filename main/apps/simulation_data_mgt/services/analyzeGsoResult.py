@@ -5,138 +5,127 @@
 from main.utils.logger import log_trigger, log_writer
 import os
 import pandas as pd
+from main.apps.simulation_data_mgt.services.cellStatisticsLoader import aggregate_cell_statistics
+from main.apps.simulation_data_mgt.services.cellMetricsTable import save_cell_metrics
+
+# 每個 cell 的 statistics.csv 中納入平均的欄位（目前與 handover 的欄位相同）
+COLUMNS_TO_ANALYZE = [
+    'handover_count', 'handover_fail_count',
+    'remaining_duration_to_first', 'remaining_start_to_first', 'remaining_end_to_first',
+    'remaining_duration_from_last', 'remaining_start_from_last', 'remaining_end_from_last',
+    'valid_interval_count',
+    'sum_score_max', 'sum_score_min', 'sum_score_mean',
+    'distance_of_available_gs_of_cell_mean_max', 'distance_of_available_gs_of_cell_mean_min', 'distance_of_available_gs_of_cell_mean_mean',
+    'elevation_of_available_gs_of_cell_mean_max', 'elevation_of_available_gs_of_cell_mean_min', 'elevation_of_available_gs_of_cell_mean_mean',
+    'ul_snr_of_available_gs_of_cell_mean_max', 'ul_snr_of_available_gs_of_cell_mean_min', 'ul_snr_of_available_gs_of_cell_mean_mean',
+    'ul_code_rate_of_available_gs_of_cell_mean_max', 'ul_code_rate_of_available_gs_of_cell_mean_min', 'ul_code_rate_of_available_gs_of_cell_mean_mean',
+    'dl_snr_of_available_gs_of_cell_mean_max', 'dl_snr_of_available_gs_of_cell_mean_min', 'dl_snr_of_available_gs_of_cell_mean_mean',
+    'dl_code_rate_of_available_gs_of_cell_mean_max', 'dl_code_rate_of_available_gs_of_cell_mean_min', 'dl_code_rate_of_available_gs_of_cell_mean_mean',
+    'connection_duration_max', 'connection_duration_min', 'connection_duration_mean', 'connection_duration_count',
+    'disconnect_duration_max', 'disconnect_duration_min', 'disconnect_duration_mean', 'disconnect_duration_count'
+]
+
+# 定義欄位名稱映射
+COLUMN_NAME_MAPPING = {
+    # DL Code Rate 相關
+    'dl_code_rate_of_available_gs_of_cell_mean_max': 'avg_cells_dl_code_rate_of_available_gs_of_cell_mean_max',
+    'dl_code_rate_of_available_gs_of_cell_mean_min': 'avg_cells_dl_code_rate_of_available_gs_of_cell_mean_min',
+    'dl_code_rate_of_available_gs_of_cell_mean_mean': 'avg_cells_dl_code_rate_of_available_gs_of_cell_mean_avg',
+
+    # UL Code Rate 相關
+    'ul_code_rate_of_available_gs_of_cell_mean_max': 'avg_cells_ul_code_rate_of_available_gs_of_cell_mean_max',
+    'ul_code_rate_of_available_gs_of_cell_mean_min': 'avg_cells_ul_code_rate_of_available_gs_of_cell_mean_min',
+    'ul_code_rate_of_available_gs_of_cell_mean_mean': 'avg_cells_ul_code_rate_of_available_gs_of_cell_mean_avg',
+
+    # DL SNR 相關
+    'dl_snr_of_available_gs_of_cell_mean_max': 'avg_cells_dl_snr_of_available_gs_of_cell_mean_max',
+    'dl_snr_of_available_gs_of_cell_mean_min': 'avg_cells_dl_snr_of_available_gs_of_cell_mean_min',
+    'dl_snr_of_available_gs_of_cell_mean_mean': 'avg_cells_dl_snr_of_available_gs_of_cell_mean_avg',
+
+    # UL SNR 相關
+    'ul_snr_of_available_gs_of_cell_mean_max': 'avg_cells_ul_snr_of_available_gs_of_cell_mean_max',
+    'ul_snr_of_available_gs_of_cell_mean_min': 'avg_cells_ul_snr_of_available_gs_of_cell_mean_min',
+    'ul_snr_of_available_gs_of_cell_mean_mean': 'avg_cells_ul_snr_of_available_gs_of_cell_mean_avg',
+
+    # Distance 相關
+    'distance_of_available_gs_of_cell_mean_max': 'avg_cells_distance_of_available_gs_of_cell_mean_max',
+    'distance_of_available_gs_of_cell_mean_min': 'avg_cells_distance_of_available_gs_of_cell_mean_min',
+    'distance_of_available_gs_of_cell_mean_mean': 'avg_cells_distance_of_available_gs_of_cell_mean_avg',
+
+    # Elevation 相關
+    'elevation_of_available_gs_of_cell_mean_max': 'avg_cells_elevation_of_available_gs_of_cell_mean_max',
+    'elevation_of_available_gs_of_cell_mean_min': 'avg_cells_elevation_of_available_gs_of_cell_mean_min',
+    'elevation_of_available_gs_of_cell_mean_mean': 'avg_cells_elevation_of_available_gs_of_cell_mean_avg',
+
+    # 基本計數相關
+    'handover_count': 'avg_cells_handover_count',
+    'handover_fail_count': 'avg_cells_handover_fail_count',
+    'valid_interval_count': 'avg_cells_valid_interval_count',
+
+    # Score 相關
+    'sum_score_max': 'avg_cells_sum_score_max',
+    'sum_score_min': 'avg_cells_sum_score_min',
+    'sum_score_mean': 'avg_cells_sum_score_mean',
+
+    # Remaining time 相關
+    'remaining_duration_to_first': 'avg_cells_remaining_duration_to_first',
+    'remaining_start_to_first': 'avg_cells_remaining_start_to_first',
+    'remaining_end_to_first': 'avg_cells_remaining_end_to_first',
+    'remaining_duration_from_last': 'avg_cells_remaining_duration_from_last',
+    'remaining_start_from_last': 'avg_cells_remaining_start_from_last',
+    'remaining_end_from_last': 'avg_cells_remaining_end_from_last',
+
+    # Connection Duration 相關
+    'connection_duration_max': 'avg_cells_connection_duration_max',
+    'connection_duration_min': 'avg_cells_connection_duration_min',
+    'connection_duration_mean': 'avg_cells_connection_duration_mean',
+    'connection_duration_count': 'avg_cells_connection_duration_count',
+
+    # Disconnect Duration 相關
+    'disconnect_duration_max': 'avg_cells_disconnect_duration_max',
+    'disconnect_duration_min': 'avg_cells_disconnect_duration_min',
+    'disconnect_duration_mean': 'avg_cells_disconnect_duration_mean',
+    'disconnect_duration_count': 'avg_cells_disconnect_duration_count'
+}
+
 
 @log_trigger('INFO')
 def analyzeGsoResult(simulation_result_dir):
     ideal_path = os.path.join(simulation_result_dir, 'ideal', 'cell_analysis')
     actual_path = os.path.join(simulation_result_dir, 'actual', 'cell_analysis')
 
-    columns_to_analyze = [
-        'handover_count', 'handover_fail_count',
-        'remaining_duration_to_first', 'remaining_start_to_first', 'remaining_end_to_first',
-        'remaining_duration_from_last', 'remaining_start_from_last', 'remaining_end_from_last',
-        'valid_interval_count',
-        'sum_score_max', 'sum_score_min', 'sum_score_mean',
-        'distance_of_available_gs_of_cell_mean_max', 'distance_of_available_gs_of_cell_mean_min', 'distance_of_available_gs_of_cell_mean_mean',
-        'elevation_of_available_gs_of_cell_mean_max', 'elevation_of_available_gs_of_cell_mean_min', 'elevation_of_available_gs_of_cell_mean_mean',
-        'ul_snr_of_available_gs_of_cell_mean_max', 'ul_snr_of_available_gs_of_cell_mean_min', 'ul_snr_of_available_gs_of_cell_mean_mean',
-        'ul_code_rate_of_available_gs_of_cell_mean_max', 'ul_code_rate_of_available_gs_of_cell_mean_min', 'ul_code_rate_of_available_gs_of_cell_mean_mean',
-        'dl_snr_of_available_gs_of_cell_mean_max', 'dl_snr_of_available_gs_of_cell_mean_min', 'dl_snr_of_available_gs_of_cell_mean_mean',
-        'dl_code_rate_of_available_gs_of_cell_mean_max', 'dl_code_rate_of_available_gs_of_cell_mean_min', 'dl_code_rate_of_available_gs_of_cell_mean_mean',
-        'connection_duration_max', 'connection_duration_min', 'connection_duration_mean', 'connection_duration_count',
-        'disconnect_duration_max', 'disconnect_duration_min', 'disconnect_duration_mean', 'disconnect_duration_count'
-    ]
-
-    # 定義欄位名稱映射
-    column_name_mapping = {
-        # DL Code Rate 相關
-        'dl_code_rate_of_available_gs_of_cell_mean_max': 'avg_cells_dl_code_rate_of_available_gs_of_cell_mean_max',
-        'dl_code_rate_of_available_gs_of_cell_mean_min': 'avg_cells_dl_code_rate_of_available_gs_of_cell_mean_min',
-        'dl_code_rate_of_available_gs_of_cell_mean_mean': 'avg_cells_dl_code_rate_of_available_gs_of_cell_mean_avg',
-        
-        # UL Code Rate 相關
-        'ul_code_rate_of_available_gs_of_cell_mean_max': 'avg_cells_ul_code_rate_of_available_gs_of_cell_mean_max',
-        'ul_code_rate_of_available_gs_of_cell_mean_min': 'avg_cells_ul_code_rate_of_available_gs_of_cell_mean_min',
-        'ul_code_rate_of_available_gs_of_cell_mean_mean': 'avg_cells_ul_code_rate_of_available_gs_of_cell_mean_avg',
-        
-        # DL SNR 相關
-        'dl_snr_of_available_gs_of_cell_mean_max': 'avg_cells_dl_snr_of_available_gs_of_cell_mean_max',
-        'dl_snr_of_available_gs_of_cell_mean_min': 'avg_cells_dl_snr_of_available_gs_of_cell_mean_min',
-        'dl_snr_of_available_gs_of_cell_mean_mean': 'avg_cells_dl_snr_of_available_gs_of_cell_mean_avg',
-        
-        # UL SNR 相關
-        'ul_snr_of_available_gs_of_cell_mean_max': 'avg_cells_ul_snr_of_available_gs_of_cell_mean_max',
-        'ul_snr_of_available_gs_of_cell_mean_min': 'avg_cells_ul_snr_of_available_gs_of_cell_mean_min',
-        'ul_snr_of_available_gs_of_cell_mean_mean': 'avg_cells_ul_snr_of_available_gs_of_cell_mean_avg',
-        
-        # Distance 相關
-        'distance_of_available_gs_of_cell_mean_max': 'avg_cells_distance_of_available_gs_of_cell_mean_max',
-        'distance_of_available_gs_of_cell_mean_min': 'avg_cells_distance_of_available_gs_of_cell_mean_min',
-        'distance_of_available_gs_of_cell_mean_mean': 'avg_cells_distance_of_available_gs_of_cell_mean_avg',
-        
-        # Elevation 相關
-        'elevation_of_available_gs_of_cell_mean_max': 'avg_cells_elevation_of_available_gs_of_cell_mean_max',
-        'elevation_of_available_gs_of_cell_mean_min': 'avg_cells_elevation_of_available_gs_of_cell_mean_min',
-        'elevation_of_available_gs_of_cell_mean_mean': 'avg_cells_elevation_of_available_gs_of_cell_mean_avg',
-        
-        # 基本計數相關
-        'handover_count': 'avg_cells_handover_count',
-        'handover_fail_count': 'avg_cells_handover_fail_count',
-        'valid_interval_count': 'avg_cells_valid_interval_count',
-        
-        # Score 相關
-        'sum_score_max': 'avg_cells_sum_score_max',
-        'sum_score_min': 'avg_cells_sum_score_min',
-        'sum_score_mean': 'avg_cells_sum_score_mean',
-        
-        # Remaining time 相關
-        'remaining_duration_to_first': 'avg_cells_remaining_duration_to_first',
-        'remaining_start_to_first': 'avg_cells_remaining_start_to_first',
-        'remaining_end_to_first': 'avg_cells_remaining_end_to_first',
-        'remaining_duration_from_last': 'avg_cells_remaining_duration_from_last',
-        'remaining_start_from_last': 'avg_cells_remaining_start_from_last',
-        'remaining_end_from_last': 'avg_cells_remaining_end_from_last',
-        
-        # Connection Duration 相關
-        'connection_duration_max': 'avg_cells_connection_duration_max',
-        'connection_duration_min': 'avg_cells_connection_duration_min',
-        'connection_duration_mean': 'avg_cells_connection_duration_mean',
-        'connection_duration_count': 'avg_cells_connection_duration_count',
-        
-        # Disconnect Duration 相關
-        'disconnect_duration_max': 'avg_cells_disconnect_duration_max',
-        'disconnect_duration_min': 'avg_cells_disconnect_duration_min',
-        'disconnect_duration_mean': 'avg_cells_disconnect_duration_mean',
-        'disconnect_duration_count': 'avg_cells_disconnect_duration_count'
-    }
 
 
-    # 儲存每個Cell的數據和對應的Cell名稱
-    ideal_data = []  # 改為列表而不是字典
-    actual_data = []  # 改為列表而不是字典
-    
     # 檢查目錄是否存在
     if not os.path.exists(ideal_path) or not os.path.exists(actual_path):
         print(f"One or both directories do not exist: {ideal_path}, {actual_path}")
         return
-    
-    # 處理理想情況
-    try:
-        for cell_folder in os.listdir(ideal_path):
-            cell_path = os.path.join(ideal_path, cell_folder, 'statistics.csv')
-            if os.path.exists(cell_path):
-                df = pd.read_csv(cell_path)
-                if all(col in df.columns for col in columns_to_analyze):  # 確保所有需要的列都存在
-                    ideal_data.append(df[columns_to_analyze])
-    except Exception as e:
-        print(f"Error processing ideal data: {str(e)}")
-        return
 
-    # 處理實際情況
+    # 平行讀取理想與實際情況每個Cell的數據，只解析需要的欄位並逐檔累計；欄位不齊全的Cell不納入
     try:
-        for cell_folder in os.listdir(actual_path):
-            cell_path = os.path.join(actual_path, cell_folder, 'statistics.csv')
-            if os.path.exists(cell_path):
-                df = pd.read_csv(cell_path)
-                if all(col in df.columns for col in columns_to_analyze):  # 確保所有需要的列都存在
-                    actual_data.append(df[columns_to_analyze])
+        cell_data = aggregate_cell_statistics(simulation_result_dir, COLUMNS_TO_ANALYZE)
     except Exception as e:
-        print(f"Error processing actual data: {str(e)}")
+        print(f"Error processing cell data: {str(e)}")
         return
+    ideal_data = cell_data['ideal']
+    actual_data = cell_data['actual']
 
     # 檢查是否有數據
-    if not ideal_data or not actual_data:
+    if not ideal_data.cell_count or not actual_data.cell_count:
         print("No data found in one or both directories.")
         return
+
+    # 保存理想與實際情況每個Cell的平均值，供逐Cell查詢，不必重新模擬
+    save_cell_metrics(simulation_result_dir, cell_data)
     
     try:
         # 計算平均值
-        ideal_avg = pd.concat(ideal_data).mean()
-        actual_avg = pd.concat(actual_data).mean()
+        ideal_avg = ideal_data.mean()
+        actual_avg = actual_data.mean()
         
         # 計算 Cell 數量
-        ideal_cell_count = len(ideal_data)
-        actual_cell_count = len(actual_data)
+        ideal_cell_count = ideal_data.cell_count
+        actual_cell_count = actual_data.cell_count
 
         # 創建結果DataFrame
         result = pd.DataFrame({
@@ -150,7 +139,7 @@ def analyzeGsoResult(simulation_result_dir):
         # 將 Actual 列轉換為 JSON 格式
 
         # 重命名索引
-        result.rename(index=column_name_mapping, inplace=True)
+        result.rename(index=COLUMN_NAME_MAPPING, inplace=True)
 
         result_json = {
             "gso_simulation_result": result['Actual'].to_dict()
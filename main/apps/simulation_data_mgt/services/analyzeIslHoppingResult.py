@@ -3,7 +3,7 @@
 分析 ISL（星間鏈路跳接）模組的模擬結果，提供統計、視覺化等功能。
 """
 import os
-import pandas as pd
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 
 def analyzeIslHoppingResult(simulation_result_dir):
     """
@@ -49,7 +49,7 @@ def analyzeIslHoppingResult(simulation_result_dir):
         return None
 
     try:
-        df = pd.read_csv(csv_path)
+        df = read_result_csv(csv_path)
 
         # 檢查 CSV 是否包含所需欄位
         required_cols = {"ISLBreak", "avgDistance", "avgHopCount", "runtime"}
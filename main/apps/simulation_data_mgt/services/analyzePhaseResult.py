@@ -4,8 +4,8 @@
 """
 import os
 import re
-import pandas as pd
 from main.utils.logger import log_trigger, log_writer
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 
 def sec_to_hms(seconds: float) -> str:
     """將秒數轉為 HH:MM:SS 字串。"""
@@ -88,7 +88,7 @@ def _analyze_single_csv(simulation_result_dir, csv_filename):
         return None
 
     try:
-        df = pd.read_csv(csv_path)
+        df = read_result_csv(csv_path)
         required_cols = {'satId1', 'observedTime', 'minDist'}
         if not required_cols.issubset(df.columns):
             print(f"[ERROR] Missing columns. Need {required_cols}, found {list(df.columns)}")
@@ -4,7 +4,7 @@
 """
 from main.utils.logger import log_trigger, log_writer
 import os
-import pandas as pd
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 
 @log_trigger('INFO')
 def analyzeSaveErRoutingResult(simulation_result_dir):
@@ -23,7 +23,7 @@ def analyzeSaveErRoutingResult(simulation_result_dir):
         return
 
     try:
-        df = pd.read_csv(csv_path)
+        df = read_result_csv(csv_path)
         
         # 將 DataFrame 轉為 JSON 格式（以 list[dict] 方式呈現）
         result_json = df.to_dict(orient="records")
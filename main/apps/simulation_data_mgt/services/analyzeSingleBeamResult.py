@@ -4,7 +4,7 @@
 """
 from main.utils.logger import log_trigger, log_writer
 import os
-import pandas as pd
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 
 @log_trigger('INFO')
 def analyzeSingleBeamResult(simulation_result_dir):
@@ -46,7 +46,7 @@ def analyzeSingleBeamResult(simulation_result_dir):
         return
 
     try:
-        df = pd.read_csv(statistics_csv_path)
+        df = read_result_csv(statistics_csv_path)
         
         # 將 DataFrame 轉為 JSON 格式（list[dict]）
         result_json = df.to_dict(orient="records")
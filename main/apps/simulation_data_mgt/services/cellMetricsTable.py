@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+handover、gso 的逐 cell 結果：ideal 與 actual 每個 cell 的 UT 數與各欄位平均。
+
+模擬結果（simulation_result）只保存 actual 所有 cell 的平均值，逐 cell 的數值存在結果目錄的
+cell_metrics.npz（情境、cell 名稱、UT 數各為一個陣列，各欄位平均為 cell 數 x 欄位數的矩陣），
+分析函式或以增量讀取完成模擬時寫出，並記錄寫出當時結果目錄的指紋（simAnalysisCache.result_fingerprint）。
+沒有這個檔案，或之後結果目錄有變動（例如接續執行新增了 cell）時，查詢時由 statistics.csv 或欄式副本重新建立。
+查詢時以陣列運算篩選、排序與分頁，不必重新執行模擬。
+"""
+import os
+import re
+import numpy as np
+from main.apps.simulation_data_mgt.services.cellStatisticsLoader import (
+    SITUATIONS, STATISTICS_FILE, aggregate_cell_statistics
+)
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
+
+CELL_METRICS_FILE = 'cell_metrics.npz'
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# 除了欄位名稱之外可排序的鍵
+SORT_KEYS = ('situation', 'cell', 'ut_count')
+CELL_NUMBER_PATTERN = re.compile(r'(\d+)')
+
+
+def _result_fingerprint(simulation_result_dir):
+    # simAnalysisCache 將本模組列入分析函式的版本，在此才匯入以避免循環匯入
+    from main.apps.simulation_data_mgt.services.simAnalysisCache import result_fingerprint
+    return result_fingerprint(simulation_result_dir)
+
+
+def _value(value):
+    """JSON 無法表示 NaN，沒有數值的欄位以 None 表示。"""
+    return None if np.isnan(value) else float(value)
+
+
+def _natural_key(name):
+    """cell_2 排在 cell_10 之前。"""
+    return [int(part) if part.isdigit() else part for part in CELL_NUMBER_PATTERN.split(name)]
+
+
+class CellMetricsTable:
+    def __init__(self, columns, situations, cells, ut_counts, values):
+        self.columns = list(columns)
+        self.situations = np.asarray(situations, dtype=str)
+        self.cells = np.asarray(cells, dtype=str)
+        self.ut_counts = np.asarray(ut_counts, dtype='int64')
+        self.values = np.asarray(values, dtype='float64').reshape(len(self.cells), len(self.columns))
+
+    def __len__(self):
+        return len(self.cells)
+
+    @classmethod
+    def from_aggregates(cls, aggregates):
+        """由 aggregate_cell_statistics 的結果（{情境: CellStatisticsAggregate}）建立，cell 依名稱排序。"""
+        return cls.from_cells(
+            next(iter(aggregates.values())).columns,
+            [(situation, cell, ut_count, means)
+             for situation, aggregate in aggregates.items() for cell, ut_count, means in aggregate.cells]
+        )
+
+    @classmethod
+    def from_cells(cls, columns, cells):
+        """由 [(情境, cell 名稱, UT 數, 各欄位平均), ...] 建立，cell 依名稱排序。"""
+        rows = sorted(cells, key=lambda row: (SITUATIONS.index(row[0]), _natural_key(row[1])))
+        return cls(
+            columns,
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2] for row in rows],
+            np.array([row[3] for row in rows]) if rows else np.empty((0, len(columns)))
+        )
+
+    def save(self, simulation_result_dir, fingerprint=None):
+        """:param fingerprint: 建立時結果目錄的指紋，未提供時以目前的結果目錄計算。"""
+        if fingerprint is None:
+            fingerprint = _result_fingerprint(simulation_result_dir)
+        path = os.path.join(simulation_result_dir, CELL_METRICS_FILE)
+        with open(path + '.tmp', 'wb') as f:
+            np.savez_compressed(f, columns=np.array(self.columns, dtype=str), situations=self.situations,
+                                cells=self.cells, ut_counts=self.ut_counts, values=self.values,
+                                fingerprint=np.array(fingerprint))
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, simulation_result_dir, fingerprint=None):
+        """
+        :param fingerprint: 提供時，寫出時記錄的指紋不同（結果目錄之後有變動）則視為不存在。
+        :return: CellMetricsTable；檔案不存在時回傳 None。
+        """
+        path = os.path.join(simulation_result_dir, CELL_METRICS_FILE)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if fingerprint is not None and ('fingerprint' not in data or str(data['fingerprint']) != fingerprint):
+                return None
+            return cls(data['columns'].tolist(), data['situations'], data['cells'], data['ut_counts'], data['values'])
+
+    def query(self, situation=None, cells=None, filters=None, metrics=None, sort_by=None, descending=False,
+              page=1, page_size=DEFAULT_PAGE_SIZE):
+        """
+        篩選、排序並分頁。
+
+        :param situation: 'ideal' 或 'actual'，None 表示兩者。
+        :param cells: 只回傳這些 cell 名稱。
+        :param filters: {欄位: {'min': 下限, 'max': 上限}}（含端點），沒有數值的 cell 不符合。
+        :param metrics: 回傳的欄位，None 表示所有欄位。
+        :param sort_by: 'situation'、'cell'、'ut_count' 或欄位名稱；None 依情境與 cell 名稱。沒有數值的 cell 排在最後。
+        :return: {'total', 'page', 'page_size', 'columns', 'rows'}；參數不正確時拋出 ValueError。
+        """
+        positions = {column: index for index, column in enumerate(self.columns)}
+        metrics = list(self.columns if metrics is None else metrics)
+        unknown = [column for column in list(metrics) + list(filters or {}) if column not in positions]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {unknown}")
+        if situation is not None and situation not in SITUATIONS:
+            raise ValueError(f"situation must be one of {list(SITUATIONS)}")
+        if sort_by is not None and sort_by not in SORT_KEYS and sort_by not in positions:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        page, page_size = int(page), int(page_size)
+        if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page must be >= 1 and page_size between 1 and {MAX_PAGE_SIZE}")
+
+        mask = np.ones(len(self), dtype=bool)
+        if situation is not None:
+            mask &= self.situations == situation
+        if cells is not None:
+            mask &= np.isin(self.cells, [str(cell) for cell in cells])
+        for column, bounds in (filters or {}).items():
+            values = self.values[:, positions[column]]
+            with np.errstate(invalid='ignore'):
+                if bounds.get('min') is not None:
+                    mask &= values >= float(bounds['min'])
+                if bounds.get('max') is not None:
+                    mask &= values <= float(bounds['max'])
+        indices = np.flatnonzero(mask)
+
+        if sort_by in positions:
+            values = self.values[indices, positions[sort_by]]
+            order = np.argsort(-values if descending else values, kind='stable')
+            indices = indices[order]
+        elif sort_by is not None:
+            keys = {
+                'situation': lambda index: SITUATIONS.index(self.situations[index]),
+                'cell': lambda index: _natural_key(self.cells[index]),
+                'ut_count': lambda index: self.ut_counts[index],
+            }
+            indices = sorted(indices, key=keys[sort_by], reverse=descending)
+        page_indices = indices[(page - 1) * page_size:page * page_size]
+
+        metric_positions = [positions[column] for column in metrics]
+        return {
+            'total': int(len(indices)),
+            'page': page,
+            'page_size': page_size,
+            'columns': metrics,
+            'rows': [
+                {
+                    'situation': str(self.situations[index]),
+                    'cell': str(self.cells[index]),
+                    'ut_count': int(self.ut_counts[index]),
+                    'metrics': {
+                        column: _value(self.values[index, position])
+                        for column, position in zip(metrics, metric_positions)
+                    },
+                }
+                for index in page_indices
+            ],
+        }
+
+
+def save_cell_metrics(simulation_result_dir, aggregates):
+    """分析函式呼叫：寫出逐 cell 的結果；失敗時只印出錯誤，不影響分析結果。"""
+    try:
+        CellMetricsTable.from_aggregates(aggregates).save(simulation_result_dir)
+    except Exception as e:
+        print(f"Unable to save cell metrics: {str(e)}")
+
+
+def get_cell_metrics(simulation_result_dir, columns, persist=True):
+    """
+    讀取逐 cell 的結果。沒有 cell_metrics.npz，或寫出後結果目錄有變動時，由 statistics.csv（或欄式副本）重新建立。
+
+    :param persist: 是否寫出重新建立的結果；模擬尚未完成時結果目錄還會變動，不寫出。
+    :return: CellMetricsTable；結果目錄沒有任何 cell 時回傳 None。
+    """
+    if not os.path.isdir(simulation_result_dir):
+        return None
+    fingerprint = _result_fingerprint(simulation_result_dir)
+    table = CellMetricsTable.load(simulation_result_dir, fingerprint)
+    if table is not None:
+        return table
+    table = CellMetricsTable.from_aggregates(aggregate_cell_statistics(simulation_result_dir, columns))
+    if not len(table):
+        return None
+    if persist:
+        table.save(simulation_result_dir, fingerprint)
+    return table
+
+
+def cell_ut_rows(simulation_result_dir, situation, cell, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """
+    單一 cell 每個 UT 的數值（該 cell 的 statistics.csv 的每一列）。
+
+    :return: {'total', 'page', 'page_size', 'columns', 'rows'}；檔案不存在時回傳 None，參數不正確時拋出 ValueError。
+    """
+    if situation not in SITUATIONS:
+        raise ValueError(f"situation must be one of {list(SITUATIONS)}")
+    if not cell or os.sep in cell or cell in ('.', '..') or (os.altsep and os.altsep in cell):
+        raise ValueError("Invalid cell name")
+    page, page_size = int(page), int(page_size)
+    if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page must be >= 1 and page_size between 1 and {MAX_PAGE_SIZE}")
+    path = os.path.join(simulation_result_dir, situation, 'cell_analysis', cell, STATISTICS_FILE)
+    if not os.path.exists(path):
+        return None
+    df = read_result_csv(path)
+    rows = df.iloc[(page - 1) * page_size:page * page_size]
+    # NaN 無法以 JSON 表示，改為 None
+    rows = rows.astype(object).where(rows.notna(), None)
+    return {
+        'total': len(df),
+        'page': page,
+        'page_size': page_size,
+        'columns': [str(column) for column in df.columns],
+        'rows': rows.to_dict(orient='records'),
+    }
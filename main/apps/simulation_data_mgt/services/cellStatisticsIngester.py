@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+在模擬容器仍在執行時，逐步讀取 handover、gso 模擬輸出的每個 cell 的 statistics.csv。
+
+模擬器每完成一個 cell 就寫出該 cell 的 statistics.csv。監控作業時定期掃描輸出目錄，
+每個檔案只解析一次並保留它對各欄位的總和與筆數，因此：
+  * 模擬執行中即可查詢目前已完成 cell 的平均值（partial result）；
+  * 容器結束時只需讀取最後新增的少數檔案，即可得到與 analyzeHandoverResult 相同的結果；
+  * 作業逾時或失敗時，以已完成的 cell 計算部分結果（simResultSalvage）。
+"""
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+from main.apps.simulation_data_mgt.services.analyzeGsoResult import (
+    COLUMNS_TO_ANALYZE as GSO_COLUMNS_TO_ANALYZE, COLUMN_NAME_MAPPING as GSO_COLUMN_NAME_MAPPING
+)
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import COLUMNS_TO_ANALYZE, COLUMN_NAME_MAPPING
+from main.apps.simulation_data_mgt.services.cellStatisticsLoader import (
+    SITUATIONS, STATISTICS_FILE, CellStatisticsAggregate, read_cell_values
+)
+
+CELL_COUNT_PATTERN = re.compile(r'(\d+)\s*cell', re.IGNORECASE)
+
+
+class CellStatisticsIngester:
+    """
+    累計 <result_dir>/<ideal|actual>/cell_analysis/<cell>/statistics.csv 的欄位總和與筆數。
+
+    模擬器可能正在寫入檔案，因此執行中只讀取大小與修改時間在兩次掃描間都沒有變化的檔案；
+    容器結束後的最後一次掃描（final=True）則讀取所有檔案。已讀取的檔案若之後被改寫，會以新內容取代。
+    """
+
+    def __init__(self, simulation_result_dir, result_key, columns=COLUMNS_TO_ANALYZE,
+                 column_name_mapping=COLUMN_NAME_MAPPING):
+        self.simulation_result_dir = simulation_result_dir
+        self.result_key = result_key
+        self.columns = list(columns)
+        self.column_name_mapping = column_name_mapping
+        self._lock = threading.Lock()
+        self._seen = {}  # 檔案路徑 -> 上次掃描時的 (大小, 修改時間)
+        # 檔案路徑 -> (簽章, 情境, 各欄位總和, 各欄位筆數, 列數)；欄位不齊全的檔案總和為 None
+        self._ingested = {}
+
+    def _statistics_files(self):
+        for situation in SITUATIONS:
+            cell_analysis_path = os.path.join(self.simulation_result_dir, situation, 'cell_analysis')
+            try:
+                cell_folders = os.listdir(cell_analysis_path)
+            except FileNotFoundError:
+                continue
+            for cell_folder in cell_folders:
+                yield situation, os.path.join(cell_analysis_path, cell_folder, STATISTICS_FILE)
+
+    def _read(self, path):
+        values = read_cell_values(path, self.columns)
+        if values is None:  # 與分析函式相同，欄位不齊全的 cell 不納入
+            return None, None, 0
+        aggregate = CellStatisticsAggregate(self.columns).add_values(values)
+        return aggregate.sum, aggregate.count, len(values)
+
+    def scan(self, final=False, skip_errors=False):
+        """
+        讀取新完成（或被改寫）的 statistics.csv。
+
+        :param final: 容器已結束，讀取所有檔案且不再等待檔案穩定；讀取失敗時拋出例外。
+        :param skip_errors: final 時略過無法讀取的檔案（例如容器被終止時寫到一半的檔案），不拋出例外。
+        :return: 累計結果是否有變動。
+        """
+        changed = False
+        with self._lock:
+            for situation, path in self._statistics_files():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                ingested = self._ingested.get(path)
+                if ingested is not None and ingested[0] == signature:
+                    continue
+                if not final and self._seen.get(path) != signature:
+                    # 檔案可能仍在寫入，等下一次掃描確認沒有變化再讀取
+                    self._seen[path] = signature
+                    continue
+                try:
+                    sums, counts, rows = self._read(path)
+                except Exception as e:
+                    if final and not skip_errors:
+                        raise
+                    print(f"Unable to ingest {path}: {str(e)}")
+                    continue
+                self._ingested[path] = (signature, situation, sums, counts, rows)
+                self._seen.pop(path, None)
+                changed = True
+        return changed
+
+    def _totals(self, situation):
+        """回傳某情境已讀取的 cell 數與各欄位的平均值。"""
+        contributions = [
+            (sums, counts) for _, file_situation, sums, counts, _ in self._ingested.values()
+            if file_situation == situation and sums is not None
+        ]
+        if not contributions:
+            return 0, None
+        sums = np.sum([sums for sums, _ in contributions], axis=0)
+        counts = np.sum([counts for _, counts in contributions], axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / np.where(counts > 0, counts, 1), np.nan)
+        return len(contributions), pd.Series(means, index=self.columns)
+
+    def completed_cells(self):
+        """回傳各情境已讀取、欄位齊全的 cell 資料夾名稱。"""
+        with self._lock:
+            return {
+                situation: sorted(
+                    os.path.basename(os.path.dirname(path))
+                    for path, (_, file_situation, sums, _, _) in self._ingested.items()
+                    if file_situation == situation and sums is not None
+                )
+                for situation in SITUATIONS
+            }
+
+    def cell_means(self):
+        """
+        回傳已讀取、欄位齊全的每個 cell 的 UT 數與各欄位平均：[(情境, cell 名稱, UT 數, 各欄位平均), ...]，
+        供寫出逐 cell 的結果（cellMetricsTable）。
+        """
+        with self._lock:
+            ingested = [item for item in self._ingested.items() if item[1][2] is not None]
+        cells = []
+        for path, (_, situation, sums, counts, rows) in ingested:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = sums / np.where(counts > 0, counts, np.nan)
+            cells.append((situation, os.path.basename(os.path.dirname(path)), rows, means))
+        return cells
+
+    def cell_counts(self):
+        with self._lock:
+            return {situation: self._totals(situation)[0] for situation in SITUATIONS}
+
+    def result(self):
+        """
+        回傳與 analyzeHandoverResult 相同格式的結果；ideal 或 actual 沒有任何 cell 時回傳 None。
+        """
+        with self._lock:
+            ideal_count, _ = self._totals('ideal')
+            actual_count, actual_avg = self._totals('actual')
+        if not ideal_count or not actual_count:
+            return None
+        return {self.result_key: actual_avg.rename(index=self.column_name_mapping).to_dict()}
+
+    def partial_result(self):
+        """執行中查詢用：目前已完成的 cell 數，以及 actual 已完成 cell 的平均值。"""
+        with self._lock:
+            counts = {situation: self._totals(situation)[0] for situation in SITUATIONS}
+            _, actual_avg = self._totals('actual')
+        result = {}
+        if actual_avg is not None:
+            # NaN 無法存入 JSON 欄位，沒有資料的欄位以 None 表示
+            result = {
+                self.column_name_mapping.get(column, column): None if pd.isna(value) else float(value)
+                for column, value in actual_avg.items()
+            }
+        return {'cell_count': counts, self.result_key: result}
+
+    def finalize(self):
+        """容器結束後讀取剩下的檔案並回傳最終結果。"""
+        self.scan(final=True)
+        return self.result()
+
+
+def expected_cell_count(parameter):
+    """由參數 cell_ut（例如 "31Cell_220UT"）取得 cell 數；無法判斷時回傳 None。"""
+    if not isinstance(parameter, dict):
+        return None
+    match = CELL_COUNT_PATTERN.search(str(parameter.get('cell_ut', '')))
+    return int(match.group(1)) if match else None
+
+
+def count_statistics_files(simulation_result_dir):
+    """回傳目前已寫出 statistics.csv 的 cell 數（ideal 與 actual 合計），只檢查檔案是否存在、不讀取內容。"""
+    count = 0
+    for situation in SITUATIONS:
+        cell_analysis_path = os.path.join(simulation_result_dir, situation, 'cell_analysis')
+        try:
+            cell_folders = os.listdir(cell_analysis_path)
+        except FileNotFoundError:
+            continue
+        count += sum(
+            1 for cell_folder in cell_folders
+            if os.path.exists(os.path.join(cell_analysis_path, cell_folder, STATISTICS_FILE))
+        )
+    return count
+
+
+def handover_result_ingester(simulation_result_dir):
+    return CellStatisticsIngester(simulation_result_dir, 'handover_simulation_result')
+
+
+def gso_result_ingester(simulation_result_dir):
+    # GSO 的 cell_analysis 輸出格式與 handover 相同，納入平均的欄位與名稱映射以 GSO 分析函式的為準
+    return CellStatisticsIngester(simulation_result_dir, 'gso_simulation_result',
+                                  columns=GSO_COLUMNS_TO_ANALYZE,
+                                  column_name_mapping=GSO_COLUMN_NAME_MAPPING)
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+讀取 handover、gso 模擬輸出的每個 cell 的 statistics.csv（<result_dir>/<ideal|actual>/cell_analysis/<cell>/statistics.csv）。
+
+300 UT 的配置有數千個檔案，每個檔案只有幾十列、只需要其中 38 個欄位，讀取時間主要花在每個檔案的固定成本上，因此：
+  * 先讀取標頭確認欄位齊全，欄位不齊全的 cell 不解析內容（與原本的分析函式一樣不納入）；
+  * 以 numpy.loadtxt 依標頭的欄位位置（usecols）只解析需要的欄位，並指定 float64 型別，
+    省去 pandas 每次建立 parser 與型別推斷的成本；有缺值等 loadtxt 無法處理的內容時改用 pandas 讀取；
+  * ideal 與 actual 的檔案在同一個執行緒池中平行讀取（解析時會釋放 GIL）。
+
+分析只需要各欄位的平均值，aggregate_cell_statistics 讀完一個檔案就累計到 CellStatisticsAggregate 後丟棄，
+不保留所有 cell 的 DataFrame，記憶體用量不隨 cell 數增加；每個執行緒各自累計，最後再合併。
+結果目錄有欄式副本（simResultSidecar）且 cell 檔案沒有變動時，兩者都改從副本讀取。
+"""
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+SITUATIONS = ('ideal', 'actual')
+STATISTICS_FILE = 'statistics.csv'
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def read_header(path):
+    """回傳 (欄位名稱清單, 標頭之後是否還有資料列)。"""
+    with open(path, newline='') as f:
+        header = next(csv.reader([f.readline()]), [])
+        return header, bool(f.readline().strip())
+
+
+def read_cell_values(path, columns):
+    """
+    讀取單一 cell 的 statistics.csv 中 columns 的數值。
+
+    :return: 形狀為 (列數, len(columns)) 的 float64 陣列，缺值為 NaN；標頭缺少任何一個欄位時回傳 None。
+    """
+    header, has_rows = read_header(path)
+    positions = {}
+    for index, column in enumerate(header):
+        positions.setdefault(column, index)
+    if not all(column in positions for column in columns):
+        return None
+    columns = list(columns)
+    if not has_rows:
+        return np.empty((0, len(columns)))
+    try:
+        return np.loadtxt(path, delimiter=',', skiprows=1, usecols=[positions[column] for column in columns],
+                          dtype='float64', quotechar='"', ndmin=2)
+    except ValueError:
+        # 空白欄位（缺值）等 loadtxt 無法解析的內容，以 pandas 讀取，缺值為 NaN
+        return pd.read_csv(path, usecols=columns, dtype='float64')[columns].to_numpy()
+
+
+def read_cell_statistics(path, columns):
+    """
+    讀取單一 cell 的 statistics.csv，只保留 columns（依 columns 的順序，型別為 float64）。
+
+    :return: DataFrame；標頭缺少任何一個欄位時回傳 None。
+    """
+    values = read_cell_values(path, columns)
+    if values is None:
+        return None
+    return pd.DataFrame(values, columns=list(columns))
+
+
+class CellStatisticsAggregate:
+    """
+    各欄位的累計筆數、總和、最小值與最大值（略過缺值，與 pandas 相同），以及累計的 cell 數。
+    累計時提供 cell 名稱的話，另外保留每個 cell 的列數與各欄位平均（cells），供逐 cell 查詢（cellMetricsTable）。
+
+    兩個累計結果可以合併（merge），合併的順序不影響結果（浮點數誤差除外）。
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.cell_count = 0
+        self.cells = []  # [(cell 名稱, 列數, 各欄位平均), ...]
+        self.count = np.zeros(len(self.columns))
+        self.sum = np.zeros(len(self.columns))
+        self.min = np.full(len(self.columns), np.inf)
+        self.max = np.full(len(self.columns), -np.inf)
+
+    def add(self, df, cell=None):
+        """累計一個 cell 的 DataFrame（需包含所有 columns）。"""
+        return self.add_values(df[self.columns].to_numpy(dtype='float64'), cell)
+
+    def add_values(self, values, cell=None):
+        """
+        累計一個 cell 的數值陣列（欄位順序與 columns 相同，缺值為 NaN）。
+
+        :param cell: cell 名稱；提供時保留這個 cell 的列數與各欄位平均。
+        """
+        self.cell_count += 1
+        if not values.size:
+            if cell is not None:
+                self.cells.append((cell, len(values), np.full(len(self.columns), np.nan)))
+            return self
+        missing = np.isnan(values)
+        if missing.any():
+            present = ~missing
+            count = present.sum(axis=0)
+            total = np.where(present, values, 0.0).sum(axis=0)
+            np.minimum(self.min, np.where(present, values, np.inf).min(axis=0), out=self.min)
+            np.maximum(self.max, np.where(present, values, -np.inf).max(axis=0), out=self.max)
+        else:
+            count = len(values)
+            total = values.sum(axis=0)
+            np.minimum(self.min, values.min(axis=0), out=self.min)
+            np.maximum(self.max, values.max(axis=0), out=self.max)
+        self.count += count
+        self.sum += total
+        if cell is not None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.cells.append((cell, len(values), total / np.where(count > 0, count, np.nan)))
+        return self
+
+    def merge(self, other):
+        """合併另一個相同欄位的累計結果。"""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge aggregates of different columns")
+        self.cell_count += other.cell_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.cells.extend(other.cells)
+        return self
+
+    def _series(self, values):
+        return pd.Series(np.where(self.count > 0, values, np.nan), index=self.columns)
+
+    def mean(self):
+        """各欄位的平均值；沒有任何數值的欄位為 NaN，與 pd.concat(...).mean() 相同。"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._series(self.sum / np.where(self.count > 0, self.count, 1))
+
+    def minimum(self):
+        return self._series(self.min)
+
+    def maximum(self):
+        return self._series(self.max)
+
+
+def statistics_files(simulation_result_dir, situation):
+    """列出某情境所有 cell 的 statistics.csv 路徑；目錄不存在時回傳空清單。"""
+    cell_analysis_path = os.path.join(simulation_result_dir, situation, 'cell_analysis')
+    try:
+        cell_folders = os.listdir(cell_analysis_path)
+    except FileNotFoundError:
+        return []
+    paths = (os.path.join(cell_analysis_path, cell_folder, STATISTICS_FILE) for cell_folder in cell_folders)
+    return [path for path in paths if os.path.exists(path)]
+
+
+def _read_sidecar(simulation_result_dir, columns):
+    from main.apps.simulation_data_mgt.services.simResultSidecar import read_cell_sidecar
+    try:
+        return read_cell_sidecar(simulation_result_dir, columns)
+    except Exception as e:
+        print(f"Unable to read cell statistics from result sidecar, reading CSV files: {str(e)}")
+        return None
+
+
+def load_cell_statistics(simulation_result_dir, columns, max_workers=DEFAULT_WORKERS, use_sidecar=True):
+    """
+    平行讀取 ideal 與 actual 所有 cell 的 statistics.csv。
+
+    :param max_workers: 執行緒數，1 表示依序讀取。
+    :param use_sidecar: 有可用的欄式副本時從副本讀取。
+    :return: {情境: [每個欄位齊全的 cell 的 DataFrame, ...]}；讀取失敗時拋出例外。
+    """
+    sidecar = _read_sidecar(simulation_result_dir, columns) if use_sidecar else None
+    if sidecar is not None:
+        return {
+            situation: [pd.DataFrame(values, columns=list(columns)) for _, values in cells]
+            for situation, cells in sidecar.items()
+        }
+    jobs = [(situation, path) for situation in SITUATIONS
+            for path in statistics_files(simulation_result_dir, situation)]
+    if max_workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            frames = list(pool.map(lambda job: read_cell_statistics(job[1], columns), jobs))
+    else:
+        frames = [read_cell_statistics(path, columns) for _, path in jobs]
+
+    data = {situation: [] for situation in SITUATIONS}
+    for (situation, _), df in zip(jobs, frames):
+        if df is not None:
+            data[situation].append(df)
+    return data
+
+
+def aggregate_cell_statistics(simulation_result_dir, columns, max_workers=DEFAULT_WORKERS, use_sidecar=True):
+    """
+    讀取 ideal 與 actual 所有 cell 的 statistics.csv，逐檔累計而不保留 DataFrame。
+
+    檔案依執行緒數分組，每個執行緒各自累計，最後合併各執行緒的結果。
+
+    :param max_workers: 執行緒數，1 表示依序讀取。
+    :param use_sidecar: 有可用的欄式副本時從副本讀取。
+    :return: {情境: CellStatisticsAggregate}，只包含欄位齊全的 cell，並保留每個 cell 的平均；讀取失敗時拋出例外。
+    """
+    sidecar = _read_sidecar(simulation_result_dir, columns) if use_sidecar else None
+    if sidecar is not None:
+        aggregates = {situation: CellStatisticsAggregate(columns) for situation in SITUATIONS}
+        for situation, cells in sidecar.items():
+            for cell, values in cells:
+                aggregates[situation].add_values(values, cell)
+        return aggregates
+
+    jobs = [(situation, path) for situation in SITUATIONS
+            for path in statistics_files(simulation_result_dir, situation)]
+
+    def aggregate(group):
+        aggregates = {situation: CellStatisticsAggregate(columns) for situation in SITUATIONS}
+        for situation, path in group:
+            values = read_cell_values(path, columns)
+            if values is not None:
+                aggregates[situation].add_values(values, os.path.basename(os.path.dirname(path)))
+        return aggregates
+
+    workers = max(1, min(max_workers, len(jobs)))
+    groups = [jobs[index::workers] for index in range(workers)]
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(aggregate, groups))
+    else:
+        partials = [aggregate(group) for group in groups]
+
+    totals = partials[0]
+    for partial in partials[1:]:
+        for situation in SITUATIONS:
+            totals[situation].merge(partial[situation])
+    return totals
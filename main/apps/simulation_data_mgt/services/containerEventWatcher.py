@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+容器事件監聽：整個行程只開一條 Docker 事件串流，收到模擬容器的 die / oom 事件時
+立即喚醒等待該容器的監控流程，取代每個作業每 10 秒各自執行一次 `docker ps`。
+"""
+import json
+import threading
+import time
+from main.apps.simulation_data_mgt.services.dockerEngineClient import get_docker_client
+
+# exec_die 用於暖容器池：作業以 docker exec 執行，指令結束時容器本身仍在執行
+EVENT_FILTERS = {'type': ['container'], 'event': ['die', 'oom', 'exec_die']}
+RECONNECT_DELAY = 5
+
+
+class ContainerWaiter:
+    """單一容器的等待狀態；die 事件發生後 exited 會被設定。"""
+
+    def __init__(self, container_name):
+        self.container_name = container_name
+        self.exited = threading.Event()
+        self.oom_killed = False
+        self.exit_code = None
+
+
+class ContainerEventWatcher:
+    """
+    監聽容器結束事件並通知對應的等待者。
+
+    generation 在每次事件串流（重新）連線時遞增；監控流程若發現 generation 改變，
+    代表中間可能漏掉事件，需要自行確認一次容器狀態。
+    事件串流無法使用時（例如 Docker socket 無法連線）connected 為 False，由呼叫端退回輪詢，
+    監聽器則每 RECONNECT_DELAY 秒重新連線。
+    """
+
+    def __init__(self, client=None):
+        self.client = client
+        self.generation = 0
+        self.connected = False
+        self._lock = threading.Lock()
+        self._waiters = {}
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._watch_loop, name="containerEventWatcher", daemon=True)
+            self._thread.start()
+
+    def register(self, container_name):
+        """在啟動或接手容器之前登記，確保容器很快結束時也不會漏掉事件。"""
+        self.start()
+        with self._lock:
+            waiter = self._waiters.get(container_name)
+            if waiter is None:
+                waiter = ContainerWaiter(container_name)
+                self._waiters[container_name] = waiter
+            return waiter
+
+    def unregister(self, container_name):
+        with self._lock:
+            self._waiters.pop(container_name, None)
+
+    def notify(self, container_name, action='die', exit_code=None):
+        """標記容器已結束並喚醒等待者；事件串流與本地操作（例如終止作業）共用。"""
+        with self._lock:
+            waiter = self._waiters.get(container_name)
+        if waiter is None:
+            return
+        if action == 'oom':
+            waiter.oom_killed = True
+            return
+        waiter.exit_code = exit_code
+        waiter.exited.set()
+
+    def handle_event(self, event):
+        """處理一筆 Docker 事件（dict 或 JSON 字串）。"""
+        if not isinstance(event, dict):
+            try:
+                event = json.loads(event)
+            except (json.JSONDecodeError, TypeError):
+                return
+        attributes = event.get('Actor', {}).get('Attributes', {})
+        container_name = attributes.get('name')
+        if not container_name:
+            return
+        action = event.get('Action') or event.get('status') or ''
+        exit_code = attributes.get('exitCode')
+        self.notify(container_name, action, int(exit_code) if exit_code not in (None, '') else None)
+
+    def _on_connect(self):
+        self.generation += 1
+        self.connected = True
+
+    def _watch_loop(self):
+        client = self.client or get_docker_client()
+        while True:
+            try:
+                for event in client.stream_events(EVENT_FILTERS, on_connect=self._on_connect):
+                    self.handle_event(event)
+            except Exception as e:
+                print(f"Container event watcher error: {str(e)}")
+            finally:
+                self.connected = False
+            time.sleep(RECONNECT_DELAY)
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_container_event_watcher():
+    """取得整個行程共用的容器事件監聽器。"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ContainerEventWatcher()
+        return _watcher
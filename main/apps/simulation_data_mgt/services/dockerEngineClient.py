@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+Docker Engine API 用戶端：直接透過 unix socket 以 HTTP/1.1 與 Docker daemon 溝通，
+連線使用 keep-alive 並放在連線池中重複使用，取代每次操作都 fork 一個 docker CLI。
+"""
+import http.client
+import json
+import queue
+import re
+import socket
+import threading
+from urllib.parse import quote, urlencode
+from django.conf import settings
+
+DEFAULT_SOCKET_PATH = '/var/run/docker.sock'
+
+_MEMORY_UNITS = {'': 1, 'b': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3, 't': 1024 ** 4}
+# 已送出請求後才失敗時，只有這些方法可以安全地重送
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+
+
+class DockerEngineError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"Docker Engine API error ({status}): {message}")
+        self.status = status
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """以 unix socket 取代 TCP 的 HTTPConnection。"""
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def parse_memory_limit(memory_limit):
+    """將 '28g'、'512m' 等 docker -m 格式轉為 bytes。"""
+    if isinstance(memory_limit, int):
+        return memory_limit
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)b?\s*', str(memory_limit).lower())
+    if not match:
+        raise ValueError(f"Invalid memory limit: {memory_limit}")
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2)])
+
+
+class DockerEngineClient:
+    """
+    Docker Engine API 的精簡用戶端，只提供模擬作業需要的容器操作。
+
+    一般請求共用連線池；事件串流會長時間佔用連線，因此另外建立獨立連線。
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, pool_size=8, timeout=30):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _get_connection(self):
+        """回傳 (連線, 是否為池中重複使用的連線)。"""
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return UnixHTTPConnection(self.socket_path, timeout=self.timeout), False
+
+    def _release_connection(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _request(self, method, path, params=None, body=None):
+        url = path + (f"?{urlencode(params)}" if params else '')
+        headers = {'Host': 'docker'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+
+        while True:
+            conn, reused = self._get_connection()
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                # 池中的閒置連線可能已被 daemon 關閉，請求沒有送達，改用下一條連線重試；新建連線失敗則直接回報
+                if reused:
+                    continue
+                raise DockerEngineError(None, f"{method} {path} failed: {str(e)}")
+            try:
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                # 請求已送出：只有 daemon 在回應前就關閉閒置連線時，冪等的請求才重送；
+                # 逾時等其他錯誤時 daemon 可能已執行請求（例如 create、stop），重送會重複執行
+                if reused and method in IDEMPOTENT_METHODS and isinstance(
+                        e, (http.client.RemoteDisconnected, BrokenPipeError)):
+                    continue
+                raise DockerEngineError(None, f"{method} {path} failed: {str(e)}")
+            if response.will_close:
+                conn.close()
+            else:
+                self._release_connection(conn)
+            try:
+                content = json.loads(data) if data else None
+            except json.JSONDecodeError:
+                content = data.decode(errors='replace')
+            return response.status, content
+
+    @staticmethod
+    def _raise_for_status(status, content, allowed=(200, 201, 204)):
+        if status not in allowed:
+            message = content.get('message') if isinstance(content, dict) else content
+            raise DockerEngineError(status, message)
+
+    def ping(self):
+        status, _ = self._request('GET', '/_ping')
+        return status == 200
+
+    def info(self):
+        status, content = self._request('GET', '/info')
+        self._raise_for_status(status, content, allowed=(200,))
+        return content
+
+    def image_digest(self, image):
+        """回傳映像檔的 id（sha256 digest）；映像檔不存在時回傳 None。"""
+        status, content = self._request('GET', f'/images/{quote(image)}/json')
+        if status == 404:
+            return None
+        self._raise_for_status(status, content, allowed=(200,))
+        return content['Id']
+
+    def container_memory_usage(self, name):
+        """回傳容器目前不含 page cache 的記憶體用量（bytes）；容器不存在時回傳 None。"""
+        stats = self.container_stats(name)
+        return stats['memory_usage'] if stats is not None else None
+
+    def container_stats(self, name):
+        """
+        回傳容器目前的 cgroup 統計；容器不存在時回傳 None。
+
+        :return: {"memory_usage": 不含 page cache 的記憶體用量, "memory_peak": 記憶體峰值（cgroup v2 為目前用量）,
+                  "cpu_seconds": 累計 CPU 秒數, "block_read_bytes", "block_write_bytes": 累計區塊讀寫量}
+        """
+        status, content = self._request('GET', f'/containers/{quote(name)}/stats',
+                                        params={'stream': 'false', 'one-shot': 'true'})
+        if status == 404:
+            return None
+        self._raise_for_status(status, content, allowed=(200,))
+        memory_stats = content.get('memory_stats') or {}
+        usage = memory_stats.get('usage') or 0
+        # 與 docker stats 相同，扣除可回收的 page cache（cgroup v1: total_inactive_file，v2: inactive_file）
+        detail = memory_stats.get('stats') or {}
+        cache = detail.get('total_inactive_file', detail.get('inactive_file', 0)) or 0
+        cpu_usage = (content.get('cpu_stats') or {}).get('cpu_usage') or {}
+        block_io = {'read': 0, 'write': 0}
+        for entry in (content.get('blkio_stats') or {}).get('io_service_bytes_recursive') or []:
+            op = str(entry.get('op', '')).lower()
+            if op in block_io:
+                block_io[op] += entry.get('value') or 0
+        return {
+            'memory_usage': max(0, usage - cache),
+            'memory_peak': max(memory_stats.get('max_usage') or 0, usage),
+            'cpu_seconds': (cpu_usage.get('total_usage') or 0) / 1e9,
+            'block_read_bytes': block_io['read'],
+            'block_write_bytes': block_io['write'],
+        }
+
+    def run_container(self, name, image, command, binds=(), memory_limit=None, oom_kill_disable=True,
+                      auto_remove=True):
+        """
+        建立並啟動容器，等同 `docker run -d --rm --name=<name> -v <binds> -m <memory_limit> <image> <command>`。
+
+        :return: 容器 id。
+        """
+        host_config = {
+            'Binds': list(binds),
+            'AutoRemove': auto_remove,
+            'OomKillDisable': oom_kill_disable,
+        }
+        if memory_limit:
+            host_config['Memory'] = parse_memory_limit(memory_limit)
+        status, content = self._request('POST', '/containers/create', params={'name': name}, body={
+            'Image': image,
+            'Cmd': list(command),
+            'HostConfig': host_config,
+        })
+        self._raise_for_status(status, content, allowed=(201,))
+        container_id = content['Id']
+        status, content = self._request('POST', f'/containers/{container_id}/start')
+        self._raise_for_status(status, content, allowed=(204, 304))
+        return container_id
+
+    def update_container(self, name, memory_limit):
+        """調整執行中容器的記憶體上限（swap 不限制，避免低於既有 swap 上限時被拒絕）。"""
+        status, content = self._request('POST', f'/containers/{quote(name)}/update', body={
+            'Memory': parse_memory_limit(memory_limit),
+            'MemorySwap': -1,
+        })
+        self._raise_for_status(status, content, allowed=(200,))
+
+    def exec_container(self, name, command):
+        """
+        在執行中的容器內以背景方式執行指令，等同 `docker exec -d <name> <command>`。
+
+        :return: exec id。
+        """
+        status, content = self._request('POST', f'/containers/{quote(name)}/exec', body={
+            'Cmd': list(command),
+            'AttachStdout': False,
+            'AttachStderr': False,
+        })
+        self._raise_for_status(status, content, allowed=(201,))
+        exec_id = content['Id']
+        status, content = self._request('POST', f'/exec/{exec_id}/start', body={'Detach': True, 'Tty': False})
+        self._raise_for_status(status, content, allowed=(200, 204))
+        return exec_id
+
+    def inspect_exec(self, exec_id):
+        """回傳 exec 的狀態（Running、ExitCode、Pid）；exec 不存在（例如容器已移除）時回傳 None。"""
+        status, content = self._request('GET', f'/exec/{quote(exec_id)}/json')
+        if status == 404:
+            return None
+        self._raise_for_status(status, content, allowed=(200,))
+        return content
+
+    def inspect_container(self, name):
+        """回傳容器資訊；容器不存在時回傳 None。"""
+        status, content = self._request('GET', f'/containers/{quote(name)}/json')
+        if status == 404:
+            return None
+        self._raise_for_status(status, content, allowed=(200,))
+        return content
+
+    def container_pid(self, name):
+        info = self.inspect_container(name)
+        if info is None:
+            raise DockerEngineError(404, f"No such container: {name}")
+        return int(info['State']['Pid'])
+
+    def list_containers(self, name=None):
+        """回傳執行中容器的名稱清單（不含開頭的 '/'）；name 為名稱子字串篩選。"""
+        params = {}
+        if name:
+            params['filters'] = json.dumps({'name': [name]})
+        status, content = self._request('GET', '/containers/json', params=params)
+        self._raise_for_status(status, content, allowed=(200,))
+        return [
+            container_name.lstrip('/')
+            for container in content
+            for container_name in container.get('Names', [])[:1]
+        ]
+
+    def stop_container(self, name, timeout=10):
+        status, content = self._request('POST', f'/containers/{quote(name)}/stop', params={'t': timeout})
+        self._raise_for_status(status, content, allowed=(204, 304, 404))
+
+    def remove_container(self, name, force=True):
+        status, content = self._request('DELETE', f'/containers/{quote(name)}', params={'force': str(force).lower()})
+        self._raise_for_status(status, content, allowed=(204, 404, 409))
+
+    def stream_events(self, filters=None, on_connect=None):
+        """
+        訂閱 Docker 事件，逐一產生事件 dict。連線中斷時結束產生器，由呼叫端決定是否重新連線。
+
+        :param on_connect: 串流建立成功後（收到第一筆事件之前）呼叫的函式。
+        """
+        params = {'filters': json.dumps(filters)} if filters else None
+        conn = UnixHTTPConnection(self.socket_path, timeout=None)
+        try:
+            conn.request('GET', '/events' + (f"?{urlencode(params)}" if params else ''), headers={'Host': 'docker'})
+            response = conn.getresponse()
+            if response.status != 200:
+                raise DockerEngineError(response.status, response.read().decode(errors='replace'))
+            if on_connect is not None:
+                on_connect()
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_docker_client():
+    """取得整個行程共用的 Docker Engine API 用戶端。"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = DockerEngineClient(getattr(settings, 'DOCKER_SOCKET_PATH', DEFAULT_SOCKET_PATH))
+        return _client
@@ -2,10 +2,10 @@ from main.utils.logger import log_trigger, log_writer
 from matplotlib.backends.backend_pdf import PdfPages
 import matplotlib.pyplot as plt
 import seaborn as sns
-import pandas as pd
 import numpy as np
 import os
 from main.utils.update_parameter import update_parameter
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 def sec_to_hms(seconds):
     hh = seconds // 3600
     mm = (seconds % 3600) // 60
@@ -63,7 +63,7 @@ def genConnectedDurationResultPDF(connectedDuration):
             print(f"[INFO] Using coverage CSV: {connectedDuration_csv_path}")
         if os.path.exists(connectedDuration_csv_path):
             try:
-                df = pd.read_csv(connectedDuration_csv_path)
+                df = read_result_csv(connectedDuration_csv_path)
                 if not {'time', 'coverSatCount'}.issubset(df.columns):
                     print(f"[WARN] CSV columns not match. Need 'time' & 'coverSatCount'. Found: {list(df.columns)}")
                 else:
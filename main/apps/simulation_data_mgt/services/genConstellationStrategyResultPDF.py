@@ -1,9 +1,9 @@
 from main.utils.logger import log_trigger, log_writer
 from matplotlib.backends.backend_pdf import PdfPages
 import matplotlib.pyplot as plt
-import pandas as pd
 import os
 from main.utils.update_parameter import update_parameter
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 
 @log_trigger('INFO')
 def genConstellationStrategyResultPDF(constellationStrategy):
@@ -59,7 +59,7 @@ def genConstellationStrategyResultPDF(constellationStrategy):
         for csv_filename in csv_list:
             tmp_path = os.path.join(constellationStrategy.constellationStrategy_data_path, csv_filename)
             try:
-                df_temp = pd.read_csv(tmp_path)
+                df_temp = read_result_csv(tmp_path)
                 if {'satId', 'maxDist'}.issubset(df_temp.columns):
                     dist_csv_path = tmp_path
                     break  # 只取第一個符合條件的 CSV
@@ -68,7 +68,7 @@ def genConstellationStrategyResultPDF(constellationStrategy):
 
         if dist_csv_path is not None and os.path.exists(dist_csv_path):
             try:
-                df_dist = pd.read_csv(dist_csv_path)
+                df_dist = read_result_csv(dist_csv_path)
                 fig2, ax2 = plt.subplots(figsize=(10, 6))
 
                 ax2.plot(df_dist["satId"], df_dist["maxDist"], marker='o', label='maxDist')
@@ -103,7 +103,7 @@ def genConstellationStrategyResultPDF(constellationStrategy):
         for csv_filename in csv_list:
             tmp_path = os.path.join(constellationStrategy.constellationStrategy_data_path, csv_filename)
             try:
-                df_temp = pd.read_csv(tmp_path)
+                df_temp = read_result_csv(tmp_path)
                 # 是否同時具備 diffA, diffE, diffR，以及 stdDiffA, stdDiffE, stdDiffR
                 if {'satId', 'diffA', 'diffE', 'diffR', 
                     'stdDiffA', 'stdDiffE', 'stdDiffR'}.issubset(df_temp.columns):
@@ -116,7 +116,7 @@ def genConstellationStrategyResultPDF(constellationStrategy):
         # --------------- Page 4: Standardized AER --------------- #
         if aer_csv_path is not None and os.path.exists(aer_csv_path):
             try:
-                df_aer = pd.read_csv(aer_csv_path)
+                df_aer = read_result_csv(aer_csv_path)
 
                 # --- 第 3 頁：非標準化 AER (diffA, diffE, diffR) ---
                 fig3, ax3 = plt.subplots(figsize=(10, 6))
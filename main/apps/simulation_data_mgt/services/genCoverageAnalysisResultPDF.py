@@ -2,12 +2,12 @@ from main.utils.logger import log_trigger, log_writer
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
 import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
 import seaborn as sns
 import os
 import math  # <-- 新增 math
 from main.utils.update_parameter import update_parameter
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 @log_trigger('INFO')
 def genCoverageAnalysisResultPDF(coverage):
     # 1. 取得當下時間（用在第一頁右上角的時間戳記）
@@ -67,7 +67,7 @@ def genCoverageAnalysisResultPDF(coverage):
 
             if os.path.exists(coverage_csv_path):
                 try:
-                    df = pd.read_csv(coverage_csv_path)
+                    df = read_result_csv(coverage_csv_path)
                     df['coverage_seconds'] = df['coverage'] * 86400
 
                     sns.set_style("whitegrid")
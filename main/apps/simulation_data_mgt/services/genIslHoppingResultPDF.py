@@ -2,11 +2,11 @@ from main.utils.logger import log_trigger, log_writer
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
 import matplotlib.pyplot as plt
-import pandas as pd
 import seaborn as sns
 import os
 import math  # <-- 若有需要以 5 度等做刻度計算，可留著
 from main.utils.update_parameter import update_parameter
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 @log_trigger('INFO')
 def genIslHoppingResultPDF(islHopping):
     """
@@ -78,7 +78,7 @@ def genIslHoppingResultPDF(islHopping):
 
             if os.path.exists(isl_csv_path):
                 try:
-                    df = pd.read_csv(isl_csv_path)
+                    df = read_result_csv(isl_csv_path)
 
                     # 第 2 頁需要的欄位
                     required_cols = {"ISLBreak", "avgHopCount"}
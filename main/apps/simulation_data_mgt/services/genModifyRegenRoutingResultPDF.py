@@ -2,11 +2,11 @@ from main.utils.logger import log_trigger, log_writer
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
 import matplotlib.pyplot as plt
-import pandas as pd
 import seaborn as sns
 import os
 import math  # 若未使用可移除
 from main.utils.update_parameter import update_parameter
+from main.apps.simulation_data_mgt.services.simResultSidecar import read_result_csv
 @log_trigger('INFO')
 def genModifyRegenRoutingResultPDF(modifyRegenRouting):
     """
@@ -80,7 +80,7 @@ def genModifyRegenRoutingResultPDF(modifyRegenRouting):
 
             if os.path.exists(csv_path):
                 try:
-                    df = pd.read_csv(csv_path)
+                    df = read_result_csv(csv_path)
 
                     # ========== 第 2 頁：ISLBreak vs avgHopCount ========== #
                     required_cols = {"ISLBreak", "avgHopCount"}
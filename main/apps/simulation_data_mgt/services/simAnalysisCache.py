@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+結果分析的快取：分析結果存在結果目錄的 analysis_cache.json，以
+「分析函式版本 + 結果目錄中每個檔案的路徑、大小、修改時間」作為指紋。
+
+輪詢、接手（resume）或重新產生報告時再次分析同一個結果目錄，只需 stat 目錄中的檔案即可取回結果，
+不必重新讀取資料；檔案被改寫、新增、刪除，或分析函式與共用讀取程式的程式碼改變時重新分析。
+分析時或分析後才產生的 PDF 報告、欄式副本（simResultSidecar）、逐 cell 結果（cellMetricsTable）與快取檔本身不列入指紋。
+"""
+import hashlib
+import inspect
+import json
+import os
+from functools import lru_cache
+from django.conf import settings
+from main.apps.simulation_data_mgt.services import (
+    cellMetricsTable, cellStatisticsIngester, cellStatisticsLoader, simResultSidecar
+)
+from main.apps.simulation_data_mgt.services.cellMetricsTable import CELL_METRICS_FILE
+from main.apps.simulation_data_mgt.services.simResultSidecar import MANIFEST_FILE, SIDECAR_FILE
+
+ANALYSIS_CACHE_FILE = 'analysis_cache.json'
+# 程式碼以外的因素（例如 pandas 的版本）改變分析結果時遞增，使所有快取失效
+ANALYSIS_CACHE_VERSION = 1
+# 分析函式共用、決定分析數值的模組；原始檔內容列入分析函式的版本
+SHARED_MODULES = (cellStatisticsLoader, cellStatisticsIngester, simResultSidecar, cellMetricsTable)
+IGNORED_FILES = (ANALYSIS_CACHE_FILE, SIDECAR_FILE, MANIFEST_FILE, CELL_METRICS_FILE)
+IGNORED_SUFFIXES = ('.pdf', '.tmp')
+
+
+def analysis_cache_enabled():
+    return getattr(settings, 'SIM_ANALYSIS_CACHE_ENABLED', True)
+
+
+@lru_cache(maxsize=None)
+def analyzer_version(analyzer):
+    """
+    分析函式的版本：函式所在原始檔與共用模組（SHARED_MODULES）原始檔內容的雜湊，
+    任何一個修改後快取自動失效。
+    """
+    function = inspect.unwrap(analyzer)
+    digest = hashlib.sha256(f"{ANALYSIS_CACHE_VERSION}:{function.__module__}.{function.__qualname__}".encode('utf-8'))
+    for source in (function,) + tuple(SHARED_MODULES):
+        try:
+            with open(inspect.getsourcefile(source), 'rb') as f:
+                digest.update(f.read())
+        except (OSError, TypeError):
+            pass
+    return digest.hexdigest()
+
+
+def result_fingerprint(simulation_result_dir):
+    """結果目錄中每個檔案（相對路徑、大小、修改時間）的雜湊。"""
+    entries = []
+    for root, dirs, files in os.walk(simulation_result_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name in IGNORED_FILES or name.lower().endswith(IGNORED_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append(f"{os.path.relpath(path, simulation_result_dir)}\0{stat.st_size}\0{stat.st_mtime_ns}")
+    return hashlib.sha256('\n'.join(entries).encode('utf-8')).hexdigest()
+
+
+def _read_cache(simulation_result_dir):
+    try:
+        with open(os.path.join(simulation_result_dir, ANALYSIS_CACHE_FILE)) as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Unable to read analysis cache in {simulation_result_dir}: {str(e)}")
+        return {}
+
+
+def lookup_analysis(sim_type, simulation_result_dir, fingerprint=None):
+    """:return: 快取的分析結果；沒有快取或指紋、版本不符時回傳 None。"""
+    if not analysis_cache_enabled() or not os.path.isdir(simulation_result_dir):
+        return None
+    entry = _read_cache(simulation_result_dir).get(sim_type.name)
+    if not isinstance(entry, dict) or entry.get('version') != analyzer_version(sim_type.analyzer):
+        return None
+    if entry.get('fingerprint') != (fingerprint or result_fingerprint(simulation_result_dir)):
+        return None
+    return entry.get('result')
+
+
+def store_analysis(sim_type, simulation_result_dir, result, fingerprint=None):
+    """
+    存入分析結果；結果為 None（分析失敗），或無法原樣以 JSON 保存（例如以數值為鍵的 dict）時不存。
+
+    :param fingerprint: 分析開始前取得的指紋；分析期間檔案有變動時，下次查詢不會命中。
+    """
+    if result is None or not analysis_cache_enabled() or not os.path.isdir(simulation_result_dir):
+        return
+    try:
+        if json.loads(json.dumps(result)) != result:
+            return
+    except (TypeError, ValueError):
+        return
+    cache = _read_cache(simulation_result_dir)
+    cache[sim_type.name] = {
+        'version': analyzer_version(sim_type.analyzer),
+        'fingerprint': fingerprint or result_fingerprint(simulation_result_dir),
+        'result': result,
+    }
+    cache_path = os.path.join(simulation_result_dir, ANALYSIS_CACHE_FILE)
+    try:
+        with open(cache_path + '.tmp', 'w') as f:
+            json.dump(cache, f)
+        os.replace(cache_path + '.tmp', cache_path)
+    except OSError as e:
+        print(f"Unable to store analysis cache in {simulation_result_dir}: {str(e)}")
+
+
+def analyze_with_cache(sim_type, simulation_result_dir):
+    """以快取的結果回應分析；沒有可用的快取時執行分析函式並存入快取。"""
+    if not analysis_cache_enabled() or not os.path.isdir(simulation_result_dir):
+        return sim_type.analyzer(simulation_result_dir)
+    fingerprint = result_fingerprint(simulation_result_dir)
+    result = lookup_analysis(sim_type, simulation_result_dir, fingerprint)
+    if result is not None:
+        return result
+    result = sim_type.analyzer(simulation_result_dir)
+    store_analysis(sim_type, simulation_result_dir, result, fingerprint)
+    return result
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+遠端模擬主機的代理程式（simJobAgent）與 Django 端使用的用戶端。
+
+agent 在模擬主機上以 HTTP 接收作業，透過當地的 Docker Engine 啟動模擬容器，並在作業結束後把結果目錄
+打包傳回 Django 主機。agent 不存取資料庫：排程、監控、結果分析與報告仍由 Django 行程負責。
+
+    SIM_AGENT_TOKEN=<token> python -m main.apps.simulation_data_mgt.services.simJobAgent --port 8600 --root /data/simulation_agent
+
+agent 可以在主機上以任意映像檔與指令啟動容器，因此一定要設定共用驗證 token，沒有 token 時不啟動。
+
+每個容器的結果寫在 <root>/<容器名稱>。容器不會自動移除，監控端在容器結束後仍能讀取 OOMKilled 與結束碼；
+取回結果後以 DELETE 移除容器與結果目錄。
+"""
+import argparse
+import hmac
+import json
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+import requests
+from main.apps.simulation_data_mgt.services.dockerEngineClient import (
+    DEFAULT_SOCKET_PATH, DockerEngineClient, DockerEngineError, parse_memory_limit
+)
+
+DEFAULT_PORT = 8600
+# 自動偵測主機記憶體時保留給系統與其他服務的比例（與 simMemoryEstimator 相同）
+HOST_MEMORY_RESERVE_RATIO = 0.1
+CONTAINER_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class SimJobAgentError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"Simulation agent error ({status}): {message}")
+        self.status = status
+
+
+class SimJobAgentHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, content=None):
+        body = json.dumps(content).encode() if content is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _authorized(self):
+        token = self.server.agent.token
+        if not token:
+            return False
+        return hmac.compare_digest(self.headers.get('Authorization', ''), f'Bearer {token}')
+
+    def _route(self, method):
+        agent = self.server.agent
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        if not self._authorized():
+            return self._send_json(401, {'message': 'Invalid agent token'})
+        try:
+            if method == 'GET' and parts == ['capacity']:
+                return self._send_json(200, agent.capacity())
+            if method == 'GET' and len(parts) == 2 and parts[0] == 'images':
+                digest = agent.client.image_digest(parts[1])
+                if digest is None:
+                    return self._send_json(404, {'message': f'No such image: {parts[1]}'})
+                return self._send_json(200, {'Id': digest})
+            if method == 'GET' and parts == ['containers']:
+                return self._send_json(200, agent.client.list_containers(name=params.get('name')))
+            if method == 'POST' and parts == ['containers']:
+                return self._send_json(201, {'Id': agent.run_simulation(**self._read_json())})
+            if len(parts) in (2, 3) and parts[0] == 'containers':
+                name = parts[1]
+                if not CONTAINER_NAME_PATTERN.match(name):
+                    return self._send_json(400, {'message': f'Invalid container name: {name}'})
+                action = parts[2] if len(parts) == 3 else None
+                if method == 'GET' and action is None:
+                    info = agent.client.inspect_container(name)
+                    if info is None:
+                        return self._send_json(404, {'message': f'No such container: {name}'})
+                    return self._send_json(200, info)
+                if method == 'GET' and action == 'stats':
+                    stats = agent.client.container_stats(name)
+                    if stats is None:
+                        return self._send_json(404, {'message': f'No such container: {name}'})
+                    return self._send_json(200, stats)
+                if method == 'POST' and action == 'stop':
+                    agent.client.stop_container(name, timeout=int(params.get('t', 10)))
+                    return self._send_json(204)
+                if method == 'DELETE' and action is None:
+                    agent.remove(name)
+                    return self._send_json(204)
+                if method == 'GET' and action == 'results':
+                    return self._send_results(agent.result_dir(name))
+        except DockerEngineError as e:
+            return self._send_json(e.status or 502, {'message': str(e)})
+        except (KeyError, TypeError, ValueError) as e:
+            return self._send_json(400, {'message': str(e)})
+        except Exception as e:
+            return self._send_json(500, {'message': str(e)})
+        return self._send_json(404, {'message': f'page not found: {method} {url.path}'})
+
+    def _send_results(self, result_dir):
+        """將結果目錄打包為 tar.gz 傳回，先寫入暫存檔以提供 Content-Length。"""
+        if not os.path.isdir(result_dir):
+            return self._send_json(404, {'message': 'No simulation results'})
+        with tempfile.TemporaryFile() as archive_file:
+            with tarfile.open(fileobj=archive_file, mode='w:gz') as archive:
+                for entry in sorted(os.listdir(result_dir)):
+                    archive.add(os.path.join(result_dir, entry), arcname=entry)
+            size = archive_file.tell()
+            archive_file.seek(0)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/gzip')
+            self.send_header('Content-Length', str(size))
+            self.end_headers()
+            shutil.copyfileobj(archive_file, self.wfile, DOWNLOAD_CHUNK_SIZE)
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_POST(self):
+        self._route('POST')
+
+    def do_DELETE(self):
+        self._route('DELETE')
+
+
+class SimJobAgent:
+    """
+    模擬主機代理程式。
+
+    :param root: 存放各容器結果目錄的根目錄。
+    :param client: 當地的 DockerEngineClient。
+    :param token: 共用驗證 token，必須提供；空字串時拋出 ValueError。
+    :param memory_capacity: 可分配給模擬容器的記憶體，未設定時依 Docker 主機記憶體保留一成。
+    """
+
+    def __init__(self, root, client=None, token='', memory_capacity=None, host='0.0.0.0', port=DEFAULT_PORT):
+        if not token:
+            raise ValueError("SIM_AGENT_TOKEN is required to run the simulation agent")
+        self.root = os.path.abspath(root)
+        self.client = client or DockerEngineClient()
+        self.token = token
+        self.memory_capacity = parse_memory_limit(memory_capacity) if memory_capacity else None
+        self.address = (host, port)
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """在背景執行緒中提供服務（測試與內嵌使用）。"""
+        self._create_server()
+        threading.Thread(target=self._server.serve_forever, name="simJobAgent", daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        self._create_server()
+        print(f"Simulation agent listening on {self.url}, results in {self.root}")
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _create_server(self):
+        os.makedirs(self.root, exist_ok=True)
+        self._server = ThreadingHTTPServer(self.address, SimJobAgentHandler)
+        self._server.daemon_threads = True
+        self._server.agent = self
+
+    def result_dir(self, container_name):
+        return os.path.join(self.root, container_name)
+
+    def capacity(self):
+        info = self.client.info()
+        memory_total = info.get('MemTotal')
+        memory_capacity = self.memory_capacity
+        if memory_capacity is None and memory_total:
+            memory_capacity = int(memory_total * (1 - HOST_MEMORY_RESERVE_RATIO))
+        return {
+            'memory_capacity': memory_capacity,
+            'memory_total': memory_total,
+            'ncpu': info.get('NCPU'),
+        }
+
+    def run_simulation(self, name, image, command, output_dir, memory_limit=None, oom_kill_disable=True):
+        """啟動模擬容器，容器內的輸出目錄掛載到這個容器自己的結果目錄。"""
+        if not CONTAINER_NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid container name: {name}")
+        result_dir = self.result_dir(name)
+        shutil.rmtree(result_dir, ignore_errors=True)
+        os.makedirs(result_dir)
+        print(f"Docker run: {name} {image} {' '.join(command)}")
+        return self.client.run_container(
+            name, image, command,
+            binds=[f'{result_dir}:{output_dir}'],
+            memory_limit=memory_limit,
+            oom_kill_disable=oom_kill_disable,
+            auto_remove=False
+        )
+
+    def remove(self, name):
+        self.client.remove_container(name, force=True)
+        shutil.rmtree(self.result_dir(name), ignore_errors=True)
+
+
+class SimJobAgentClient:
+    """
+    simJobAgent 的 HTTP 用戶端。容器操作的方法名稱與回傳格式與 DockerEngineClient 相同，
+    監控、取消與終止作業的流程可以不區分本機或遠端主機。
+    """
+
+    def __init__(self, url, token='', timeout=30):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self._session = requests.Session()
+        if token:
+            self._session.headers['Authorization'] = f'Bearer {token}'
+
+    def _request(self, method, path, allowed=(200,), missing_ok=False, timeout=None, **kwargs):
+        try:
+            response = self._session.request(method, self.url + path, timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise SimJobAgentError(None, f"{method} {path} failed: {str(e)}")
+        if missing_ok and response.status_code == 404:
+            return None
+        if response.status_code not in allowed:
+            try:
+                message = response.json().get('message')
+            except ValueError:
+                message = response.text
+            raise SimJobAgentError(response.status_code, message)
+        return response
+
+    def capacity(self, timeout=None):
+        return self._request('GET', '/capacity', timeout=timeout).json()
+
+    def image_digest(self, image):
+        response = self._request('GET', f'/images/{quote(image, safe="")}', missing_ok=True)
+        return response.json()['Id'] if response is not None else None
+
+    def list_containers(self, name=None):
+        return self._request('GET', '/containers', params={'name': name} if name else None).json()
+
+    def run_simulation(self, name, image, command, output_dir, memory_limit=None, oom_kill_disable=True):
+        """:return: 容器 id。"""
+        return self._request('POST', '/containers', allowed=(201,), json={
+            'name': name,
+            'image': image,
+            'command': list(command),
+            'output_dir': output_dir,
+            'memory_limit': parse_memory_limit(memory_limit) if memory_limit else None,
+            'oom_kill_disable': oom_kill_disable,
+        }).json()['Id']
+
+    def inspect_container(self, name):
+        response = self._request('GET', f'/containers/{quote(name)}', missing_ok=True)
+        return response.json() if response is not None else None
+
+    def container_stats(self, name):
+        response = self._request('GET', f'/containers/{quote(name)}/stats', missing_ok=True)
+        return response.json() if response is not None else None
+
+    def stop_container(self, name, timeout=10):
+        self._request('POST', f'/containers/{quote(name)}/stop', allowed=(204,), missing_ok=True,
+                      params={'t': timeout}, timeout=self.timeout + timeout)
+
+    def remove_container(self, name, force=True):
+        self._request('DELETE', f'/containers/{quote(name)}', allowed=(204,), missing_ok=True)
+
+    def fetch_results(self, name, result_dir):
+        """
+        下載容器的結果目錄並解壓到 result_dir；result_dir 中已有的檔案（例如接續執行時保留的 cell）會被同名檔案覆蓋。
+
+        :return: 是否有結果可以下載。
+        """
+        response = self._request('GET', f'/containers/{quote(name)}/results', missing_ok=True, stream=True)
+        if response is None:
+            return False
+        with response, tempfile.TemporaryFile() as archive_file:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                archive_file.write(chunk)
+            archive_file.seek(0)
+            with tarfile.open(fileobj=archive_file, mode='r:gz') as archive:
+                members = archive.getmembers()
+                for member in members:
+                    path = os.path.normpath(member.name)
+                    if os.path.isabs(path) or path == '..' or path.startswith('..' + os.sep) \
+                            or not (member.isfile() or member.isdir()):
+                        raise SimJobAgentError(None, f"Unsafe entry in result archive: {member.name}")
+                os.makedirs(result_dir, exist_ok=True)
+                archive.extractall(result_dir, members=members)
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulation host agent')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--root', default=os.path.join(os.getcwd(), 'simulation_agent'),
+                        help='directory for simulation results on this host')
+    parser.add_argument('--docker-socket', default=os.environ.get('DOCKER_SOCKET_PATH') or DEFAULT_SOCKET_PATH)
+    parser.add_argument('--token', default=os.environ.get('SIM_AGENT_TOKEN', ''))
+    parser.add_argument('--memory-capacity', default=os.environ.get('SIM_JOB_MEMORY_CAPACITY') or None,
+                        help='memory available to simulation containers, e.g. 400g')
+    args = parser.parse_args(argv)
+    if not args.token:
+        parser.error('a shared token is required: set SIM_AGENT_TOKEN or pass --token')
+    SimJobAgent(
+        args.root,
+        client=DockerEngineClient(args.docker_socket),
+        token=args.token,
+        memory_capacity=args.memory_capacity,
+        host=args.host,
+        port=args.port
+    ).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+模擬主機（執行容器的 backend）：本機的 Docker Engine，以及 SIM_JOB_HOSTS 設定的遠端主機（simJobAgent）。
+
+排程時依各主機剩餘的記憶體選擇執行的主機，佇列紀錄的 simJobQueue_host 記下作業所在的主機；
+之後監控、取消與終止作業都透過該主機的用戶端操作容器。兩種用戶端提供相同的容器操作方法。
+"""
+import threading
+import time
+from django.conf import settings
+from main.apps.simulation_data_mgt.services.dockerEngineClient import get_docker_client
+from main.apps.simulation_data_mgt.services.simJobAgent import SimJobAgentClient
+from main.apps.simulation_data_mgt.services.simMemoryEstimator import host_memory_capacity
+
+LOCAL_HOST = 'local'
+# 遠端主機容量的暫存秒數；主機無法連線時同樣暫存，避免每次排程都等待逾時
+CAPACITY_CACHE_SECONDS = 30
+CAPACITY_TIMEOUT = 5
+
+
+class LocalSimJobBackend:
+    """在 Django 所在主機上以本機 Docker Engine 執行容器，可使用暖容器池與容器事件。"""
+    remote = False
+
+    def __init__(self, client=None):
+        self.name = LOCAL_HOST
+        self._client = client
+
+    def client(self):
+        return self._client or get_docker_client()
+
+    def memory_capacity(self):
+        return host_memory_capacity()
+
+
+class RemoteSimJobBackend:
+    """在遠端主機上透過 simJobAgent 執行容器，結果在作業結束後下載回本機的結果目錄。"""
+    remote = True
+
+    def __init__(self, name, url, token=''):
+        self.name = name
+        self.url = url
+        self._client = SimJobAgentClient(url, token)
+        self._capacity = None  # (時間, 容量, 錯誤)
+        self._lock = threading.Lock()
+
+    def client(self):
+        return self._client
+
+    def memory_capacity(self):
+        """回傳 agent 回報的可用記憶體；無法連線時拋出例外。"""
+        with self._lock:
+            if self._capacity is None or time.time() - self._capacity[0] > CAPACITY_CACHE_SECONDS:
+                try:
+                    self._capacity = (time.time(), self._client.capacity(CAPACITY_TIMEOUT)['memory_capacity'], None)
+                except Exception as e:
+                    self._capacity = (time.time(), None, e)
+            _, capacity, error = self._capacity
+        if error is not None:
+            raise error
+        return capacity
+
+
+def host_capacities(backends=None):
+    """
+    回傳可用主機的記憶體容量 {主機名稱: bytes}；容量為 None 表示不限制。無法連線的主機不列入。
+    """
+    capacities = {}
+    for name, backend in (backends or get_sim_job_backends()).items():
+        try:
+            capacities[name] = backend.memory_capacity()
+        except Exception as e:
+            print(f"Simulation host {name} is unavailable: {str(e)}")
+    return capacities
+
+
+_backends = None
+_backends_lock = threading.Lock()
+
+
+def get_sim_job_backends():
+    """依設定建立所有模擬主機：本機（SIM_JOB_LOCAL_HOST_ENABLED）與 SIM_JOB_HOSTS 的遠端主機。"""
+    global _backends
+    with _backends_lock:
+        if _backends is None:
+            backends = {}
+            if getattr(settings, 'SIM_JOB_LOCAL_HOST_ENABLED', True):
+                backends[LOCAL_HOST] = LocalSimJobBackend()
+            token = getattr(settings, 'SIM_AGENT_TOKEN', '')
+            for name, url in getattr(settings, 'SIM_JOB_HOSTS', {}).items():
+                backends[name] = RemoteSimJobBackend(name, url, token)
+            _backends = backends
+        return _backends
+
+
+def get_sim_job_backend(host):
+    """
+    取得作業所在主機的 backend；空字串為本機。
+    本機停止接收新作業時，既有的本機作業仍可監控與終止。
+    """
+    host = host or LOCAL_HOST
+    backend = get_sim_job_backends().get(host)
+    if backend is None:
+        if host == LOCAL_HOST:
+            return LocalSimJobBackend()
+        raise ValueError(f"Unknown simulation host: {host}")
+    return backend
+
+
+def get_host_client(host):
+    return get_sim_job_backend(host).client()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+模擬作業的非同步取消。
+
+取消請求只更新資料庫後立即回傳：排隊中的作業直接標記為 cancelled；執行中的作業標記為 cancelling，
+由背景的 reaper 執行緒平行停止並移除容器後再標記為 cancelled。
+監控該作業的執行緒發現作業被取消時會停止等待，不會分析結果。
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.simJobBackends import get_sim_job_backend
+from main.apps.simulation_data_mgt.services.simJobExecutor import ACTIVE_STATUSES
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+
+CANCELLING = 'cancelling'
+CANCELLED = 'cancelled'
+CANCEL_STATUSES = (CANCELLING, CANCELLED)
+# 沒有新的取消請求時，reaper 重新檢查 cancelling 作業的間隔（秒），用於接手其他行程未完成的取消
+REAP_INTERVAL = 30
+STOP_TIMEOUT = 10
+
+
+def _set_target_status(sim_type_name, target_uids, status):
+    sim_type = get_sim_job_type(sim_type_name)
+    sim_type.model.objects.filter(**{f'{sim_type.name}_uid__in': target_uids}).update(**{
+        f'{sim_type.name}_status': status
+    })
+
+
+def cancel_queue_jobs(queue_jobs, reaper=None):
+    """
+    取消一組佇列作業並立即回傳，不等待容器停止。
+
+    :param queue_jobs: SimJobQueue 的 QuerySet。
+    :param reaper: 負責停止容器的 reaper，預設為行程共用的 reaper。
+    :return: {"cancelled": 直接取消的排隊作業數, "cancelling": 等待停止容器的執行中作業數}
+    """
+    queue_jobs = queue_jobs.filter(simJobQueue_status__in=ACTIVE_STATUSES)
+    queued = list(queue_jobs.filter(simJobQueue_status='queued').values_list(
+        'pk', 'simJobQueue_sim_type', 'simJobQueue_target_uid'))
+    running = list(queue_jobs.filter(simJobQueue_status='running').values_list(
+        'pk', 'simJobQueue_sim_type', 'simJobQueue_target_uid'))
+
+    # 以條件式 update 變更狀態，剛被領取或剛結束的作業不會被誤改
+    now = timezone.now()
+    cancelled = SimJobQueue.objects.filter(pk__in=[pk for pk, _, _ in queued], simJobQueue_status='queued').update(
+        simJobQueue_status=CANCELLED,
+        simJobQueue_end_time=now,
+        simJobQueue_message='Cancelled before start'
+    )
+    cancelling = SimJobQueue.objects.filter(pk__in=[pk for pk, _, _ in running], simJobQueue_status='running').update(
+        simJobQueue_status=CANCELLING,
+        simJobQueue_message='Cancellation requested'
+    )
+
+    for rows, status in ((queued, CANCELLED), (running, CANCELLING)):
+        targets = {}
+        for _, sim_type_name, target_uid in rows:
+            targets.setdefault(sim_type_name, []).append(target_uid)
+        for sim_type_name, target_uids in targets.items():
+            _set_target_status(sim_type_name, target_uids, status)
+
+    if cancelling:
+        (reaper or get_sim_job_reaper()).wake()
+    return {'cancelled': cancelled, 'cancelling': cancelling}
+
+
+def cancel_target(sim_type_name, target_uid, reaper=None):
+    return cancel_queue_jobs(SimJobQueue.objects.filter(
+        simJobQueue_sim_type=get_sim_job_type(sim_type_name).name,
+        simJobQueue_target_uid=target_uid
+    ), reaper)
+
+
+def cancel_user_jobs(user_uid, reaper=None):
+    return cancel_queue_jobs(SimJobQueue.objects.filter(f_user_uid_id=user_uid), reaper)
+
+
+def cancel_sweep(sweep, reaper=None):
+    return cancel_queue_jobs(SimJobQueue.objects.filter(
+        simJobQueue_sim_type=sweep.simSweep_sim_type,
+        simJobQueue_target_uid__in=[point['target_uid'] for point in sweep.simSweep_points]
+    ), reaper)
+
+
+def is_cancel_requested(queue_job):
+    return SimJobQueue.objects.filter(pk=queue_job.pk, simJobQueue_status__in=CANCEL_STATUSES).exists()
+
+
+def finish_cancelled(queue_job):
+    """
+    容器停止後完成取消：刪除未結束的 SimJob 並把模擬標記為 cancelled。
+    reaper 與監控執行緒都可能呼叫，重複呼叫沒有影響；作業已在取消前完成時不做任何變更。
+    """
+    SimJobQueue.objects.filter(pk=queue_job.pk, simJobQueue_status=CANCELLING).update(
+        simJobQueue_status=CANCELLED,
+        simJobQueue_end_time=timezone.now(),
+        simJobQueue_message='Cancelled'
+    )
+    if not SimJobQueue.objects.filter(pk=queue_job.pk, simJobQueue_status=CANCELLED).exists():
+        return False
+    sim_type = get_sim_job_type(queue_job.simJobQueue_sim_type)
+    try:
+        obj = sim_type.get_target(queue_job.simJobQueue_target_uid)
+    except sim_type.model.DoesNotExist:
+        return True
+    sim_type.open_sim_jobs(obj).delete()
+    _set_target_status(sim_type.name, [queue_job.simJobQueue_target_uid], CANCELLED)
+    return True
+
+
+class SimJobReaper:
+    """
+    背景停止 cancelling 作業的容器。停止容器（docker stop 最多等待 STOP_TIMEOUT 秒）以執行緒池平行進行，
+    資料庫更新則在 reaper 執行緒中依序完成。遠端主機上的容器由該主機的 agent 停止。
+
+    :param client: 本機容器使用的 Docker 用戶端，預設為行程共用的用戶端。
+    """
+
+    def __init__(self, concurrency=16, client=None):
+        self.concurrency = max(1, int(concurrency))
+        self.client = client
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _client(self, host=''):
+        backend = get_sim_job_backend(host)
+        if self.client is not None and not backend.remote:
+            return self.client
+        return backend.client()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._reap_loop, name="simJobReaper", daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        self.start()
+        self._wakeup.set()
+
+    def _stop_container(self, container):
+        host, container_name = container
+        try:
+            client = self._client(host)
+        except Exception as e:
+            print(f"Docker container stop error: {str(e)}")
+            return
+        try:
+            client.stop_container(container_name, timeout=STOP_TIMEOUT)
+        except Exception as e:
+            print(f"Docker container stop error: {str(e)}")
+        try:
+            client.remove_container(container_name, force=True)
+        except Exception as e:
+            print(f"Docker container remove error: {str(e)}")
+
+    def reap(self):
+        """停止所有 cancelling 作業的容器並完成取消，回傳完成取消的作業數。"""
+        queue_jobs = list(SimJobQueue.objects.filter(simJobQueue_status=CANCELLING))
+        if not queue_jobs:
+            return 0
+        containers = {
+            (queue_job.simJobQueue_host,
+             queue_job.simJobQueue_container_name or get_sim_job_type(queue_job.simJobQueue_sim_type).container_name(
+                 queue_job.simJobQueue_target_uid))
+            for queue_job in queue_jobs
+        }
+        # 依 cell 拆分的作業，每個分片各有一個容器
+        containers.update(
+            (queue_job.simJobQueue_host, shard['container_name'])
+            for queue_job in queue_jobs for shard in queue_job.simJobQueue_shards
+        )
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(containers))) as pool:
+            list(pool.map(self._stop_container, containers))
+
+        reaped = 0
+        for queue_job in queue_jobs:
+            try:
+                if finish_cancelled(queue_job):
+                    reaped += 1
+            except Exception as e:
+                print(f"Simulation cancel error for {queue_job.simJobQueue_sim_type} "
+                      f"{queue_job.simJobQueue_target_uid}: {str(e)}")
+        print(f"Simulation reaper: cancelled {reaped} running simulation jobs")
+        return reaped
+
+    def _reap_loop(self):
+        while True:
+            self._wakeup.wait(REAP_INTERVAL)
+            self._wakeup.clear()
+            try:
+                self.reap()
+            except Exception as e:
+                print(f"Simulation reaper error: {str(e)}")
+            finally:
+                connection.close()
+
+
+_reaper = None
+_reaper_lock = threading.Lock()
+
+
+def get_sim_job_reaper():
+    """取得整個行程共用的 reaper。"""
+    global _reaper
+    with _reaper_lock:
+        if _reaper is None:
+            _reaper = SimJobReaper(getattr(settings, 'SIM_JOB_CANCEL_CONCURRENCY', 16))
+        return _reaper
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""
+模擬作業執行器：以固定數量的工作執行緒統一執行所有類型的模擬作業，
+超過上限的作業會在佇列中等待，避免每個請求各自開一條長時間阻塞的執行緒。
+
+佇列存放在資料庫（SimJobQueue），因此 Django 行程重啟後排隊中的作業不會遺失，
+執行中的作業也能由 simJobReconciler 交給其他行程接手。
+設定多台模擬主機（simJobBackends）時，領取作業的同時依各主機剩餘的記憶體決定作業在哪台主機執行。
+"""
+import heapq
+import os
+import socket
+import threading
+from collections import Counter, defaultdict, deque
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.utils import timezone
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import UNFINISHED_STATUSES, SimJobQueue
+from main.apps.simulation_data_mgt.services.simJobBackends import LOCAL_HOST, host_capacities
+from main.apps.simulation_data_mgt.services.simJobShards import shard_count
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.services.simMemoryEstimator import estimate_queue_job_memory, parameter_key
+from main.apps.simulation_data_mgt.services.simRuntimePredictor import predict_runtime
+
+ACTIVE_STATUSES = ['queued', 'running']
+# 容器仍存在的狀態：取消中的作業在容器停止、被回收之前仍佔用執行名額與記憶體
+CONTAINER_STATUSES = ('running', 'cancelling')
+# 最早排隊的作業等待超過此時間後，不再讓後面較小的作業插隊使用記憶體
+MEMORY_BACKFILL_LIMIT = timedelta(minutes=30)
+# 短作業優先排程時，等待超過此時間的作業不再讓預估較短的作業插隊
+SHORTEST_FIRST_MAX_WAIT = timedelta(hours=2)
+
+# 目前行程的識別，用來標記由哪個行程負責監控作業
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SimJobExecutor:
+    """
+    有上限的模擬作業執行器。
+
+    每個作業以 (sim_type, target_uid) 識別，同一個作業在佇列或執行中時不會重複加入。
+    dispatcher 執行緒在有空閒工作執行緒時，依使用者公平份額從資料庫領取下一個排隊中的作業，
+    全部行程合計執行中的作業不會超過 max_workers（遠端主機的容器同樣由這裡的工作執行緒監控）。
+
+    :param memory_capacity: 只使用本機時的記憶體容量函式。
+    :param host_capacities: 回傳 {主機名稱: 記憶體容量} 的函式，預設依 simJobBackends 的設定。
+    """
+
+    def __init__(self, max_workers, poll_interval=5, runner=None, resumer=None,
+                 memory_estimator=None, memory_capacity=None, host_capacities=None):
+        self.max_workers = max(1, int(max_workers))
+        self.poll_interval = poll_interval
+        self._runner = runner
+        self._resumer = resumer
+        self._memory_estimator = memory_estimator
+        self._memory_capacity = memory_capacity
+        self._host_capacities = host_capacities
+        self._condition = threading.Condition()
+        self._ready = deque()  # 已領取、等待工作執行緒處理的 (handler, queue_job)
+        self._adopted = deque()  # 由 reconciler 接手、需要繼續監控的作業
+        self._running = {}  # simJobQueue_uid -> queue_job
+        self._workers = []
+        self._dispatcher = None
+        self._stopped = False
+
+    def start(self):
+        with self._condition:
+            if self._dispatcher is not None:
+                return
+            for index in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"simJobWorker-{index + 1}",
+                    daemon=True
+                )
+                self._workers.append(worker)
+                worker.start()
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="simJobDispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def shutdown(self):
+        """停止領取新作業；執行中的作業會繼續執行到結束。"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def wake(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    def submit(self, sim_type, target_uid, user_uid, parameter=None):
+        """
+        將模擬作業加入佇列。
+
+        :param sim_type: 模擬類型，例如 "handover"、"coverage"。
+        :param target_uid: 對應的 meta data uid。
+        :param user_uid: 提交作業的使用者 uid。
+        :param parameter: 模擬參數，用來比對過去相同參數的記憶體用量。
+        :return: 佇列位置，0 表示已有空閒名額可立即執行。
+        同一個模擬已有未結束的佇列紀錄時不會重複加入（由唯一索引保證，同時送出的請求也只會建立一筆）。
+        """
+        queue_job = self.active_job(sim_type, target_uid)
+        if queue_job is None:
+            try:
+                with transaction.atomic():
+                    queue_job = SimJobQueue.objects.create(
+                        simJobQueue_sim_type=sim_type,
+                        simJobQueue_target_uid=target_uid,
+                        simJobQueue_parameter_key=parameter_key(parameter) if parameter is not None else '',
+                        simJobQueue_expected_runtime=(predict_runtime(sim_type, parameter)
+                                                      if parameter is not None else None),
+                        simJobQueue_shard_count=(shard_count(get_sim_job_type(sim_type), parameter)
+                                                 if parameter is not None else 1),
+                        f_user_uid_id=user_uid
+                    )
+            except IntegrityError:
+                # 另一個請求剛建立了佇列紀錄
+                queue_job = SimJobQueue.objects.filter(
+                    simJobQueue_sim_type=sim_type,
+                    simJobQueue_target_uid=target_uid,
+                    simJobQueue_status__in=UNFINISHED_STATUSES
+                ).first()
+                if queue_job is None:
+                    raise
+        self.start()
+        # 在交易中呼叫時，等交易提交、佇列紀錄對工作執行緒可見後再喚醒
+        transaction.on_commit(self.wake)
+        return self.position_of(queue_job)
+
+    def submit_many(self, sim_type, targets):
+        """
+        一次將多個同類型的模擬作業加入佇列（參數掃描使用），以單一 bulk insert 建立佇列紀錄。
+
+        :param targets: [(target_uid, user_uid, parameter), ...]
+        :return: 新加入佇列的作業數；已在佇列或執行中的作業不會重複加入。
+        """
+        active = {
+            str(target_uid) for target_uid in SimJobQueue.objects.filter(
+                simJobQueue_sim_type=sim_type,
+                simJobQueue_target_uid__in=[target_uid for target_uid, _, _ in targets],
+                simJobQueue_status__in=UNFINISHED_STATUSES
+            ).values_list('simJobQueue_target_uid', flat=True)
+        }
+        queue_jobs = [
+            SimJobQueue(
+                simJobQueue_sim_type=sim_type,
+                simJobQueue_target_uid=target_uid,
+                simJobQueue_parameter_key=parameter_key(parameter) if parameter is not None else '',
+                simJobQueue_expected_runtime=predict_runtime(sim_type, parameter) if parameter is not None else None,
+                simJobQueue_shard_count=shard_count(get_sim_job_type(sim_type), parameter) if parameter is not None else 1,
+                f_user_uid_id=user_uid
+            )
+            for target_uid, user_uid, parameter in targets
+            if str(target_uid) not in active
+        ]
+        # 查詢之後才由其他請求加入佇列的作業，由唯一索引略過
+        SimJobQueue.objects.bulk_create(queue_jobs, ignore_conflicts=True)
+        self.start()
+        transaction.on_commit(self.wake)
+        return len(queue_jobs)
+
+    def adopt(self, queue_job):
+        """接手一個狀態為 running 的作業，交由工作執行緒繼續監控。"""
+        self.start()
+        with self._condition:
+            if queue_job.simJobQueue_uid in self._running:
+                return
+            if any(job.simJobQueue_uid == queue_job.simJobQueue_uid for job in self._adopted):
+                return
+            self._adopted.append(queue_job)
+            self._condition.notify_all()
+
+    def active_job(self, sim_type, target_uid):
+        return SimJobQueue.objects.filter(
+            simJobQueue_sim_type=sim_type,
+            simJobQueue_target_uid=target_uid,
+            simJobQueue_status__in=ACTIVE_STATUSES
+        ).first()
+
+    def queue_position(self, sim_type, target_uid):
+        """回傳作業目前的佇列位置；若作業不在佇列或執行中則回傳 None。"""
+        queue_job = self.active_job(sim_type, target_uid)
+        if queue_job is None:
+            return None
+        return self.position_of(queue_job)
+
+    def position_of(self, queue_job):
+        # 以同一個查詢取得所有排隊、執行中與取消中的作業，避免作業剛被領取時重複計入
+        active_jobs = list(SimJobQueue.objects.filter(simJobQueue_status__in=UNFINISHED_STATUSES))
+        current = next((job for job in active_jobs if job.pk == queue_job.pk), None)
+        if current is None or current.simJobQueue_status != 'queued':
+            return 0
+        running_count = sum(1 for job in active_jobs if job.simJobQueue_status in CONTAINER_STATUSES)
+        order = [job.pk for job in fair_share_order(active_jobs, self._user_weights(), self._shortest_first())]
+        return max(0, order.index(queue_job.pk) + 1 - max(0, self.max_workers - running_count))
+
+    def queue_depth(self):
+        return SimJobQueue.objects.filter(simJobQueue_status='queued').count()
+
+    def status(self):
+        active_jobs = list(SimJobQueue.objects.filter(simJobQueue_status__in=UNFINISHED_STATUSES))
+        running_jobs = sorted(
+            (job for job in active_jobs if job.simJobQueue_status in CONTAINER_STATUSES),
+            key=lambda job: job.simJobQueue_start_time or job.simJobQueue_enqueue_time
+        )
+        queued_jobs = fair_share_order(active_jobs, self._user_weights(), self._shortest_first())
+        with self._condition:
+            local_running = len(self._running)
+        capacities = self._get_host_capacities()()
+        hosts = []
+        for host in sorted(set(capacities) | {job.simJobQueue_host or LOCAL_HOST for job in running_jobs}):
+            host_jobs = [job for job in running_jobs if (job.simJobQueue_host or LOCAL_HOST) == host]
+            hosts.append({
+                'host': host,
+                'available': host in capacities,
+                'memory_capacity': capacities.get(host),
+                'memory_reserved': sum(job.simJobQueue_memory_limit for job in host_jobs),
+                'running_count': len(host_jobs),
+            })
+        return {
+            'max_workers': self.max_workers,
+            'memory_capacity': (None if not capacities or None in capacities.values()
+                                else sum(capacities.values())),
+            'memory_reserved': sum(job.simJobQueue_memory_limit for job in running_jobs),
+            'running_count': len(running_jobs),
+            'hosts': hosts,
+            'queue_depth': len(queued_jobs),
+            'local_running_count': local_running,
+            'running_jobs': [_job_summary(job) for job in running_jobs],
+            'queued_jobs': [
+                dict(_job_summary(job), queue_position=index + 1)
+                for index, job in enumerate(queued_jobs)
+            ]
+        }
+
+    def _user_weights(self):
+        return getattr(settings, 'SIM_JOB_USER_WEIGHTS', {})
+
+    def _shortest_first(self):
+        return getattr(settings, 'SIM_JOB_SCHEDULING', 'sjf') == 'sjf'
+
+    def _claim_next_job(self):
+        active_jobs = list(SimJobQueue.objects.filter(simJobQueue_status__in=UNFINISHED_STATUSES))
+        # 取消中的作業容器可能尚未停止，與執行中的作業一樣計入執行名額與已保留的記憶體
+        running_jobs = [job for job in active_jobs if job.simJobQueue_status in CONTAINER_STATUSES]
+        if len(running_jobs) >= self.max_workers:
+            return None
+        capacities = self._get_host_capacities()()
+        if not capacities:
+            return None
+        reserved = Counter()
+        running = Counter()
+        for job in running_jobs:
+            reserved[job.simJobQueue_host or LOCAL_HOST] += job.simJobQueue_memory_limit
+            running[job.simJobQueue_host or LOCAL_HOST] += 1
+        estimate_memory = self._get_memory_estimator()
+
+        # 依各使用者的加權公平份額決定順序，執行中作業較少的使用者優先；同一使用者的作業預估較短的優先
+        candidates = fair_share_order(active_jobs, self._user_weights(), self._shortest_first())[:50]
+        for index, candidate in enumerate(candidates):
+            memory_limit = estimate_memory(candidate)
+            host = select_host(capacities, reserved, running, memory_limit)
+            # 記憶體不足時改領取後面較小的作業；但排第一的作業等待太久時保留名額給它，避免大型作業餓死
+            if host is None:
+                if index == 0 and timezone.now() - candidate.simJobQueue_enqueue_time > MEMORY_BACKFILL_LIMIT:
+                    return None
+                continue
+            now = timezone.now()
+            # 以條件式 update 領取作業，避免多個行程領到同一個作業
+            claimed = SimJobQueue.objects.filter(pk=candidate.pk, simJobQueue_status='queued').update(
+                simJobQueue_status='running',
+                simJobQueue_worker=WORKER_ID,
+                simJobQueue_host=host,
+                simJobQueue_memory_limit=memory_limit,
+                simJobQueue_start_time=now,
+                simJobQueue_heartbeat_time=now
+            )
+            if claimed:
+                candidate.refresh_from_db()
+                return candidate
+        return None
+
+    def _dispatch_loop(self):
+        while True:
+            with self._condition:
+                while not self._stopped and len(self._running) + len(self._ready) >= self.max_workers and not self._adopted:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                adopted = self._adopted.popleft() if self._adopted else None
+
+            task = None
+            try:
+                if adopted is not None:
+                    task = (self._get_resumer(), adopted)
+                else:
+                    queue_job = self._claim_next_job()
+                    if queue_job is not None:
+                        task = (self._get_runner(), queue_job)
+            except Exception as e:
+                print(f"Simulation dispatcher error: {str(e)}")
+            finally:
+                connection.close()
+
+            with self._condition:
+                if task is not None:
+                    self._ready.append(task)
+                    self._condition.notify_all()
+                else:
+                    self._condition.wait(self.poll_interval)
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                while not self._stopped and not self._ready:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                handler, queue_job = self._ready.popleft()
+                self._running[queue_job.simJobQueue_uid] = queue_job
+
+            try:
+                close_old_connections()
+                handler(queue_job)
+            except Exception as e:
+                print(f"Simulation executor error for {queue_job.simJobQueue_sim_type} {queue_job.simJobQueue_target_uid}: {str(e)}")
+            finally:
+                # 作業結束後歸還資料庫連線，避免閒置的工作執行緒長期佔用連線
+                connection.close()
+                with self._condition:
+                    self._running.pop(queue_job.simJobQueue_uid, None)
+                    self._condition.notify_all()
+
+    def _get_memory_estimator(self):
+        if self._memory_estimator is None:
+            self._memory_estimator = estimate_queue_job_memory
+        return self._memory_estimator
+
+    def _get_host_capacities(self):
+        if self._host_capacities is None:
+            if self._memory_capacity is not None:
+                memory_capacity = self._memory_capacity
+                self._host_capacities = lambda: {LOCAL_HOST: memory_capacity()}
+            else:
+                self._host_capacities = host_capacities
+        return self._host_capacities
+
+    def _get_runner(self):
+        if self._runner is None:
+            from main.apps.simulation_data_mgt.services.simJobLifecycle import run_sim_job
+            self._runner = run_sim_job
+        return self._runner
+
+    def _get_resumer(self):
+        if self._resumer is None:
+            from main.apps.simulation_data_mgt.services.simJobLifecycle import resume_sim_job
+            self._resumer = resume_sim_job
+        return self._resumer
+
+
+def select_host(capacities, reserved, running, memory_limit):
+    """
+    選擇剩餘記憶體最多、且放得下作業的主機；剩餘記憶體相同時選執行中作業較少的主機。
+    沒有執行中作業的主機一律可以執行，超過容量的大型作業不會永遠無法執行。
+
+    :param capacities: {主機名稱: 記憶體容量}，None 表示不限制。
+    :param reserved: {主機名稱: 已預留的記憶體}。
+    :param running: {主機名稱: 執行中作業數}。
+    :return: 主機名稱；沒有主機放得下時回傳 None。
+    """
+    best = None
+    for host, capacity in capacities.items():
+        free = float('inf') if capacity is None else capacity - reserved.get(host, 0)
+        if running.get(host, 0) and memory_limit > free:
+            continue
+        key = (-free, running.get(host, 0), host)
+        if best is None or key < best[0]:
+            best = (key, host)
+    return best[1] if best else None
+
+
+def shortest_first_key(queue_job, now=None):
+    """
+    短作業優先的排序依據：(是否等待過久, 預估執行秒數, 排隊時間)。
+    等待超過 SHORTEST_FIRST_MAX_WAIT 的作業排在最前面避免餓死；沒有預估值的作業排在有預估值的作業之後。
+    """
+    now = now or timezone.now()
+    if now - queue_job.simJobQueue_enqueue_time > SHORTEST_FIRST_MAX_WAIT:
+        return (0, 0.0, queue_job.simJobQueue_enqueue_time)
+    expected = queue_job.simJobQueue_expected_runtime
+    return (1, float('inf') if expected is None else expected, queue_job.simJobQueue_enqueue_time)
+
+
+def fair_share_order(active_jobs, weights=None, shortest_first=False):
+    """
+    依使用者加權公平份額排出排隊中作業的執行順序。
+
+    每次挑選「執行中作業數 / 權重」最小的使用者，取出他排在最前面的作業，並視為該作業已開始執行；
+    份額相同時以該作業的排序依據決定。每位使用者的作業預設依排隊時間排列（只有一位使用者排隊時即為先進先出），
+    shortest_first 時改依 shortest_first_key 讓預估執行時間較短的作業先執行。
+
+    :param active_jobs: 排隊中、執行中與取消中的 SimJobQueue。
+    :param weights: {user_uid: 權重}，未列出的使用者權重為 1。
+    :param shortest_first: 是否使用短作業優先。
+    :return: 排隊中作業依執行順序排列的 list。
+    """
+    weights = weights or {}
+    now = timezone.now()
+    if shortest_first:
+        def order_key(job):
+            return shortest_first_key(job, now)
+    else:
+        def order_key(job):
+            return job.simJobQueue_enqueue_time
+    running = Counter()
+    queues = defaultdict(deque)
+    for job in sorted(active_jobs, key=order_key):
+        user_uid = str(job.f_user_uid_id)
+        if job.simJobQueue_status in CONTAINER_STATUSES:
+            running[user_uid] += 1
+        elif job.simJobQueue_status == 'queued':
+            queues[user_uid].append(job)
+
+    def share(user_uid):
+        return running[user_uid] / max(float(weights.get(user_uid, 1)), 1e-6)
+
+    heap = [(share(user_uid), order_key(jobs[0]), user_uid) for user_uid, jobs in queues.items()]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        _, _, user_uid = heapq.heappop(heap)
+        order.append(queues[user_uid].popleft())
+        running[user_uid] += 1
+        if queues[user_uid]:
+            heapq.heappush(heap, (share(user_uid), order_key(queues[user_uid][0]), user_uid))
+    return order
+
+
+def _job_summary(queue_job):
+    return {
+        'simJobQueue_uid': str(queue_job.simJobQueue_uid),
+        'sim_type': queue_job.simJobQueue_sim_type,
+        'target_uid': str(queue_job.simJobQueue_target_uid),
+        'user_uid': str(queue_job.f_user_uid_id),
+        'status': queue_job.simJobQueue_status,
+        'worker': queue_job.simJobQueue_worker,
+        'host': queue_job.simJobQueue_host or LOCAL_HOST,
+        'memory_limit': queue_job.simJobQueue_memory_limit,
+        'shard_count': queue_job.simJobQueue_shard_count,
+        'peak_memory': queue_job.simJobQueue_peak_memory,
+        'expected_runtime': queue_job.simJobQueue_expected_runtime,
+        'timeout': queue_job.simJobQueue_timeout,
+        'enqueue_time': queue_job.simJobQueue_enqueue_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'start_time': queue_job.simJobQueue_start_time.strftime('%Y-%m-%dT%H:%M:%SZ') if queue_job.simJobQueue_start_time else None
+    }
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_sim_job_executor():
+    """取得整個行程共用的模擬作業執行器。"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = SimJobExecutor(
+                getattr(settings, 'SIM_JOB_MAX_WORKERS', 4),
+                poll_interval=getattr(settings, 'SIM_JOB_POLL_INTERVAL', 5)
+            )
+        return _executor
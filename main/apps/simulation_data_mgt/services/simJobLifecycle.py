@@ -0,0 +1,883 @@
+# -*- coding: utf-8 -*-
+"""
+模擬作業的容器生命週期：啟動 Docker 容器、監控至結束、分析結果並產生 PDF 報告。
+結果分析與 PDF 報告在 simPostProcessor 的行程池中執行，不佔用 web 行程的 GIL。
+作業由排程選定的模擬主機（simJobBackends）執行：遠端主機的容器透過 simJobAgent 啟動與查詢，結束後下載結果目錄。
+依 cell 拆分的作業（simJobShards）同時執行多個分片容器，全部完成後合併輸出再分析。
+同一套流程供所有模擬類型使用，也供行程重啟後接手既有容器（resume）使用。
+"""
+import os
+import shutil
+import threading
+import time
+from django.db import transaction
+from django.utils import timezone
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.containerEventWatcher import get_container_event_watcher
+from main.apps.simulation_data_mgt.services.dockerEngineClient import get_docker_client, parse_memory_limit
+from main.apps.simulation_data_mgt.services.simJobAgent import SimJobAgentError
+from main.apps.simulation_data_mgt.services.simJobBackends import get_host_client, get_sim_job_backend
+from main.apps.simulation_data_mgt.services.simJobCanceller import finish_cancelled, is_cancel_requested
+from main.apps.simulation_data_mgt.services.simJobExecutor import WORKER_ID
+from main.apps.simulation_data_mgt.services.simJobShards import (
+    MAX_SHARD_RETRIES, merge_shard_results, new_shards, shard_parameter
+)
+from main.apps.simulation_data_mgt.services.simJobTelemetry import SimJobTelemetryRecorder
+from main.apps.simulation_data_mgt.services.simPostProcessor import get_sim_post_processor
+from main.apps.simulation_data_mgt.services.simAnalysisCache import store_analysis
+from main.apps.simulation_data_mgt.services.simRuntimePredictor import adaptive_timeout
+from main.apps.simulation_data_mgt.services.simResultCache import (
+    CACHE_RESTORED_MESSAGE, get_image_digest, lookup_result, restore_result, store_result, unshare_result_files
+)
+from main.apps.simulation_data_mgt.services.cellMetricsTable import CellMetricsTable
+from main.apps.simulation_data_mgt.services.cellStatisticsIngester import count_statistics_files, expected_cell_count
+from main.apps.simulation_data_mgt.services.cellStatisticsLoader import SITUATIONS
+from main.apps.simulation_data_mgt.services.simResultSalvage import resumable_cells, salvage_partial_result
+from main.apps.simulation_data_mgt.services.warmContainerPool import (
+    get_warm_container_pool, pool_result_dir_supported, settle_result_dir
+)
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.utils.logger import log_trigger, log_writer
+
+# 事件串流無法使用時，退回每 POLL_INTERVAL 秒查詢一次容器狀態
+POLL_INTERVAL = 10
+# 等待容器事件時，每 HEARTBEAT_INTERVAL 秒更新一次 heartbeat 並檢查作業是否被標記失敗
+HEARTBEAT_INTERVAL = 30
+# 即使事件串流正常，也每隔一段時間確認一次容器狀態，避免事件遺失時永遠等待
+SAFETY_CHECK_INTERVAL = 300
+# 因 OOM 重新排隊的次數上限
+MAX_OOM_RETRIES = 2
+# 容器清單快取的有效秒數
+CONTAINER_LIST_MAX_AGE = 2
+# 遠端主機的 agent 持續無法連線超過此秒數時，判定作業失敗
+AGENT_UNREACHABLE_TIMEOUT = 600
+
+_container_snapshot = {'time': 0, 'names': set()}
+_container_snapshot_lock = threading.Lock()
+
+
+def container_exists(container_name):
+    return container_name in running_container_names()
+
+
+def running_container_names(max_age=CONTAINER_LIST_MAX_AGE):
+    """
+    回傳執行中的模擬容器名稱集合。多個作業在短時間內查詢時共用同一次 list 呼叫的結果。
+    """
+    with _container_snapshot_lock:
+        if time.time() - _container_snapshot['time'] > max_age:
+            _container_snapshot['names'] = set(list_simulation_containers())
+            _container_snapshot['time'] = time.time()
+        return _container_snapshot['names']
+
+
+def invalidate_container_snapshot():
+    with _container_snapshot_lock:
+        _container_snapshot['time'] = 0
+
+
+def list_simulation_containers():
+    """列出所有執行中的模擬容器名稱（*Simulation_<uid>）。"""
+    return get_docker_client().list_containers(name='Simulation_')
+
+
+def exec_is_running(exec_id):
+    """暖容器中以 docker exec 執行的模擬是否仍在執行；容器已被移除時視為已結束。"""
+    info = get_docker_client().inspect_exec(exec_id)
+    return bool(info and info.get('Running'))
+
+
+def finish_queue_job(queue_job, status, message=''):
+    SimJobQueue.objects.filter(pk=queue_job.pk).update(
+        simJobQueue_status=status,
+        simJobQueue_end_time=timezone.now(),
+        simJobQueue_message=message
+    )
+
+
+def _heartbeat(queue_job, container_name=None, telemetry=None, client=None):
+    """
+    更新 heartbeat，並量測容器目前的資源用量：不含 page cache 的記憶體用量的最大值作為之後估計記憶體的依據，
+    完整的統計交給 telemetry 記錄。client 為容器所在主機的用戶端，預設為本機。
+    """
+    if container_name:
+        try:
+            stats = (client or get_docker_client()).container_stats(container_name)
+        except Exception as e:
+            print(f"Unable to read resource usage of {container_name}: {str(e)}")
+            stats = None
+        if stats is not None:
+            # 模擬寫出大量 CSV，page cache 會一直增長到接近 -m 上限；以含 cache 的峰值估計會使每次重跑的估計值持續上升
+            queue_job.simJobQueue_peak_memory = max(queue_job.simJobQueue_peak_memory, stats['memory_usage'])
+            if telemetry is not None:
+                try:
+                    telemetry.add(stats)
+                except Exception as e:
+                    print(f"Unable to record resource usage of {container_name}: {str(e)}")
+    SimJobQueue.objects.filter(pk=queue_job.pk).update(
+        simJobQueue_worker=WORKER_ID,
+        simJobQueue_heartbeat_time=timezone.now(),
+        simJobQueue_peak_memory=queue_job.simJobQueue_peak_memory
+    )
+
+
+def _requeue_after_oom(queue_job, sim_type, obj, sim_job, simulation_result_dir, memory_limit=None):
+    """
+    容器因超過記憶體上限被終止：記錄峰值為當時的上限並重新排隊，下次估計會加倍。
+    超過 MAX_OOM_RETRIES 次則判定失敗。
+
+    :param memory_limit: 被終止的容器的上限，預設為作業預留的記憶體；依 cell 拆分的作業傳入單一分片的上限。
+    """
+    target_uid = str(sim_type.get_field(obj, 'uid'))
+    memory_limit = memory_limit or queue_job.simJobQueue_memory_limit
+    oom_count = queue_job.simJobQueue_oom_count + 1
+    print(f"Simulation container was OOM killed at {memory_limit} bytes for {sim_type.name}_uid: {target_uid}")
+    if oom_count > MAX_OOM_RETRIES:
+        SimJobQueue.objects.filter(pk=queue_job.pk).update(
+            simJobQueue_oom_count=oom_count,
+            simJobQueue_peak_memory=max(queue_job.simJobQueue_peak_memory, memory_limit)
+        )
+        raise Exception(f"Container was OOM killed {oom_count} times, simulation_failed")
+
+    sim_job.delete()
+    shutil.rmtree(simulation_result_dir, ignore_errors=True)
+    sim_type.set_field(obj, 'status', "queued")
+    obj.save()
+    SimJobQueue.objects.filter(pk=queue_job.pk).update(
+        simJobQueue_status='queued',
+        simJobQueue_worker='',
+        simJobQueue_host='',
+        simJobQueue_start_time=None,
+        simJobQueue_heartbeat_time=None,
+        simJobQueue_memory_limit=0,
+        simJobQueue_oom_count=oom_count,
+        simJobQueue_peak_memory=max(queue_job.simJobQueue_peak_memory, memory_limit),
+        simJobQueue_partial_result={},
+        simJobQueue_shards=[],
+        simJobQueue_message=f'OOM killed at {memory_limit} bytes, requeued'
+    )
+
+
+def _missing_cells(sim_type, obj, simulation_result_dir):
+    """
+    逐步輸出 cell 的模擬是否還有 cell 沒有寫出（ideal 與 actual 都要有參數中的所有 cell）。
+    參數無法判斷 cell 數時視為有缺少。
+    """
+    cell_count = expected_cell_count(sim_type.get_field(obj, 'parameter'))
+    return not cell_count or count_statistics_files(simulation_result_dir) < cell_count * len(SITUATIONS)
+
+
+def restore_cached_result(queue_job, sim_type, obj, entry):
+    """
+    以快取的結果完成佇列作業：連結結果目錄、寫入分析結果並補上一筆 SimJob 紀錄，全部寫入後才產生 PDF。
+    PDF 產生失敗只記錄錯誤，模擬仍以快取結果完成，不會改為重新執行。
+    """
+    simulation_result_dir = sim_type.result_dir(obj)
+    settle_result_dir(simulation_result_dir)
+    restore_result(entry, simulation_result_dir)
+
+    with transaction.atomic():
+        sim_type.set_field(obj, 'simulation_result', entry.simResultCache_simulation_result)
+        sim_type.set_field(obj, 'status', "completed")
+        sim_type.set_field(obj, 'data_path', simulation_result_dir)
+        obj.save()
+
+        now = timezone.now()
+        sim_job = sim_type.create_sim_job(obj, now)
+        setattr(sim_job, f'{sim_type.name}SimJob_end_time', now)
+        sim_job.save()
+        finish_queue_job(queue_job, 'completed', CACHE_RESTORED_MESSAGE)
+    print(f"Simulation result restored from cache for {sim_type.name}_uid: {sim_type.get_field(obj, 'uid')}")
+
+    try:
+        pdf_path = get_sim_post_processor().generate_report(sim_type, obj)
+        print(f"PDF report generated at: {pdf_path}")
+    except Exception as e:
+        print(f"Unable to generate PDF report for cached result: {str(e)}")
+
+
+@log_trigger('INFO')
+def terminate_sim_job(sim_type_name, target_uid, salvage_reason=None):
+    """
+    停止並移除模擬容器，模擬標記為 simulation_failed。
+
+    :param salvage_reason: 作業逾時或失敗的原因。有提供時，逐步輸出 cell 結果的模擬改以已完成的 cell
+                           保存部分結果（狀態 partial），SimJob 標記結束而不刪除。
+    """
+    sim_type = get_sim_job_type(sim_type_name)
+    try:
+        obj = sim_type.get_target(target_uid)
+        sim_jobs = sim_type.open_sim_jobs(obj)
+
+        # 在暖容器中執行的作業，停止的是借用的暖容器；在遠端主機執行的作業，由該主機的 agent 停止容器
+        queue_job = SimJobQueue.objects.filter(
+            simJobQueue_sim_type=sim_type.name,
+            simJobQueue_target_uid=target_uid,
+            simJobQueue_status__in=['queued', 'running']
+        ).first()
+        if queue_job is not None and queue_job.simJobQueue_exec_id:
+            container_name = queue_job.simJobQueue_container_name
+        else:
+            container_name = sim_type.container_name(target_uid)
+
+        host = queue_job.simJobQueue_host if queue_job is not None else ''
+        client = get_host_client(host)
+        simulation_result_dir = (queue_job.simJobQueue_result_dir if queue_job is not None else '') \
+            or sim_type.result_dir(obj)
+        # 依 cell 拆分的作業停止所有執行中的分片容器
+        shards = queue_job.simJobQueue_shards if queue_job is not None else []
+        containers = [(shard['container_name'], shard['result_dir'])
+                      for shard in shards if shard['status'] == 'running'] if shards \
+            else [(container_name, simulation_result_dir)]
+
+        # 嘗試停止和移除 Docker 容器
+        for name, result_dir in containers:
+            try:
+                client.stop_container(name, timeout=10)
+            except Exception as e:
+                print(f"Docker container stop error: {str(e)}")
+            if salvage_reason and sim_type.ingester is not None and get_sim_job_backend(host).remote:
+                # 遠端主機的結果在移除容器時一併刪除，先下載已完成的 cell
+                try:
+                    client.fetch_results(name, result_dir)
+                except Exception as e:
+                    print(f"Unable to download partial simulation results: {str(e)}")
+            try:
+                # 如果 docker stop 失敗或逾時，強制移除容器
+                client.remove_container(name, force=True)
+            except Exception as e:
+                print(f"Docker container remove error: {str(e)}")
+
+        partial = None
+        if salvage_reason:
+            if shards:
+                merge_shard_results(simulation_result_dir)
+            try:
+                partial = salvage_partial_result(sim_type, obj, simulation_result_dir, salvage_reason)
+            except Exception as e:
+                print(f"Unable to salvage partial simulation results: {str(e)}")
+
+        if partial is not None:
+            sim_jobs.update(**{f'{sim_type.name}SimJob_end_time': timezone.now()})
+            if queue_job is not None:
+                SimJobQueue.objects.filter(pk=queue_job.pk).update(simJobQueue_partial_result=partial)
+            print(f"Partial simulation result salvaged from {partial['cell_count']} cells "
+                  f"for {sim_type.name}_uid: {target_uid}")
+            return True
+
+        sim_jobs.delete()
+
+        sim_type.set_field(obj, 'status', "simulation_failed")
+        obj.save()
+
+        print(f"All related simulation jobs terminated for {sim_type.name}_uid: {target_uid}")
+        return True
+
+    except Exception as e:
+        print(f"Simulation job termination error: {str(e)}")
+        return False
+
+
+@log_trigger('INFO')
+def run_sim_job(queue_job):
+    """
+    啟動模擬容器並監控至完成。對應原本各 SimJobManager 的 run_*_simulation_async。
+    """
+    sim_type = get_sim_job_type(queue_job.simJobQueue_sim_type)
+    target_uid = str(queue_job.simJobQueue_target_uid)
+    sim_job = None
+    try:
+        obj = sim_type.get_target(target_uid)
+        backend = get_sim_job_backend(queue_job.simJobQueue_host)
+
+        # 已有相同類型、相同參數、相同模擬器版本的結果時直接以快取完成；
+        # 在作業執行緒查詢（而不是在送出請求時），Docker 查詢、複製結果與 PDF 都不佔用請求的交易
+        queue_job.simJobQueue_image_digest = get_image_digest(sim_type.image, queue_job.simJobQueue_host) or ''
+        SimJobQueue.objects.filter(pk=queue_job.pk).update(simJobQueue_image_digest=queue_job.simJobQueue_image_digest)
+        entry = lookup_result(sim_type.name, queue_job.simJobQueue_parameter_key, queue_job.simJobQueue_image_digest)
+        if entry is not None:
+            restore_cached_result(queue_job, sim_type, obj, entry)
+            return
+
+        # 依過去相似參數的執行時間決定逾時，避免卡住的短作業佔用名額到類型上限
+        queue_job.simJobQueue_timeout = adaptive_timeout(sim_type.name, sim_type.get_field(obj, 'parameter'))
+        SimJobQueue.objects.filter(pk=queue_job.pk).update(simJobQueue_timeout=queue_job.simJobQueue_timeout)
+
+        start_time = timezone.now()
+        sim_job = sim_type.create_sim_job(obj, start_time)
+
+        sim_type.set_field(obj, 'status', "processing")
+        obj.save()
+
+        simulation_result_dir = sim_type.result_dir(obj)
+        print(f"Simulation result directory: {simulation_result_dir}")
+        # 前一次在暖容器中執行、監控中斷而未搬回的結果先搬回原位
+        settle_result_dir(simulation_result_dir)
+        # 前一次以相同參數執行留下部分結果時保留已完成的 cell，並告知模擬器略過；
+        # 否則清除舊的輸出，避免混入其他參數或失敗執行的結果。結果目錄可能是由快取以硬連結取回的，
+        # 保留的檔案改為各自的複本，容器寫入時才不會改到快取的內容
+        completed_cells = resumable_cells(sim_type, obj, simulation_result_dir)
+        if completed_cells:
+            print(f"Resuming simulation with {sum(len(cells) for cells in completed_cells.values())} "
+                  f"completed cells for {sim_type.name}_uid: {target_uid}")
+            unshare_result_files(simulation_result_dir)
+        else:
+            shutil.rmtree(simulation_result_dir, ignore_errors=True)
+        os.makedirs(simulation_result_dir, exist_ok=True)
+
+        # 記憶體上限使用排程時依過去紀錄估計的預留量；低於類型預設上限時允許 OOM 終止，
+        # 讓作業以較大的上限重新排隊，而不是卡在上限內無法繼續
+        default_limit = parse_memory_limit(sim_type.memory_limit)
+        memory_limit = queue_job.simJobQueue_memory_limit or default_limit
+        script_command = sim_type.simulation_command(
+            obj, {'completed_cells': completed_cells} if completed_cells else None)
+        client = backend.client()
+
+        cell_count = expected_cell_count(sim_type.get_field(obj, 'parameter')) or 0
+        if 1 < queue_job.simJobQueue_shard_count <= cell_count:
+            _start_sharded_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, backend, cell_count)
+            return
+
+        if backend.remote:
+            _start_remote_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, backend,
+                                  script_command, memory_limit, memory_limit >= default_limit)
+            return
+
+        # 有閒置的暖容器時以 docker exec 執行，省下建立與啟動容器的時間
+        pool = get_warm_container_pool()
+        pool_container = None
+        if pool.enabled and pool_result_dir_supported(simulation_result_dir):
+            pool_container = pool.acquire(sim_type.image)
+        container_name = pool_container or sim_type.container_name(target_uid)
+        SimJobQueue.objects.filter(pk=queue_job.pk).update(
+            simJobQueue_container_name=container_name,
+            simJobQueue_result_dir=simulation_result_dir
+        )
+        queue_job.simJobQueue_container_name = container_name
+        # 先登記等待，容器啟動後很快結束時才不會漏掉 die 事件
+        get_container_event_watcher().register(container_name)
+
+        if pool_container:
+            print(f"Docker exec: {container_name} {script_command}")
+            try:
+                exec_id = pool.run(container_name, script_command, simulation_result_dir, memory_limit,
+                                   output_dir=sim_type.output_dir)
+                container_pid = client.inspect_exec(exec_id)['Pid']
+            except Exception as e:
+                settle_result_dir(simulation_result_dir)
+                pool.release(container_name, reusable=False)
+                raise Exception(f"Unable to start simulation in warm container: {str(e)}")
+            queue_job.simJobQueue_exec_id = exec_id
+            SimJobQueue.objects.filter(pk=queue_job.pk).update(simJobQueue_exec_id=exec_id)
+        else:
+            command = ['bash', '-c', script_command]
+            binds = [f'{os.path.abspath(simulation_result_dir)}:{sim_type.output_dir}']
+            print(f"Docker run: {container_name} {sim_type.image} {' '.join(command)}")
+            try:
+                client.run_container(
+                    container_name, sim_type.image, command,
+                    binds=binds,
+                    memory_limit=memory_limit,  # 限制 memory 大小
+                    oom_kill_disable=memory_limit >= default_limit,  # 不因使用太多 memory 而被 host 端砍掉
+                    auto_remove=True  # 容器停止後自動移除
+                )
+            except Exception as e:
+                raise Exception(f"Unable to start Docker container: {str(e)}")
+            invalidate_container_snapshot()
+
+            try:
+                container_pid = client.container_pid(container_name)
+            except Exception:
+                raise Exception("Unable to get container process ID")
+        setattr(sim_job, f'{sim_type.name}SimJob_process_id', container_pid)
+        sim_job.save()
+
+        _monitor_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, container_name, start_time)
+
+    except Exception as e:
+        print(f"Simulation error: {str(e)}")
+        get_container_event_watcher().unregister(queue_job.simJobQueue_container_name or sim_type.container_name(target_uid))
+        cancelled = is_cancel_requested(queue_job)
+        if not cancelled:
+            # 未結束的 SimJob 由 terminate_sim_job 刪除，保存部分結果時則標記結束
+            terminate_sim_job(sim_type.name, target_uid, salvage_reason=str(e))
+        elif sim_job is not None:
+            sim_job.delete()
+        if queue_job.simJobQueue_exec_id:
+            settle_result_dir(simulation_result_dir)
+            get_warm_container_pool().release(queue_job.simJobQueue_container_name, reusable=False)
+        if cancelled:
+            # 啟動期間被取消，容器已由 reaper 移除
+            finish_cancelled(queue_job)
+        else:
+            finish_queue_job(queue_job, 'failed', str(e))
+
+
+@log_trigger('INFO')
+def resume_sim_job(queue_job):
+    """
+    接手一個已在執行（或已結束但尚未分析）的模擬容器，繼續監控並完成結果分析與 PDF 產生。
+    """
+    sim_type = get_sim_job_type(queue_job.simJobQueue_sim_type)
+    target_uid = str(queue_job.simJobQueue_target_uid)
+    try:
+        obj = sim_type.get_target(target_uid)
+        sim_job = sim_type.open_sim_jobs(obj).order_by(f'{sim_type.name}SimJob_start_time').first()
+        if sim_job is None:
+            sim_job = sim_type.create_sim_job(obj, queue_job.simJobQueue_start_time or timezone.now())
+        start_time = getattr(sim_job, f'{sim_type.name}SimJob_start_time')
+
+        simulation_result_dir = queue_job.simJobQueue_result_dir or sim_type.result_dir(obj)
+        container_name = queue_job.simJobQueue_container_name or sim_type.container_name(target_uid)
+        print(f"Resuming simulation monitor for {sim_type.name}_uid: {target_uid}")
+
+        sim_type.set_field(obj, 'status', "processing")
+        obj.save()
+
+        backend = get_sim_job_backend(queue_job.simJobQueue_host)
+        if queue_job.simJobQueue_shards:
+            _monitor_sharded_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, start_time, backend)
+            return
+        if backend.remote:
+            _monitor_remote_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, container_name,
+                                    start_time, backend)
+            return
+        _monitor_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, container_name, start_time)
+
+    except Exception as e:
+        print(f"Simulation error: {str(e)}")
+        terminate_sim_job(sim_type.name, target_uid, salvage_reason=str(e))
+        finish_queue_job(queue_job, 'failed', str(e))
+
+
+def _monitor_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, container_name, start_time):
+    """
+    等待容器結束。平常靠容器事件喚醒，只有在事件串流重新連線、無法使用，
+    或距上次確認超過 SAFETY_CHECK_INTERVAL 時才實際查詢一次容器狀態。
+    在暖容器中執行的作業改為等待 exec 結束，結束後歸還暖容器。
+    支援逐步讀取結果的模擬類型，每次 heartbeat 時讀取新完成的結果檔案並更新部分結果。
+    每次 heartbeat 同時記錄容器的資源用量（SimJobTelemetry）。
+    作業被取消時停止等待，不分析結果。
+    """
+    target_uid = str(sim_type.get_field(obj, 'uid'))
+    timeout = queue_job.simJobQueue_timeout or sim_type.timeout
+    deadline = start_time.timestamp() + timeout
+    watcher = get_container_event_watcher()
+    waiter = watcher.register(container_name)
+    checked_generation = None
+    last_check = 0
+    exec_id = queue_job.simJobQueue_exec_id
+    reusable = False
+    ingester = sim_type.ingester(simulation_result_dir) if sim_type.ingester else None
+    try:
+        telemetry = SimJobTelemetryRecorder(queue_job, sim_type, sim_job, container_name, start_time,
+                                            shared_container=bool(exec_id))
+    except Exception as e:
+        print(f"Unable to record resource usage of {container_name}: {str(e)}")
+        telemetry = None
+
+    try:
+        while True:
+            _heartbeat(queue_job, container_name, telemetry)
+
+            # 作業已被取消：容器通常已由 reaper 停止，這裡再確認一次（例如取消時容器尚未啟動）
+            if is_cancel_requested(queue_job):
+                print(f"Simulation cancelled for {sim_type.name}_uid: {target_uid}")
+                if not exec_id:
+                    try:
+                        get_docker_client().remove_container(container_name, force=True)
+                    except Exception as e:
+                        print(f"Docker container remove error: {str(e)}")
+                finish_cancelled(queue_job)
+                return
+
+            # 檢查是否超時
+            if time.time() > deadline:
+                print(f"Simulation timeout after {timeout} seconds for {sim_type.name}_uid: {target_uid}")
+                terminate_sim_job(sim_type.name, target_uid,
+                                  salvage_reason=f'Simulation timeout after {timeout} seconds')
+                finish_queue_job(queue_job, 'failed', f'Simulation timeout after {timeout} seconds')
+                return
+
+            running = not waiter.exited.is_set()
+            if running and (not watcher.connected or watcher.generation != checked_generation
+                            or time.time() - last_check > SAFETY_CHECK_INTERVAL):
+                checked_generation = watcher.generation if watcher.connected else None
+                last_check = time.time()
+                running = exec_is_running(exec_id) if exec_id else container_exists(container_name)
+            elif not running and exec_id:
+                # exec_die 之外，同一容器的 die 事件也會喚醒等待；以 exec 狀態為準
+                running = exec_is_running(exec_id)
+                if running:
+                    waiter.exited.clear()
+
+            if running and ingester is not None:
+                _ingest_partial_result(queue_job, ingester)
+
+            if not running:
+                if exec_id:
+                    # 結果從暖容器的暫存目錄搬回原位後才分析、保存部分結果或清除
+                    settle_result_dir(simulation_result_dir)
+                if waiter.oom_killed:
+                    _requeue_after_oom(queue_job, sim_type, obj, sim_job, simulation_result_dir)
+                    return
+                results_exist = os.path.exists(simulation_result_dir) and os.listdir(simulation_result_dir)
+                if results_exist and sim_type.ingester is not None and waiter.exit_code \
+                        and _missing_cells(sim_type, obj, simulation_result_dir):
+                    # 逐步輸出 cell 的模擬異常結束且只寫出部分 cell，交由失敗流程保存部分結果；
+                    # 所有 cell 都已寫出時與正常結束相同地分析
+                    raise Exception(f"Container exited with code {waiter.exit_code}, simulation_failed")
+                if results_exist:
+                    # 模擬正常結束，暖容器可以交給下一個作業
+                    reusable = True
+                    _complete_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, ingester)
+                    return
+                # 如果容器已經停止但沒有結果檔案，判定為失敗
+                raise Exception("Container stopped but no results found, simulation_failed")
+
+            wait_seconds = HEARTBEAT_INTERVAL if watcher.connected else POLL_INTERVAL
+            waiter.exited.wait(max(0, min(wait_seconds, deadline - time.time())))
+
+            # 重新從資料庫獲取狀態
+            obj.refresh_from_db()
+            if sim_type.get_field(obj, 'status') == "simulation_failed":
+                finish_queue_job(queue_job, 'failed', 'Simulation marked as failed')
+                return
+    finally:
+        watcher.unregister(container_name)
+        if telemetry is not None:
+            try:
+                telemetry.finish(queue_job, waiter.oom_killed)
+            except Exception as e:
+                print(f"Unable to record resource usage of {container_name}: {str(e)}")
+        if exec_id:
+            try:
+                settle_result_dir(simulation_result_dir)
+            except OSError as e:
+                print(f"Unable to move results out of warm container {container_name}: {str(e)}")
+            get_warm_container_pool().release(container_name, reusable=reusable)
+
+
+def _start_remote_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, backend, script_command,
+                          memory_limit, oom_kill_disable):
+    """透過 simJobAgent 在遠端主機啟動模擬容器並監控至完成。"""
+    target_uid = str(sim_type.get_field(obj, 'uid'))
+    container_name = sim_type.container_name(target_uid)
+    SimJobQueue.objects.filter(pk=queue_job.pk).update(
+        simJobQueue_container_name=container_name,
+        simJobQueue_result_dir=simulation_result_dir
+    )
+    queue_job.simJobQueue_container_name = container_name
+    client = backend.client()
+
+    command = ['bash', '-c', script_command]
+    print(f"Docker run on {backend.name}: {container_name} {sim_type.image} {' '.join(command)}")
+    try:
+        client.run_simulation(container_name, sim_type.image, command, sim_type.output_dir,
+                              memory_limit=memory_limit, oom_kill_disable=oom_kill_disable)
+        container_pid = client.inspect_container(container_name)['State']['Pid']
+    except Exception as e:
+        raise Exception(f"Unable to start Docker container on {backend.name}: {str(e)}")
+    setattr(sim_job, f'{sim_type.name}SimJob_process_id', container_pid)
+    sim_job.save()
+
+    _monitor_remote_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, container_name,
+                            getattr(sim_job, f'{sim_type.name}SimJob_start_time'), backend)
+
+
+def _monitor_remote_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, container_name, start_time,
+                            backend):
+    """
+    等待遠端主機上的容器結束。遠端主機沒有容器事件可以訂閱，每 POLL_INTERVAL 秒向 agent 查詢一次容器狀態；
+    容器結束後下載結果目錄並移除遠端的容器與結果，之後與本機作業相同地分析結果並產生報告。
+    執行中不逐步讀取部分結果。
+    """
+    target_uid = str(sim_type.get_field(obj, 'uid'))
+    timeout = queue_job.simJobQueue_timeout or sim_type.timeout
+    deadline = start_time.timestamp() + timeout
+    client = backend.client()
+    last_contact = time.time()
+    oom_killed = False
+    try:
+        telemetry = SimJobTelemetryRecorder(queue_job, sim_type, sim_job, container_name, start_time)
+    except Exception as e:
+        print(f"Unable to record resource usage of {container_name}: {str(e)}")
+        telemetry = None
+
+    try:
+        while True:
+            _heartbeat(queue_job, container_name, telemetry, client)
+
+            if is_cancel_requested(queue_job):
+                print(f"Simulation cancelled for {sim_type.name}_uid: {target_uid}")
+                try:
+                    client.remove_container(container_name, force=True)
+                except Exception as e:
+                    print(f"Docker container remove error: {str(e)}")
+                finish_cancelled(queue_job)
+                return
+
+            if time.time() > deadline:
+                print(f"Simulation timeout after {timeout} seconds for {sim_type.name}_uid: {target_uid}")
+                terminate_sim_job(sim_type.name, target_uid,
+                                  salvage_reason=f'Simulation timeout after {timeout} seconds')
+                finish_queue_job(queue_job, 'failed', f'Simulation timeout after {timeout} seconds')
+                return
+
+            try:
+                info = client.inspect_container(container_name)
+                last_contact = time.time()
+            except SimJobAgentError as e:
+                # 網路短暫中斷時繼續等待，agent 有回應的錯誤或持續無法連線才判定失敗
+                if e.status is not None or time.time() - last_contact > AGENT_UNREACHABLE_TIMEOUT:
+                    raise
+                print(f"Simulation host {backend.name} is unreachable: {str(e)}")
+            else:
+                if info is None:
+                    raise Exception(f"Container was removed on {backend.name}, simulation_failed")
+                if not info['State']['Running']:
+                    oom_killed = bool(info['State'].get('OOMKilled'))
+                    if oom_killed:
+                        client.remove_container(container_name, force=True)
+                        _requeue_after_oom(queue_job, sim_type, obj, sim_job, simulation_result_dir)
+                        return
+                    exit_code = info['State'].get('ExitCode')
+                    results_exist = (client.fetch_results(container_name, simulation_result_dir)
+                                     and os.listdir(simulation_result_dir))
+                    client.remove_container(container_name, force=True)
+                    if results_exist and sim_type.ingester is not None and exit_code \
+                            and _missing_cells(sim_type, obj, simulation_result_dir):
+                        # 已下載的部分 cell 由 terminate_sim_job 保存為部分結果
+                        raise Exception(f"Container exited with code {exit_code}, simulation_failed")
+                    if results_exist:
+                        _complete_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir)
+                        return
+                    raise Exception("Container stopped but no results found, simulation_failed")
+
+            time.sleep(max(0, min(POLL_INTERVAL, deadline - time.time())))
+
+            # 重新從資料庫獲取狀態
+            obj.refresh_from_db()
+            if sim_type.get_field(obj, 'status') == "simulation_failed":
+                finish_queue_job(queue_job, 'failed', 'Simulation marked as failed')
+                return
+    finally:
+        if telemetry is not None:
+            try:
+                telemetry.finish(queue_job, oom_killed)
+            except Exception as e:
+                print(f"Unable to record resource usage of {container_name}: {str(e)}")
+
+
+def _start_sharded_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, backend, cell_count):
+    """把作業依 cell 拆成 simJobQueue_shard_count 個分片，啟動分片容器並監控至全部完成。"""
+    container_name = sim_type.container_name(str(sim_type.get_field(obj, 'uid')))
+    shards = new_shards(container_name, simulation_result_dir, cell_count, queue_job.simJobQueue_shard_count)
+    SimJobQueue.objects.filter(pk=queue_job.pk).update(
+        simJobQueue_container_name=container_name,
+        simJobQueue_result_dir=simulation_result_dir,
+        simJobQueue_shards=shards
+    )
+    queue_job.simJobQueue_container_name = container_name
+    queue_job.simJobQueue_shards = shards
+    print(f"Simulation split into {len(shards)} cell shards on {backend.name}: {container_name}")
+    _monitor_sharded_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir,
+                             getattr(sim_job, f'{sim_type.name}SimJob_start_time'), backend)
+
+
+def _start_shard(sim_type, obj, shard, shard_total, simulation_result_dir, backend, memory_limit, oom_kill_disable):
+    client = backend.client()
+    shard['attempts'] += 1
+    os.makedirs(shard['result_dir'], exist_ok=True)
+    script_command = sim_type.simulation_command(
+        obj, shard_parameter(sim_type, shard, shard_total, simulation_result_dir))
+    command = ['bash', '-c', script_command]
+    container_name = shard['container_name']
+    print(f"Docker run on {backend.name}: {container_name} {sim_type.image} {' '.join(command)}")
+    try:
+        # 前一次嘗試留下的容器
+        client.remove_container(container_name, force=True)
+        if backend.remote:
+            client.run_simulation(container_name, sim_type.image, command, sim_type.output_dir,
+                                  memory_limit=memory_limit, oom_kill_disable=oom_kill_disable)
+        else:
+            client.run_container(
+                container_name, sim_type.image, command,
+                binds=[f'{os.path.abspath(shard["result_dir"])}:{sim_type.output_dir}'],
+                memory_limit=memory_limit,
+                oom_kill_disable=oom_kill_disable,
+                auto_remove=False  # 結束後仍需讀取結束碼與 OOMKilled，由監控流程移除
+            )
+    except Exception as e:
+        raise Exception(f"Unable to start Docker container {container_name}: {str(e)}")
+    shard['status'] = 'running'
+
+
+def _monitor_sharded_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, start_time, backend):
+    """
+    監控依 cell 拆分的作業：啟動等待中的分片，每 POLL_INTERVAL 秒查詢各分片容器的狀態。
+    分片正常結束且有輸出時標記完成並移除容器（遠端主機先下載結果）；異常結束或沒有輸出時只重新執行該分片，
+    同一分片失敗超過 MAX_SHARD_RETRIES 次判定作業失敗。任一分片因 OOM 被終止時停止其他分片，
+    整個作業以較大的記憶體重新排隊。所有分片完成後合併輸出並分析結果。
+    作業預留的記憶體由各分片平分，記錄的峰值為單一分片容器的峰值。
+    """
+    target_uid = str(sim_type.get_field(obj, 'uid'))
+    timeout = queue_job.simJobQueue_timeout or sim_type.timeout
+    deadline = start_time.timestamp() + timeout
+    client = backend.client()
+    shards = queue_job.simJobQueue_shards
+    default_limit = parse_memory_limit(sim_type.memory_limit)
+    memory_limit = (queue_job.simJobQueue_memory_limit // len(shards)) or default_limit
+    last_contact = time.time()
+
+    def save_shards():
+        SimJobQueue.objects.filter(pk=queue_job.pk).update(simJobQueue_shards=shards)
+
+    while True:
+        running_shards = [shard for shard in shards if shard['status'] == 'running']
+        for shard in running_shards:
+            _heartbeat(queue_job, shard['container_name'], client=client)
+        if not running_shards:
+            _heartbeat(queue_job)
+
+        if is_cancel_requested(queue_job):
+            print(f"Simulation cancelled for {sim_type.name}_uid: {target_uid}")
+            for shard in running_shards:
+                try:
+                    client.remove_container(shard['container_name'], force=True)
+                except Exception as e:
+                    print(f"Docker container remove error: {str(e)}")
+            finish_cancelled(queue_job)
+            return
+
+        if time.time() > deadline:
+            print(f"Simulation timeout after {timeout} seconds for {sim_type.name}_uid: {target_uid}")
+            terminate_sim_job(sim_type.name, target_uid, salvage_reason=f'Simulation timeout after {timeout} seconds')
+            finish_queue_job(queue_job, 'failed', f'Simulation timeout after {timeout} seconds')
+            return
+
+        for shard in shards:
+            if shard['status'] == 'pending':
+                _start_shard(sim_type, obj, shard, len(shards), simulation_result_dir, backend,
+                             memory_limit, memory_limit >= default_limit)
+                save_shards()
+                continue
+            if shard['status'] != 'running':
+                continue
+            container_name = shard['container_name']
+            try:
+                info = client.inspect_container(container_name)
+                last_contact = time.time()
+            except SimJobAgentError as e:
+                if e.status is not None or time.time() - last_contact > AGENT_UNREACHABLE_TIMEOUT:
+                    raise
+                print(f"Simulation host {backend.name} is unreachable: {str(e)}")
+                continue
+            if info is not None and info['State']['Running']:
+                continue
+
+            if info is not None and info['State'].get('OOMKilled'):
+                for other in shards:
+                    if other['status'] == 'running':
+                        client.remove_container(other['container_name'], force=True)
+                # 記錄單一分片的上限，估計時再乘上分片數
+                _requeue_after_oom(queue_job, sim_type, obj, sim_job, simulation_result_dir, memory_limit)
+                return
+            exit_code = info['State'].get('ExitCode') if info is not None else None
+            if backend.remote and info is not None:
+                client.fetch_results(container_name, shard['result_dir'])
+            client.remove_container(container_name, force=True)
+
+            if exit_code == 0 and os.path.isdir(shard['result_dir']) and os.listdir(shard['result_dir']):
+                shard['status'] = 'completed'
+            elif shard['attempts'] > MAX_SHARD_RETRIES:
+                raise Exception(f"Shard {shard['index']} failed {shard['attempts']} times "
+                                f"(exit code {exit_code}), simulation_failed")
+            else:
+                # 只重新執行失敗的分片，已寫出的 cell 以 completed_cells 略過
+                print(f"Shard {shard['index']} exited with code {exit_code}, retrying "
+                      f"for {sim_type.name}_uid: {target_uid}")
+                shard['status'] = 'pending'
+            save_shards()
+
+        if all(shard['status'] == 'completed' for shard in shards):
+            merge_shard_results(simulation_result_dir)
+            _complete_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir)
+            return
+
+        time.sleep(max(0, min(POLL_INTERVAL, deadline - time.time())))
+
+        obj.refresh_from_db()
+        if sim_type.get_field(obj, 'status') == "simulation_failed":
+            finish_queue_job(queue_job, 'failed', 'Simulation marked as failed')
+            return
+
+
+def _ingest_partial_result(queue_job, ingester):
+    try:
+        if ingester.scan():
+            SimJobQueue.objects.filter(pk=queue_job.pk).update(simJobQueue_partial_result=ingester.partial_result())
+    except Exception as e:
+        print(f"Unable to ingest partial simulation results: {str(e)}")
+
+
+def _complete_sim_job(queue_job, sim_type, obj, sim_job, simulation_result_dir, ingester=None):
+    target_uid = str(sim_type.get_field(obj, 'uid'))
+    sim_result = None
+    if ingester is not None:
+        # 執行中已讀取大部分結果檔案，只需補讀最後完成的檔案；失敗時改以分析函式重新讀取全部檔案
+        try:
+            sim_result = ingester.finalize()
+            store_analysis(sim_type, simulation_result_dir, sim_result)
+        except Exception as e:
+            print(f"Incremental result ingestion failed, analyzing full results: {str(e)}")
+        else:
+            # 不經過分析函式，逐 cell 的結果改由讀取過的檔案寫出
+            try:
+                CellMetricsTable.from_cells(ingester.columns, ingester.cell_means()).save(simulation_result_dir)
+            except Exception as e:
+                print(f"Unable to save cell metrics: {str(e)}")
+    # 先轉存欄式副本，分析、PDF 報告與之後的重新分析共用這一次的 CSV 解析；失敗時仍使用原始 CSV
+    try:
+        get_sim_post_processor().build_sidecar(simulation_result_dir)
+    except Exception as e:
+        print(f"Unable to build result sidecar: {str(e)}")
+    try:
+        if sim_result is None:
+            sim_result = get_sim_post_processor().analyze(sim_type, simulation_result_dir)
+    except Exception as e:
+        print(f"Error processing simulation results: {str(e)}")
+        sim_type.set_field(obj, 'status', "error")
+        obj.save()
+        sim_type.open_sim_jobs(obj).update(**{f'{sim_type.name}SimJob_end_time': timezone.now()})
+        finish_queue_job(queue_job, 'failed', f"Error processing simulation results: {str(e)}")
+        return
+
+    if sim_result is None:
+        print(f"simulation_failed: No valid results for {sim_type.name}_uid: {target_uid}")
+        sim_type.set_field(obj, 'status', "simulation_failed")
+        obj.save()
+        sim_type.open_sim_jobs(obj).update(**{f'{sim_type.name}SimJob_end_time': timezone.now()})
+        finish_queue_job(queue_job, 'failed', 'No valid results')
+        return
+
+    sim_type.set_field(obj, 'simulation_result', sim_result)
+    sim_type.set_field(obj, 'status', "completed")
+    sim_type.set_field(obj, 'data_path', simulation_result_dir)
+    obj.save()
+
+    setattr(sim_job, f'{sim_type.name}SimJob_end_time', timezone.now())
+    sim_job.save()
+
+    # PDF 產生時會改寫參數內容，因此在產生 PDF 之前存入快取
+    store_result(sim_type.name, queue_job.simJobQueue_parameter_key, queue_job.simJobQueue_image_digest,
+                 simulation_result_dir, sim_result)
+
+    # 結果已保存並存入快取，PDF 產生失敗（包含行程池中斷）只記錄錯誤，作業仍為完成
+    try:
+        pdf_path = get_sim_post_processor().generate_report(sim_type, obj)
+        print(f"PDF report generated at: {pdf_path}")
+    except Exception as e:
+        print(f"Unable to generate PDF report: {str(e)}")
+    finish_queue_job(queue_job, 'completed')
+    print(f"Simulation completed successfully, results saved for {sim_type.name}_uid: {target_uid}")
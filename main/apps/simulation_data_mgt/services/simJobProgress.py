@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+模擬作業的進度與預估完成時間（ETA）。
+
+只讀取佇列紀錄、meta 資料的狀態欄位與結果目錄的檔案數，不讀取分析結果，供前端輪詢使用：
+  * 有逐步輸出 cell 結果的類型（handover、gso）：以已寫出的 statistics.csv 數對比參數 cell_ut 的 cell 數；
+  * 其他類型：以容器已執行時間對比排隊時預測的執行時間（simRuntimePredictor），
+    沒有預測值時對比同類型作業過去執行時間的中位數。
+"""
+import statistics
+from django.utils import timezone
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.cellStatisticsIngester import (
+    SITUATIONS, count_statistics_files, expected_cell_count
+)
+from main.apps.simulation_data_mgt.services.simJobExecutor import get_sim_job_executor
+from main.apps.simulation_data_mgt.services.simJobShards import shard_result_dirs
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.services.simResultCache import CACHE_RESTORED_MESSAGE
+
+# 估計執行時間時參考的最近完成作業數
+RUNTIME_HISTORY_SIZE = 20
+# 執行中的作業進度最多顯示到 99%，結果分析完成後才是 100%
+MAX_RUNNING_PROGRESS = 0.99
+
+
+def expected_runtime(sim_type_name, parameter_key=''):
+    """
+    依過去完成的作業估計執行秒數：優先參考相同參數的作業，沒有時參考同類型的作業，取中位數。
+    沒有任何紀錄時回傳 None。
+    """
+    completed = SimJobQueue.objects.filter(
+        simJobQueue_sim_type=sim_type_name,
+        simJobQueue_status='completed',
+        simJobQueue_start_time__isnull=False,
+        simJobQueue_end_time__isnull=False
+    ).exclude(simJobQueue_message=CACHE_RESTORED_MESSAGE)
+
+    for queryset in ([completed.filter(simJobQueue_parameter_key=parameter_key)] if parameter_key else []) + [completed]:
+        durations = [
+            (end_time - start_time).total_seconds()
+            for start_time, end_time in queryset.order_by('-simJobQueue_end_time').values_list(
+                'simJobQueue_start_time', 'simJobQueue_end_time')[:RUNTIME_HISTORY_SIZE]
+        ]
+        if durations:
+            return statistics.median(durations)
+    return None
+
+
+def _running_progress(sim_type, queue_job, parameter, elapsed):
+    """回傳 (進度 0~1 或 None, 剩餘秒數或 None, 估計方式, 額外資訊)。"""
+    expected = (queue_job.simJobQueue_expected_runtime
+                or expected_runtime(sim_type.name, queue_job.simJobQueue_parameter_key))
+    detail = {
+        'expected_runtime_seconds': expected,
+        'timeout_seconds': queue_job.simJobQueue_timeout or sim_type.timeout
+    }
+
+    cell_count = expected_cell_count(parameter) if sim_type.ingester else None
+    if cell_count and queue_job.simJobQueue_result_dir:
+        total_files = cell_count * len(SITUATIONS)
+        written = sum(count_statistics_files(result_dir) for result_dir in
+                      [queue_job.simJobQueue_result_dir] + shard_result_dirs(queue_job.simJobQueue_result_dir))
+        detail.update(cells_written=written, cells_expected=total_files)
+        if written:
+            progress = min(written / total_files, MAX_RUNNING_PROGRESS)
+            return progress, elapsed * (1 - progress) / progress, 'cells', detail
+
+    if expected:
+        progress = min(elapsed / expected, MAX_RUNNING_PROGRESS)
+        return progress, max(0.0, expected - elapsed), 'history', detail
+    return None, None, None, detail
+
+
+def job_progress(sim_type_name, target_uid):
+    """
+    回傳單一模擬的進度；找不到模擬時回傳 None。
+
+    :return: {"status", "progress"(0~1 或 None), "eta_seconds", "elapsed_seconds", "method", ...}
+    """
+    sim_type = get_sim_job_type(sim_type_name)
+    name = sim_type.name
+    row = sim_type.model.objects.filter(**{f'{name}_uid': target_uid}).values_list(
+        f'{name}_status', f'{name}_parameter').first()
+    if row is None:
+        return None
+    status, parameter = row
+
+    progress = {
+        'sim_type': name,
+        'target_uid': str(target_uid),
+        'status': status,
+        'job_status': None,
+        'progress': None,
+        'eta_seconds': None,
+        'elapsed_seconds': None,
+        'method': None,
+    }
+    if status == 'completed':
+        progress.update(progress=1.0, eta_seconds=0)
+        return progress
+
+    queue_job = SimJobQueue.objects.filter(
+        simJobQueue_sim_type=name,
+        simJobQueue_target_uid=target_uid
+    ).order_by('-simJobQueue_enqueue_time').first()
+    if queue_job is None:
+        return progress
+    progress['job_status'] = queue_job.simJobQueue_status
+
+    if queue_job.simJobQueue_status == 'queued':
+        progress.update(
+            progress=0.0,
+            queue_position=get_sim_job_executor().position_of(queue_job),
+            expected_runtime_seconds=(queue_job.simJobQueue_expected_runtime
+                                      or expected_runtime(name, queue_job.simJobQueue_parameter_key))
+        )
+    elif queue_job.simJobQueue_status == 'running' and queue_job.simJobQueue_start_time:
+        elapsed = (timezone.now() - queue_job.simJobQueue_start_time).total_seconds()
+        value, eta, method, detail = _running_progress(sim_type, queue_job, parameter, elapsed)
+        progress.update(detail)
+        progress.update(
+            progress=round(value, 4) if value is not None else None,
+            eta_seconds=round(eta) if eta is not None else None,
+            elapsed_seconds=round(elapsed),
+            method=method
+        )
+    return progress
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+模擬作業的 reconciler：定期比對 SimJobQueue、各 SimJob 與實際執行中的 Docker 容器，
+將失去監控者的作業（行程重啟、當機）交給目前行程的執行器接手。
+"""
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.containerEventWatcher import get_container_event_watcher
+from main.apps.simulation_data_mgt.services.dockerEngineClient import get_docker_client
+from main.apps.simulation_data_mgt.services.simJobCanceller import CANCELLING, get_sim_job_reaper
+from main.apps.simulation_data_mgt.services.simJobExecutor import ACTIVE_STATUSES, WORKER_ID, get_sim_job_executor
+from main.apps.simulation_data_mgt.services.simJobLifecycle import list_simulation_containers
+from main.apps.simulation_data_mgt.services.simJobTypes import SIM_JOB_TYPES, get_sim_job_type, parse_container_name
+from main.apps.simulation_data_mgt.services.warmContainerPool import (
+    get_warm_container_pool, list_pool_containers, parse_pool_container_name, remove_scratch_dir
+)
+
+
+def _worker_is_dead(worker):
+    """判斷同一台主機上的監控行程是否已不存在；其他主機的行程一律視為存活，交由 heartbeat 判斷。"""
+    host, _, pid = worker.rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def _claim_orphan(queue_job):
+    """以條件式 update 搶下失去監控者的作業，避免多個行程同時接手。"""
+    claimed = SimJobQueue.objects.filter(
+        pk=queue_job.pk,
+        simJobQueue_status='running',
+        simJobQueue_worker=queue_job.simJobQueue_worker
+    ).update(
+        simJobQueue_worker=WORKER_ID,
+        simJobQueue_heartbeat_time=timezone.now()
+    )
+    if not claimed:
+        return None
+    queue_job.refresh_from_db()
+    return queue_job
+
+
+def _adopt_untracked(sim_type_name, target_uid, container_name=''):
+    """為沒有佇列紀錄的容器或 SimJob 建立一筆 running 紀錄並接手監控。"""
+    sim_type = get_sim_job_type(sim_type_name)
+    try:
+        obj = sim_type.get_target(target_uid)
+    except sim_type.model.DoesNotExist:
+        print(f"Reconciler: {sim_type_name}_uid {target_uid} not found, skipped")
+        return None
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            return SimJobQueue.objects.create(
+                simJobQueue_sim_type=sim_type_name,
+                simJobQueue_target_uid=target_uid,
+                simJobQueue_status='running',
+                simJobQueue_container_name=container_name or sim_type.container_name(target_uid),
+                simJobQueue_result_dir=sim_type.result_dir(obj),
+                simJobQueue_worker=WORKER_ID,
+                simJobQueue_start_time=now,
+                simJobQueue_heartbeat_time=now,
+                f_user_uid_id=obj.f_user_uid_id
+            )
+    except IntegrityError:
+        # 比對期間已有其他請求或行程建立了佇列紀錄
+        print(f"Reconciler: {sim_type_name}_uid {target_uid} is already tracked, skipped")
+        return None
+
+
+def reconcile_sim_jobs(executor=None, containers=None):
+    """
+    執行一次比對。
+
+    1) running 且 heartbeat 逾時（或監控行程已結束）的作業：由目前行程接手監控。
+    2) 執行中但沒有佇列紀錄的模擬容器：補建紀錄後接手監控。
+    3) 尚未結束（end_time 為空）但沒有佇列紀錄的 SimJob：補建紀錄後接手，由監控流程判斷結果。
+
+    :param executor: 接手作業的執行器，預設為行程共用的執行器。
+    :param containers: 執行中的容器名稱清單，預設呼叫 docker ps 取得。
+    :return: 本次接手的作業數量。
+    """
+    executor = executor or get_sim_job_executor()
+    adopted = 0
+
+    stale_before = timezone.now() - timedelta(seconds=getattr(settings, 'SIM_JOB_HEARTBEAT_TIMEOUT', 120))
+    for queue_job in SimJobQueue.objects.filter(simJobQueue_status='running').exclude(simJobQueue_worker=WORKER_ID):
+        heartbeat = queue_job.simJobQueue_heartbeat_time
+        if heartbeat is not None and heartbeat >= stale_before and not _worker_is_dead(queue_job.simJobQueue_worker):
+            continue
+        previous_worker = queue_job.simJobQueue_worker or 'unknown worker'
+        if _claim_orphan(queue_job) is not None:
+            print(f"Reconciler: adopting {queue_job.simJobQueue_sim_type} {queue_job.simJobQueue_target_uid} "
+                  f"from {previous_worker}")
+            executor.adopt(queue_job)
+            adopted += 1
+
+    # 取消中的作業由 reaper 停止容器，不接手監控
+    tracked = {
+        (sim_type, str(target_uid))
+        for sim_type, target_uid in SimJobQueue.objects.filter(
+            simJobQueue_status__in=ACTIVE_STATUSES + [CANCELLING]
+        ).values_list('simJobQueue_sim_type', 'simJobQueue_target_uid')
+    }
+
+    if containers is None:
+        try:
+            containers = list_simulation_containers()
+        except Exception as e:
+            print(f"Reconciler error: {str(e)}")
+            containers = []
+    for container_name in containers:
+        parsed = parse_container_name(container_name)
+        if parsed is None or parsed in tracked:
+            continue
+        queue_job = _adopt_untracked(parsed[0], parsed[1], container_name.lstrip('/'))
+        if queue_job is not None:
+            tracked.add(parsed)
+            executor.adopt(queue_job)
+            adopted += 1
+
+    for sim_type in SIM_JOB_TYPES.values():
+        open_target_uids = sim_type.sim_job_model.objects.filter(**{
+            f'{sim_type.name}SimJob_end_time__isnull': True
+        }).values_list(f'f_{sim_type.name}_uid', flat=True).distinct()
+        for target_uid in open_target_uids:
+            key = (sim_type.name, str(target_uid))
+            if key in tracked:
+                continue
+            queue_job = _adopt_untracked(sim_type.name, str(target_uid))
+            if queue_job is not None:
+                tracked.add(key)
+                executor.adopt(queue_job)
+                adopted += 1
+
+    return adopted
+
+
+def remove_orphan_pool_containers(containers=None):
+    """
+    移除已結束的行程留下、且沒有作業正在使用的暖容器。
+
+    :param containers: 執行中的暖容器名稱清單，預設向 Docker 查詢。
+    :return: 移除的容器數量。
+    """
+    if containers is None:
+        containers = list_pool_containers()
+    in_use = set(SimJobQueue.objects.filter(
+        simJobQueue_status__in=ACTIVE_STATUSES
+    ).exclude(simJobQueue_exec_id='').values_list('simJobQueue_container_name', flat=True))
+
+    removed = 0
+    for container_name in containers:
+        owner = parse_pool_container_name(container_name)
+        if owner is None or owner == WORKER_ID or container_name in in_use or not _worker_is_dead(owner):
+            continue
+        print(f"Reconciler: removing warm container {container_name} left by {owner}")
+        get_docker_client().remove_container(container_name, force=True)
+        remove_scratch_dir(container_name)
+        removed += 1
+    return removed
+
+
+_supervisor = None
+_supervisor_lock = threading.Lock()
+
+
+def _reconcile_loop(interval):
+    while True:
+        try:
+            reconcile_sim_jobs()
+            if get_warm_container_pool().enabled:
+                remove_orphan_pool_containers()
+        except Exception as e:
+            print(f"Reconciler error: {str(e)}")
+        finally:
+            connection.close()
+        time.sleep(interval)
+
+
+def start_sim_job_supervisor():
+    """
+    啟動容器事件監聽、暖容器池、執行器、取消作業的 reaper 與 reconciler 背景執行緒；同一個行程重複呼叫只會啟動一次。
+    """
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is not None:
+            return
+        get_container_event_watcher().start()
+        get_warm_container_pool().start()
+        get_sim_job_executor().start()
+        get_sim_job_reaper().start()
+        _supervisor = threading.Thread(
+            target=_reconcile_loop,
+            args=(getattr(settings, 'SIM_JOB_RECONCILE_INTERVAL', 60),),
+            name="simJobReconciler",
+            daemon=True
+        )
+        _supervisor.start()
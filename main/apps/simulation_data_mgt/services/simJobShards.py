@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+依 cell 拆分的模擬作業（cell shard）。
+
+handover、gso 的模擬器在同一個容器內逐一模擬每個 cell，並寫出 <ideal|actual>/cell_analysis/<cell>/statistics.csv。
+cell 數多的模擬可以拆成數個分片平行執行：每個分片在自己的容器中只模擬參數 cells 列出的 cell 編號，
+結果寫在 <結果目錄>/shards/<分片編號>；所有分片完成後把各分片的輸出合併回結果目錄，再以原本的分析函式分析。
+分片的狀態記錄在佇列紀錄的 simJobQueue_shards，單一分片失敗時只重新執行該分片（simJobLifecycle）。
+"""
+import os
+import shutil
+from django.conf import settings
+from main.apps.simulation_data_mgt.services.cellStatisticsIngester import expected_cell_count
+from main.apps.simulation_data_mgt.services.simResultSalvage import completed_cells
+
+SHARD_DIR_NAME = 'shards'
+# 單一分片異常結束時重新執行的次數上限
+MAX_SHARD_RETRIES = 2
+
+
+def shard_count(sim_type, parameter):
+    """
+    依 SIM_JOB_CELL_SHARDS 與參數 cell_ut 的 cell 數決定作業拆成幾個分片，每個分片至少
+    SIM_JOB_MIN_CELLS_PER_SHARD 個 cell。回傳 1 表示以單一容器執行。
+    """
+    max_shards = getattr(settings, 'SIM_JOB_CELL_SHARDS', 1)
+    if not sim_type.cell_sharded or max_shards <= 1:
+        return 1
+    cell_count = expected_cell_count(parameter)
+    if not cell_count:
+        return 1
+    min_cells = max(1, getattr(settings, 'SIM_JOB_MIN_CELLS_PER_SHARD', 8))
+    return max(1, min(max_shards, cell_count // min_cells))
+
+
+def plan_shards(cell_count, count):
+    """把 cell 編號 0 ~ cell_count-1 依序切成 count 段大小相近的連續區間。"""
+    base, extra = divmod(cell_count, count)
+    shards = []
+    start = 0
+    for index in range(count):
+        size = base + (1 if index < extra else 0)
+        shards.append(list(range(start, start + size)))
+        start += size
+    return shards
+
+
+def shard_result_dir(simulation_result_dir, index):
+    return os.path.join(simulation_result_dir, SHARD_DIR_NAME, str(index))
+
+
+def new_shards(container_name, simulation_result_dir, cell_count, count):
+    """
+    建立分片狀態清單（存入 simJobQueue_shards）。
+
+    status: pending（等待啟動）-> running -> completed；異常結束的分片回到 pending 重新執行。
+    """
+    return [
+        {
+            'index': index,
+            'cells': cells,
+            'container_name': f"{container_name}_shard{index}",
+            'result_dir': shard_result_dir(simulation_result_dir, index),
+            'status': 'pending',
+            'attempts': 0,
+        }
+        for index, cells in enumerate(plan_shards(cell_count, count))
+    ]
+
+
+def shard_parameter(sim_type, shard, shard_total, simulation_result_dir):
+    """
+    分片執行時附加的參數：cells 為分片負責的 cell 編號；結果目錄（接續部分結果時保留的 cell）
+    或分片目錄（前一次嘗試寫出的 cell）中已完成的 cell 以 completed_cells 傳給模擬器略過。
+    """
+    parameter = {'cells': shard['cells'], 'shard_index': shard['index'], 'shard_count': shard_total}
+    done = {}
+    for result_dir in (simulation_result_dir, shard['result_dir']):
+        for situation, cells in completed_cells(sim_type, result_dir).items():
+            done.setdefault(situation, set()).update(cells)
+    if any(done.values()):
+        parameter['completed_cells'] = {situation: sorted(cells) for situation, cells in done.items()}
+    return parameter
+
+
+def shard_result_dirs(simulation_result_dir):
+    """列出結果目錄下尚未合併的分片目錄。"""
+    shards_root = os.path.join(simulation_result_dir, SHARD_DIR_NAME)
+    try:
+        names = os.listdir(shards_root)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(shards_root, name) for name in sorted(names, key=lambda name: (len(name), name))]
+
+
+def merge_shard_results(simulation_result_dir):
+    """
+    把各分片的輸出移回結果目錄並刪除分片目錄。各分片的 cell 資料夾互不重疊；
+    多個分片都寫出的其他檔案保留編號最大的分片的版本。
+
+    :return: 移動的檔案數。
+    """
+    moved = 0
+    for shard_dir in shard_result_dirs(simulation_result_dir):
+        for root, _, files in os.walk(shard_dir):
+            target_dir = os.path.join(simulation_result_dir, os.path.relpath(root, shard_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            for file_name in files:
+                os.replace(os.path.join(root, file_name), os.path.join(target_dir, file_name))
+                moved += 1
+    shutil.rmtree(os.path.join(simulation_result_dir, SHARD_DIR_NAME), ignore_errors=True)
+    return moved
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+模擬容器的資源用量紀錄。
+
+監控執行緒每次 heartbeat 讀取一次容器的 cgroup 統計（docker stats），記錄記憶體用量（不含 page cache）、
+累計 CPU 秒數與區塊讀寫量，每次執行（一筆 <name>SimJob）存成一筆 SimJobTelemetry：
+摘要欄位加上精簡的時間序列。telemetry_summary 依模擬類型（與參數）彙總，供容量規劃使用。
+"""
+import math
+from django.db.models import Q
+from django.utils import timezone
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.models.SimJobTelemetryModel import SimJobTelemetry
+
+# 時間序列的取樣點上限，超過時每兩點保留一點
+MAX_SAMPLES = 240
+# 每取樣 SAVE_INTERVAL 次寫入一次資料庫，行程中斷時仍保留大部分紀錄
+SAVE_INTERVAL = 10
+COUNTERS = ('cpu_seconds', 'block_read_bytes', 'block_write_bytes')
+
+
+class SimJobTelemetryRecorder:
+    """
+    單次執行的資源用量紀錄。在暖容器中以 docker exec 執行時，容器的累計計數包含先前的作業，
+    因此以第一次取樣為基準扣除；記憶體只取不含 page cache 的用量。
+    """
+
+    def __init__(self, queue_job, sim_type, sim_job, container_name, start_time, shared_container=False):
+        self.sim_type_name = sim_type.name
+        self.target_uid = queue_job.simJobQueue_target_uid
+        self.sim_job_uid = getattr(sim_job, f'{sim_type.name}SimJob_uid')
+        self.parameter_key = queue_job.simJobQueue_parameter_key
+        self.container_name = container_name
+        self.start_time = start_time
+        self.shared_container = shared_container
+        self.samples = []
+        self.peak_memory = 0
+        self.totals = dict.fromkeys(COUNTERS, 0)
+        self._baseline = None
+        self._unsaved = 0
+
+        # 行程重啟後接手時延續既有的紀錄
+        existing = SimJobTelemetry.objects.filter(simJobTelemetry_sim_job_uid=self.sim_job_uid).first()
+        if existing is not None:
+            self.samples = list(existing.simJobTelemetry_samples)
+            self.peak_memory = existing.simJobTelemetry_peak_memory
+            self.totals = {
+                'cpu_seconds': existing.simJobTelemetry_cpu_seconds,
+                'block_read_bytes': existing.simJobTelemetry_block_read_bytes,
+                'block_write_bytes': existing.simJobTelemetry_block_write_bytes,
+            }
+
+    def add(self, stats):
+        """加入一次 DockerEngineClient.container_stats 的結果。"""
+        if self._baseline is None:
+            if self.shared_container:
+                # 以目前的計數扣除已記錄的量作為基準（接手時，接手前未記錄的期間視為沒有用量）
+                self._baseline = {name: stats[name] - self.totals[name] for name in COUNTERS}
+            else:
+                self._baseline = dict.fromkeys(COUNTERS, 0)
+        for name in COUNTERS:
+            self.totals[name] = max(self.totals[name], stats[name] - self._baseline[name])
+        self.peak_memory = max(self.peak_memory, stats['memory_usage'])
+
+        elapsed = (timezone.now() - self.start_time).total_seconds()
+        self.samples.append([
+            round(elapsed, 1), stats['memory_usage'], round(self.totals['cpu_seconds'], 3),
+            self.totals['block_read_bytes'], self.totals['block_write_bytes']
+        ])
+        if len(self.samples) > MAX_SAMPLES:
+            # 保留最後一點，往前每兩點保留一點
+            self.samples = self.samples[::-2][::-1]
+
+        self._unsaved += 1
+        if self._unsaved >= SAVE_INTERVAL:
+            self.save()
+
+    def save(self, status='running', oom_killed=False, end_time=None):
+        self._unsaved = 0
+        SimJobTelemetry.objects.update_or_create(
+            simJobTelemetry_sim_job_uid=self.sim_job_uid,
+            defaults={
+                'simJobTelemetry_sim_type': self.sim_type_name,
+                'simJobTelemetry_target_uid': self.target_uid,
+                'simJobTelemetry_parameter_key': self.parameter_key,
+                'simJobTelemetry_container_name': self.container_name,
+                'simJobTelemetry_status': status,
+                'simJobTelemetry_start_time': self.start_time,
+                'simJobTelemetry_end_time': end_time,
+                'simJobTelemetry_wall_seconds': ((end_time or timezone.now()) - self.start_time).total_seconds(),
+                'simJobTelemetry_peak_memory': self.peak_memory,
+                'simJobTelemetry_cpu_seconds': self.totals['cpu_seconds'],
+                'simJobTelemetry_block_read_bytes': self.totals['block_read_bytes'],
+                'simJobTelemetry_block_write_bytes': self.totals['block_write_bytes'],
+                'simJobTelemetry_oom_killed': oom_killed,
+                'simJobTelemetry_samples': self.samples,
+            }
+        )
+
+    def finish(self, queue_job, oom_killed=False):
+        """
+        監控結束時寫入最終紀錄，狀態取自佇列作業。佇列作業仍為 running 表示監控因例外結束，
+        呼叫端隨後會將作業標記為失敗。
+        """
+        status = SimJobQueue.objects.filter(pk=queue_job.pk).values_list('simJobQueue_status', flat=True).first()
+        if status in (None, 'running'):
+            status = 'failed'
+        elif status == 'queued':
+            status = 'requeued'
+        self.save(status, oom_killed, timezone.now())
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def _distribution(values):
+    return {
+        'mean': sum(values) / len(values),
+        'p50': _percentile(values, 0.5),
+        'p95': _percentile(values, 0.95),
+        'max': max(values),
+    }
+
+
+def telemetry_summary(sim_type_name=None, group_by_parameter=False, status='completed'):
+    """
+    依模擬類型（group_by_parameter 時再依參數雜湊）彙總已結束執行的資源用量。
+
+    :param status: 只彙總此結束狀態的執行；None 表示全部。
+    :return: [{"sim_type", "parameter_key"?, "run_count", "oom_killed_count", "wall_seconds", "peak_memory",
+               "cpu_seconds", "cpu_cores", "block_read_bytes", "block_write_bytes"}, ...]
+    """
+    rows = SimJobTelemetry.objects.filter(simJobTelemetry_end_time__isnull=False)
+    if sim_type_name:
+        rows = rows.filter(simJobTelemetry_sim_type=sim_type_name)
+    if status:
+        # OOM 的執行也列入，記憶體需求才不會被低估
+        rows = rows.filter(Q(simJobTelemetry_status=status) | Q(simJobTelemetry_oom_killed=True))
+
+    group_fields = ['simJobTelemetry_sim_type'] + (['simJobTelemetry_parameter_key'] if group_by_parameter else [])
+    groups = {}
+    for row in rows.values_list(*group_fields, 'simJobTelemetry_wall_seconds', 'simJobTelemetry_peak_memory',
+                                'simJobTelemetry_cpu_seconds', 'simJobTelemetry_block_read_bytes',
+                                'simJobTelemetry_block_write_bytes', 'simJobTelemetry_oom_killed'):
+        key = row[:len(group_fields)]
+        groups.setdefault(key, []).append(row[len(group_fields):])
+
+    summary = []
+    for key, runs in sorted(groups.items()):
+        wall, peak, cpu, block_read, block_write, oom_killed = (list(column) for column in zip(*runs))
+        entry = {'sim_type': key[0]}
+        if group_by_parameter:
+            entry['parameter_key'] = key[1]
+        total_wall = sum(wall)
+        entry.update({
+            'run_count': len(runs),
+            'oom_killed_count': sum(oom_killed),
+            'wall_seconds': _distribution(wall),
+            'peak_memory': _distribution(peak),
+            'cpu_seconds': _distribution(cpu),
+            # 平均同時使用的 CPU 核心數
+            'cpu_cores': sum(cpu) / total_wall if total_wall else None,
+            'block_read_bytes': _distribution(block_read),
+            'block_write_bytes': _distribution(block_write),
+        })
+        summary.append(entry)
+    return summary
+
+
+def job_telemetry(sim_type_name, target_uid):
+    """回傳某個模擬每次執行的資源用量與時間序列，依開始時間排序。"""
+    return [
+        {
+            'sim_job_uid': str(row.simJobTelemetry_sim_job_uid),
+            'status': row.simJobTelemetry_status,
+            'container_name': row.simJobTelemetry_container_name,
+            'start_time': row.simJobTelemetry_start_time,
+            'end_time': row.simJobTelemetry_end_time,
+            'wall_seconds': row.simJobTelemetry_wall_seconds,
+            'peak_memory': row.simJobTelemetry_peak_memory,
+            'cpu_seconds': row.simJobTelemetry_cpu_seconds,
+            'block_read_bytes': row.simJobTelemetry_block_read_bytes,
+            'block_write_bytes': row.simJobTelemetry_block_write_bytes,
+            'oom_killed': row.simJobTelemetry_oom_killed,
+            'samples': row.simJobTelemetry_samples,
+        }
+        for row in SimJobTelemetry.objects.filter(
+            simJobTelemetry_sim_type=sim_type_name,
+            simJobTelemetry_target_uid=target_uid
+        ).order_by('simJobTelemetry_start_time')
+    ]
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+各模擬類型的宣告式設定：對應的 meta 資料模型、SimJob 模型、Docker 映像檔、模擬腳本、容器內的輸出目錄、
+記憶體上限、逾時時間、結果分析函式與報告產生函式。
+欄位名稱皆依照既有命名慣例（<name>_uid、<name>_status、<name>SimJob_end_time ...）推導。
+排程、容器生命週期（simJobLifecycle）與 API（simJobManager、api/urls.py）都由 SIM_JOB_TYPES 驅動，
+新增模擬類型只需在 SIM_JOB_TYPES 加入一筆設定。
+"""
+import os
+import re
+import json
+from main.apps.meta_data_mgt.models.HandoverModel import Handover
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.meta_data_mgt.models.ConnectedDurationModel import ConnectedDuration
+from main.apps.meta_data_mgt.models.PhaseModel import Phase
+from main.apps.meta_data_mgt.models.ConstellationStrategyModel import ConstellationStrategy
+from main.apps.meta_data_mgt.models.IslHoppingModel import IslHopping
+from main.apps.meta_data_mgt.models.ModifyRegenRoutingModel import ModifyRegenRouting
+from main.apps.meta_data_mgt.models.OneToMultiModel import OneToMulti
+from main.apps.meta_data_mgt.models.MultiToMultiModel import MultiToMulti
+from main.apps.meta_data_mgt.models.SaveErRoutingModel import SaveErRouting
+from main.apps.meta_data_mgt.models.EndToEndRoutingModel import EndToEndRouting
+from main.apps.meta_data_mgt.models.SingleBeamModel import SingleBeam
+from main.apps.meta_data_mgt.models.GsoModel import Gso
+from main.apps.simulation_data_mgt.models.handoverSimJobModel import HandoverSimJob
+from main.apps.simulation_data_mgt.models.CoverageSimJobModel import CoverageSimJob
+from main.apps.simulation_data_mgt.models.ConnectedDurationSimJobModel import ConnectedDurationSimJob
+from main.apps.simulation_data_mgt.models.PhaseSimJobModel import PhaseSimJob
+from main.apps.simulation_data_mgt.models.ConstellationStrategySimJobModel import ConstellationStrategySimJob
+from main.apps.simulation_data_mgt.models.IslHoppingSimJobModel import IslHoppingSimJob
+from main.apps.simulation_data_mgt.models.ModifyRegenRoutingSimJobModel import ModifyRegenRoutingSimJob
+from main.apps.simulation_data_mgt.models.OneToMultiSimJobModel import OneToMultiSimJob
+from main.apps.simulation_data_mgt.models.MultiToMultiSimJobModel import MultiToMultiSimJob
+from main.apps.simulation_data_mgt.models.SaveErRoutingSimJobModel import SaveErRoutingSimJob
+from main.apps.simulation_data_mgt.models.EndToEndRoutingSimJobModel import EndToEndRoutingSimJob
+from main.apps.simulation_data_mgt.models.SingleBeamSimJobModel import SingleBeamSimJob
+from main.apps.simulation_data_mgt.models.GsoSimJobModel import GsoSimJob
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import analyzeHandoverResult
+from main.apps.simulation_data_mgt.services.analyzeCoverageAnalysisResult import analyzeCoverageAnalysisResult
+from main.apps.simulation_data_mgt.services.analyzeConnectedDurationResult import analyzeConnectedDurationResult
+from main.apps.simulation_data_mgt.services.analyzePhaseResult import analyzePhaseResult
+from main.apps.simulation_data_mgt.services.analyzeConstellationStrategyResult import analyzeConstellationStrategyResult
+from main.apps.simulation_data_mgt.services.analyzeIslHoppingResult import analyzeIslHoppingResult
+from main.apps.simulation_data_mgt.services.analyzeModifyRegenRoutingResult import analyzeModifyRegenRoutingResult
+from main.apps.simulation_data_mgt.services.analyzeOneToMultiResult import analyzeOneToMultiResult
+from main.apps.simulation_data_mgt.services.analyzeMultiToMultiResult import analyzeMultiToMultiResult
+from main.apps.simulation_data_mgt.services.analyzeSaveErRoutingResult import analyzeSaveErRoutingResult
+from main.apps.simulation_data_mgt.services.analyzeEndToEndRoutingResult import analyzeEndToEndRoutingResult
+from main.apps.simulation_data_mgt.services.analyzeSingleBeamResult import analyzeSingleBeamResult
+from main.apps.simulation_data_mgt.services.analyzeGsoResult import analyzeGsoResult
+from main.apps.simulation_data_mgt.services.genHandoverResultPDF import genHandoverResultPDF
+from main.apps.simulation_data_mgt.services.genCoverageAnalysisResultPDF import genCoverageAnalysisResultPDF
+from main.apps.simulation_data_mgt.services.genConnectedDurationResultPDF import genConnectedDurationResultPDF
+from main.apps.simulation_data_mgt.services.genPhaseResultPDF import genPhaseResultPDF
+from main.apps.simulation_data_mgt.services.genConstellationStrategyResultPDF import genConstellationStrategyResultPDF
+from main.apps.simulation_data_mgt.services.genIslHoppingResultPDF import genIslHoppingResultPDF
+from main.apps.simulation_data_mgt.services.genModifyRegenRoutingResultPDF import genModifyRegenRoutingResultPDF
+from main.apps.simulation_data_mgt.services.genOneToMultiResultPDF import genOneToMultiResultPDF
+from main.apps.simulation_data_mgt.services.genMultiToMultiResultPDF import genMultiToMultiResultPDF
+from main.apps.simulation_data_mgt.services.genSaveErRoutingResultPDF import genSaveErRoutingResultPDF
+from main.apps.simulation_data_mgt.services.genEndToEndRoutingResultPDF import genEndToEndRoutingResultPDF
+from main.apps.simulation_data_mgt.services.genSingleBeamResultPDF import genSingleBeamResultPDF
+from main.apps.simulation_data_mgt.services.genGsoResultPDF import genGsoResultPDF
+from main.apps.simulation_data_mgt.services.cellStatisticsIngester import gso_result_ingester, handover_result_ingester
+
+# 模擬器在容器內寫出結果的目錄，執行時掛載（或連結）到作業的結果目錄
+CONTAINER_OUTPUT_DIR = '/root/mercury/build/service/output'
+CONTAINER_NAME_PATTERN = re.compile(r'^/?(?P<sim_type>[A-Za-z]+)Simulation_(?P<target_uid>[0-9a-fA-F-]{36})$')
+
+
+class SimJobType:
+    """
+    單一模擬類型的設定與欄位存取輔助函式。
+    """
+
+    def __init__(self, name, model, sim_job_model, image, memory_limit, analyzer, report_generator,
+                 timeout=60 * 60 * 8, ingester=None, script=None, output_dir=CONTAINER_OUTPUT_DIR,
+                 cell_sharded=False):
+        self.name = name
+        self.model = model
+        self.sim_job_model = sim_job_model
+        self.image = image
+        # 容器內執行的模擬腳本，以 JSON 參數為唯一引數
+        self.script = script or f"/root/mercury/shell/simulation_{name}_script.sh"
+        self.output_dir = output_dir
+        self.memory_limit = memory_limit
+        self.analyzer = analyzer
+        self.report_generator = report_generator
+        self.timeout = timeout
+        # 執行中逐步讀取結果檔案的 ingester 建構函式（接收結果目錄）；None 表示只在容器結束後分析
+        self.ingester = ingester
+        # 模擬器是否接受 cells 參數、只模擬部分 cell，可依 cell 拆成多個容器平行執行（simJobShards）
+        self.cell_sharded = cell_sharded
+        # API 訊息中使用的名稱（meta 資料模型名稱，例如 Coverage）
+        self.display_name = model.__name__
+        # 報告產生函式寫在結果目錄下的 PDF 檔名
+        self.report_file_name = f"{name}_simulation_report.pdf"
+
+    def get_target(self, target_uid):
+        return self.model.objects.get(**{f'{self.name}_uid': target_uid})
+
+    def get_field(self, obj, field):
+        return getattr(obj, f'{self.name}_{field}')
+
+    def set_field(self, obj, field, value):
+        setattr(obj, f'{self.name}_{field}', value)
+
+    def open_sim_jobs(self, obj):
+        return self.sim_job_model.objects.filter(**{
+            f'f_{self.name}_uid': obj,
+            f'{self.name}SimJob_end_time__isnull': True
+        })
+
+    def create_sim_job(self, obj, start_time):
+        return self.sim_job_model.objects.create(**{
+            f'f_{self.name}_uid': obj,
+            f'{self.name}SimJob_start_time': start_time
+        })
+
+    def container_name(self, target_uid):
+        return f"{self.name}Simulation_{target_uid}"
+
+    def result_dir(self, obj):
+        return os.path.join(
+            'simulation_result', f'{self.name}_simulation',
+            str(obj.f_user_uid.user_uid),
+            str(self.get_field(obj, 'uid'))
+        )
+
+    def simulation_command(self, obj, extra_parameter=None):
+        """
+        :param extra_parameter: 只傳給這次執行、不寫回 meta 資料的參數（例如接續部分結果時已完成的 cell）。
+        """
+        parameter = self.get_field(obj, 'parameter')
+        script = self.script
+        if not isinstance(parameter, dict):
+            try:
+                parameter = json.loads(parameter)
+            except json.JSONDecodeError:
+                return parameter
+        if extra_parameter and isinstance(parameter, dict):
+            parameter = dict(parameter, **extra_parameter)
+        return f"{script} '{json.dumps(parameter)}'"
+
+
+SIM_JOB_TYPES = {
+    sim_job_type.name: sim_job_type for sim_job_type in [
+        SimJobType('handover', Handover, HandoverSimJob, 'handoverimage', '100g',
+                   analyzeHandoverResult, genHandoverResultPDF, ingester=handover_result_ingester,
+                   cell_sharded=True),
+        SimJobType('coverage', Coverage, CoverageSimJob, 'handoverimage', '28g',
+                   analyzeCoverageAnalysisResult, genCoverageAnalysisResultPDF),
+        SimJobType('connectedDuration', ConnectedDuration, ConnectedDurationSimJob, 'handoverimage', '28g',
+                   analyzeConnectedDurationResult, genConnectedDurationResultPDF),
+        SimJobType('phase', Phase, PhaseSimJob, 'handoverimage', '28g',
+                   analyzePhaseResult, genPhaseResultPDF),
+        SimJobType('constellationStrategy', ConstellationStrategy, ConstellationStrategySimJob, 'handoverimage', '28g',
+                   analyzeConstellationStrategyResult, genConstellationStrategyResultPDF),
+        SimJobType('islHopping', IslHopping, IslHoppingSimJob, 'handoverimage', '28g',
+                   analyzeIslHoppingResult, genIslHoppingResultPDF),
+        SimJobType('modifyRegenRouting', ModifyRegenRouting, ModifyRegenRoutingSimJob, 'handoverimage', '28g',
+                   analyzeModifyRegenRoutingResult, genModifyRegenRoutingResultPDF),
+        SimJobType('oneToMulti', OneToMulti, OneToMultiSimJob, 'routingimage', '28g',
+                   analyzeOneToMultiResult, genOneToMultiResultPDF),
+        SimJobType('multiToMulti', MultiToMulti, MultiToMultiSimJob, 'routingimage', '28g',
+                   analyzeMultiToMultiResult, genMultiToMultiResultPDF),
+        SimJobType('saveErRouting', SaveErRouting, SaveErRoutingSimJob, 'routingimage', '28g',
+                   analyzeSaveErRoutingResult, genSaveErRoutingResultPDF, timeout=60 * 60 * 24 * 3),
+        SimJobType('endToEndRouting', EndToEndRouting, EndToEndRoutingSimJob, 'routingimage', '28g',
+                   analyzeEndToEndRoutingResult, genEndToEndRoutingResultPDF),
+        SimJobType('singleBeam', SingleBeam, SingleBeamSimJob, 'handoverimage', '28g',
+                   analyzeSingleBeamResult, genSingleBeamResultPDF),
+        SimJobType('gso', Gso, GsoSimJob, 'handoverimage', '150g',
+                   analyzeGsoResult, genGsoResultPDF, ingester=gso_result_ingester, cell_sharded=True),
+    ]
+}
+
+
+def get_sim_job_type(name):
+    if name not in SIM_JOB_TYPES:
+        raise ValueError(f"Unknown simulation type: {name}")
+    return SIM_JOB_TYPES[name]
+
+
+def parse_container_name(container_name):
+    """
+    解析 "<sim_type>Simulation_<uid>" 形式的容器名稱。
+
+    :return: (sim_type, target_uid)；若不是模擬容器則回傳 None。
+    """
+    match = CONTAINER_NAME_PATTERN.match(container_name)
+    if not match or match.group('sim_type') not in SIM_JOB_TYPES:
+        return None
+    return match.group('sim_type'), match.group('target_uid').lower()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+模擬作業的記憶體估計：依過去執行時量測到的記憶體峰值，估計下一次執行需要的記憶體，
+作為排程時的記憶體預留量與容器的 `-m` 上限，取代每個類型固定的 28g / 100g / 150g。
+"""
+import hashlib
+import json
+import threading
+import time
+from django.conf import settings
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.dockerEngineClient import get_docker_client, parse_memory_limit
+
+# 估計值相對於過去峰值的安全餘裕
+SAFETY_MARGIN = 1.25
+# 因 OOM 被終止的作業，下一次以當時上限的倍數重新估計
+OOM_GROWTH = 2
+MIN_MEMORY = 1024 ** 3
+# 同類型但參數不同時，至少要有幾筆紀錄才以類型整體的峰值估計
+MIN_TYPE_SAMPLES = 3
+TYPE_PERCENTILE = 0.9
+HISTORY_LIMIT = 50
+# 自動偵測主機記憶體時保留給系統與其他服務的比例
+HOST_MEMORY_RESERVE_RATIO = 0.1
+CAPACITY_CACHE_SECONDS = 60
+
+
+def parameter_key(parameter):
+    """以參數內容計算雜湊，參數相同的作業共用同一組記憶體紀錄。"""
+    if isinstance(parameter, str):
+        try:
+            parameter = json.loads(parameter)
+        except json.JSONDecodeError:
+            pass
+    canonical = json.dumps(parameter, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def default_memory_limit(sim_type_name):
+    from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+    return parse_memory_limit(get_sim_job_type(sim_type_name).memory_limit)
+
+
+def estimate_memory(sim_type_name, key=''):
+    """
+    估計作業需要的記憶體（bytes）。
+
+    1) 同類型、同參數有紀錄：取最近紀錄的最大峰值乘上安全餘裕（曾 OOM 的紀錄以上限加倍）；
+       沒有 OOM 的紀錄時不超過該類型原本固定的記憶體上限。
+    2) 同類型有足夠紀錄：取峰值的 90 百分位數乘上安全餘裕。
+    3) 沒有紀錄：使用該類型原本固定的記憶體上限。
+    """
+    history = SimJobQueue.objects.filter(
+        simJobQueue_sim_type=sim_type_name,
+        simJobQueue_peak_memory__gt=0
+    ).order_by('-simJobQueue_enqueue_time')
+
+    if key:
+        samples = list(history.filter(simJobQueue_parameter_key=key).values_list(
+            'simJobQueue_peak_memory', 'simJobQueue_oom_count')[:HISTORY_LIMIT])
+        if samples:
+            estimate = max(
+                peak * (OOM_GROWTH ** oom_count if oom_count else SAFETY_MARGIN)
+                for peak, oom_count in samples
+            )
+            # 峰值乘上安全餘裕後成為下一次的上限，沒有 OOM 時不讓估計值隨重跑次數無限增長
+            if not any(oom_count for _, oom_count in samples):
+                estimate = min(estimate, default_memory_limit(sim_type_name))
+            return max(MIN_MEMORY, int(estimate))
+
+    peaks = sorted(history.values_list('simJobQueue_peak_memory', flat=True)[:HISTORY_LIMIT])
+    if len(peaks) >= MIN_TYPE_SAMPLES:
+        index = min(len(peaks) - 1, int(len(peaks) * TYPE_PERCENTILE))
+        return max(MIN_MEMORY, int(peaks[index] * SAFETY_MARGIN))
+
+    return default_memory_limit(sim_type_name)
+
+
+def estimate_queue_job_memory(queue_job):
+    """
+    作業需要預留的記憶體。依 cell 拆分的作業同時執行多個容器，預留量為每個容器的估計乘上分片數；
+    記錄的峰值是單一容器的峰值，因此估計值仍以單一容器計算。
+    """
+    estimate = estimate_memory(queue_job.simJobQueue_sim_type, queue_job.simJobQueue_parameter_key)
+    return estimate * max(1, queue_job.simJobQueue_shard_count)
+
+
+_capacity_cache = {'time': 0, 'value': None}
+_capacity_lock = threading.Lock()
+
+
+def host_memory_capacity():
+    """
+    可分配給模擬容器的記憶體總量（bytes）。
+
+    優先使用 SIM_JOB_MEMORY_CAPACITY；未設定時向 Docker 查詢主機記憶體並保留一成。
+    無法取得時回傳 None，代表不做記憶體限制。
+    """
+    configured = getattr(settings, 'SIM_JOB_MEMORY_CAPACITY', '')
+    if configured:
+        return parse_memory_limit(configured)
+
+    with _capacity_lock:
+        if time.time() - _capacity_cache['time'] < CAPACITY_CACHE_SECONDS:
+            return _capacity_cache['value']
+        try:
+            total = get_docker_client().info()['MemTotal']
+            _capacity_cache['value'] = int(total * (1 - HOST_MEMORY_RESERVE_RATIO))
+        except Exception as e:
+            print(f"Unable to detect host memory capacity: {str(e)}")
+            _capacity_cache['value'] = None
+        _capacity_cache['time'] = time.time()
+        return _capacity_cache['value']
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+容器結束後的結果分析（pandas）、結果欄式副本（simResultSidecar）與 PDF 報告產生（matplotlib）。
+
+這兩個步驟都是 CPU 密集的工作，若在監控容器的執行緒中直接執行，會在 web 行程內長時間持有 GIL，
+拖慢 API 回應。這裡改由獨立的行程池執行：監控執行緒只送出工作並等待結果（等待時不持有 GIL）。
+子行程以 spawn 啟動，不繼承 web 行程的執行緒與資料庫連線；分析與報告函式只讀寫結果目錄，不存取資料庫。
+SIM_POSTPROCESS_WORKERS 為 0 時退回在呼叫端執行緒中直接執行。
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _analyze(sim_type_name, simulation_result_dir):
+    from main.apps.simulation_data_mgt.services.simAnalysisCache import analyze_with_cache
+    from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+    return analyze_with_cache(get_sim_job_type(sim_type_name), simulation_result_dir)
+
+
+def _build_sidecar(simulation_result_dir):
+    from main.apps.simulation_data_mgt.services.simResultSidecar import build_result_sidecar
+    manifest = build_result_sidecar(simulation_result_dir)
+    return None if manifest is None else len(manifest['files'])
+
+
+def _generate_report(sim_type_name, obj):
+    from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+    return get_sim_job_type(sim_type_name).report_generator(obj)
+
+
+class SimPostProcessor:
+    """
+    執行結果分析與報告產生的行程池。子行程意外結束（例如被 OOM killer 終止）時，
+    該次工作拋出例外，下一次工作會重新建立行程池。
+    """
+
+    def __init__(self, workers=2):
+        self.workers = max(0, int(workers))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def run(self, func, *args):
+        """在行程池中執行 func(*args) 並等待結果。"""
+        if not self.workers:
+            return func(*args)
+        executor = self._get_executor()
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+
+    def analyze(self, sim_type, simulation_result_dir):
+        """:return: 分析結果；結果目錄沒有變動時直接取回上次的結果（simAnalysisCache）。"""
+        return self.run(_analyze, sim_type.name, os.path.abspath(simulation_result_dir))
+
+    def build_sidecar(self, simulation_result_dir):
+        """:return: 轉存的 CSV 檔案數；功能關閉或沒有 CSV 時回傳 None。"""
+        return self.run(_build_sidecar, os.path.abspath(simulation_result_dir))
+
+    def generate_report(self, sim_type, obj):
+        """:return: PDF 路徑；報告產生時對參數的改寫只發生在子行程的副本上。"""
+        return self.run(_generate_report, sim_type.name, obj)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_post_processor = None
+_post_processor_lock = threading.Lock()
+
+
+def get_sim_post_processor():
+    """取得整個行程共用的結果處理行程池。"""
+    global _post_processor
+    with _post_processor_lock:
+        if _post_processor is None:
+            _post_processor = SimPostProcessor(getattr(settings, 'SIM_POSTPROCESS_WORKERS', 2))
+        return _post_processor
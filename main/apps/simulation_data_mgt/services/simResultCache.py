@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+模擬結果快取：以「模擬類型 + 參數雜湊 + 模擬器映像檔 digest」作為內容位址，
+不同使用者以相同參數執行同一版模擬器時，直接以硬連結（或複製）取回已完成的結果目錄與分析結果，
+不必再跑一次容器。快取總大小超過上限時，依最後使用時間淘汰最久未使用的結果。
+"""
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from main.apps.simulation_data_mgt.models.SimResultCacheModel import SimResultCache, SimResultCacheCounter
+from main.apps.simulation_data_mgt.services.dockerEngineClient import parse_memory_limit
+from main.apps.simulation_data_mgt.services.simJobBackends import LOCAL_HOST, get_host_client
+
+DEFAULT_CACHE_DIR = os.path.join('simulation_result', 'cache')
+DEFAULT_MAX_SIZE = '200g'
+IMAGE_DIGEST_CACHE_SECONDS = 300
+# PDF 報告內含各筆模擬自己的設定，每次取用快取時重新產生，不放進快取
+IGNORED_PATTERNS = ('*.pdf',)
+# 以快取完成的佇列作業訊息；估計執行時間時排除這些作業
+CACHE_RESTORED_MESSAGE = 'Result restored from cache'
+
+_digest_cache = {}
+_digest_lock = threading.Lock()
+_evict_lock = threading.Lock()
+
+
+def cache_enabled():
+    return getattr(settings, 'SIM_RESULT_CACHE_ENABLED', True)
+
+
+def cache_dir():
+    return getattr(settings, 'SIM_RESULT_CACHE_DIR', '') or DEFAULT_CACHE_DIR
+
+
+def cache_max_size():
+    return parse_memory_limit(getattr(settings, 'SIM_RESULT_CACHE_MAX_SIZE', '') or DEFAULT_MAX_SIZE)
+
+
+def get_image_digest(image, host=''):
+    """
+    取得映像檔在模擬主機（預設為本機）上目前的 digest，短時間內重複查詢時使用暫存值。
+    無法取得時回傳 None，代表這次不使用快取。
+    """
+    key = (host or LOCAL_HOST, image)
+    with _digest_lock:
+        cached = _digest_cache.get(key)
+        if cached and time.time() - cached[0] < IMAGE_DIGEST_CACHE_SECONDS:
+            return cached[1]
+    try:
+        digest = get_host_client(host).image_digest(image)
+    except Exception as e:
+        print(f"Unable to get image digest of {image}: {str(e)}")
+        return None
+    with _digest_lock:
+        _digest_cache[key] = (time.time(), digest)
+    return digest
+
+
+def make_cache_key(sim_type_name, parameter_key, image_digest):
+    return hashlib.sha256(f"{sim_type_name}:{parameter_key}:{image_digest}".encode('utf-8')).hexdigest()
+
+
+def _count(sim_type_name, field):
+    SimResultCacheCounter.objects.get_or_create(simResultCacheCounter_sim_type=sim_type_name)
+    SimResultCacheCounter.objects.filter(simResultCacheCounter_sim_type=sim_type_name).update(
+        **{field: F(field) + 1}
+    )
+
+
+def _copy_tree(source, target):
+    """以硬連結複製目錄，跨檔案系統等無法建立硬連結時改為一般複製。"""
+    def link_or_copy(src, dst):
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    shutil.copytree(source, target, copy_function=link_or_copy, ignore=shutil.ignore_patterns(*IGNORED_PATTERNS))
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def lookup_result(sim_type_name, parameter_key, image_digest):
+    """
+    查詢快取，命中時更新使用次數與最後使用時間。
+
+    :return: SimResultCache；未命中時回傳 None。
+    """
+    if not cache_enabled() or not parameter_key or not image_digest:
+        return None
+    cache_key = make_cache_key(sim_type_name, parameter_key, image_digest)
+    entry = SimResultCache.objects.filter(simResultCache_cache_key=cache_key).first()
+    if entry is not None and not os.path.isdir(entry.simResultCache_result_dir):
+        print(f"Cached result directory missing, dropping cache entry: {entry.simResultCache_result_dir}")
+        entry.delete()
+        entry = None
+    if entry is None:
+        _count(sim_type_name, 'simResultCacheCounter_miss_count')
+        return None
+
+    now = timezone.now()
+    SimResultCache.objects.filter(pk=entry.pk).update(
+        simResultCache_hit_count=F('simResultCache_hit_count') + 1,
+        simResultCache_last_access_time=now
+    )
+    entry.simResultCache_last_access_time = now
+    _count(sim_type_name, 'simResultCacheCounter_hit_count')
+    return entry
+
+
+def restore_result(entry, target_dir):
+    """將快取的結果目錄連結到 target_dir（原有內容會被取代）。"""
+    shutil.rmtree(target_dir, ignore_errors=True)
+    os.makedirs(os.path.dirname(os.path.abspath(target_dir)), exist_ok=True)
+    _copy_tree(entry.simResultCache_result_dir, target_dir)
+
+
+def unshare_result_files(result_dir):
+    """
+    將結果目錄中與其他目錄共用的檔案（由快取以硬連結取回）換成各自的複本。
+    結果目錄要交給容器寫入前呼叫，避免改寫到快取或其他使用者的結果。
+    """
+    for root, _, files in os.walk(result_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.islink(path) or os.stat(path).st_nlink < 2:
+                continue
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            shutil.copy2(path, tmp_path)
+            os.replace(tmp_path, path)
+
+
+def store_result(sim_type_name, parameter_key, image_digest, simulation_result_dir, simulation_result):
+    """
+    將完成的結果目錄與分析結果存入快取；同一個 cache key 已存在時不重複存放。
+    存放完成後若快取總大小超過上限，淘汰最久未使用的結果。
+    """
+    if not cache_enabled() or not parameter_key or not image_digest:
+        return None
+    cache_key = make_cache_key(sim_type_name, parameter_key, image_digest)
+    if SimResultCache.objects.filter(simResultCache_cache_key=cache_key).exists():
+        return None
+
+    target_dir = os.path.join(cache_dir(), sim_type_name, cache_key)
+    tmp_dir = f"{target_dir}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(os.path.dirname(target_dir), exist_ok=True)
+        _copy_tree(simulation_result_dir, tmp_dir)
+        shutil.rmtree(target_dir, ignore_errors=True)
+        os.rename(tmp_dir, target_dir)
+        entry, created = SimResultCache.objects.get_or_create(
+            simResultCache_cache_key=cache_key,
+            defaults={
+                'simResultCache_sim_type': sim_type_name,
+                'simResultCache_parameter_key': parameter_key,
+                'simResultCache_image_digest': image_digest,
+                'simResultCache_result_dir': target_dir,
+                'simResultCache_simulation_result': simulation_result,
+                'simResultCache_size_bytes': _dir_size(target_dir),
+            }
+        )
+    except Exception as e:
+        print(f"Unable to store simulation result in cache: {str(e)}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+
+    evict_results(cache_max_size())
+    return entry if created else None
+
+
+def evict_results(max_bytes):
+    """依最後使用時間由舊到新淘汰快取，直到總大小不超過 max_bytes。回傳淘汰的筆數。"""
+    with _evict_lock:
+        entries = list(SimResultCache.objects.order_by('simResultCache_last_access_time').values_list(
+            'pk', 'simResultCache_sim_type', 'simResultCache_result_dir', 'simResultCache_size_bytes'))
+        total = sum(size for _, _, _, size in entries)
+        evicted = 0
+        for pk, sim_type_name, result_dir, size in entries:
+            if total <= max_bytes:
+                break
+            SimResultCache.objects.filter(pk=pk).delete()
+            shutil.rmtree(result_dir, ignore_errors=True)
+            _count(sim_type_name, 'simResultCacheCounter_eviction_count')
+            total -= size
+            evicted += 1
+        return evicted
+
+
+def cache_status():
+    entries = SimResultCache.objects.all()
+    return {
+        'enabled': cache_enabled(),
+        'entry_count': entries.count(),
+        'size_bytes': sum(entries.values_list('simResultCache_size_bytes', flat=True)),
+        'max_size_bytes': cache_max_size(),
+        'counters': [
+            {
+                'sim_type': counter.simResultCacheCounter_sim_type,
+                'hit_count': counter.simResultCacheCounter_hit_count,
+                'miss_count': counter.simResultCacheCounter_miss_count,
+                'eviction_count': counter.simResultCacheCounter_eviction_count,
+            }
+            for counter in SimResultCacheCounter.objects.order_by('simResultCacheCounter_sim_type')
+        ]
+    }
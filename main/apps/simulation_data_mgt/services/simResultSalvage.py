@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+部分結果的保存（salvage）。
+
+逐步輸出 cell 結果的模擬（handover、gso）逾時或容器異常結束時，不丟棄已寫出的 statistics.csv，
+而是以已完成的 cell 計算部分結果：模擬狀態標記為 partial，結果中的 "partial" 記錄原因與覆蓋範圍
+（各情境已完成的 cell 與參數 cell_ut 預期的 cell 數）。
+
+以相同參數重新執行時保留結果目錄，並把已完成的 cell 以 completed_cells 傳給模擬腳本，
+模擬器可以略過這些 cell；完成後的分析會一併讀取保留下來的 cell。
+"""
+import os
+from django.utils import timezone
+from main.apps.simulation_data_mgt.services.cellStatisticsIngester import expected_cell_count
+from main.apps.simulation_data_mgt.services.simMemoryEstimator import parameter_key
+
+PARTIAL_STATUS = 'partial'
+PARTIAL_KEY = 'partial'
+
+
+def _ingest_completed_cells(sim_type, simulation_result_dir):
+    ingester = sim_type.ingester(simulation_result_dir)
+    # 容器已停止，寫到一半而無法解析的檔案視為未完成的 cell
+    ingester.scan(final=True, skip_errors=True)
+    return ingester
+
+
+def completed_cells(sim_type, simulation_result_dir):
+    """回傳結果目錄中已完成的 cell {情境: [cell 資料夾, ...]}；目錄不存在時各情境為空。"""
+    if not os.path.isdir(simulation_result_dir):
+        return {}
+    return _ingest_completed_cells(sim_type, simulation_result_dir).completed_cells()
+
+
+def salvage_partial_result(sim_type, obj, simulation_result_dir, reason):
+    """
+    以已完成的 cell 計算部分結果並寫入模擬（狀態 partial）。
+
+    :return: 覆蓋範圍資訊；模擬類型不支援或 ideal / actual 沒有任何完成的 cell 時回傳 None，不做任何變更。
+    """
+    if sim_type.ingester is None or not simulation_result_dir or not os.path.isdir(simulation_result_dir):
+        return None
+    ingester = _ingest_completed_cells(sim_type, simulation_result_dir)
+    result = ingester.result()
+    if result is None:
+        return None
+
+    parameter = sim_type.get_field(obj, 'parameter')
+    cell_count = ingester.cell_counts()
+    expected = expected_cell_count(parameter)
+    coverage = {
+        'reason': reason,
+        'parameter_key': parameter_key(parameter),
+        'cell_count': cell_count,
+        'expected_cell_count': expected,
+        # 兩個情境都完成的 cell 才算完成
+        'coverage': round(min(1.0, min(cell_count.values()) / expected), 4) if expected else None,
+        'completed_cells': ingester.completed_cells(),
+        'salvaged_time': timezone.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
+    }
+    sim_type.set_field(obj, 'simulation_result', dict(result, **{PARTIAL_KEY: coverage}))
+    sim_type.set_field(obj, 'status', PARTIAL_STATUS)
+    sim_type.set_field(obj, 'data_path', simulation_result_dir)
+    obj.save()
+    return coverage
+
+
+def resumable_cells(sim_type, obj, simulation_result_dir):
+    """
+    前一次執行以相同參數留下部分結果時，回傳結果目錄中已完成的 cell {情境: [cell 資料夾, ...]}；
+    沒有可接續的部分結果時回傳 None。
+    """
+    if sim_type.ingester is None or not os.path.isdir(simulation_result_dir):
+        return None
+    previous = sim_type.get_field(obj, 'simulation_result')
+    partial = previous.get(PARTIAL_KEY) if isinstance(previous, dict) else None
+    if not partial or partial.get('parameter_key') != parameter_key(sim_type.get_field(obj, 'parameter')):
+        return None
+    cells = completed_cells(sim_type, simulation_result_dir)
+    return cells if any(cells.values()) else None
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+模擬結果的欄式副本（sidecar）：模擬完成後把結果目錄下所有 CSV 轉存成單一壓縮檔
+<result_dir>/result_sidecar.npz，並寫出清單 result_sidecar.json。
+
+  * 每個 CSV 為一個表格，每個欄位存成一個陣列（數值欄位保留原本的型別，文字欄位另存缺值遮罩）；
+    讀取時只解壓縮需要的欄位。
+  * handover、gso 的 <ideal|actual>/cell_analysis/<cell>/statistics.csv 合併成一個表格，
+    以 situation、cell 欄位區分（partition），並記錄每個 cell 原本有哪些欄位，
+    讀取時與 cellStatisticsLoader 相同，欄位不齊全的 cell 不納入。
+  * 清單記錄每個來源檔案的大小與修改時間，檔案被改寫、新增或刪除後不再使用副本，改回讀取 CSV。
+
+原始 CSV 保留不刪除（使用者下載結果與結果快取仍使用原始目錄），副本會另外佔用約壓縮後大小的磁碟空間，
+也會隨結果目錄存入結果快取；不需要時以 SIM_RESULT_SIDECAR_ENABLED 關閉。
+檔案格式使用 numpy 的 npz（zip + deflate），不需要額外安裝 pyarrow。建立時逐檔、逐欄位寫入，不同時保留所有 cell 的資料。
+"""
+import json
+import os
+import pickle
+import tempfile
+import zipfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from main.apps.simulation_data_mgt.services.cellStatisticsLoader import SITUATIONS, STATISTICS_FILE, statistics_files
+
+SIDECAR_FILE = 'result_sidecar.npz'
+MANIFEST_FILE = 'result_sidecar.json'
+SIDECAR_VERSION = 1
+CELL_TABLE = 'cell_statistics'
+# read_result_csv 往上尋找清單的層數（例如 <result_dir>/ideal/gs_analysis/<sub>/statistics.csv）
+MAX_PARENT_LEVELS = 4
+
+
+def sidecar_enabled():
+    return getattr(settings, 'SIM_RESULT_SIDECAR_ENABLED', True)
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _cell_key(relpath):
+    """<situation>/cell_analysis/<cell>/statistics.csv 回傳 (situation, cell)，其他檔案回傳 None。"""
+    parts = relpath.split(os.sep)
+    if len(parts) == 4 and parts[0] in SITUATIONS and parts[1] == 'cell_analysis' and parts[3] == STATISTICS_FILE:
+        return parts[0], parts[2]
+    return None
+
+
+def _csv_files(simulation_result_dir):
+    """結果目錄下所有 CSV 的相對路徑（排序後）。"""
+    paths = []
+    for root, _, files in os.walk(simulation_result_dir):
+        for name in files:
+            if name.lower().endswith('.csv'):
+                paths.append(os.path.relpath(os.path.join(root, name), simulation_result_dir))
+    return sorted(paths)
+
+
+def _write_array(archive, key, values):
+    """以與 np.savez_compressed 相同的格式寫入一個陣列，寫完即可釋放，不必同時保留所有陣列。"""
+    with archive.open(f'{key}.npy', 'w', force_zip64=True) as f:
+        np.lib.format.write_array(f, np.asanyarray(values), allow_pickle=False)
+
+
+def _store_column(archive, key, series):
+    """把一個欄位寫入 archive（數值欄位保留原本的型別，文字欄位另存缺值遮罩），回傳欄位的種類。"""
+    if series.dtype.kind in 'biuf':
+        _write_array(archive, key, series.to_numpy())
+        return 'numeric'
+    missing = series.isna().to_numpy()
+    _write_array(archive, key, np.array(series.where(~missing, '').astype(str).tolist(), dtype=str))
+    if missing.any():
+        _write_array(archive, f'{key}_null', missing)
+    return 'string'
+
+
+def _store_table(archive, table_index, df):
+    """把 DataFrame 的每個欄位寫入 archive，回傳欄位的描述。"""
+    return {
+        'rows': len(df),
+        'columns': [
+            {'name': str(column), 'kind': _store_column(archive, f't{table_index}_c{column_index}', df[column])}
+            for column_index, column in enumerate(df.columns)
+        ],
+    }
+
+
+def _read_spill(path):
+    chunks = []
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                chunks.append(pickle.load(f))
+            except EOFError:
+                return chunks
+
+
+def _store_cell_table(archive, table_index, simulation_result_dir, cell_relpaths):
+    """
+    所有 cell 的 statistics.csv 合併成一個表格寫入 archive，結果與 pd.concat 所有 cell 相同，
+    但不同時保留所有 cell 的資料：先只讀標頭取得欄位聯集，再逐 cell 讀取並把每個欄位依序暫存到該欄位的檔案，
+    最後逐欄位合併寫入。同時間只保留一個 cell 或一個欄位的資料。
+
+    :return: (表格描述, 分區欄位的陣列)。
+    """
+    paths = [os.path.join(simulation_result_dir, relpath) for relpath in cell_relpaths]
+    union = list(dict.fromkeys(column for path in paths for column in pd.read_csv(path, nrows=0).columns))
+    positions = {column: index for index, column in enumerate(union)}
+    present = np.zeros((len(paths), len(union)), dtype=bool)
+    offsets = [0]
+
+    # 暫存目錄與檔案以 .tmp 結尾，不列入分析快取的指紋
+    with tempfile.TemporaryDirectory(dir=simulation_result_dir, suffix='.tmp') as spill_dir:
+        spill_paths = [os.path.join(spill_dir, f'{index}.tmp') for index in range(len(union))]
+        spills = [open(path, 'wb') for path in spill_paths]
+        try:
+            for index, path in enumerate(paths):
+                df = pd.read_csv(path)
+                present[index, [positions[column] for column in df.columns]] = True
+                offsets.append(offsets[-1] + len(df))
+                # 只有標頭的 cell 各欄位為 object 型別，不參與合併以免數值欄位被轉成 object
+                if not len(df):
+                    continue
+                for column, spill in zip(union, spills):
+                    # 暫存單一欄位的 DataFrame（cell 沒有的欄位為沒有欄位的 DataFrame），合併時的型別與缺值與整表合併相同
+                    chunk = df[[column]] if column in df.columns else df.iloc[:, :0]
+                    pickle.dump(chunk, spill, protocol=pickle.HIGHEST_PROTOCOL)
+                del df
+        finally:
+            for spill in spills:
+                spill.close()
+
+        columns = []
+        for column_index, (column, spill_path) in enumerate(zip(union, spill_paths)):
+            chunks = _read_spill(spill_path)
+            os.remove(spill_path)
+            combined = pd.concat(chunks, ignore_index=True, sort=False) if chunks else pd.DataFrame()
+            series = combined.reindex(columns=[column])[column]
+            del chunks, combined
+            key = f't{table_index}_c{column_index}'
+            columns.append({'name': str(column), 'kind': _store_column(archive, key, series)})
+
+    keys = [_cell_key(relpath) for relpath in cell_relpaths]
+    # 分區欄位：每個 cell 的情境、名稱、在合併表格中的起始列，以及原本有哪些欄位
+    partitions = {
+        'cells_situation': np.array([situation for situation, _ in keys], dtype=str),
+        'cells_name': np.array([cell for _, cell in keys], dtype=str),
+        'cells_offset': np.array(offsets),
+        'cells_columns': present,
+    }
+    return {'rows': offsets[-1], 'columns': columns, 'name': CELL_TABLE}, partitions
+
+
+def _load_column(data, table_index, column_index, column):
+    values = data[f't{table_index}_c{column_index}']
+    if column['kind'] == 'numeric':
+        return values
+    values = values.astype(object)
+    null_key = f't{table_index}_c{column_index}_null'
+    if null_key in data.files:
+        values[data[null_key]] = np.nan
+    return values
+
+
+def build_result_sidecar(simulation_result_dir):
+    """
+    把結果目錄下的 CSV 轉存為欄式副本，已存在的副本會被取代。
+
+    :return: 清單內容；功能關閉或目錄下沒有 CSV 時回傳 None。
+    """
+    if not sidecar_enabled() or not os.path.isdir(simulation_result_dir):
+        return None
+    relpaths = _csv_files(simulation_result_dir)
+    if not relpaths:
+        return None
+
+    tables = []
+    files = {}
+    cell_relpaths = []
+    sidecar_path = os.path.join(simulation_result_dir, SIDECAR_FILE)
+    manifest_path = os.path.join(simulation_result_dir, MANIFEST_FILE)
+    # 先移除舊的清單，寫入過程中中斷時不會以舊清單讀取新的副本
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    tmp_path = sidecar_path + '.tmp'
+    # 每個 CSV 讀取後立即寫入壓縮檔，不同時保留所有檔案的內容
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for relpath in relpaths:
+                path = os.path.join(simulation_result_dir, relpath)
+                signature = _signature(path)
+                if _cell_key(relpath) is not None:
+                    files[relpath] = {'size': signature[0], 'mtime_ns': signature[1], 'cell': len(cell_relpaths)}
+                    cell_relpaths.append(relpath)
+                    continue
+                table = _store_table(archive, len(tables), pd.read_csv(path))
+                table['name'] = relpath
+                files[relpath] = {'size': signature[0], 'mtime_ns': signature[1], 'table': len(tables)}
+                tables.append(table)
+
+            manifest = {
+                'version': SIDECAR_VERSION,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'files': files,
+                'tables': tables,
+            }
+            if cell_relpaths:
+                cell_index = len(tables)
+                table, partitions = _store_cell_table(archive, cell_index, simulation_result_dir, cell_relpaths)
+                tables.append(table)
+                for key, values in partitions.items():
+                    _write_array(archive, key, values)
+                manifest['cell_table'] = cell_index
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, sidecar_path)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+def read_manifest(simulation_result_dir):
+    """讀取清單；沒有副本、版本不符或無法讀取時回傳 None。"""
+    if not sidecar_enabled():
+        return None
+    manifest_path = os.path.join(simulation_result_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path) or not os.path.exists(os.path.join(simulation_result_dir, SIDECAR_FILE)):
+        return None
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Unable to read result sidecar manifest {manifest_path}: {str(e)}")
+        return None
+    if manifest.get('version') != SIDECAR_VERSION:
+        return None
+    return manifest
+
+
+def _unchanged(entry, path):
+    try:
+        return entry is not None and _signature(path) == (entry['size'], entry['mtime_ns'])
+    except OSError:
+        return False
+
+
+def _find_result_dir(path):
+    """由 CSV 路徑往上尋找有副本清單的結果目錄。"""
+    directory = os.path.dirname(os.path.abspath(path))
+    for _ in range(MAX_PARENT_LEVELS + 1):
+        if os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return None
+
+
+def read_result_csv(path):
+    """
+    讀取結果目錄中的 CSV：副本存在且檔案沒有變動時從副本讀取，否則以 pd.read_csv 讀取，兩者結果相同。
+    """
+    simulation_result_dir = _find_result_dir(path)
+    manifest = read_manifest(simulation_result_dir) if simulation_result_dir else None
+    if manifest is not None:
+        entry = manifest['files'].get(os.path.relpath(os.path.abspath(path), simulation_result_dir))
+        if entry is not None and 'table' in entry and _unchanged(entry, path):
+            try:
+                table_index = entry['table']
+                table = manifest['tables'][table_index]
+                with np.load(os.path.join(simulation_result_dir, SIDECAR_FILE), allow_pickle=False) as data:
+                    return pd.DataFrame({
+                        column['name']: _load_column(data, table_index, column_index, column)
+                        for column_index, column in enumerate(table['columns'])
+                    }, index=pd.RangeIndex(table['rows']))
+            except Exception as e:
+                print(f"Unable to read {path} from result sidecar: {str(e)}")
+    return pd.read_csv(path)
+
+
+def read_cell_sidecar(simulation_result_dir, columns):
+    """
+    從副本讀取 ideal 與 actual 每個 cell 的 columns（float64）。
+
+    :return: {情境: [(cell 名稱, 陣列), ...]}，只包含欄位齊全的 cell，順序與 statistics_files 相同；
+             沒有副本，或 cell 的 statistics.csv 有新增、刪除、改寫時回傳 None。
+    """
+    manifest = read_manifest(simulation_result_dir)
+    if manifest is None:
+        return None
+    files = manifest['files']
+    paths = {situation: statistics_files(simulation_result_dir, situation) for situation in SITUATIONS}
+    cell_entries = {relpath for relpath, entry in files.items() if 'cell' in entry}
+    relpaths = {
+        situation: [os.path.relpath(path, simulation_result_dir) for path in paths[situation]]
+        for situation in SITUATIONS
+    }
+    if cell_entries != {relpath for situation in SITUATIONS for relpath in relpaths[situation]}:
+        return None
+    for situation in SITUATIONS:
+        for path, relpath in zip(paths[situation], relpaths[situation]):
+            if not _unchanged(files[relpath], path):
+                return None
+
+    data = {situation: [] for situation in SITUATIONS}
+    if not cell_entries:
+        return data
+    table_index = manifest['cell_table']
+    table = manifest['tables'][table_index]
+    positions = {column['name']: index for index, column in enumerate(table['columns'])}
+    if not all(column in positions for column in columns):
+        # 所有 cell 都缺少某個欄位，沒有 cell 會被納入
+        return data
+    with np.load(os.path.join(simulation_result_dir, SIDECAR_FILE), allow_pickle=False) as arrays:
+        values = np.column_stack([
+            np.asarray(_load_column(arrays, table_index, positions[column], table['columns'][positions[column]]),
+                       dtype='float64')
+            for column in columns
+        ]) if columns else np.empty((table['rows'], 0))
+        offsets = arrays['cells_offset']
+        complete = arrays['cells_columns'][:, [positions[column] for column in columns]].all(axis=1)
+    for situation in SITUATIONS:
+        for relpath in relpaths[situation]:
+            cell = files[relpath]['cell']
+            if complete[cell]:
+                data[situation].append((relpath.split(os.sep)[2], values[offsets[cell]:offsets[cell + 1]]))
+    return data
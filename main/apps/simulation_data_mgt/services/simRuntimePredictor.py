@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+模擬執行時間預測：依各類型過去完成的 SimJob（<name>SimJob_start_time / end_time）
+與對應的 <name>_parameter 建立簡單的迴歸模型，用於：
+  * 每個作業的逾時時間（預測的 p99 乘上餘裕），取代固定的 8 小時；
+  * 排程時讓預估較短的作業先執行（shortest expected job first）。
+
+參數中的數值欄位直接作為特徵，另外從字串參數推導星座衛星數（TLE_12P_22Sats... -> 264）、
+cell / UT 數（31Cell_220UT）與模擬時長（simEndTime - simStartTime）。
+模型以 log(執行秒數) 對 log(1 + 特徵) 做 ridge 迴歸；紀錄太少時只取 log 執行時間的平均與標準差。
+"""
+import json
+import math
+import re
+import threading
+import time
+import numpy as np
+from django.conf import settings
+
+# 少於此筆數時不做迴歸，只用整體分布
+MIN_REGRESSION_SAMPLES = 8
+# 少於此筆數時不調整逾時時間，沿用類型原本的上限
+MIN_TIMEOUT_SAMPLES = 5
+HISTORY_LIMIT = 200
+# 執行時間短於此秒數的紀錄（例如由快取完成的模擬）不列入
+MIN_SAMPLE_SECONDS = 1
+RIDGE_LAMBDA = 1.0
+# 殘差標準差的下限，避免紀錄幾乎相同時 p99 過於接近預測值
+MIN_LOG_SIGMA = 0.1
+P99_Z = 2.326
+TIMEOUT_MARGIN = 1.5
+MIN_TIMEOUT = 15 * 60
+MODEL_MAX_AGE = 600
+
+SATELLITES_PATTERN = re.compile(r'(\d+)P_(\d+)Sats', re.IGNORECASE)
+CELL_UT_PATTERN = re.compile(r'(\d+)\s*Cell(?:_(\d+)\s*UT)?', re.IGNORECASE)
+
+
+def _to_number(value):
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return None
+        return number if math.isfinite(number) else None
+    return None
+
+
+def extract_features(parameter, prefix=''):
+    """
+    將參數轉換為 {特徵名稱: 數值}。
+
+    巢狀參數以 "a.b" 命名；數值與數值字串直接使用，其他字串嘗試推導衛星數與 cell / UT 數。
+    """
+    features = {}
+    if isinstance(parameter, str):
+        try:
+            parameter = json.loads(parameter)
+        except json.JSONDecodeError:
+            return features
+    if not isinstance(parameter, dict):
+        return features
+    for key, value in parameter.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            features.update(extract_features(value, f"{name}."))
+            continue
+        if isinstance(value, list):
+            features[f"{name}.length"] = float(len(value))
+            continue
+        number = _to_number(value)
+        if number is not None:
+            features[name] = number
+            continue
+        if isinstance(value, str):
+            match = SATELLITES_PATTERN.search(value)
+            if match:
+                features[f"{name}.satellites"] = float(int(match.group(1)) * int(match.group(2)))
+            match = CELL_UT_PATTERN.search(value)
+            if match:
+                features[f"{name}.cells"] = float(match.group(1))
+                if match.group(2):
+                    features[f"{name}.uts"] = float(match.group(2))
+
+    if not prefix:
+        start, end = _to_number(parameter.get('simStartTime')), _to_number(parameter.get('simEndTime'))
+        if start is not None and end is not None:
+            features['sim_duration'] = end - start
+    return features
+
+
+def _transform(value):
+    return math.copysign(math.log1p(abs(value)), value)
+
+
+class RuntimeModel:
+    """單一模擬類型的執行時間模型。"""
+
+    def __init__(self, samples):
+        """
+        :param samples: [(特徵 dict, 執行秒數), ...]
+        """
+        self.sample_count = len(samples)
+        self.feature_names = []
+        self.coefficients = None
+        self.intercept = 0.0
+        self.sigma = MIN_LOG_SIGMA
+        if not samples:
+            return
+
+        y = np.array([math.log(seconds) for _, seconds in samples])
+        self.intercept = float(y.mean())
+        if len(samples) < MIN_REGRESSION_SAMPLES:
+            self.sigma = max(MIN_LOG_SIGMA, float(y.std()))
+            return
+
+        # 只使用在紀錄中有變化的特徵
+        names = sorted({name for features, _ in samples for name in features})
+        matrix = np.array([[_transform(features.get(name, 0.0)) for name in names] for features, _ in samples])
+        varying = matrix.std(axis=0) > 0
+        self.feature_names = [name for name, keep in zip(names, varying) if keep]
+        matrix = matrix[:, varying]
+        if not self.feature_names:
+            self.sigma = max(MIN_LOG_SIGMA, float(y.std()))
+            return
+
+        self._mean = matrix.mean(axis=0)
+        centered = matrix - self._mean
+        gram = centered.T @ centered + RIDGE_LAMBDA * np.eye(len(self.feature_names))
+        self.coefficients = np.linalg.solve(gram, centered.T @ (y - self.intercept))
+        residuals = y - self.intercept - centered @ self.coefficients
+        dof = max(1, len(samples) - len(self.feature_names) - 1)
+        self.sigma = max(MIN_LOG_SIGMA, float(math.sqrt((residuals ** 2).sum() / dof)))
+
+    def predict_log(self, features):
+        if self.coefficients is None:
+            return self.intercept
+        row = np.array([_transform(features.get(name, 0.0)) for name in self.feature_names])
+        return self.intercept + float((row - self._mean) @ self.coefficients)
+
+    def predict(self, features):
+        """:return: (預測執行秒數, p99 執行秒數)；沒有紀錄時回傳 (None, None)。"""
+        if not self.sample_count:
+            return None, None
+        mu = self.predict_log(features)
+        return math.exp(mu), math.exp(mu + P99_Z * self.sigma)
+
+
+def load_samples(sim_type):
+    """讀取該類型最近完成的 SimJob 執行時間與參數。"""
+    name = sim_type.name
+    rows = sim_type.sim_job_model.objects.filter(**{
+        f'{name}SimJob_end_time__isnull': False,
+        f'f_{name}_uid__{name}_status': 'completed',
+    }).order_by(f'-{name}SimJob_end_time').values_list(
+        f'{name}SimJob_start_time', f'{name}SimJob_end_time', f'f_{name}_uid__{name}_parameter'
+    )[:HISTORY_LIMIT]
+
+    samples = []
+    for start_time, end_time, parameter in rows:
+        seconds = (end_time - start_time).total_seconds()
+        if seconds >= MIN_SAMPLE_SECONDS:
+            samples.append((extract_features(parameter), seconds))
+    return samples
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_runtime_model(sim_type_name):
+    """取得（必要時重新建立）該類型的執行時間模型，每 MODEL_MAX_AGE 秒依最新紀錄重建一次。"""
+    from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+    with _models_lock:
+        cached = _models.get(sim_type_name)
+        if cached is not None and time.time() - cached[0] < MODEL_MAX_AGE:
+            return cached[1]
+    model = RuntimeModel(load_samples(get_sim_job_type(sim_type_name)))
+    with _models_lock:
+        _models[sim_type_name] = (time.time(), model)
+    return model
+
+
+def invalidate_runtime_models():
+    with _models_lock:
+        _models.clear()
+
+
+def predict_runtime(sim_type_name, parameter):
+    """預測執行秒數；沒有任何紀錄或預測失敗時回傳 None。"""
+    try:
+        expected, _ = get_runtime_model(sim_type_name).predict(extract_features(parameter))
+    except Exception as e:
+        print(f"Unable to predict runtime for {sim_type_name}: {str(e)}")
+        return None
+    return expected
+
+
+def adaptive_timeout(sim_type_name, parameter):
+    """
+    作業的逾時秒數：預測的 p99 執行時間乘上 TIMEOUT_MARGIN，介於 MIN_TIMEOUT 與類型原本的上限之間。
+    SIM_JOB_ADAPTIVE_TIMEOUT 關閉或紀錄不足時使用類型原本的上限。
+    """
+    from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+    max_timeout = get_sim_job_type(sim_type_name).timeout
+    if not getattr(settings, 'SIM_JOB_ADAPTIVE_TIMEOUT', True):
+        return max_timeout
+    try:
+        model = get_runtime_model(sim_type_name)
+        if model.sample_count < MIN_TIMEOUT_SAMPLES:
+            return max_timeout
+        _, p99 = model.predict(extract_features(parameter))
+    except Exception as e:
+        print(f"Unable to predict timeout for {sim_type_name}: {str(e)}")
+        return max_timeout
+    return int(min(max_timeout, max(MIN_TIMEOUT, p99 * TIMEOUT_MARGIN)))
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+參數掃描（sweep）：以一組基礎參數加上多個掃描軸展開成網格，
+一次建立所有掃描點的 meta 資料並交由模擬作業佇列排程，之後以單一 sweep uid 查詢整體進度與合併的結果表。
+"""
+import copy
+import itertools
+from collections import Counter
+from django.db import transaction
+from main.apps.simulation_data_mgt.models.SimSweepModel import SimSweep
+from main.apps.simulation_data_mgt.services.simJobExecutor import get_sim_job_executor
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.services.simMemoryEstimator import parameter_key
+
+# 單一 sweep 最多展開的掃描點數
+MAX_SWEEP_POINTS = 500
+FINISHED_STATUSES = ('completed', 'partial', 'simulation_failed', 'error', 'cancelled')
+# 已在執行或已完成的既有紀錄不重新排程
+SKIP_SCHEDULE_STATUSES = ('completed', 'queued', 'processing')
+
+
+def _set_parameter(parameter, path, value):
+    """以 "a.b.c" 形式的路徑設定巢狀參數。"""
+    keys = path.split('.')
+    for key in keys[:-1]:
+        child = parameter.get(key)
+        if not isinstance(child, dict):
+            child = parameter[key] = {}
+        parameter = child
+    parameter[keys[-1]] = value
+
+
+def expand_axes(base_parameter, axes):
+    """
+    展開掃描網格。
+
+    :param base_parameter: 基礎參數 dict，每個掃描點以它為起點。
+    :param axes: {"<參數名稱或 a.b 路徑>": [值, ...], ...}，依輸入順序做笛卡兒積。
+    :return: [(掃描軸的值 dict, 完整參數 dict), ...]
+    """
+    if not isinstance(base_parameter, dict):
+        raise ValueError("base_parameter must be a JSON object")
+    if not isinstance(axes, dict) or not axes:
+        raise ValueError("axes must be a non-empty JSON object")
+    for name, values in axes.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Axis {name} must be a non-empty list")
+
+    point_count = 1
+    for values in axes.values():
+        point_count *= len(values)
+    if point_count > MAX_SWEEP_POINTS:
+        raise ValueError(f"Sweep has {point_count} points, exceeding the limit of {MAX_SWEEP_POINTS}")
+
+    names = list(axes.keys())
+    points = []
+    for combination in itertools.product(*(axes[name] for name in names)):
+        values = dict(zip(names, combination))
+        parameter = copy.deepcopy(base_parameter)
+        for name, value in values.items():
+            _set_parameter(parameter, name, value)
+        points.append((values, parameter))
+    return points
+
+
+def _point_name(sweep_name, values):
+    label = ', '.join(f"{name}={value}" for name, value in values.items())
+    return f"{sweep_name} [{label}]"[:255]
+
+
+def create_sweep(sim_type_name, sweep_name, base_parameter, axes, user_uid, executor=None):
+    """
+    建立 sweep：以 bulk insert 建立所有掃描點的 meta 資料，並一次加入模擬作業佇列。
+    與使用者既有紀錄參數相同的掃描點直接沿用該紀錄，不重複建立。
+
+    :return: SimSweep。
+    """
+    sim_type = get_sim_job_type(sim_type_name)
+    name = sim_type.name
+    points = expand_axes(base_parameter, axes)
+
+    existing = {
+        parameter_key(parameter): (target_uid, status)
+        for target_uid, parameter, status in sim_type.model.objects.filter(f_user_uid_id=user_uid).values_list(
+            f'{name}_uid', f'{name}_parameter', f'{name}_status')
+    }
+
+    new_objs = []
+    rescheduled = []
+    schedule = []
+    sweep_points = []
+    with transaction.atomic():
+        for values, parameter in points:
+            key = parameter_key(parameter)
+            if key in existing:
+                target_uid, status = existing[key]
+                if status not in SKIP_SCHEDULE_STATUSES:
+                    rescheduled.append(target_uid)
+                    schedule.append((target_uid, user_uid, parameter))
+                    existing[key] = (target_uid, "queued")
+            else:
+                obj = sim_type.model(**{
+                    f'{name}_name': _point_name(sweep_name, values),
+                    f'{name}_parameter': parameter,
+                    f'{name}_status': "queued",
+                    'f_user_uid_id': user_uid,
+                })
+                target_uid = sim_type.get_field(obj, 'uid')
+                # bulk_create 不會呼叫 model 的 save，data_path 依相同規則在這裡產生
+                sim_type.set_field(obj, 'data_path', f"{name}/{user_uid}/{target_uid}")
+                new_objs.append(obj)
+                schedule.append((target_uid, user_uid, parameter))
+                existing[key] = (target_uid, "queued")
+            sweep_points.append({'target_uid': str(target_uid), 'values': values})
+
+        sim_type.model.objects.bulk_create(new_objs)
+        if rescheduled:
+            sim_type.model.objects.filter(**{f'{name}_uid__in': rescheduled}).update(**{f'{name}_status': "queued"})
+
+        sweep = SimSweep.objects.create(
+            simSweep_name=sweep_name,
+            simSweep_sim_type=name,
+            simSweep_base_parameter=base_parameter,
+            simSweep_axes=axes,
+            simSweep_points=sweep_points,
+            f_user_uid_id=user_uid
+        )
+
+    (executor or get_sim_job_executor()).submit_many(name, schedule)
+    return sweep
+
+
+def _flatten_result(result, prefix=''):
+    """將分析結果攤平成 {"a.b": 純量} 的欄位，清單等非純量值不放進結果表。"""
+    columns = {}
+    if not isinstance(result, dict):
+        return columns
+    for key, value in result.items():
+        column = f"{prefix}{key}"
+        if isinstance(value, dict):
+            columns.update(_flatten_result(value, f"{column}."))
+        elif value is None or isinstance(value, (str, int, float, bool)):
+            columns[column] = value
+    return columns
+
+
+def sweep_progress(sweep):
+    """
+    回傳 sweep 的整體進度與合併的結果表：每個掃描點一列，欄位為掃描軸、狀態與攤平後的分析結果。
+    """
+    sim_type = get_sim_job_type(sweep.simSweep_sim_type)
+    name = sim_type.name
+    target_uids = [point['target_uid'] for point in sweep.simSweep_points]
+    objs = {
+        str(sim_type.get_field(obj, 'uid')): obj
+        for obj in sim_type.model.objects.filter(**{f'{name}_uid__in': target_uids})
+    }
+
+    axis_columns = list(sweep.simSweep_axes.keys())
+    result_columns = []
+    rows = []
+    status_counts = Counter()
+    for point in sweep.simSweep_points:
+        obj = objs.get(point['target_uid'])
+        status = sim_type.get_field(obj, 'status') if obj is not None else 'deleted'
+        status_counts[status] += 1
+        row = dict(point['values'], target_uid=point['target_uid'], status=status)
+        result = _flatten_result(sim_type.get_field(obj, 'simulation_result')) if obj is not None else {}
+        for column, value in result.items():
+            if column in row:
+                continue
+            if column not in result_columns:
+                result_columns.append(column)
+            row[column] = value
+        rows.append(row)
+
+    total = len(rows)
+    finished = sum(count for status, count in status_counts.items() if status in FINISHED_STATUSES + ('deleted',))
+    if finished < total:
+        sweep_status = 'running'
+    elif status_counts.get('completed', 0) == total:
+        sweep_status = 'completed'
+    else:
+        sweep_status = 'completed_with_errors'
+
+    return {
+        'sweep_uid': str(sweep.simSweep_uid),
+        'sweep_name': sweep.simSweep_name,
+        'sim_type': name,
+        'sweep_status': sweep_status,
+        'total': total,
+        'completed_count': status_counts.get('completed', 0),
+        'finished_count': finished,
+        'progress': round(finished / total, 4) if total else 1.0,
+        'status_counts': dict(status_counts),
+        'columns': axis_columns + ['target_uid', 'status'] + result_columns,
+        'results': rows,
+        'create_time': sweep.simSweep_create_time.strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+暖容器池：預先為 handoverimage、routingimage 等模擬器映像檔啟動閒置容器，
+作業以 `docker exec` 在閒置容器中執行模擬腳本，省下每次 `docker run` 建立與啟動容器的時間。
+
+每個池中的容器只掛載自己的暫存目錄（simulation_result/.warm_pool/<容器名稱>），看不到其他作業的
+結果與結果快取。作業執行前把結果目錄搬到暫存目錄的 job 子目錄，原位置改為指向它的符號連結，
+執行期間讀取結果目錄的程式不受影響；作業結束後再搬回原位。同一個容器可以依序服務不同作業，
+但同一時間只借給一個作業使用。
+"""
+import os
+import posixpath
+import re
+import shlex
+import shutil
+import threading
+import time
+import uuid
+from collections import defaultdict
+from django.conf import settings
+from main.apps.simulation_data_mgt.services.dockerEngineClient import get_docker_client
+from main.apps.simulation_data_mgt.services.simJobExecutor import WORKER_ID
+from main.apps.simulation_data_mgt.services.simJobTypes import CONTAINER_OUTPUT_DIR
+
+POOL_CONTAINER_PREFIX = 'simPool_'
+RESULT_ROOT = 'simulation_result'
+SCRATCH_ROOT = os.path.join(RESULT_ROOT, '.warm_pool')
+CONTAINER_RESULT_ROOT = '/root/mercury/simulation_result'
+# 暫存目錄中作業結果的子目錄
+JOB_DIR_NAME = 'job'
+MAINTAIN_INTERVAL = 30
+
+# simPool_<hostname>-<pid>_<token>_<image>
+POOL_CONTAINER_PATTERN = re.compile(
+    rf'^/?{POOL_CONTAINER_PREFIX}(?P<host>.+?)-(?P<pid>\d+)_(?P<token>[0-9a-f]{{8}})_(?P<image>.+)$'
+)
+
+
+def parse_pool_container_name(container_name):
+    """
+    解析暖容器名稱。
+
+    :return: 建立該容器的行程識別 "<hostname>:<pid>"；若不是暖容器則回傳 None。
+    """
+    match = POOL_CONTAINER_PATTERN.match(container_name)
+    if not match:
+        return None
+    return f"{match.group('host')}:{match.group('pid')}"
+
+
+def pool_result_dir_supported(result_dir):
+    """
+    結果目錄是否可以在暖容器中執行：需在 simulation_result 底下（與暫存目錄在同一個檔案系統，
+    搬移只需 rename），且不在暫存目錄中。
+    """
+    relative = os.path.relpath(os.path.abspath(result_dir), os.path.abspath(RESULT_ROOT))
+    if relative == '.' or relative.startswith('..'):
+        return False
+    return relative.split(os.sep)[0] != os.path.basename(SCRATCH_ROOT)
+
+
+def scratch_dir(container_name):
+    """暖容器在主機上的暫存目錄，掛載到容器內的 CONTAINER_RESULT_ROOT。"""
+    return os.path.join(SCRATCH_ROOT, container_name)
+
+
+def settle_result_dir(result_dir):
+    """
+    作業結束後把結果從暖容器的暫存目錄搬回結果目錄，取代執行期間的符號連結。
+    結果目錄不是指向暫存目錄的符號連結時不做任何事，可以重複呼叫。
+    """
+    if not os.path.islink(result_dir):
+        return
+    job_dir = os.path.realpath(result_dir)
+    if os.path.commonpath([job_dir, os.path.realpath(SCRATCH_ROOT)]) != os.path.realpath(SCRATCH_ROOT):
+        return
+    os.unlink(result_dir)
+    if os.path.isdir(job_dir):
+        os.rename(job_dir, result_dir)
+
+
+def remove_scratch_dir(container_name):
+    """刪除已移除的暖容器的暫存目錄；仍有未搬回的作業結果時保留，由下一次執行該作業時搬回。"""
+    path = scratch_dir(container_name)
+    if os.path.exists(os.path.join(path, JOB_DIR_NAME)):
+        print(f"Warm container pool: keeping {path}, it still holds job results")
+        return
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def list_pool_containers():
+    return get_docker_client().list_containers(name=POOL_CONTAINER_PREFIX)
+
+
+class WarmContainerPool:
+    """
+    每個映像檔最多維持 size 個暖容器（閒置與使用中合計）。
+
+    映像檔超過 idle_timeout 秒沒有作業使用時，移除它的閒置容器；之後再有作業使用時重新補滿。
+    沒有閒置容器時 acquire 回傳 None，呼叫端改以一般 `docker run` 執行。
+    """
+
+    def __init__(self, size, idle_timeout=600, images=(), client=None, owner=WORKER_ID):
+        self.size = max(0, int(size))
+        self.idle_timeout = idle_timeout
+        self.images = [image for image in images if image]
+        self.client = client
+        host, _, pid = owner.rpartition(':')
+        self._owner_tag = f"{re.sub(r'[^a-zA-Z0-9.-]', '-', host)}-{pid}"
+        self._lock = threading.Lock()
+        self._maintain_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = defaultdict(list)  # 映像檔 -> 閒置容器名稱
+        self._busy = {}  # 使用中的容器名稱 -> 映像檔
+        self._last_used = {}  # 映像檔 -> 最後使用時間
+        self._thread = None
+        self._stopped = False
+
+    @property
+    def enabled(self):
+        return self.size > 0
+
+    def _client(self):
+        return self.client or get_docker_client()
+
+    def start(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            for image in self.images:
+                self._last_used.setdefault(image, time.time())
+            self._thread = threading.Thread(target=self._maintain_loop, name="warmContainerPool", daemon=True)
+            self._thread.start()
+
+    def shutdown(self, timeout=30):
+        """停止補充容器並移除所有閒置容器；使用中的容器在歸還時移除。"""
+        with self._lock:
+            self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        with self._lock:
+            idle = [name for names in self._idle.values() for name in names]
+            self._idle.clear()
+        for container_name in idle:
+            self._remove(container_name)
+
+    def acquire(self, image):
+        """借出一個閒置的暖容器；沒有可用容器時回傳 None。"""
+        if not self.enabled:
+            return None
+        self.start()
+        with self._lock:
+            self._last_used[image] = time.time()
+        try:
+            while True:
+                with self._lock:
+                    if self._stopped or not self._idle[image]:
+                        return None
+                    container_name = self._idle[image].pop()
+                    self._busy[container_name] = image
+                try:
+                    info = self._client().inspect_container(container_name)
+                except Exception as e:
+                    print(f"Warm container pool error: {str(e)}")
+                    info = None
+                if info is not None and info['State']['Running']:
+                    return container_name
+                self.release(container_name, reusable=False)
+        finally:
+            # 借出後池中的容器變少，請背景執行緒補充
+            self._wakeup.set()
+
+    def release(self, container_name, reusable=True):
+        """
+        歸還暖容器。不可重用（例如曾發生 OOM、作業被終止）、池已停止、
+        或容器不是由這個池借出（例如由其他行程接手的作業）時直接移除容器。
+        """
+        with self._lock:
+            if any(container_name in names for names in self._idle.values()):
+                return  # 已經歸還過
+            image = self._busy.pop(container_name, None)
+            if image is not None and reusable and not self._stopped:
+                self._idle[image].append(container_name)
+                return
+        self._remove(container_name)
+        self._wakeup.set()
+
+    def run(self, container_name, script_command, result_dir, memory_limit, output_dir=CONTAINER_OUTPUT_DIR):
+        """
+        在暖容器中執行模擬腳本：結果目錄（含續跑時已完成的 cell）搬到容器的暫存目錄，原位置改為符號連結，
+        容器內的輸出目錄 output_dir 連結到暫存目錄中的結果。作業結束後由 settle_result_dir 搬回原位。
+
+        :return: exec id。
+        """
+        if not pool_result_dir_supported(result_dir):
+            raise ValueError(f"Result directory {result_dir} is not under {RESULT_ROOT}")
+        client = self._client()
+        if memory_limit:
+            client.update_container(container_name, memory_limit)
+
+        job_dir = os.path.join(scratch_dir(container_name), JOB_DIR_NAME)
+        settle_result_dir(result_dir)
+        shutil.rmtree(job_dir, ignore_errors=True)
+        os.makedirs(os.path.dirname(job_dir), exist_ok=True)
+        if os.path.isdir(result_dir):
+            os.rename(result_dir, job_dir)
+        else:
+            os.makedirs(job_dir)
+            os.makedirs(os.path.dirname(os.path.abspath(result_dir)), exist_ok=True)
+        os.symlink(os.path.abspath(job_dir), result_dir)
+
+        container_job_dir = posixpath.join(CONTAINER_RESULT_ROOT, JOB_DIR_NAME)
+        command = (
+            f"rm -rf {shlex.quote(output_dir)} && "
+            f"ln -s {shlex.quote(container_job_dir)} {shlex.quote(output_dir)} && {script_command}"
+        )
+        try:
+            return client.exec_container(container_name, ['bash', '-c', command])
+        except Exception:
+            settle_result_dir(result_dir)
+            raise
+
+    def status(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle_timeout': self.idle_timeout,
+                'idle': {image: len(names) for image, names in self._idle.items() if names},
+                'busy': len(self._busy),
+            }
+
+    def maintain(self):
+        """移除閒置過久映像檔的容器，並把最近使用的映像檔補滿到 size 個容器。"""
+        with self._maintain_lock:
+            self._maintain()
+
+    def _maintain(self):
+        now = time.time()
+        to_remove = []
+        to_create = []
+        with self._lock:
+            if self._stopped:
+                return
+            for image, last_used in list(self._last_used.items()):
+                if now - last_used > self.idle_timeout:
+                    to_remove.extend(self._idle.pop(image, []))
+                    del self._last_used[image]
+                    continue
+                busy = sum(1 for busy_image in self._busy.values() if busy_image == image)
+                to_create.extend([image] * max(0, self.size - busy - len(self._idle[image])))
+
+        for container_name in to_remove:
+            print(f"Warm container pool: evicting idle container {container_name}")
+            self._remove(container_name)
+        for image in to_create:
+            container_name = self._create(image)
+            if container_name is None:
+                continue
+            with self._lock:
+                keep = not self._stopped and image in self._last_used
+                if keep:
+                    self._idle[image].append(container_name)
+            if not keep:
+                self._remove(container_name)
+
+    def _create(self, image):
+        image_tag = re.sub(r'[^a-zA-Z0-9_.-]', '-', image)
+        container_name = f"{POOL_CONTAINER_PREFIX}{self._owner_tag}_{uuid.uuid4().hex[:8]}_{image_tag}"
+        try:
+            # 只掛載這個容器自己的暫存目錄，作業無法改寫其他作業的結果或結果快取的檔案
+            os.makedirs(scratch_dir(container_name), exist_ok=True)
+            self._client().run_container(
+                container_name, image, ['bash', '-c', 'sleep infinity'],
+                binds=[f'{os.path.abspath(scratch_dir(container_name))}:{CONTAINER_RESULT_ROOT}'],
+                oom_kill_disable=False,  # 記憶體上限在每個作業開始時依估計值調整，超過時由 OOM 流程重新排隊
+                auto_remove=True
+            )
+        except Exception as e:
+            print(f"Warm container pool: unable to start container for {image}: {str(e)}")
+            remove_scratch_dir(container_name)
+            return None
+        return container_name
+
+    def _remove(self, container_name):
+        try:
+            self._client().remove_container(container_name, force=True)
+        except Exception as e:
+            print(f"Warm container pool: unable to remove container {container_name}: {str(e)}")
+            return
+        remove_scratch_dir(container_name)
+
+    def _maintain_loop(self):
+        while not self._stopped:
+            try:
+                self.maintain()
+            except Exception as e:
+                print(f"Warm container pool error: {str(e)}")
+            self._wakeup.wait(MAINTAIN_INTERVAL)
+            self._wakeup.clear()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_warm_container_pool():
+    """取得整個行程共用的暖容器池；SIM_JOB_WARM_POOL_SIZE 為 0 時池不啟用。"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmContainerPool(
+                getattr(settings, 'SIM_JOB_WARM_POOL_SIZE', 0),
+                idle_timeout=getattr(settings, 'SIM_JOB_WARM_POOL_IDLE_TIMEOUT', 600),
+                images=getattr(settings, 'SIM_JOB_WARM_POOL_IMAGES', [])
+            )
+        return _pool
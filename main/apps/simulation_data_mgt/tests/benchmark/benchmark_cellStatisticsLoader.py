@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+比較 handover / gso 分析讀取 statistics.csv 的速度：原本依序讀取所有欄位的方式，
+與 cellStatisticsLoader（先驗證標頭、usecols 與指定型別、平行讀取），
+以及逐檔累計、不保留 DataFrame 的 aggregate_cell_statistics；同時以 tracemalloc 量測各方式的記憶體峰值。
+最後轉存欄式副本（simResultSidecar），比較從副本讀取的時間與副本、原始 CSV 的大小。
+
+以合成的結果目錄執行（每個 cell 的 statistics.csv 含分析用的欄位與其他不需要的欄位）：
+
+    python -m main.apps.simulation_data_mgt.tests.benchmark.benchmark_cellStatisticsLoader --cells 300 --rows 20
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import django
+import numpy as np
+import pandas as pd
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import COLUMNS_TO_ANALYZE
+from main.apps.simulation_data_mgt.services.cellStatisticsLoader import (
+    DEFAULT_WORKERS, SITUATIONS, aggregate_cell_statistics, load_cell_statistics
+)
+from main.apps.simulation_data_mgt.services.simResultSidecar import SIDECAR_FILE, build_result_sidecar
+
+
+def write_synthetic_tree(result_dir, cells, rows, extra_columns, seed=0):
+    """寫出 ideal / actual 各 cells 個 cell 的 statistics.csv，欄位順序打亂並混入 extra_columns 個不需要的欄位。"""
+    rng = np.random.default_rng(seed)
+    columns = list(COLUMNS_TO_ANALYZE) + [f'extra_metric_{index}' for index in range(extra_columns)]
+    rng.shuffle(columns)
+    for situation in SITUATIONS:
+        for cell in range(cells):
+            cell_dir = os.path.join(result_dir, situation, 'cell_analysis', f'cell_{cell}')
+            os.makedirs(cell_dir, exist_ok=True)
+            df = pd.DataFrame(rng.random((rows, len(columns))) * 1000, columns=columns)
+            df.insert(0, 'ut_id', [f'ut_{cell}_{row}' for row in range(rows)])
+            df.to_csv(os.path.join(cell_dir, 'statistics.csv'), index=False)
+
+
+def load_serial_full(simulation_result_dir, columns):
+    """原本分析函式的讀取方式：依序讀取每個檔案的所有欄位後再挑出需要的欄位。"""
+    data = {}
+    for situation in SITUATIONS:
+        cell_analysis_path = os.path.join(simulation_result_dir, situation, 'cell_analysis')
+        data[situation] = []
+        for cell_folder in os.listdir(cell_analysis_path):
+            cell_path = os.path.join(cell_analysis_path, cell_folder, 'statistics.csv')
+            if os.path.exists(cell_path):
+                df = pd.read_csv(cell_path)
+                if all(col in df.columns for col in columns):
+                    data[situation].append(df[columns])
+    return data
+
+
+def means_of(data):
+    """{情境: DataFrame 清單} 或 {情境: CellStatisticsAggregate} 的各欄位平均。"""
+    return {
+        situation: value.mean() if hasattr(value, 'cell_count') else pd.concat(value).mean()
+        for situation, value in data.items()
+    }
+
+
+def peak_memory(load):
+    """執行一次 load，回傳執行期間 Python 配置的記憶體峰值（bytes）。"""
+    tracemalloc.start()
+    try:
+        means_of(load())
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(load, repeat):
+    best = None
+    data = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, data
+
+
+def run_benchmark(cells, rows, extra_columns, workers, repeat):
+    result_dir = tempfile.mkdtemp(prefix='cell-loader-benchmark-')
+    try:
+        write_synthetic_tree(result_dir, cells, rows, extra_columns)
+        columns = list(COLUMNS_TO_ANALYZE)
+        cases = [
+            ('serial, all columns (previous)', lambda: load_serial_full(result_dir, columns)),
+            ('serial, usecols + dtype', lambda: load_cell_statistics(result_dir, columns, max_workers=1)),
+            (f'{workers} threads, usecols + dtype', lambda: load_cell_statistics(result_dir, columns, max_workers=workers)),
+            ('serial, streaming aggregate', lambda: aggregate_cell_statistics(result_dir, columns, max_workers=1)),
+            (f'{workers} threads, streaming aggregate',
+             lambda: aggregate_cell_statistics(result_dir, columns, max_workers=workers)),
+            ('sidecar, streaming aggregate', lambda: aggregate_cell_statistics(result_dir, columns)),
+        ]
+        results = []
+        expected = None
+        sizes = {}
+        for name, load in cases:
+            if name.startswith('sidecar'):
+                sizes['csv'] = sum(
+                    os.path.getsize(os.path.join(root, f))
+                    for root, _, files in os.walk(result_dir) for f in files if f.endswith('.csv')
+                )
+                start = time.perf_counter()
+                build_result_sidecar(result_dir)
+                sizes['build'] = time.perf_counter() - start
+                sizes['sidecar'] = os.path.getsize(os.path.join(result_dir, SIDECAR_FILE))
+            elapsed, data = measure(load, repeat)
+            means = means_of(data)
+            if expected is None:
+                expected = means
+            else:
+                for situation in SITUATIONS:
+                    np.testing.assert_allclose(means[situation].to_numpy(), expected[situation].to_numpy())
+            results.append((name, elapsed, peak_memory(load)))
+        return results, sizes
+    finally:
+        shutil.rmtree(result_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-cell statistics.csv loading")
+    parser.add_argument('--cells', type=int, default=300, help="每個情境的 cell 數")
+    parser.add_argument('--rows', type=int, default=20, help="每個 statistics.csv 的列數")
+    parser.add_argument('--extra-columns', type=int, default=60, help="分析不需要的欄位數")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--repeat', type=int, default=3, help="每種方式執行的次數，取最短時間")
+    args = parser.parse_args()
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings.local')
+    django.setup()
+
+    results, sizes = run_benchmark(args.cells, args.rows, args.extra_columns, args.workers, args.repeat)
+    baseline = results[0][1]
+    print(f"{2 * args.cells} files, {args.rows} rows, {len(COLUMNS_TO_ANALYZE)} of "
+          f"{len(COLUMNS_TO_ANALYZE) + args.extra_columns + 1} columns used")
+    for name, elapsed, peak in results:
+        print(f"{name:<36} {elapsed:8.3f}s  {baseline / elapsed:5.2f}x  peak {peak / 1024 ** 2:7.1f} MiB")
+    print(f"sidecar build {sizes['build']:.3f}s, CSV {sizes['csv'] / 1024 ** 2:.1f} MiB, "
+          f"sidecar {sizes['sidecar'] / 1024 ** 2:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
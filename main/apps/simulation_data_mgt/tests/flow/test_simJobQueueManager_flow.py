@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import requests
+import json
+import random
+
+DJANGO_SERVER = "127.0.0.1"
+API_VERSION   = "1.0"
+
+def print_response(step_name, response):
+    """輔助函式：方便打印每個步驟的回應內容"""
+    print(f"\n=== {step_name} ===")
+    print("Status Code:", response.status_code)
+    try:
+        print("Response JSON:", response.json())
+    except json.decoder.JSONDecodeError:
+        print("Response is not JSON or is binary data.")
+    print("=" * 30)
+
+def main():
+    # ---------------------------------------------------------------------
+    # Flow 測試：（6步）
+    #   1) meta_data_mgt.userManager.create_user
+    #   2) meta_data_mgt.coverageManager.create_coverage（建立多筆不同參數）
+    #   3) simulation_data_mgt.coverageSimJobManager.run_coverage_sim_job（連續送出）
+    #   4) simulation_data_mgt.simJobQueueManager.query_sim_job_queue_status
+    #   5) simulation_data_mgt.simJobQueueManager.query_sim_job_progress
+    #   6) meta_data_mgt.userManager.delete_user
+    # ---------------------------------------------------------------------
+
+    # 1) 建立使用者 (create_user)
+    create_user_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/meta_data_mgt/userManager/create_user"
+    user_payload = {
+        "user_name": f"test{random.randint(1000,9999)}",
+        "user_password": f"password{random.randint(1000,9999)}",
+        "user_email": f"test{random.randint(1000,9999)}@example.com"
+    }
+    resp_create_user = requests.post(create_user_url, json=user_payload)
+    print_response("1) Create User", resp_create_user)
+
+    user_uid = resp_create_user.json().get("data", {}).get("user_uid") if resp_create_user.status_code == 200 else None
+    if not user_uid:
+        print("無法取得 user_uid，後續流程無法執行。")
+        return
+
+    # 2) 建立多筆 coverage (create_coverage)
+    create_coverage_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/meta_data_mgt/coverageManager/create_coverage"
+    coverage_uids = []
+    for min_latitude in ["-60", "-50", "-40"]:
+        coverage_payload = {
+            "coverage_name": f"Queue Coverage {min_latitude}",
+            "coverage_parameter": {
+                "TLE_inputFileName": "TLE_12P_22Sats_29deg_F7.txt",
+                "minLatitude": min_latitude,
+                "maxLatitude": "60",
+                "leastSatCount": "3",
+                "simStartTime": "0",
+                "simEndTime": "600"
+            },
+            "f_user_uid": user_uid
+        }
+        resp_create_coverage = requests.post(create_coverage_url, json=coverage_payload)
+        print_response(f"2) Create Coverage {min_latitude}", resp_create_coverage)
+        if resp_create_coverage.status_code == 200:
+            coverage_uids.append(resp_create_coverage.json()["data"]["coverage_uid"])
+
+    # 3) 連續送出模擬作業，超過上限的作業應回傳 queue_position
+    run_coverage_sim_job_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/simulation_data_mgt/coverageSimJobManager/run_coverage_sim_job"
+    for coverage_uid in coverage_uids:
+        resp_run_coverage = requests.post(run_coverage_sim_job_url, json={"coverage_uid": coverage_uid})
+        print_response(f"3) Run Coverage Sim Job {coverage_uid}", resp_run_coverage)
+
+    # 4) 查詢佇列狀態 (query_sim_job_queue_status)
+    query_queue_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/simulation_data_mgt/simJobQueueManager/query_sim_job_queue_status"
+    resp_queue = requests.post(query_queue_url, json={})
+    print_response("4) Query Sim Job Queue Status", resp_queue)
+
+    # 5) 一次查詢所有 coverage 的進度與預估完成時間 (query_sim_job_progress)
+    query_progress_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/simulation_data_mgt/simJobQueueManager/query_sim_job_progress"
+    resp_progress = requests.post(query_progress_url, json={"sim_type": "coverage", "target_uids": coverage_uids})
+    print_response("5) Query Sim Job Progress", resp_progress)
+
+    # 6) 刪除使用者 (delete_user)
+    # delete_user_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/meta_data_mgt/userManager/delete_user"
+    # resp_delete_user = requests.post(delete_user_url, json={"user_uid": user_uid})
+    # print_response("6) Delete User", resp_delete_user)
+
+if __name__ == "__main__":
+    main()
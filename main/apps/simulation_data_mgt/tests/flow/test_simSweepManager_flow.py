@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import requests
+import json
+import random
+
+DJANGO_SERVER = "127.0.0.1"
+API_VERSION   = "1.0"
+
+def print_response(step_name, response):
+    """輔助函式：方便打印每個步驟的回應內容"""
+    print(f"\n=== {step_name} ===")
+    print("Status Code:", response.status_code)
+    try:
+        print("Response JSON:", response.json())
+    except json.decoder.JSONDecodeError:
+        print("Response is not JSON or is binary data.")
+    print("=" * 30)
+
+def main():
+    # ---------------------------------------------------------------------
+    # Flow 測試：（4步）
+    #   1) meta_data_mgt.userManager.create_user
+    #   2) simulation_data_mgt.simSweepManager.create_sim_sweep（beams_per_satellite x frequencies_per_satellite）
+    #   3) simulation_data_mgt.simSweepManager.query_sim_sweep
+    #   4) meta_data_mgt.userManager.delete_user
+    # ---------------------------------------------------------------------
+
+    # 1) 建立使用者 (create_user)
+    create_user_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/meta_data_mgt/userManager/create_user"
+    user_payload = {
+        "user_name": f"test{random.randint(1000,9999)}",
+        "user_password": f"password{random.randint(1000,9999)}",
+        "user_email": f"test{random.randint(1000,9999)}@example.com"
+    }
+    resp_create_user = requests.post(create_user_url, json=user_payload)
+    print_response("1) Create User", resp_create_user)
+
+    user_uid = resp_create_user.json().get("data", {}).get("user_uid") if resp_create_user.status_code == 200 else None
+    if not user_uid:
+        print("無法取得 user_uid，後續流程無法執行。")
+        return
+
+    # 2) 建立 sweep (create_sim_sweep)
+    create_sweep_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/simulation_data_mgt/simSweepManager/create_sim_sweep"
+    sweep_payload = {
+        "sim_type": "handover",
+        "sweep_name": "Handover Beam Sweep",
+        "base_parameter": {
+            "constellation": "TLE_6P_22Sats_29deg_F1",
+            "handover_strategy": "MinRange",
+            "cell_ut": "10"
+        },
+        "axes": {
+            "beams_per_satellite": ["1", "2", "4"],
+            "frequencies_per_satellite": ["1", "2"]
+        },
+        "f_user_uid": user_uid
+    }
+    resp_create_sweep = requests.post(create_sweep_url, json=sweep_payload)
+    print_response("2) Create Sim Sweep", resp_create_sweep)
+
+    sweep_uid = resp_create_sweep.json().get("data", {}).get("sweep_uid") if resp_create_sweep.status_code == 200 else None
+    if not sweep_uid:
+        print("無法取得 sweep_uid，後續流程無法執行。")
+        return
+
+    # 3) 查詢 sweep 進度與結果表 (query_sim_sweep)
+    query_sweep_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/simulation_data_mgt/simSweepManager/query_sim_sweep"
+    resp_query_sweep = requests.post(query_sweep_url, json={"sweep_uid": sweep_uid})
+    print_response("3) Query Sim Sweep", resp_query_sweep)
+
+    # 4) 刪除使用者 (delete_user)
+    # delete_user_url = f"http://{DJANGO_SERVER}:8000/api/{API_VERSION}/meta_data_mgt/userManager/delete_user"
+    # resp_delete_user = requests.post(delete_user_url, json={"user_uid": user_uid})
+    # print_response("4) Delete User", resp_delete_user)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+測試用的逐 cell 結果：在結果目錄寫出 <situation>/cell_analysis/<cell>/statistics.csv，
+格式與 handover、gso 模擬輸出的相同。
+"""
+import os
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import COLUMNS_TO_ANALYZE
+
+
+def write_cell(result_dir, situation, cell, rows, columns=COLUMNS_TO_ANALYZE, extra_columns=False):
+    """
+    寫出一個 cell 的 statistics.csv，每個 UT 一列，該列所有欄位都是同一個數值（'' 表示缺值）。
+
+    :param rows: 每個 UT 的數值。
+    :param extra_columns: 為 True 時欄位反序排列並多一個文字欄位，用來確認只讀取需要的欄位。
+    :return: 檔案路徑。
+    """
+    columns = list(reversed(columns)) if extra_columns else list(columns)
+    cell_dir = os.path.join(result_dir, situation, 'cell_analysis', cell)
+    os.makedirs(cell_dir, exist_ok=True)
+    path = os.path.join(cell_dir, 'statistics.csv')
+    with open(path, 'w') as f:
+        f.write(','.join(['ut_id'] + columns + (['note'] if extra_columns else [])) + '\n')
+        for index, row in enumerate(rows):
+            f.write(','.join([f'ut_{index}'] + [str(row)] * len(columns) + (['text'] if extra_columns else [])) + '\n')
+    return path
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+測試用的假 Docker Engine：在暫存的 unix socket 上提供 DockerEngineClient 用到的 API，
+容器只存在記憶體中，可以模擬容器結束（die / oom 事件）。
+"""
+import json
+import os
+import queue
+import socketserver
+import tempfile
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+class FakeDockerEngineHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.engine.lock:
+            self.server.engine.connection_count += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def address_string(self):
+        return 'fake-docker'
+
+    def _send_json(self, status, content=None):
+        body = json.dumps(content).encode() if content is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _route(self, method):
+        engine = self.server.engine
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        with engine.lock:
+            engine.requests.append((method, url.path))
+
+        if method == 'GET' and parts == ['_ping']:
+            return self._send_json(200, 'OK')
+        if method == 'GET' and parts == ['info']:
+            return self._send_json(200, {'MemTotal': engine.mem_total, 'NCPU': engine.ncpu})
+        if method == 'GET' and len(parts) == 3 and parts[0] == 'images' and parts[2] == 'json':
+            with engine.lock:
+                image_id = engine.images.get(parts[1])
+            if image_id is None:
+                return self._send_json(404, {'message': f'No such image: {parts[1]}'})
+            return self._send_json(200, {'Id': image_id, 'RepoTags': [parts[1]]})
+        if len(parts) >= 3 and parts[0] == 'exec':
+            with engine.lock:
+                exec_info = engine.execs.get(parts[1])
+                if exec_info is None:
+                    return self._send_json(404, {'message': f'No such exec instance: {parts[1]}'})
+                if method == 'POST' and parts[2] == 'start':
+                    self._read_json()
+                    engine.next_pid += 1
+                    exec_info.update(Running=True, Pid=engine.next_pid)
+                    return self._send_json(200)
+                if method == 'GET' and parts[2] == 'json':
+                    return self._send_json(200, exec_info)
+        if method == 'GET' and parts == ['events']:
+            return self._stream_events()
+        if method == 'POST' and parts == ['containers', 'create']:
+            body = self._read_json()
+            name = params.get('name')
+            with engine.lock:
+                if name in engine.containers:
+                    return self._send_json(409, {'message': f'Conflict. The container name "/{name}" is already in use'})
+                engine.containers[name] = {
+                    'Id': uuid.uuid4().hex,
+                    'Name': f'/{name}',
+                    'Config': {'Image': body['Image'], 'Cmd': body['Cmd']},
+                    'HostConfig': body.get('HostConfig', {}),
+                    'State': {'Running': False, 'Pid': 0, 'OOMKilled': False, 'ExitCode': 0},
+                }
+                return self._send_json(201, {'Id': engine.containers[name]['Id'], 'Warnings': []})
+        if len(parts) >= 2 and parts[0] == 'containers':
+            if parts[1] == 'json' and method == 'GET':
+                name_filter = json.loads(params.get('filters', '{}')).get('name', [''])[0]
+                with engine.lock:
+                    listed = [
+                        {'Id': container['Id'], 'Names': [container['Name']]}
+                        for name, container in engine.containers.items()
+                        if container['State']['Running'] and name_filter in name
+                    ]
+                return self._send_json(200, listed)
+            name = engine.resolve(parts[1])
+            if name is None:
+                return self._send_json(404, {'message': f'No such container: {parts[1]}'})
+            action = parts[2] if len(parts) > 2 else None
+            if method == 'POST' and action == 'start':
+                with engine.lock:
+                    engine.next_pid += 1
+                    engine.containers[name]['State'].update(Running=True, Pid=engine.next_pid)
+                return self._send_json(204)
+            if method == 'GET' and action == 'stats':
+                with engine.lock:
+                    cache = engine.page_cache.get(name, 0)
+                    usage = engine.memory_usage.get(name, 0) + cache
+                    cpu_seconds = engine.cpu_seconds.get(name, 0)
+                    block_read, block_write = engine.block_io.get(name, (0, 0))
+                return self._send_json(200, {
+                    'memory_stats': {'usage': usage, 'limit': engine.mem_total, 'stats': {'inactive_file': cache}},
+                    'cpu_stats': {'cpu_usage': {'total_usage': int(cpu_seconds * 1e9)}},
+                    'blkio_stats': {'io_service_bytes_recursive': [
+                        {'major': 8, 'minor': 0, 'op': 'read', 'value': block_read},
+                        {'major': 8, 'minor': 0, 'op': 'write', 'value': block_write},
+                    ]},
+                })
+            if method == 'GET' and action == 'json':
+                with engine.lock:
+                    return self._send_json(200, engine.containers[name])
+            if method == 'POST' and action == 'update':
+                body = self._read_json()
+                with engine.lock:
+                    engine.containers[name]['HostConfig'].update(body)
+                return self._send_json(200, {'Warnings': []})
+            if method == 'POST' and action == 'exec':
+                body = self._read_json()
+                exec_id = uuid.uuid4().hex
+                with engine.lock:
+                    if not engine.containers[name]['State']['Running']:
+                        return self._send_json(409, {'message': f'Container {name} is not running'})
+                    engine.execs[exec_id] = {
+                        'ID': exec_id, 'ContainerID': engine.containers[name]['Id'], 'container': name,
+                        'ProcessConfig': {'entrypoint': body['Cmd'][0], 'arguments': body['Cmd'][1:]},
+                        'Running': False, 'ExitCode': None, 'Pid': 0,
+                    }
+                return self._send_json(201, {'Id': exec_id})
+            if method == 'POST' and action == 'stop':
+                engine.exit_container(name, exit_code=143)
+                return self._send_json(204)
+            if method == 'DELETE' and action is None:
+                engine.exit_container(name, exit_code=137)
+                with engine.lock:
+                    engine.containers.pop(name, None)
+                return self._send_json(204)
+        return self._send_json(404, {'message': f'page not found: {method} {url.path}'})
+
+    def _stream_events(self):
+        subscriber = queue.Queue()
+        with self.server.engine.lock:
+            self.server.engine.subscribers.append(subscriber)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.wfile.flush()
+        try:
+            while True:
+                event = subscriber.get()
+                if event is None:
+                    break
+                chunk = (json.dumps(event) + '\n').encode()
+                self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+                self.wfile.flush()
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.server.engine.lock:
+                self.server.engine.subscribers.remove(subscriber)
+        self.close_connection = True
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_POST(self):
+        self._route('POST')
+
+    def do_DELETE(self):
+        self._route('DELETE')
+
+
+class FakeDockerEngine:
+    """
+    使用方式：
+        engine = FakeDockerEngine()
+        engine.start()
+        client = DockerEngineClient(engine.socket_path)
+        ...
+        engine.stop()
+    """
+
+    def __init__(self):
+        self._tmpdir = tempfile.mkdtemp(prefix='fake-docker-')
+        self.socket_path = os.path.join(self._tmpdir, 'docker.sock')
+        self.lock = threading.RLock()
+        self.containers = {}
+        self.subscribers = []
+        self.requests = []
+        self.connection_count = 0
+        self.next_pid = 1000
+        self.mem_total = 64 * 1024 ** 3
+        self.ncpu = 8
+        self.memory_usage = {}  # 容器名稱 -> 模擬的記憶體用量（bytes，不含 page cache）
+        self.page_cache = {}  # 容器名稱 -> 模擬的可回收 page cache（bytes），計入 cgroup 的 usage
+        self.cpu_seconds = {}  # 容器名稱 -> 模擬的累計 CPU 秒數
+        self.block_io = {}  # 容器名稱 -> 模擬的累計區塊讀寫量 (read bytes, write bytes)
+        self.execs = {}  # exec id -> exec 狀態
+        self.images = {
+            'handoverimage': 'sha256:' + 'a' * 64,
+            'routingimage': 'sha256:' + 'b' * 64,
+        }
+        self._server = None
+
+    def start(self):
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, FakeDockerEngineHandler)
+        self._server.daemon_threads = True
+        self._server.engine = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.close_event_streams()
+        self._server.shutdown()
+        self._server.server_close()
+        os.unlink(self.socket_path)
+        os.rmdir(self._tmpdir)
+
+    def resolve(self, name_or_id):
+        with self.lock:
+            for name, container in self.containers.items():
+                if name_or_id in (name, container['Id']):
+                    return name
+        return None
+
+    def emit(self, action, name, **attributes):
+        event = {
+            'Type': 'container',
+            'Action': action,
+            'status': action,
+            'Actor': {'Attributes': dict(attributes, name=name)},
+        }
+        with self.lock:
+            for subscriber in self.subscribers:
+                subscriber.put(event)
+
+    def execs_of(self, name):
+        with self.lock:
+            return [exec_id for exec_id, exec_info in self.execs.items() if exec_info['container'] == name]
+
+    def finish_exec(self, exec_id, exit_code=0):
+        """模擬 docker exec 的指令結束並送出 exec_die 事件。"""
+        with self.lock:
+            exec_info = self.execs.get(exec_id)
+            if exec_info is None or not exec_info['Running']:
+                return
+            exec_info.update(Running=False, ExitCode=exit_code)
+        self.emit('exec_die', exec_info['container'], execID=exec_id, exitCode=str(exit_code))
+
+    def exit_container(self, name, exit_code=0, oom_killed=False):
+        """模擬容器結束：更新狀態並送出 oom / die 事件；設定 AutoRemove 的容器會被移除。"""
+        with self.lock:
+            container = self.containers.get(name)
+            if container is None or not container['State']['Running']:
+                return
+            container['State'].update(Running=False, Pid=0, ExitCode=exit_code, OOMKilled=oom_killed)
+            for exec_id in self.execs_of(name):
+                self.execs.pop(exec_id)
+            if container['HostConfig'].get('AutoRemove'):
+                self.containers.pop(name)
+        if oom_killed:
+            self.emit('oom', name)
+        self.emit('die', name, exitCode=str(exit_code))
+
+    def close_event_streams(self):
+        with self.lock:
+            for subscriber in self.subscribers:
+                subscriber.put(None)
@@ -0,0 +1,177 @@
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from django.test import TestCase
+from django.urls import reverse
+from main.apps.meta_data_mgt.models.HandoverModel import Handover
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import COLUMNS_TO_ANALYZE, analyzeHandoverResult
+from main.apps.simulation_data_mgt.services.cellMetricsTable import (
+    CELL_METRICS_FILE, CellMetricsTable, cell_ut_rows, get_cell_metrics
+)
+from main.apps.simulation_data_mgt.services.cellStatisticsIngester import handover_result_ingester
+from main.apps.simulation_data_mgt.tests.service.cellStatisticsFixture import write_cell
+
+
+class CellMetricsTableTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='cell_metrics_user',
+            user_password='password',
+            user_email='cell_metrics_user@example.com'
+        )
+        self.result_dir = tempfile.mkdtemp(prefix='cell-metrics-')
+        self.handover = Handover.objects.create(
+            handover_name='cell_metrics',
+            handover_parameter={},
+            handover_status='completed',
+            f_user_uid=self.user
+        )
+        # save() 會以預設路徑覆寫 data_path，直接更新資料庫
+        Handover.objects.filter(pk=self.handover.pk).update(handover_data_path=self.result_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def post(self, url_name, data):
+        return self.client.post(reverse(url_name), data=json.dumps(data), content_type='application/json')
+
+    def write_cells(self):
+        # cell_i 的 ideal 平均為 i + 0.5、actual 平均為 i；cell_3 的 actual 沒有數值
+        for index in range(12):
+            write_cell(self.result_dir, 'ideal', f'cell_{index}', [index, index + 1])
+            write_cell(self.result_dir, 'actual', f'cell_{index}', [index] * (index + 1) if index != 3 else [''])
+
+    def test_analysis_writes_table(self):
+        """
+        測試流程:
+          1) 分析函式寫出 cell_metrics.npz，每個 cell 的 UT 數與平均正確，cell 依名稱自然排序
+          2) 以情境、cell 名稱與欄位範圍篩選，依欄位排序（沒有數值的 cell 排在最後）並分頁
+          3) 不正確的欄位、情境或分頁參數拋出 ValueError
+        """
+        self.write_cells()
+        self.assertIsNotNone(analyzeHandoverResult(self.result_dir))
+        self.assertTrue(os.path.exists(os.path.join(self.result_dir, CELL_METRICS_FILE)))
+        table = CellMetricsTable.load(self.result_dir)
+        self.assertEqual(len(table), 24)
+
+        result = table.query(situation='ideal', page_size=3)
+        self.assertEqual(result['total'], 12)
+        self.assertEqual([row['cell'] for row in result['rows']], ['cell_0', 'cell_1', 'cell_2'])
+        self.assertEqual(result['rows'][1]['ut_count'], 2)
+        self.assertEqual(result['rows'][1]['metrics']['handover_count'], 1.5)
+
+        result = table.query(situation='actual', metrics=['handover_count'], sort_by='handover_count',
+                             descending=True, page=3, page_size=5)
+        self.assertEqual(result['total'], 12)
+        self.assertEqual(result['columns'], ['handover_count'])
+        self.assertEqual([row['cell'] for row in result['rows']], ['cell_0', 'cell_3'])
+        self.assertEqual([row['metrics']['handover_count'] for row in result['rows']], [0.0, None])
+        result = table.query(situation='actual', sort_by='handover_count', page_size=12)
+        self.assertEqual([row['cell'] for row in result['rows']][:2], ['cell_0', 'cell_1'])
+        self.assertEqual(result['rows'][-1]['cell'], 'cell_3')
+
+        result = table.query(cells=['cell_4', 'cell_10'], filters={'handover_count': {'min': 4.5, 'max': 10}},
+                             sort_by='ut_count', descending=True)
+        self.assertEqual([(row['situation'], row['cell']) for row in result['rows']],
+                         [('actual', 'cell_10'), ('ideal', 'cell_4')])
+
+        for kwargs in ({'metrics': ['unknown']}, {'filters': {'unknown': {'min': 0}}}, {'situation': 'other'},
+                       {'sort_by': 'unknown'}, {'page': 0}, {'page_size': 0}):
+            with self.assertRaises(ValueError):
+                table.query(**kwargs)
+
+    def test_lazy_table_and_ut_rows(self):
+        """
+        測試流程:
+          1) 沒有 cell_metrics.npz 時（以增量讀取完成的模擬），第一次查詢由 statistics.csv 建立並寫出
+          2) 單一 cell 每個 UT 的數值可分頁，缺值以 None 表示
+          3) 不存在的 cell 回傳 None，不正確的 cell 名稱拋出 ValueError
+        """
+        self.write_cells()
+        table = get_cell_metrics(self.result_dir, COLUMNS_TO_ANALYZE)
+        self.assertEqual(len(table), 24)
+        self.assertTrue(os.path.exists(os.path.join(self.result_dir, CELL_METRICS_FILE)))
+        self.assertIsNone(get_cell_metrics(os.path.join(self.result_dir, 'missing'), COLUMNS_TO_ANALYZE))
+
+        rows = cell_ut_rows(self.result_dir, 'actual', 'cell_5', page=2, page_size=4)
+        self.assertEqual(rows['total'], 6)
+        self.assertEqual([row['ut_id'] for row in rows['rows']], ['ut_4', 'ut_5'])
+        self.assertEqual(rows['columns'], ['ut_id'] + COLUMNS_TO_ANALYZE)
+        self.assertIsNone(cell_ut_rows(self.result_dir, 'actual', 'cell_3')['rows'][0]['handover_count'])
+        self.assertIsNone(cell_ut_rows(self.result_dir, 'ideal', 'cell_99'))
+        for cell in ('', '..', os.path.join('..', 'cell_1')):
+            with self.assertRaises(ValueError):
+                cell_ut_rows(self.result_dir, 'ideal', cell)
+
+    def test_table_follows_result_changes(self):
+        """
+        測試流程:
+          1) 2 個 cell 時查詢並寫出 cell_metrics.npz；之後新增 2 個 cell，再次查詢時重新建立為 4 個 cell
+          2) persist=False（模擬尚未完成）時只在記憶體中建立，不寫出檔案
+          3) 以增量讀取的結果建立的表格與分析函式寫出的相同
+        """
+        for index in range(2):
+            write_cell(self.result_dir, 'ideal', f'cell_{index}', [index])
+        self.assertEqual(get_cell_metrics(self.result_dir, COLUMNS_TO_ANALYZE).query(situation='ideal')['total'], 2)
+        self.assertTrue(os.path.exists(os.path.join(self.result_dir, CELL_METRICS_FILE)))
+        for index in range(2, 4):
+            write_cell(self.result_dir, 'ideal', f'cell_{index}', [index])
+        self.assertEqual(get_cell_metrics(self.result_dir, COLUMNS_TO_ANALYZE).query(situation='ideal')['total'], 4)
+        self.assertEqual(len(CellMetricsTable.load(self.result_dir)), 4)
+
+        os.remove(os.path.join(self.result_dir, CELL_METRICS_FILE))
+        self.assertEqual(len(get_cell_metrics(self.result_dir, COLUMNS_TO_ANALYZE, persist=False)), 4)
+        self.assertFalse(os.path.exists(os.path.join(self.result_dir, CELL_METRICS_FILE)))
+
+        self.write_cells()
+        ingester = handover_result_ingester(self.result_dir)
+        ingester.finalize()
+        ingested = CellMetricsTable.from_cells(ingester.columns, ingester.cell_means())
+        analyzeHandoverResult(self.result_dir)
+        analyzed = CellMetricsTable.load(self.result_dir)
+        self.assertEqual(ingested.cells.tolist(), analyzed.cells.tolist())
+        self.assertEqual(ingested.situations.tolist(), analyzed.situations.tolist())
+        self.assertEqual(ingested.ut_counts.tolist(), analyzed.ut_counts.tolist())
+        np.testing.assert_allclose(ingested.values, analyzed.values)
+
+    def test_api(self):
+        """
+        測試流程:
+          1) 查詢逐 cell 結果與單一 cell 每個 UT 的數值
+          2) 不正確的欄位、cell 名稱或不支援逐 cell 結果的模擬類型回傳 400
+          3) 不存在的模擬或 cell 回傳 404
+        """
+        self.write_cells()
+        target = {'sim_type': 'handover', 'target_uid': str(self.handover.handover_uid)}
+        response = self.post('query_sim_cell_results', {
+            **target, 'situation': 'ideal', 'metrics': ['handover_count'],
+            'filters': {'handover_count': {'max': 2}}, 'sort_by': 'handover_count', 'order': 'desc'
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['total'], 2)
+        self.assertEqual([row['cell'] for row in data['rows']], ['cell_1', 'cell_0'])
+
+        response = self.post('query_sim_cell_ut_results', {**target, 'situation': 'actual', 'cell': 'cell_2'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['total'], 3)
+        self.assertTrue(os.path.exists(os.path.join(self.result_dir, CELL_METRICS_FILE)))
+
+        # 執行中的模擬查詢時不寫出
+        os.remove(os.path.join(self.result_dir, CELL_METRICS_FILE))
+        Handover.objects.filter(pk=self.handover.pk).update(handover_status='processing')
+        self.assertEqual(self.post('query_sim_cell_results', target).status_code, 200)
+        self.assertFalse(os.path.exists(os.path.join(self.result_dir, CELL_METRICS_FILE)))
+        Handover.objects.filter(pk=self.handover.pk).update(handover_status='completed')
+
+        self.assertEqual(self.post('query_sim_cell_results', {**target, 'metrics': ['unknown']}).status_code, 400)
+        self.assertEqual(self.post('query_sim_cell_ut_results', {**target, 'situation': 'ideal', 'cell': '..'}).status_code, 400)
+        self.assertEqual(self.post('query_sim_cell_results', {**target, 'sim_type': 'coverage'}).status_code, 400)
+        self.assertEqual(self.post('query_sim_cell_results', {'sim_type': 'handover'}).status_code, 400)
+        self.assertEqual(self.post('query_sim_cell_ut_results', {**target, 'situation': 'ideal', 'cell': 'cell_99'}).status_code, 404)
+        missing = {'sim_type': 'handover', 'target_uid': '00000000-0000-0000-0000-000000000000'}
+        self.assertEqual(self.post('query_sim_cell_results', missing).status_code, 404)
+        self.assertEqual(self.post('query_sim_cell_results', {**target, 'target_uid': 'invalid'}).status_code, 404)
@@ -0,0 +1,57 @@
+import shutil
+import tempfile
+from django.test import SimpleTestCase
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import analyzeHandoverResult
+from main.apps.simulation_data_mgt.services.cellStatisticsIngester import handover_result_ingester
+from main.apps.simulation_data_mgt.tests.service.cellStatisticsFixture import write_cell
+
+
+class CellStatisticsIngesterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.result_dir = tempfile.mkdtemp(prefix='cell-ingester-')
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def test_ingests_cells_incrementally(self):
+        """
+        測試流程:
+          1) 執行中掃描：檔案需在兩次掃描間沒有變化才讀取
+          2) 部分結果只包含已讀取 cell 的平均值
+          3) 容器結束後的最後掃描讀取剩下的檔案，結果與 analyzeHandoverResult 相同
+          4) 欄位不齊全的 cell 與分析函式一樣不納入
+        """
+        ingester = handover_result_ingester(self.result_dir)
+        write_cell(self.result_dir, 'ideal', 'cell_0', [1, 3])
+        write_cell(self.result_dir, 'actual', 'cell_0', [2, 4])
+        self.assertFalse(ingester.scan())
+        self.assertIsNone(ingester.result())
+        self.assertTrue(ingester.scan())
+        self.assertEqual(ingester.cell_counts(), {'ideal': 1, 'actual': 1})
+
+        partial = ingester.partial_result()
+        self.assertEqual(partial['cell_count'], {'ideal': 1, 'actual': 1})
+        self.assertEqual(partial['handover_simulation_result']['avg_cells_handover_count'], 3.0)
+
+        write_cell(self.result_dir, 'actual', 'cell_1', [10])
+        write_cell(self.result_dir, 'actual', 'cell_2', [100], columns=['handover_count'])
+        self.assertFalse(ingester.scan())  # 新檔案等待下一次掃描
+
+        result = ingester.finalize()
+        self.assertEqual(ingester.cell_counts(), {'ideal': 1, 'actual': 2})
+        expected = analyzeHandoverResult(self.result_dir)
+        self.assertEqual(set(result['handover_simulation_result']), set(expected['handover_simulation_result']))
+        for column, value in expected['handover_simulation_result'].items():
+            self.assertAlmostEqual(result['handover_simulation_result'][column], value)
+        self.assertAlmostEqual(result['handover_simulation_result']['avg_cells_handover_count'], 16 / 3)
+
+    def test_rewritten_file_replaces_previous_contribution(self):
+        ingester = handover_result_ingester(self.result_dir)
+        write_cell(self.result_dir, 'ideal', 'cell_0', [1])
+        write_cell(self.result_dir, 'actual', 'cell_0', [1])
+        ingester.finalize()
+
+        write_cell(self.result_dir, 'actual', 'cell_0', [5, 7, 9])
+        result = ingester.finalize()
+        self.assertEqual(ingester.cell_counts(), {'ideal': 1, 'actual': 1})
+        self.assertAlmostEqual(result['handover_simulation_result']['avg_cells_handover_count'], 7.0)
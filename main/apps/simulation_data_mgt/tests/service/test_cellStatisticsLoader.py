@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import shutil
+import tempfile
+from django.test import SimpleTestCase
+from main.apps.simulation_data_mgt.services.analyzeGsoResult import analyzeGsoResult
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import COLUMNS_TO_ANALYZE, analyzeHandoverResult
+from main.apps.simulation_data_mgt.services.cellStatisticsLoader import (
+    CellStatisticsAggregate, aggregate_cell_statistics, load_cell_statistics, read_cell_statistics
+)
+from main.apps.simulation_data_mgt.tests.service.cellStatisticsFixture import write_cell
+
+
+class CellStatisticsLoaderTestCase(SimpleTestCase):
+    def setUp(self):
+        self.result_dir = tempfile.mkdtemp(prefix='cell-loader-')
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def test_reads_only_needed_columns(self):
+        """
+        測試流程:
+          1) 只保留需要的欄位並依指定順序排列，其他欄位（包含文字欄位）不解析
+          2) 標頭缺少欄位時不解析內容，回傳 None
+          3) 有缺值的檔案與 pandas 相同，缺值為 NaN；只有標頭的檔案回傳空的 DataFrame
+        """
+        path = write_cell(self.result_dir, 'ideal', 'cell_0', [1, 2], extra_columns=True)
+        df = read_cell_statistics(path, COLUMNS_TO_ANALYZE)
+        self.assertEqual(list(df.columns), COLUMNS_TO_ANALYZE)
+        self.assertEqual(df['handover_count'].tolist(), [1.0, 2.0])
+        self.assertTrue(all(dtype == 'float64' for dtype in df.dtypes))
+
+        path = write_cell(self.result_dir, 'ideal', 'cell_1', [1], columns=COLUMNS_TO_ANALYZE[1:], extra_columns=True)
+        self.assertIsNone(read_cell_statistics(path, COLUMNS_TO_ANALYZE))
+
+        path = write_cell(self.result_dir, 'ideal', 'cell_2', [1, ''], extra_columns=True)
+        df = read_cell_statistics(path, COLUMNS_TO_ANALYZE)
+        self.assertEqual(len(df), 2)
+        self.assertTrue(df.iloc[1].isna().all())
+        self.assertEqual(df['handover_count'].mean(), 1.0)
+
+        path = write_cell(self.result_dir, 'ideal', 'cell_3', [], extra_columns=True)
+        df = read_cell_statistics(path, COLUMNS_TO_ANALYZE)
+        self.assertEqual((len(df), list(df.columns)), (0, COLUMNS_TO_ANALYZE))
+
+    def test_parallel_load_matches_serial_load(self):
+        """
+        測試流程:
+          1) 平行與依序讀取的結果相同，欄位不齊全的 cell 不納入
+          2) handover 與 gso 的分析結果為所有欄位齊全的 cell 的平均
+        """
+        for index in range(12):
+            write_cell(self.result_dir, 'ideal', f'cell_{index}', [index], extra_columns=True)
+            write_cell(self.result_dir, 'actual', f'cell_{index}', [index, index + 2], extra_columns=True)
+        write_cell(self.result_dir, 'actual', 'cell_partial', [100], columns=['handover_count'], extra_columns=True)
+
+        parallel = load_cell_statistics(self.result_dir, COLUMNS_TO_ANALYZE, max_workers=4)
+        serial = load_cell_statistics(self.result_dir, COLUMNS_TO_ANALYZE, max_workers=1)
+        self.assertEqual({situation: len(frames) for situation, frames in parallel.items()},
+                         {'ideal': 12, 'actual': 12})
+        for situation in ('ideal', 'actual'):
+            for left, right in zip(parallel[situation], serial[situation]):
+                self.assertTrue(left.equals(right))
+
+        handover = analyzeHandoverResult(self.result_dir)['handover_simulation_result']
+        self.assertAlmostEqual(handover['avg_cells_handover_count'], 6.5)
+        gso = analyzeGsoResult(self.result_dir)['gso_simulation_result']
+        self.assertEqual(gso, handover)
+
+    def test_streaming_aggregate_matches_concat(self):
+        """
+        測試流程:
+          1) 逐檔累計的筆數、平均、最小與最大值與 pd.concat 後計算的結果相同（缺值不納入）
+          2) 分成多組各自累計後合併，結果與依序累計相同
+          3) 平行讀取的累計結果與 load_cell_statistics 後 concat 的平均相同
+        """
+        rng = np.random.default_rng(0)
+        frames = [pd.DataFrame(rng.random((rows, 3)), columns=['a', 'b', 'c']) for rows in (3, 0, 5, 2)]
+        frames[2].iloc[1, 1] = np.nan
+        frames[3]['c'] = np.nan
+        serial = CellStatisticsAggregate(['a', 'b', 'c'])
+        for df in frames:
+            serial.add(df)
+        concat = pd.concat(frames)
+        self.assertEqual(serial.cell_count, 4)
+        self.assertEqual(serial.count.tolist(), concat.count().tolist())
+        pd.testing.assert_series_equal(serial.mean(), concat.mean())
+        pd.testing.assert_series_equal(serial.minimum(), concat.min())
+        pd.testing.assert_series_equal(serial.maximum(), concat.max())
+
+        left = CellStatisticsAggregate(['a', 'b', 'c']).add(frames[0]).add(frames[3])
+        right = CellStatisticsAggregate(['a', 'b', 'c']).add(frames[1]).add(frames[2])
+        merged = left.merge(right)
+        self.assertEqual(merged.cell_count, 4)
+        pd.testing.assert_series_equal(merged.mean(), serial.mean())
+        self.assertTrue(CellStatisticsAggregate(['a']).mean().isna().all())
+
+        for index in range(9):
+            write_cell(self.result_dir, 'ideal', f'cell_{index}', [index, index * 3], extra_columns=True)
+            write_cell(self.result_dir, 'actual', f'cell_{index}', [index, ''], extra_columns=True)
+        write_cell(self.result_dir, 'actual', 'cell_partial', [100], columns=['handover_count'], extra_columns=True)
+        frames = load_cell_statistics(self.result_dir, COLUMNS_TO_ANALYZE, max_workers=1)
+        for max_workers in (1, 4):
+            aggregates = aggregate_cell_statistics(self.result_dir, COLUMNS_TO_ANALYZE, max_workers=max_workers)
+            for situation in ('ideal', 'actual'):
+                self.assertEqual(aggregates[situation].cell_count, 9)
+                pd.testing.assert_series_equal(aggregates[situation].mean(), pd.concat(frames[situation]).mean())
+
+    def test_missing_directories(self):
+        write_cell(self.result_dir, 'ideal', 'cell_0', [1], extra_columns=True)
+        self.assertIsNone(analyzeHandoverResult(self.result_dir))
+        self.assertEqual(load_cell_statistics(self.result_dir, COLUMNS_TO_ANALYZE)['actual'], [])
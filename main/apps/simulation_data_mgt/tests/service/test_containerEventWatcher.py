@@ -0,0 +1,57 @@
+import json
+import time
+from django.test import SimpleTestCase
+from main.apps.simulation_data_mgt.services.containerEventWatcher import ContainerEventWatcher
+from main.apps.simulation_data_mgt.services.dockerEngineClient import DockerEngineClient
+from main.apps.simulation_data_mgt.tests.service.fakeDockerEngine import FakeDockerEngine
+
+
+class ContainerEventWatcherTestCase(SimpleTestCase):
+    def setUp(self):
+        self.engine = FakeDockerEngine().start()
+
+    def tearDown(self):
+        self.engine.stop()
+
+    def wait_until_connected(self, watcher):
+        for _ in range(50):
+            if watcher.connected:
+                return
+            time.sleep(0.1)
+        self.fail('watcher did not connect')
+
+    def test_die_event_wakes_registered_waiter(self):
+        """
+        測試流程:
+          1) 監聽假 Docker Engine 的事件串流
+          2) 容器因 OOM 結束時，登記的等待者被喚醒並記錄 exit code 與 OOM，其他容器不受影響
+        """
+        client = DockerEngineClient(self.engine.socket_path)
+        client.run_container('coverageSimulation_a', 'handoverimage', ['true'])
+        client.run_container('coverageSimulation_b', 'handoverimage', ['true'])
+
+        watcher = ContainerEventWatcher(client=client)
+        waiter = watcher.register('coverageSimulation_a')
+        other = watcher.register('coverageSimulation_b')
+        self.wait_until_connected(watcher)
+        self.assertEqual(watcher.generation, 1)
+
+        self.engine.exit_container('coverageSimulation_a', exit_code=137, oom_killed=True)
+        self.assertTrue(waiter.exited.wait(5))
+        self.assertTrue(waiter.oom_killed)
+        self.assertEqual(waiter.exit_code, 137)
+        self.assertFalse(other.exited.is_set())
+
+    def test_unreachable_socket_disables_watcher(self):
+        watcher = ContainerEventWatcher(client=DockerEngineClient('/nonexistent/docker.sock'))
+        waiter = watcher.register('coverageSimulation_a')
+        watcher._thread.join(0.2)
+        self.assertFalse(watcher.connected)
+
+        # 本地操作仍可直接通知等待者
+        watcher.handle_event(json.dumps({
+            'Action': 'die',
+            'Actor': {'Attributes': {'name': 'coverageSimulation_a', 'exitCode': '0'}}
+        }))
+        self.assertTrue(waiter.exited.is_set())
+        self.assertEqual(waiter.exit_code, 0)
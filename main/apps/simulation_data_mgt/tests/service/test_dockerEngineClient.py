@@ -0,0 +1,141 @@
+import http.client
+import socket
+from django.test import SimpleTestCase
+from main.apps.simulation_data_mgt.services.dockerEngineClient import (
+    DockerEngineClient, DockerEngineError, parse_memory_limit
+)
+from main.apps.simulation_data_mgt.tests.service.fakeDockerEngine import FakeDockerEngine
+
+
+class StaleConnection:
+    """池中的閒置連線：在送出請求（request）或等待回應（response）時失敗。"""
+
+    def __init__(self, phase, error):
+        self.phase = phase
+        self.error = error
+        self.requests = []
+
+    def request(self, method, url, body=None, headers=None):
+        if self.phase == 'request':
+            raise self.error
+        self.requests.append((method, url))
+
+    def getresponse(self):
+        raise self.error
+
+    def close(self):
+        pass
+
+
+class DockerEngineClientTestCase(SimpleTestCase):
+    def setUp(self):
+        self.engine = FakeDockerEngine().start()
+        self.client = DockerEngineClient(self.engine.socket_path)
+
+    def tearDown(self):
+        self.client.close()
+        self.engine.stop()
+
+    def test_container_lifecycle_reuses_connection(self):
+        """
+        測試流程:
+          1) run_container 建立並啟動容器，記憶體上限轉為 bytes
+          2) inspect 取得 PID、list 只回傳符合名稱的執行中容器
+          3) stop / remove 後容器消失，不存在的容器不會造成錯誤
+          4) 所有請求共用同一條 keep-alive 連線
+        """
+        name = 'coverageSimulation_00000000-0000-0000-0000-000000000001'
+        self.client.run_container(
+            name, 'handoverimage', ['bash', '-c', 'echo run'],
+            binds=['/tmp/result:/root/mercury/build/service/output'],
+            memory_limit='28g', auto_remove=False
+        )
+        self.client.run_container('unrelated', 'busybox', ['true'])
+
+        info = self.client.inspect_container(name)
+        self.assertEqual(info['HostConfig']['Memory'], 28 * 1024 ** 3)
+        self.assertTrue(info['HostConfig']['OomKillDisable'])
+        self.assertGreater(self.client.container_pid(name), 0)
+        self.assertEqual(self.client.list_containers(name='Simulation_'), [name])
+
+        self.client.stop_container(name)
+        self.assertEqual(self.client.list_containers(name='Simulation_'), [])
+        self.client.remove_container(name)
+        self.assertIsNone(self.client.inspect_container(name))
+        self.client.stop_container(name)
+        self.client.remove_container(name)
+
+        self.assertEqual(self.engine.connection_count, 1)
+        self.assertEqual(len(self.engine.requests), 13)
+
+    def test_info_and_memory_usage(self):
+        name = 'handoverSimulation_00000000-0000-0000-0000-000000000003'
+        self.client.run_container(name, 'handoverimage', ['true'])
+        self.engine.memory_usage[name] = 3 * 1024 ** 3
+
+        self.assertEqual(self.client.info()['MemTotal'], self.engine.mem_total)
+        self.assertEqual(self.client.container_memory_usage(name), 3 * 1024 ** 3)
+        self.assertIsNone(self.client.container_memory_usage('missing'))
+
+        self.engine.cpu_seconds[name] = 12.5
+        self.engine.block_io[name] = (4096, 8192)
+        self.assertEqual(self.client.container_stats(name), {
+            'memory_usage': 3 * 1024 ** 3,
+            'memory_peak': 3 * 1024 ** 3,
+            'cpu_seconds': 12.5,
+            'block_read_bytes': 4096,
+            'block_write_bytes': 8192,
+        })
+        self.assertIsNone(self.client.container_stats('missing'))
+
+        # page cache 計入 cgroup 的用量與峰值，但不計入記憶體用量
+        self.engine.page_cache[name] = 1024 ** 3
+        stats = self.client.container_stats(name)
+        self.assertEqual((stats['memory_usage'], stats['memory_peak']), (3 * 1024 ** 3, 4 * 1024 ** 3))
+        self.assertEqual(self.client.container_memory_usage(name), 3 * 1024 ** 3)
+
+    def test_stream_events(self):
+        name = 'gsoSimulation_00000000-0000-0000-0000-000000000002'
+        self.client.run_container(name, 'handoverimage', ['true'])
+        events = self.client.stream_events(
+            {'type': ['container'], 'event': ['die', 'oom']},
+            on_connect=lambda: self.engine.exit_container(name, exit_code=137, oom_killed=True)
+        )
+        self.assertEqual([next(events)['Action'], next(events)['Action']], ['oom', 'die'])
+        events.close()
+
+    def test_retries_only_safe_requests(self):
+        """
+        測試流程:
+          1) 閒置連線在送出請求時失敗（請求沒有送達），任何方法都改用新連線重試
+          2) 請求送出後 daemon 在回應前關閉連線：冪等的 GET 重試，POST 不重送
+          3) 請求送出後逾時：daemon 可能已執行請求，不重送
+        """
+        stale = StaleConnection('request', BrokenPipeError())
+        self.client._pool.put_nowait(stale)
+        status, _ = self.client._request('POST', '/containers/missing/stop')
+        self.assertEqual(status, 404)
+        self.assertEqual(self.engine.requests[-1], ('POST', '/containers/missing/stop'))
+
+        self.client.close()
+        self.client._pool.put_nowait(StaleConnection('response', http.client.RemoteDisconnected()))
+        self.assertTrue(self.client.ping())
+        request_count = len(self.engine.requests)
+        stale = StaleConnection('response', http.client.RemoteDisconnected())
+        self.client._pool.put_nowait(stale)
+        with self.assertRaises(DockerEngineError):
+            self.client._request('POST', '/containers/missing/stop')
+        self.assertEqual(stale.requests, [('POST', '/containers/missing/stop')])
+
+        stale = StaleConnection('response', socket.timeout('timed out'))
+        self.client._pool.put_nowait(stale)
+        with self.assertRaises(DockerEngineError):
+            self.client._request('GET', '/_ping')
+        self.assertEqual(len(self.engine.requests), request_count)
+
+    def test_parse_memory_limit(self):
+        self.assertEqual(parse_memory_limit('100g'), 100 * 1024 ** 3)
+        self.assertEqual(parse_memory_limit('512m'), 512 * 1024 ** 2)
+        self.assertEqual(parse_memory_limit(1024), 1024)
+        with self.assertRaises(ValueError):
+            parse_memory_limit('lots')
@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import tempfile
+import types
+from unittest import mock
+from django.test import SimpleTestCase
+from main.apps.simulation_data_mgt.services import simAnalysisCache
+from main.apps.simulation_data_mgt.services.simAnalysisCache import (
+    ANALYSIS_CACHE_FILE, analyze_with_cache, lookup_analysis, result_fingerprint, store_analysis
+)
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.services.simResultSidecar import build_result_sidecar
+
+
+class CountingAnalyzer:
+    """以真正的分析函式分析，並記錄被呼叫的次數。"""
+
+    def __init__(self, sim_type):
+        self.name = sim_type.name
+        self.calls = 0
+        self._analyzer = sim_type.analyzer
+
+    def analyzer(self, simulation_result_dir):
+        self.calls += 1
+        return self._analyzer(simulation_result_dir)
+
+
+class SimAnalysisCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        self.result_dir = tempfile.mkdtemp(prefix='sim-analysis-cache-')
+        self.csv_path = os.path.join(self.result_dir, 'output_build.csv')
+        self.write_isl([1.0, 2.0])
+        self.sim_type = CountingAnalyzer(get_sim_job_type('islHopping'))
+        simAnalysisCache.analyzer_version.cache_clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+        simAnalysisCache.analyzer_version.cache_clear()
+
+    def write_isl(self, distances):
+        with open(self.csv_path, 'w') as f:
+            f.write('ISLBreak,avgDistance,avgHopCount,runtime\n')
+            for index, distance in enumerate(distances):
+                f.write(f'{index + 1},{distance},6.3,0\n')
+
+    def test_repeated_analysis_uses_cache(self):
+        """
+        測試流程:
+          1) 第一次分析執行分析函式並寫出 analysis_cache.json；第二次只比對指紋，不再執行分析函式
+          2) 產生 PDF 報告與欄式副本後指紋不變，仍然命中
+          3) 結果檔案被改寫後重新分析，得到新的結果
+        """
+        first = analyze_with_cache(self.sim_type, self.result_dir)
+        self.assertEqual(self.sim_type.calls, 1)
+        self.assertTrue(os.path.exists(os.path.join(self.result_dir, ANALYSIS_CACHE_FILE)))
+        self.assertEqual(analyze_with_cache(self.sim_type, self.result_dir), first)
+        self.assertEqual(self.sim_type.calls, 1)
+
+        with open(os.path.join(self.result_dir, 'islHopping_simulation_report.pdf'), 'wb') as f:
+            f.write(b'%PDF')
+        build_result_sidecar(self.result_dir)
+        self.assertEqual(analyze_with_cache(self.sim_type, self.result_dir), first)
+        self.assertEqual(self.sim_type.calls, 1)
+
+        self.write_isl([1.0, 2.0, 3.0])
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        second = analyze_with_cache(self.sim_type, self.result_dir)
+        self.assertEqual(self.sim_type.calls, 2)
+        self.assertNotEqual(second, first)
+
+    def test_version_and_failed_analysis(self):
+        """
+        測試流程:
+          1) 分析函式的版本改變後快取不命中
+          2) 分析失敗（回傳 None）或結果無法原樣存成 JSON（數值為鍵）時不寫入快取
+          3) 以增量讀取取得的結果存入快取後，分析直接命中
+        """
+        store_analysis(self.sim_type, self.result_dir, {'cached': True})
+        self.assertEqual(lookup_analysis(self.sim_type, self.result_dir), {'cached': True})
+        with mock.patch.object(simAnalysisCache, 'ANALYSIS_CACHE_VERSION', 2):
+            simAnalysisCache.analyzer_version.cache_clear()
+            self.assertIsNone(lookup_analysis(self.sim_type, self.result_dir))
+        simAnalysisCache.analyzer_version.cache_clear()
+        self.assertEqual(analyze_with_cache(self.sim_type, self.result_dir), {'cached': True})
+        self.assertEqual(self.sim_type.calls, 0)
+
+        os.remove(os.path.join(self.result_dir, ANALYSIS_CACHE_FILE))
+        os.remove(self.csv_path)
+        self.assertIsNone(analyze_with_cache(self.sim_type, self.result_dir))
+        self.assertFalse(os.path.exists(os.path.join(self.result_dir, ANALYSIS_CACHE_FILE)))
+
+        fingerprint = result_fingerprint(self.result_dir)
+        with open(os.path.join(self.result_dir, ANALYSIS_CACHE_FILE), 'w') as f:
+            json.dump({self.sim_type.name: 'invalid'}, f)
+        self.assertIsNone(lookup_analysis(self.sim_type, self.result_dir, fingerprint))
+        store_analysis(self.sim_type, self.result_dir, {'coverage': {22.5: 0.9}})
+        self.assertIsNone(lookup_analysis(self.sim_type, self.result_dir, fingerprint))
+        with self.settings(SIM_ANALYSIS_CACHE_ENABLED=False):
+            store_analysis(self.sim_type, self.result_dir, {'cached': True})
+            self.assertIsNone(lookup_analysis(self.sim_type, self.result_dir))
+
+    def test_shared_module_change_invalidates_cache(self):
+        """
+        測試流程:
+          1) 共用讀取模組的原始檔沒有改變時，快取命中
+          2) 共用讀取模組的原始檔改變後（分析函式本身未改變），快取不命中，重新分析
+        """
+        # 模組放在結果目錄之外，確認不命中是因為版本而不是指紋
+        source_dir = tempfile.mkdtemp(prefix='sim-analysis-source-')
+        self.addCleanup(shutil.rmtree, source_dir, ignore_errors=True)
+        module = types.ModuleType('sharedReader')
+        module.__file__ = os.path.join(source_dir, 'sharedReader.py')
+        with open(module.__file__, 'w') as f:
+            f.write('VERSION = 1\n')
+        shared_modules = simAnalysisCache.SHARED_MODULES + (module,)
+        with mock.patch.object(simAnalysisCache, 'SHARED_MODULES', shared_modules):
+            simAnalysisCache.analyzer_version.cache_clear()
+            analyze_with_cache(self.sim_type, self.result_dir)
+            simAnalysisCache.analyzer_version.cache_clear()
+            analyze_with_cache(self.sim_type, self.result_dir)
+            self.assertEqual(self.sim_type.calls, 1)
+
+            with open(module.__file__, 'w') as f:
+                f.write('VERSION = 2\n')
+            simAnalysisCache.analyzer_version.cache_clear()
+            analyze_with_cache(self.sim_type, self.result_dir)
+            self.assertEqual(self.sim_type.calls, 2)
@@ -0,0 +1,234 @@
+import os
+import shutil
+import tempfile
+import uuid
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.HandoverModel import Handover
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services import simJobLifecycle
+from main.apps.simulation_data_mgt.services.dockerEngineClient import DockerEngineClient
+from main.apps.simulation_data_mgt.services.simJobAgent import SimJobAgent, SimJobAgentClient, SimJobAgentError
+from main.apps.simulation_data_mgt.services.simJobBackends import RemoteSimJobBackend, host_capacities
+from main.apps.simulation_data_mgt.services.simJobExecutor import SimJobExecutor, select_host
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.tests.service.cellStatisticsFixture import write_cell
+from main.apps.simulation_data_mgt.tests.service.fakeDockerEngine import FakeDockerEngine
+
+GIGABYTE = 1024 ** 3
+
+
+class SelectHostTestCase(SimpleTestCase):
+    def test_selects_host_with_most_free_memory(self):
+        """
+        測試流程:
+          1) 選擇剩餘記憶體最多、且放得下作業的主機
+          2) 剩餘記憶體相同時選執行中作業較少的主機
+          3) 沒有主機放得下時回傳 None；沒有執行中作業的主機可以執行超過容量的作業
+        """
+        capacities = {'local': 32 * GIGABYTE, 'node2': 64 * GIGABYTE}
+        self.assertEqual(select_host(capacities, {}, {}, 8 * GIGABYTE), 'node2')
+        reserved = {'node2': 40 * GIGABYTE}
+        running = {'node2': 2}
+        self.assertEqual(select_host(capacities, reserved, running, 8 * GIGABYTE), 'local')
+
+        self.assertEqual(select_host({'local': 32 * GIGABYTE, 'node2': 32 * GIGABYTE},
+                                     {'local': 8 * GIGABYTE, 'node2': 8 * GIGABYTE},
+                                     {'local': 2, 'node2': 1}, GIGABYTE), 'node2')
+
+        reserved = {'local': 30 * GIGABYTE, 'node2': 60 * GIGABYTE}
+        running = {'local': 1, 'node2': 1}
+        self.assertIsNone(select_host(capacities, reserved, running, 8 * GIGABYTE))
+        self.assertEqual(select_host(capacities, {}, {}, 100 * GIGABYTE), 'node2')
+        self.assertEqual(select_host({'local': None}, {'local': 100 * GIGABYTE}, {'local': 3}, GIGABYTE), 'local')
+
+
+class SimJobHostSchedulingTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='backend_user',
+            user_password='password',
+            user_email='backend_user@example.com'
+        )
+
+    def test_spreads_jobs_across_hosts_by_free_memory(self):
+        """
+        測試流程:
+          1) 本機 10g、node2 30g，每個作業預估 8g
+          2) 前三個作業分配到剩餘記憶體較多的 node2，第四個分配到本機
+          3) 兩台主機都放不下時不領取作業；狀態依主機列出容量與預留量
+        """
+        executor = SimJobExecutor(max_workers=10, memory_estimator=lambda queue_job: 8 * GIGABYTE,
+                                  host_capacities=lambda: {'local': 10 * GIGABYTE, 'node2': 30 * GIGABYTE})
+        for _ in range(5):
+            SimJobQueue.objects.create(
+                simJobQueue_sim_type='coverage',
+                simJobQueue_target_uid=uuid.uuid4(),
+                f_user_uid=self.user
+            )
+
+        hosts = [executor._claim_next_job().simJobQueue_host for _ in range(4)]
+        self.assertEqual(hosts, ['node2', 'node2', 'node2', 'local'])
+        self.assertIsNone(executor._claim_next_job())
+
+        status = executor.status()
+        self.assertEqual(status['memory_capacity'], 40 * GIGABYTE)
+        self.assertEqual(
+            [(host['host'], host['memory_reserved'], host['running_count']) for host in status['hosts']],
+            [('local', 8 * GIGABYTE, 1), ('node2', 24 * GIGABYTE, 3)]
+        )
+
+
+class SimJobAgentTestCase(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='sim-agent-')
+        self.engines = []
+        self.agents = []
+        for index, mem_total in enumerate((64 * GIGABYTE, 16 * GIGABYTE)):
+            engine = FakeDockerEngine().start()
+            engine.mem_total = mem_total
+            agent = SimJobAgent(os.path.join(self.tmpdir, f'agent{index}'),
+                                client=DockerEngineClient(engine.socket_path),
+                                token='secret', host='127.0.0.1', port=0).start()
+            self.engines.append(engine)
+            self.agents.append(agent)
+        self.backends = {
+            f'node{index}': RemoteSimJobBackend(f'node{index}', agent.url, 'secret')
+            for index, agent in enumerate(self.agents)
+        }
+
+    def tearDown(self):
+        for agent in self.agents:
+            agent.stop()
+            agent.client.close()
+        for engine in self.engines:
+            engine.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_runs_container_and_ships_results_back(self):
+        """
+        測試流程:
+          1) 兩個 agent 回報各自主機的記憶體容量（保留一成），無法連線的主機不列入
+          2) 在 node0 啟動容器：輸出目錄掛載到 agent 的結果目錄，容器不自動移除
+          3) 容器結束後仍可查詢結束狀態，下載的結果與 agent 上相同
+          4) 移除容器時一併刪除 agent 上的結果目錄
+        """
+        backends = dict(self.backends, offline=RemoteSimJobBackend('offline', 'http://127.0.0.1:9'))
+        self.assertEqual(host_capacities(backends), {
+            'node0': int(64 * GIGABYTE * 0.9),
+            'node1': int(16 * GIGABYTE * 0.9),
+        })
+
+        engine = self.engines[0]
+        client = self.backends['node0'].client()
+        name = f'coverageSimulation_{uuid.uuid4()}'
+        client.run_simulation(name, 'handoverimage', ['bash', '-c', 'run'], '/root/output',
+                              memory_limit='8g', oom_kill_disable=False)
+        result_dir = self.agents[0].result_dir(name)
+        host_config = engine.containers[name]['HostConfig']
+        self.assertEqual(host_config['Binds'], [f'{result_dir}:/root/output'])
+        self.assertEqual(host_config['Memory'], 8 * GIGABYTE)
+        self.assertFalse(host_config['AutoRemove'])
+        self.assertEqual(self.engines[1].containers, {})
+        self.assertTrue(client.inspect_container(name)['State']['Running'])
+        self.assertEqual(client.list_containers(name='Simulation_'), [name])
+
+        os.makedirs(os.path.join(result_dir, 'cells'))
+        with open(os.path.join(result_dir, 'cells', 'cell_0.csv'), 'w') as f:
+            f.write('time,cell\n0,1\n')
+        engine.memory_usage[name] = 3 * GIGABYTE
+        self.assertEqual(client.container_stats(name)['memory_usage'], 3 * GIGABYTE)
+        engine.exit_container(name, exit_code=0)
+        self.assertFalse(client.inspect_container(name)['State']['Running'])
+
+        local_dir = os.path.join(self.tmpdir, 'local', 'result')
+        self.assertTrue(client.fetch_results(name, local_dir))
+        with open(os.path.join(local_dir, 'cells', 'cell_0.csv')) as f:
+            self.assertEqual(f.read(), 'time,cell\n0,1\n')
+
+        client.remove_container(name)
+        self.assertNotIn(name, engine.containers)
+        self.assertFalse(os.path.exists(result_dir))
+        self.assertIsNone(client.inspect_container(name))
+        self.assertFalse(client.fetch_results(name, local_dir))
+
+    def test_rejects_requests_without_token(self):
+        """
+        測試流程:
+          1) 沒有 token 的請求回傳 401
+          2) 不合法的容器名稱回傳 400，不會存取 agent 根目錄以外的路徑
+          3) 沒有設定 token 的 agent 無法建立
+        """
+        with self.assertRaises(SimJobAgentError) as context:
+            SimJobAgentClient(self.agents[0].url).capacity()
+        self.assertEqual(context.exception.status, 401)
+
+        with self.assertRaises(SimJobAgentError) as context:
+            self.backends['node0'].client().run_simulation('../escape', 'handoverimage', ['true'], '/root/output')
+        self.assertEqual(context.exception.status, 400)
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, 'escape')))
+
+        # 沒有 token 時 agent 不啟動
+        with self.assertRaises(ValueError):
+            SimJobAgent(os.path.join(self.tmpdir, 'open'), token='', host='127.0.0.1', port=0)
+
+
+class RemoteSimJobMonitorTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='remote_monitor_user',
+            user_password='password',
+            user_email='remote_monitor_user@example.com'
+        )
+        self.tmpdir = tempfile.mkdtemp(prefix='sim-remote-monitor-')
+        self.engine = FakeDockerEngine().start()
+        self.agent = SimJobAgent(os.path.join(self.tmpdir, 'agent'),
+                                 client=DockerEngineClient(self.engine.socket_path),
+                                 token='secret', host='127.0.0.1', port=0).start()
+        self.backend = RemoteSimJobBackend('node0', self.agent.url, 'secret')
+
+    def tearDown(self):
+        self.agent.stop()
+        self.agent.client.close()
+        self.engine.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_nonzero_exit_with_all_cells_completes(self):
+        """
+        測試流程:
+          1) handover 模擬寫出參數中所有 cell（ideal 與 actual）後以代碼 1 結束
+          2) 結果下載後與正常結束相同地分析：模擬為 completed，佇列作業標記完成，不保存為部分結果
+        """
+        sim_type = get_sim_job_type('handover')
+        handover = Handover.objects.create(handover_name='exit_nonzero', handover_parameter={'cell_ut': '2Cell_10UT'},
+                                           handover_status='processing', f_user_uid=self.user)
+        queue_job = SimJobQueue.objects.create(simJobQueue_sim_type='handover',
+                                               simJobQueue_target_uid=handover.handover_uid,
+                                               simJobQueue_status='running', simJobQueue_host='node0',
+                                               f_user_uid=self.user)
+        start_time = timezone.now()
+        sim_job = sim_type.create_sim_job(handover, start_time)
+        name = sim_type.container_name(handover.handover_uid)
+        self.backend.client().run_simulation(name, 'handoverimage', ['true'], sim_type.output_dir)
+        for situation in ('ideal', 'actual'):
+            for cell in ('cell_0', 'cell_1'):
+                write_cell(self.agent.result_dir(name), situation, cell, [1])
+        self.engine.exit_container(name, exit_code=1)
+
+        post_processor = mock.Mock()
+        post_processor.analyze.return_value = {'handover_simulation_result': {}}
+        post_processor.generate_report.return_value = 'report.pdf'
+        local_dir = os.path.join(self.tmpdir, 'result')
+        with mock.patch.object(simJobLifecycle, 'get_sim_post_processor', return_value=post_processor):
+            simJobLifecycle._monitor_remote_sim_job(queue_job, sim_type, handover, sim_job, local_dir, name,
+                                                    start_time, self.backend)
+
+        self.assertEqual(sorted(os.listdir(os.path.join(local_dir, 'ideal', 'cell_analysis'))), ['cell_0', 'cell_1'])
+        self.assertNotIn(name, self.engine.containers)
+        handover.refresh_from_db()
+        self.assertEqual(handover.handover_status, 'completed')
+        queue_job.refresh_from_db()
+        self.assertEqual(queue_job.simJobQueue_status, 'completed')
+        self.assertFalse(queue_job.simJobQueue_partial_result)
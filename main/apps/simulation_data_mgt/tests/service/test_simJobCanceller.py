@@ -0,0 +1,78 @@
+from django.test import TestCase
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.CoverageSimJobModel import CoverageSimJob
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.dockerEngineClient import DockerEngineClient
+from main.apps.simulation_data_mgt.services.simJobCanceller import SimJobReaper, cancel_user_jobs
+from main.apps.simulation_data_mgt.tests.service.fakeDockerEngine import FakeDockerEngine
+
+
+class SimJobCancellerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='canceller_user',
+            user_password='password',
+            user_email='canceller_user@example.com'
+        )
+        self.engine = FakeDockerEngine().start()
+        self.client = DockerEngineClient(self.engine.socket_path)
+        self.reaper = SimJobReaper(concurrency=4, client=self.client)
+
+    def tearDown(self):
+        self.client.close()
+        self.engine.stop()
+
+    def create_job(self, name, status):
+        coverage = Coverage.objects.create(
+            coverage_name=name,
+            coverage_parameter={},
+            coverage_status='processing',
+            f_user_uid=self.user
+        )
+        container_name = f'coverageSimulation_{coverage.coverage_uid}'
+        if status == 'running':
+            self.client.run_container(container_name, 'handoverimage', ['sleep', 'infinity'])
+            CoverageSimJob.objects.create(f_coverage_uid=coverage)
+        queue_job = SimJobQueue.objects.create(
+            simJobQueue_sim_type='coverage',
+            simJobQueue_target_uid=coverage.coverage_uid,
+            simJobQueue_status=status,
+            simJobQueue_container_name=container_name if status == 'running' else '',
+            f_user_uid=self.user
+        )
+        return coverage, queue_job
+
+    def test_cancels_user_jobs_without_waiting_for_containers(self):
+        """
+        測試流程:
+          1) 取消使用者的所有作業：排隊中的作業直接取消，執行中的作業標記為 cancelling，容器尚未停止
+          2) reaper 平行停止並移除容器，作業與模擬標記為 cancelled，未結束的 SimJob 被刪除
+          3) 已完成的作業不受影響，重複 reap 沒有影響
+        """
+        queued, queued_job = self.create_job('queued', 'queued')
+        running = [self.create_job(f'running_{i}', 'running') for i in range(3)]
+        _, completed_job = self.create_job('completed', 'completed')
+
+        result = cancel_user_jobs(self.user.user_uid, reaper=self.reaper)
+        self.assertEqual(result, {'cancelled': 1, 'cancelling': 3})
+        queued_job.refresh_from_db()
+        self.assertEqual(queued_job.simJobQueue_status, 'cancelled')
+        queued.refresh_from_db()
+        self.assertEqual(queued.coverage_status, 'cancelled')
+        self.assertEqual(len(self.engine.containers), 3)
+        self.assertEqual(SimJobQueue.objects.filter(simJobQueue_status='cancelling').count(), 3)
+
+        self.assertEqual(self.reaper.reap(), 3)
+        self.assertEqual(self.engine.containers, {})
+        for coverage, queue_job in running:
+            coverage.refresh_from_db()
+            queue_job.refresh_from_db()
+            self.assertEqual(coverage.coverage_status, 'cancelled')
+            self.assertEqual(queue_job.simJobQueue_status, 'cancelled')
+            self.assertIsNotNone(queue_job.simJobQueue_end_time)
+        self.assertFalse(CoverageSimJob.objects.exists())
+
+        completed_job.refresh_from_db()
+        self.assertEqual(completed_job.simJobQueue_status, 'completed')
+        self.assertEqual(self.reaper.reap(), 0)
@@ -0,0 +1,249 @@
+import threading
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.simJobExecutor import SimJobExecutor, fair_share_order
+
+
+class SimJobExecutorTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='executor_user',
+            user_password='password',
+            user_email='executor_user@example.com'
+        )
+        self.release = threading.Event()
+        self.started = []
+        self.finished = threading.Semaphore(0)
+        self.executors = []
+
+    def tearDown(self):
+        self.release.set()
+        for executor in self.executors:
+            executor.shutdown()
+
+    def fake_simulation(self, queue_job):
+        self.started.append(str(queue_job.simJobQueue_target_uid))
+        self.release.wait(5)
+        SimJobQueue.objects.filter(pk=queue_job.pk).update(simJobQueue_status='completed')
+        self.finished.release()
+
+    def test_caps_concurrent_jobs_and_queues_the_rest(self):
+        """
+        測試流程:
+          1) 上限 2 的執行器提交 5 個會阻塞的作業
+          2) 確認只有 2 個作業在執行，其餘 3 個排隊
+          3) 放行後所有作業都執行完畢
+        """
+        executor = SimJobExecutor(max_workers=2, poll_interval=0.1, runner=self.fake_simulation,
+                                  memory_capacity=lambda: None)
+        self.executors.append(executor)
+        target_uids = [str(uuid.uuid4()) for _ in range(5)]
+
+        positions = [executor.submit('handover', target_uid, self.user.user_uid) for target_uid in target_uids]
+        self.assertEqual(positions, [0, 0, 1, 2, 3])
+
+        # 重複提交同一作業不會再加入佇列
+        self.assertEqual(executor.submit('handover', target_uids[4], self.user.user_uid), 3)
+        self.assertEqual(SimJobQueue.objects.count(), 5)
+
+        status = executor.status()
+        self.assertEqual(status['max_workers'], 2)
+        self.assertEqual(status['queue_depth'] + status['running_count'], 5)
+        self.assertLessEqual(status['running_count'], 2)
+
+        self.release.set()
+        for _ in range(5):
+            self.assertTrue(self.finished.acquire(timeout=10))
+        self.assertEqual(sorted(self.started), sorted(target_uids))
+        self.assertEqual(SimJobQueue.objects.filter(simJobQueue_status='completed').count(), 5)
+
+    def test_only_one_unfinished_job_per_target(self):
+        """
+        測試流程:
+          1) 同一個模擬已有執行中的佇列紀錄時，資料庫拒絕第二筆未結束的紀錄
+          2) 兩個請求同時通過檢查（模擬競爭）時，submit 回傳既有作業的位置，不會建立第二筆
+          3) 作業結束後可以再次排入佇列
+        """
+        executor = SimJobExecutor(max_workers=1, poll_interval=0.1, runner=self.fake_simulation,
+                                  memory_capacity=lambda: None)
+        self.executors.append(executor)
+        target_uid = str(uuid.uuid4())
+        running = SimJobQueue.objects.create(
+            simJobQueue_sim_type='handover',
+            simJobQueue_target_uid=target_uid,
+            simJobQueue_status='running',
+            f_user_uid=self.user
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            SimJobQueue.objects.create(simJobQueue_sim_type='handover', simJobQueue_target_uid=target_uid,
+                                       f_user_uid=self.user)
+
+        executor.active_job = lambda sim_type, uid: None
+        self.assertEqual(executor.submit('handover', target_uid, self.user.user_uid), 0)
+        self.assertEqual(executor.submit_many('handover', [(target_uid, self.user.user_uid, {})]), 0)
+        self.assertEqual(SimJobQueue.objects.filter(simJobQueue_target_uid=target_uid).count(), 1)
+
+        SimJobQueue.objects.filter(pk=running.pk).update(simJobQueue_status='failed')
+        SimJobQueue.objects.create(simJobQueue_sim_type='handover', simJobQueue_target_uid=target_uid,
+                                   simJobQueue_status='completed', f_user_uid=self.user)
+        self.assertEqual(SimJobQueue.objects.filter(simJobQueue_target_uid=target_uid).count(), 2)
+
+    def test_adopted_job_is_resumed(self):
+        """
+        測試流程:
+          1) 建立一筆 running 作業
+          2) adopt 後由 resumer 接手，而不是重新啟動模擬
+        """
+        resumed = []
+        done = threading.Event()
+
+        def fake_resume(queue_job):
+            resumed.append(queue_job.simJobQueue_uid)
+            done.set()
+
+        executor = SimJobExecutor(max_workers=1, poll_interval=0.1, runner=self.fake_simulation, resumer=fake_resume,
+                                  memory_capacity=lambda: None)
+        self.executors.append(executor)
+        queue_job = SimJobQueue.objects.create(
+            simJobQueue_sim_type='coverage',
+            simJobQueue_target_uid=uuid.uuid4(),
+            simJobQueue_status='running',
+            f_user_uid=self.user
+        )
+        executor.adopt(queue_job)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(resumed, [queue_job.simJobQueue_uid])
+        self.assertEqual(self.started, [])
+
+    def test_admits_jobs_that_fit_free_memory(self):
+        """
+        測試流程:
+          1) 容量 10g，已有一個預留 8g 的作業執行中
+          2) 最早排隊的 6g 作業放不下，改領取後面的 2g 作業並以估計值作為預留量
+          3) 被取消、容器尚未停止的作業仍計入預留的記憶體與執行名額
+          4) 最早的作業等待過久時不再讓其他作業插隊
+        """
+        gigabyte = 1024 ** 3
+        estimates = {}
+
+        def fake_estimate(queue_job):
+            return estimates[str(queue_job.simJobQueue_target_uid)]
+
+        executor = SimJobExecutor(max_workers=4, memory_estimator=fake_estimate,
+                                  memory_capacity=lambda: 10 * gigabyte)
+        SimJobQueue.objects.create(
+            simJobQueue_sim_type='handover',
+            simJobQueue_target_uid=uuid.uuid4(),
+            simJobQueue_status='running',
+            simJobQueue_memory_limit=8 * gigabyte,
+            f_user_uid=self.user
+        )
+        large = SimJobQueue.objects.create(
+            simJobQueue_sim_type='handover',
+            simJobQueue_target_uid=uuid.uuid4(),
+            f_user_uid=self.user
+        )
+        small = SimJobQueue.objects.create(
+            simJobQueue_sim_type='coverage',
+            simJobQueue_target_uid=uuid.uuid4(),
+            f_user_uid=self.user
+        )
+        another_small = SimJobQueue.objects.create(
+            simJobQueue_sim_type='coverage',
+            simJobQueue_target_uid=uuid.uuid4(),
+            f_user_uid=self.user
+        )
+        estimates[str(large.simJobQueue_target_uid)] = 6 * gigabyte
+        estimates[str(small.simJobQueue_target_uid)] = 2 * gigabyte
+        estimates[str(another_small.simJobQueue_target_uid)] = 2 * gigabyte
+
+        claimed = executor._claim_next_job()
+        self.assertEqual(claimed.pk, small.pk)
+        self.assertEqual(claimed.simJobQueue_memory_limit, 2 * gigabyte)
+
+        # 已預留 10g，沒有空間
+        self.assertIsNone(executor._claim_next_job())
+        # 取消中的作業仍預留 2g
+        SimJobQueue.objects.filter(pk=claimed.pk).update(simJobQueue_status='cancelling')
+        self.assertIsNone(executor._claim_next_job())
+        self.assertEqual(executor.status()['memory_reserved'], 10 * gigabyte)
+        executor.max_workers = 2
+        estimates[str(another_small.simJobQueue_target_uid)] = 0
+        self.assertIsNone(executor._claim_next_job())
+        executor.max_workers = 4
+        estimates[str(another_small.simJobQueue_target_uid)] = 2 * gigabyte
+
+        SimJobQueue.objects.filter(pk=claimed.pk).update(simJobQueue_status='completed')
+        SimJobQueue.objects.filter(pk=large.pk).update(
+            simJobQueue_enqueue_time=timezone.now() - timedelta(hours=1))
+        self.assertIsNone(executor._claim_next_job())
+
+
+class FairShareOrderTestCase(SimpleTestCase):
+    def job(self, name, user_uid, minute, status='queued', expected_runtime=None):
+        return SimpleNamespace(
+            name=name,
+            f_user_uid_id=user_uid,
+            simJobQueue_status=status,
+            simJobQueue_enqueue_time=timezone.now().replace(microsecond=0) + timedelta(minutes=minute),
+            simJobQueue_expected_runtime=expected_runtime
+        )
+
+    def test_interleaves_users_by_weighted_share(self):
+        """
+        測試流程:
+          1) 使用者 heavy 先送出 3 個作業且已有 1 個在執行，light 之後才送出 2 個
+          2) light 的作業不會被 heavy 的大量作業卡住
+          3) 權重加倍的使用者可分得兩倍的名額
+        """
+        jobs = [
+            self.job('heavy-running', 'heavy', 0, status='running'),
+            self.job('heavy-1', 'heavy', 1),
+            self.job('heavy-2', 'heavy', 2),
+            self.job('heavy-3', 'heavy', 3),
+            self.job('light-1', 'light', 4),
+            self.job('light-2', 'light', 5),
+        ]
+        self.assertEqual(
+            [job.name for job in fair_share_order(jobs)],
+            ['light-1', 'heavy-1', 'light-2', 'heavy-2', 'heavy-3']
+        )
+        self.assertEqual(
+            [job.name for job in fair_share_order(jobs, {'heavy': 2})],
+            ['light-1', 'heavy-1', 'heavy-2', 'light-2', 'heavy-3']
+        )
+
+    def test_shortest_expected_job_first(self):
+        """
+        測試流程:
+          1) 同一使用者的作業依預估執行時間排列，沒有預估值的排在最後
+          2) 使用者之間仍依公平份額輪流
+          3) 等待過久的作業不再被較短的作業插隊
+        """
+        jobs = [
+            self.job('long', 'a', 0, expected_runtime=8 * 3600),
+            self.job('unknown', 'a', 1),
+            self.job('short', 'a', 2, expected_runtime=600),
+            self.job('other', 'b', 3, expected_runtime=7200),
+        ]
+        self.assertEqual(
+            [job.name for job in fair_share_order(jobs, shortest_first=True)],
+            ['short', 'other', 'long', 'unknown']
+        )
+        self.assertEqual(
+            [job.name for job in fair_share_order(jobs)],
+            ['long', 'other', 'unknown', 'short']
+        )
+
+        jobs[0].simJobQueue_enqueue_time -= timedelta(hours=3)
+        self.assertEqual(
+            [job.name for job in fair_share_order(jobs, shortest_first=True)][:2],
+            ['long', 'other']
+        )
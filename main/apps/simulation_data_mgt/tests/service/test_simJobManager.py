@@ -0,0 +1,71 @@
+import json
+import os
+import shutil
+import tempfile
+from django.test import TestCase
+from django.urls import reverse
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.CoverageSimJobModel import CoverageSimJob
+from main.apps.simulation_data_mgt.services.simJobTypes import SIM_JOB_TYPES
+
+
+class SimJobManagerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='manager_user',
+            user_password='password',
+            user_email='manager_user@example.com'
+        )
+        self.result_dir = tempfile.mkdtemp(prefix='sim-job-manager-')
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def post(self, url_name, data):
+        return self.client.post(reverse(url_name), data=json.dumps(data), content_type='application/json')
+
+    def test_registers_views_for_every_simulation_type(self):
+        """
+        測試流程:
+          1) 每個模擬類型都有原本路徑與名稱的 run / delete / download API
+          2) 缺少參數、找不到資料時回傳與原本相同的錯誤訊息
+          3) 已有執行中的 SimJob 時不重複送出；下載結果目錄中的 PDF 報告；刪除結果與 SimJob
+        """
+        for name in SIM_JOB_TYPES:
+            for action in (f'run_{name}_sim_job', f'delete_{name}_sim_result', f'download_{name}_sim_result'):
+                self.assertEqual(reverse(action), f'/api/1.0/simulation_data_mgt/{name}SimJobManager/{action}')
+
+        response = self.post('run_coverage_sim_job', {})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], '缺少 coverage_uid 參數')
+        response = self.post('download_gso_sim_result', {'gso_uid': '00000000-0000-0000-0000-000000000000'})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['message'], 'Gso not found')
+
+        coverage = Coverage.objects.create(
+            coverage_name='manager',
+            coverage_parameter={'simEndTime': '60'},
+            coverage_status='processing',
+            f_user_uid=self.user
+        )
+        coverage.coverage_data_path = self.result_dir
+        coverage.save()
+        sim_job = CoverageSimJob.objects.create(f_coverage_uid=coverage)
+        response = self.post('run_coverage_sim_job', {'coverage_uid': str(coverage.coverage_uid)})
+        self.assertEqual(response.json()['status'], 'info')
+        self.assertEqual(response.json()['data']['coverageSimJob_uid'], str(sim_job.coverageSimJob_uid))
+
+        with open(os.path.join(self.result_dir, 'coverage_simulation_report.pdf'), 'wb') as f:
+            f.write(b'%PDF-1.4')
+        response = self.post('download_coverage_sim_result', {'coverage_uid': str(coverage.coverage_uid)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'%PDF-1.4')
+        self.assertIn('coverage_simulation_report.pdf', response['Content-Disposition'])
+
+        response = self.post('delete_coverage_sim_result', {'coverage_uid': str(coverage.coverage_uid)})
+        self.assertEqual(response.json()['message'], 'Coverage simulation result and related jobs deleted successfully')
+        self.assertFalse(os.path.exists(self.result_dir))
+        self.assertFalse(CoverageSimJob.objects.exists())
+        coverage.refresh_from_db()
+        self.assertEqual(coverage.coverage_status, 'None')
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.meta_data_mgt.models.HandoverModel import Handover
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.simJobProgress import expected_cell_count, expected_runtime, job_progress
+from main.apps.simulation_data_mgt.services.simResultCache import CACHE_RESTORED_MESSAGE
+
+
+class SimJobProgressTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='progress_user',
+            user_password='password',
+            user_email='progress_user@example.com'
+        )
+        self.result_dir = tempfile.mkdtemp(prefix='sim-progress-')
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def queue_job(self, sim_type, target_uid, status, started_seconds_ago, duration=None, **fields):
+        now = timezone.now()
+        return SimJobQueue.objects.create(
+            simJobQueue_sim_type=sim_type,
+            simJobQueue_target_uid=target_uid,
+            simJobQueue_status=status,
+            simJobQueue_start_time=now - timedelta(seconds=started_seconds_ago),
+            simJobQueue_end_time=now - timedelta(seconds=started_seconds_ago - duration) if duration else None,
+            f_user_uid=self.user,
+            **fields
+        )
+
+    def test_expected_cell_count(self):
+        self.assertEqual(expected_cell_count({'cell_ut': '31Cell_220UT'}), 31)
+        self.assertIsNone(expected_cell_count({'cell_ut': ''}))
+        self.assertIsNone(expected_cell_count('{"cell_ut": "31Cell_220UT"}'))
+
+    def test_progress_from_written_cells(self):
+        """
+        測試流程:
+          1) handover 參數 cell_ut 為 2 個 cell，ideal 與 actual 共應寫出 4 個 statistics.csv
+          2) 已執行 100 秒、寫出 2 個檔案：進度 50%，預估還需 100 秒
+        """
+        handover = Handover.objects.create(
+            handover_name='progress',
+            handover_parameter={'cell_ut': '2Cell_1UT'},
+            handover_status='processing',
+            f_user_uid=self.user
+        )
+        for situation in ('ideal', 'actual'):
+            cell_dir = os.path.join(self.result_dir, situation, 'cell_analysis', 'cell_0')
+            os.makedirs(cell_dir)
+            open(os.path.join(cell_dir, 'statistics.csv'), 'w').close()
+        self.queue_job('handover', handover.handover_uid, 'running', 100, simJobQueue_result_dir=self.result_dir)
+
+        progress = job_progress('handover', handover.handover_uid)
+        self.assertEqual((progress['method'], progress['progress']), ('cells', 0.5))
+        self.assertEqual((progress['cells_written'], progress['cells_expected']), (2, 4))
+        self.assertAlmostEqual(progress['eta_seconds'], 100, delta=2)
+
+    def test_progress_from_history(self):
+        """
+        測試流程:
+          1) 過去完成的 coverage 作業執行時間中位數為 400 秒，以快取完成的作業不列入
+          2) 已執行 100 秒：進度約 25%，預估還需約 300 秒
+          3) 已完成的模擬進度為 100%
+        """
+        for duration in (300, 400, 500):
+            self.queue_job('coverage', Coverage.objects.create(
+                coverage_name='history', coverage_parameter={}, coverage_status='completed', f_user_uid=self.user
+            ).coverage_uid, 'completed', 1000, duration)
+        self.queue_job('coverage', Coverage.objects.create(
+            coverage_name='cached', coverage_parameter={}, coverage_status='completed', f_user_uid=self.user
+        ).coverage_uid, 'completed', 1000, 1, simJobQueue_message=CACHE_RESTORED_MESSAGE)
+        self.assertEqual(expected_runtime('coverage'), 400)
+
+        coverage = Coverage.objects.create(
+            coverage_name='running', coverage_parameter={}, coverage_status='processing', f_user_uid=self.user
+        )
+        self.queue_job('coverage', coverage.coverage_uid, 'running', 100)
+        progress = job_progress('coverage', coverage.coverage_uid)
+        self.assertEqual(progress['method'], 'history')
+        self.assertAlmostEqual(progress['progress'], 0.25, delta=0.01)
+        self.assertAlmostEqual(progress['eta_seconds'], 300, delta=2)
+
+        completed = Coverage.objects.filter(coverage_status='completed').first()
+        self.assertEqual(job_progress('coverage', completed.coverage_uid)['progress'], 1.0)
+        self.assertIsNone(job_progress('coverage', '00000000-0000-0000-0000-000000000000'))
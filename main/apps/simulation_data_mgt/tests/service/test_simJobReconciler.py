@@ -0,0 +1,82 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.simulation_data_mgt.models.CoverageSimJobModel import CoverageSimJob
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.simJobExecutor import WORKER_ID
+from main.apps.simulation_data_mgt.services.simJobReconciler import reconcile_sim_jobs
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.adopted = []
+
+    def adopt(self, queue_job):
+        self.adopted.append(queue_job)
+
+
+class SimJobReconcilerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='reconciler_user',
+            user_password='password',
+            user_email='reconciler_user@example.com'
+        )
+
+    def create_coverage(self, name):
+        return Coverage.objects.create(
+            coverage_name=name,
+            coverage_parameter={},
+            coverage_status='processing',
+            f_user_uid=self.user
+        )
+
+    def test_adopts_jobs_left_behind_by_restarted_process(self):
+        """
+        測試流程:
+          1) heartbeat 逾時的 running 作業會被接手，heartbeat 正常的作業不會
+          2) 沒有佇列紀錄的模擬容器會補建紀錄並接手
+          3) 尚未結束但沒有佇列紀錄的 SimJob 會補建紀錄並接手
+        """
+        stale = self.create_coverage('stale')
+        alive = self.create_coverage('alive')
+        orphan_container = self.create_coverage('orphan_container')
+        orphan_sim_job = self.create_coverage('orphan_sim_job')
+
+        stale_job = SimJobQueue.objects.create(
+            simJobQueue_sim_type='coverage',
+            simJobQueue_target_uid=stale.coverage_uid,
+            simJobQueue_status='running',
+            simJobQueue_worker='previous-host:1',
+            simJobQueue_heartbeat_time=timezone.now() - timedelta(hours=1),
+            f_user_uid=self.user
+        )
+        SimJobQueue.objects.create(
+            simJobQueue_sim_type='coverage',
+            simJobQueue_target_uid=alive.coverage_uid,
+            simJobQueue_status='running',
+            simJobQueue_worker='other-host:1',
+            simJobQueue_heartbeat_time=timezone.now(),
+            f_user_uid=self.user
+        )
+        CoverageSimJob.objects.create(f_coverage_uid=orphan_sim_job)
+
+        executor = FakeExecutor()
+        adopted = reconcile_sim_jobs(
+            executor=executor,
+            containers=[f'coverageSimulation_{orphan_container.coverage_uid}', 'unrelated_container']
+        )
+
+        self.assertEqual(adopted, 3)
+        self.assertEqual(
+            sorted(str(job.simJobQueue_target_uid) for job in executor.adopted),
+            sorted(str(obj.coverage_uid) for obj in [stale, orphan_container, orphan_sim_job])
+        )
+        stale_job.refresh_from_db()
+        self.assertEqual(stale_job.simJobQueue_worker, WORKER_ID)
+        self.assertEqual(SimJobQueue.objects.filter(simJobQueue_status='running').count(), 4)
+
+        # 第二次比對不會重複接手
+        self.assertEqual(reconcile_sim_jobs(executor=FakeExecutor(), containers=[]), 0)
@@ -0,0 +1,186 @@
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.HandoverModel import Handover
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import analyzeHandoverResult
+from main.apps.simulation_data_mgt.services.dockerEngineClient import DockerEngineClient
+from main.apps.simulation_data_mgt.services.simJobBackends import LocalSimJobBackend
+from main.apps.simulation_data_mgt.services.simJobExecutor import SimJobExecutor
+from main.apps.simulation_data_mgt.services.simJobLifecycle import _monitor_sharded_sim_job, _start_shard
+from main.apps.simulation_data_mgt.services.simJobShards import (
+    SHARD_DIR_NAME, merge_shard_results, new_shards, plan_shards, shard_count
+)
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.services.simMemoryEstimator import estimate_queue_job_memory
+from main.apps.simulation_data_mgt.tests.service.cellStatisticsFixture import write_cell
+from main.apps.simulation_data_mgt.tests.service.fakeDockerEngine import FakeDockerEngine
+
+GIGABYTE = 1024 ** 3
+
+
+class SimJobShardsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='shard_user',
+            user_password='password',
+            user_email='shard_user@example.com'
+        )
+        self.handover = get_sim_job_type('handover')
+        self.result_dir = tempfile.mkdtemp(prefix='sim-shards-')
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    @override_settings(SIM_JOB_CELL_SHARDS=4, SIM_JOB_MIN_CELLS_PER_SHARD=8)
+    def test_shard_count_and_plan(self):
+        """
+        測試流程:
+          1) 31 個 cell、每個分片至少 8 個 cell：拆成 3 個分片；38 個 cell 拆成上限的 4 個
+          2) cell 數不足、參數沒有 cell_ut 或模擬器不支援分片的類型不拆分
+          3) 分片為大小相近的連續區間，涵蓋所有 cell
+        """
+        self.assertEqual(shard_count(self.handover, {'cell_ut': '31Cell_220UT'}), 3)
+        self.assertEqual(shard_count(self.handover, {'cell_ut': '38Cell_300UT'}), 4)
+        self.assertEqual(shard_count(self.handover, {'cell_ut': '12Cell_100UT'}), 1)
+        self.assertEqual(shard_count(self.handover, {}), 1)
+        self.assertEqual(shard_count(get_sim_job_type('coverage'), {'cell_ut': '38Cell_300UT'}), 1)
+        with self.settings(SIM_JOB_CELL_SHARDS=1):
+            self.assertEqual(shard_count(self.handover, {'cell_ut': '38Cell_300UT'}), 1)
+
+        shards = plan_shards(31, 3)
+        self.assertEqual([len(cells) for cells in shards], [11, 10, 10])
+        self.assertEqual(sum(shards, []), list(range(31)))
+
+    @override_settings(SIM_JOB_CELL_SHARDS=4, SIM_JOB_MIN_CELLS_PER_SHARD=8)
+    def test_sharded_job_reserves_memory_per_shard(self):
+        """
+        測試流程:
+          1) 提交 38 個 cell 的 handover：佇列紀錄記下 4 個分片
+          2) 預留記憶體為單一容器的估計乘上分片數
+        """
+        target = Handover.objects.create(handover_name='sharded', handover_parameter={'cell_ut': '38Cell_300UT'},
+                                         handover_status='queued', f_user_uid=self.user)
+        executor = SimJobExecutor(max_workers=1, memory_capacity=lambda: None)
+        executor.start = lambda: None
+        executor.submit('handover', target.handover_uid, self.user.user_uid, target.handover_parameter)
+        queue_job = SimJobQueue.objects.get(simJobQueue_target_uid=target.handover_uid)
+        self.assertEqual(queue_job.simJobQueue_shard_count, 4)
+        self.assertEqual(estimate_queue_job_memory(queue_job), 4 * 100 * GIGABYTE)
+
+    def test_merges_shard_outputs_before_analysis(self):
+        """
+        測試流程:
+          1) 結果目錄保留一個先前完成的 cell，兩個分片各寫出自己的 cell 與一個共用檔案
+          2) 合併後分片目錄被刪除，所有 cell 都在結果目錄，共用檔案保留編號較大的分片的版本
+          3) 合併後的分析結果包含所有 cell
+        """
+        write_cell(self.result_dir, 'ideal', 'cell_0', [1])
+        write_cell(self.result_dir, 'actual', 'cell_0', [1])
+        shards = new_shards('handoverSimulation_x', self.result_dir, 4, 2)
+        self.assertEqual([shard['cells'] for shard in shards], [[0, 1], [2, 3]])
+        for shard, cells in zip(shards, (['cell_1'], ['cell_2', 'cell_3'])):
+            for cell in cells:
+                write_cell(shard['result_dir'], 'ideal', cell, [3])
+                write_cell(shard['result_dir'], 'actual', cell, [3])
+            with open(os.path.join(shard['result_dir'], 'run.log'), 'w') as f:
+                f.write(str(shard['index']))
+
+        self.assertEqual(merge_shard_results(self.result_dir), 8)
+        self.assertFalse(os.path.exists(os.path.join(self.result_dir, SHARD_DIR_NAME)))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.result_dir, 'ideal', 'cell_analysis'))),
+                         ['cell_0', 'cell_1', 'cell_2', 'cell_3'])
+        with open(os.path.join(self.result_dir, 'run.log')) as f:
+            self.assertEqual(f.read(), '1')
+        result = analyzeHandoverResult(self.result_dir)
+        self.assertAlmostEqual(result['handover_simulation_result']['avg_cells_handover_count'], 2.5)
+
+
+class ShardContainerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='shard_container_user',
+            user_password='password',
+            user_email='shard_container_user@example.com'
+        )
+        self.engine = FakeDockerEngine().start()
+        self.client = DockerEngineClient(self.engine.socket_path)
+        self.result_dir = tempfile.mkdtemp(prefix='sim-shard-container-')
+
+    def tearDown(self):
+        self.client.close()
+        self.engine.stop()
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def test_retried_shard_skips_written_cells(self):
+        """
+        測試流程:
+          1) 分片容器只模擬分片的 cell，輸出目錄掛載到分片目錄，容器不自動移除
+          2) 分片寫出一個 cell 後失敗：重新啟動同名容器，已寫出的 cell 以 completed_cells 傳給模擬器
+        """
+        sim_type = get_sim_job_type('handover')
+        handover = Handover.objects.create(handover_name='shard', handover_parameter={'cell_ut': '4Cell_10UT'},
+                                           handover_status='processing', f_user_uid=self.user)
+        container_name = sim_type.container_name(uuid.uuid4())
+        shard = new_shards(container_name, self.result_dir, 4, 2)[1]
+        backend = LocalSimJobBackend(self.client)
+
+        _start_shard(sim_type, handover, shard, 2, self.result_dir, backend, 8 * GIGABYTE, False)
+        container = self.engine.containers[shard['container_name']]
+        self.assertEqual(container['HostConfig']['Binds'],
+                         [f"{os.path.abspath(shard['result_dir'])}:{sim_type.output_dir}"])
+        self.assertFalse(container['HostConfig']['AutoRemove'])
+        parameter = json.loads(container['Config']['Cmd'][2].split(' ', 1)[1].strip("'"))
+        self.assertEqual(parameter, {'cell_ut': '4Cell_10UT', 'cells': [2, 3], 'shard_index': 1, 'shard_count': 2})
+        self.assertEqual((shard['status'], shard['attempts']), ('running', 1))
+
+        write_cell(shard['result_dir'], 'ideal', 'cell_2', [1])
+        write_cell(shard['result_dir'], 'actual', 'cell_2', [1])
+        self.engine.exit_container(shard['container_name'], exit_code=1)
+        _start_shard(sim_type, handover, shard, 2, self.result_dir, backend, 8 * GIGABYTE, False)
+        container = self.engine.containers[shard['container_name']]
+        self.assertTrue(container['State']['Running'])
+        parameter = json.loads(container['Config']['Cmd'][2].split(' ', 1)[1].strip("'"))
+        self.assertEqual(parameter['completed_cells'], {'ideal': ['cell_2'], 'actual': ['cell_2']})
+        self.assertEqual(shard['attempts'], 2)
+
+    def test_oom_killed_shard_records_per_shard_limit(self):
+        """
+        測試流程:
+          1) 2 個分片的作業預留 16g，每個分片容器上限 8g；其中一個分片因 OOM 被終止
+          2) 其他分片被移除，作業重新排隊，記錄的峰值為單一分片的 8g
+          3) 下次估計每個分片加倍為 16g，作業預留 32g（而不是以整個作業的預留量再加倍）
+        """
+        sim_type = get_sim_job_type('handover')
+        handover = Handover.objects.create(handover_name='shard_oom', handover_parameter={'cell_ut': '4Cell_10UT'},
+                                           handover_status='processing', f_user_uid=self.user)
+        container_name = sim_type.container_name(handover.handover_uid)
+        shards = new_shards(container_name, self.result_dir, 4, 2)
+        backend = LocalSimJobBackend(self.client)
+        for shard in shards:
+            _start_shard(sim_type, handover, shard, 2, self.result_dir, backend, 8 * GIGABYTE, False)
+        queue_job = SimJobQueue.objects.create(
+            simJobQueue_sim_type='handover',
+            simJobQueue_target_uid=handover.handover_uid,
+            simJobQueue_status='running',
+            simJobQueue_parameter_key='shard-oom',
+            simJobQueue_memory_limit=16 * GIGABYTE,
+            simJobQueue_shard_count=2,
+            simJobQueue_shards=shards,
+            f_user_uid=self.user
+        )
+        self.engine.exit_container(shards[0]['container_name'], exit_code=137, oom_killed=True)
+        start_time = timezone.now()
+        sim_job = sim_type.create_sim_job(handover, start_time)
+
+        _monitor_sharded_sim_job(queue_job, sim_type, handover, sim_job, self.result_dir, start_time, backend)
+        self.assertNotIn(shards[1]['container_name'], self.engine.containers)
+        queue_job.refresh_from_db()
+        self.assertEqual((queue_job.simJobQueue_status, queue_job.simJobQueue_oom_count), ('queued', 1))
+        self.assertEqual(queue_job.simJobQueue_peak_memory, 8 * GIGABYTE)
+        self.assertEqual(estimate_queue_job_memory(queue_job), 2 * 16 * GIGABYTE)
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.CoverageSimJobModel import CoverageSimJob
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.models.SimJobTelemetryModel import SimJobTelemetry
+from main.apps.simulation_data_mgt.services.simJobTelemetry import (
+    MAX_SAMPLES, SimJobTelemetryRecorder, job_telemetry, telemetry_summary
+)
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+
+GIB = 1024 ** 3
+
+
+def stats(memory, cpu, block_read=0, block_write=0):
+    return {
+        'memory_usage': memory,
+        'memory_peak': memory,
+        'cpu_seconds': cpu,
+        'block_read_bytes': block_read,
+        'block_write_bytes': block_write,
+    }
+
+
+class SimJobTelemetryTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='telemetry_user',
+            user_password='password',
+            user_email='telemetry_user@example.com'
+        )
+        self.sim_type = get_sim_job_type('coverage')
+
+    def start_run(self, status='completed', parameter_key='key-a', shared_container=False):
+        coverage = Coverage.objects.create(
+            coverage_name='telemetry',
+            coverage_parameter={},
+            coverage_status='processing',
+            f_user_uid=self.user
+        )
+        start_time = timezone.now() - timedelta(seconds=600)
+        sim_job = CoverageSimJob.objects.create(f_coverage_uid=coverage, coverageSimJob_start_time=start_time)
+        queue_job = SimJobQueue.objects.create(
+            simJobQueue_sim_type='coverage',
+            simJobQueue_target_uid=coverage.coverage_uid,
+            simJobQueue_status=status,
+            simJobQueue_parameter_key=parameter_key,
+            f_user_uid=self.user
+        )
+        recorder = SimJobTelemetryRecorder(queue_job, self.sim_type, sim_job, 'container', start_time,
+                                           shared_container=shared_container)
+        return coverage, queue_job, recorder
+
+    def test_records_and_summarizes_resource_usage(self):
+        """
+        測試流程:
+          1) 記錄記憶體峰值、累計 CPU 秒數與區塊讀寫量，結束時狀態取自佇列作業
+          2) 暖容器中的執行以第一次取樣為基準扣除先前作業的計數
+          3) 依模擬類型與參數彙總；監控因例外結束的執行記為 failed，不列入 completed 的彙總
+          4) 取樣點超過上限時降低解析度並保留最後一點
+        """
+        coverage, queue_job, recorder = self.start_run()
+        recorder.add(stats(2 * GIB, 100, 10, 20))
+        recorder.add(stats(6 * GIB, 400, 30, 50))
+        recorder.add(stats(4 * GIB, 600, 40, 60))
+        recorder.finish(queue_job)
+
+        runs = job_telemetry('coverage', coverage.coverage_uid)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0]['status'], 'completed')
+        self.assertEqual(runs[0]['peak_memory'], 6 * GIB)
+        self.assertEqual(runs[0]['cpu_seconds'], 600)
+        self.assertEqual((runs[0]['block_read_bytes'], runs[0]['block_write_bytes']), (40, 60))
+        self.assertEqual(len(runs[0]['samples']), 3)
+        self.assertGreaterEqual(runs[0]['wall_seconds'], 600)
+
+        _, shared_job, shared = self.start_run(parameter_key='key-b', shared_container=True)
+        shared.add(stats(GIB, 1000, 500, 500))
+        shared.add(stats(2 * GIB, 1300, 700, 800))
+        shared.finish(shared_job)
+        record = SimJobTelemetry.objects.get(simJobTelemetry_parameter_key='key-b')
+        self.assertEqual(record.simJobTelemetry_cpu_seconds, 300)
+        self.assertEqual(record.simJobTelemetry_block_write_bytes, 300)
+
+        _, failed_job, failed = self.start_run(status='running')
+        failed.add(stats(50 * GIB, 10))
+        failed.finish(failed_job)
+        self.assertEqual(SimJobTelemetry.objects.filter(simJobTelemetry_status='failed').count(), 1)
+
+        summary = telemetry_summary()
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary[0]['run_count'], 2)
+        self.assertEqual(summary[0]['peak_memory']['max'], 6 * GIB)
+        self.assertEqual(summary[0]['cpu_seconds']['mean'], 450)
+        by_parameter = telemetry_summary('coverage', group_by_parameter=True)
+        self.assertEqual([entry['parameter_key'] for entry in by_parameter], ['key-a', 'key-b'])
+        self.assertEqual(telemetry_summary(status=None)[0]['run_count'], 3)
+
+        _, _, long_run = self.start_run()
+        for i in range(MAX_SAMPLES + 1):
+            long_run.add(stats(GIB, i))
+        self.assertLessEqual(len(long_run.samples), MAX_SAMPLES)
+        self.assertEqual(long_run.samples[-1][2], MAX_SAMPLES)
@@ -0,0 +1,93 @@
+import uuid
+from django.test import TestCase
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.dockerEngineClient import DockerEngineClient
+from main.apps.simulation_data_mgt.services.simJobLifecycle import _heartbeat
+from main.apps.simulation_data_mgt.services.simMemoryEstimator import estimate_memory, parameter_key
+from main.apps.simulation_data_mgt.tests.service.fakeDockerEngine import FakeDockerEngine
+
+GIGABYTE = 1024 ** 3
+
+
+class SimMemoryEstimatorTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='estimator_user',
+            user_password='password',
+            user_email='estimator_user@example.com'
+        )
+
+    def record(self, sim_type, key, peak_memory, oom_count=0):
+        SimJobQueue.objects.create(
+            simJobQueue_sim_type=sim_type,
+            simJobQueue_target_uid=uuid.uuid4(),
+            simJobQueue_status='completed',
+            simJobQueue_parameter_key=key,
+            simJobQueue_peak_memory=peak_memory,
+            simJobQueue_oom_count=oom_count,
+            f_user_uid=self.user
+        )
+
+    def test_parameter_key_ignores_key_order_and_encoding(self):
+        self.assertEqual(
+            parameter_key({'minLatitude': '-60', 'maxLatitude': '60'}),
+            parameter_key('{"maxLatitude": "60", "minLatitude": "-60"}')
+        )
+        self.assertNotEqual(parameter_key({'minLatitude': '-60'}), parameter_key({'minLatitude': '-50'}))
+
+    def test_estimate_memory_from_history(self):
+        """
+        測試流程:
+          1) 沒有紀錄時使用類型預設上限
+          2) 相同參數有紀錄時取峰值加上安全餘裕，曾 OOM 的紀錄以上限加倍；沒有 OOM 時不超過類型預設上限
+          3) 參數沒見過但同類型紀錄足夠時取 90 百分位數
+        """
+        key = parameter_key({'minLatitude': '-60'})
+        self.assertEqual(estimate_memory('coverage', key), 28 * GIGABYTE)
+        self.assertEqual(estimate_memory('handover', key), 100 * GIGABYTE)
+
+        self.record('coverage', key, 4 * GIGABYTE)
+        self.assertEqual(estimate_memory('coverage', key), 5 * GIGABYTE)
+
+        self.record('coverage', key, 4 * GIGABYTE, oom_count=1)
+        self.assertEqual(estimate_memory('coverage', key), 8 * GIGABYTE)
+
+        other_key = parameter_key({'minLatitude': '-50'})
+        self.assertEqual(estimate_memory('coverage', other_key), 28 * GIGABYTE)
+        self.record('coverage', parameter_key({'minLatitude': '-40'}), 2 * GIGABYTE)
+        self.assertEqual(estimate_memory('coverage', other_key), 5 * GIGABYTE)
+
+        large_key = parameter_key({'minLatitude': '-70'})
+        self.record('coverage', large_key, 27 * GIGABYTE)
+        self.assertEqual(estimate_memory('coverage', large_key), 28 * GIGABYTE)
+        self.record('coverage', large_key, 28 * GIGABYTE, oom_count=1)
+        self.assertEqual(estimate_memory('coverage', large_key), 56 * GIGABYTE)
+
+    def test_heartbeat_records_usage_without_page_cache(self):
+        """
+        測試流程:
+          1) 容器的 cgroup 用量包含大量 page cache（模擬寫出大量 CSV）
+          2) heartbeat 記錄的峰值不含 page cache，重跑時的估計值不會因 cache 而上升
+        """
+        engine = FakeDockerEngine().start()
+        self.addCleanup(engine.stop)
+        client = DockerEngineClient(engine.socket_path)
+        self.addCleanup(client.close)
+        key = parameter_key({'minLatitude': '-60'})
+        queue_job = SimJobQueue.objects.create(
+            simJobQueue_sim_type='coverage',
+            simJobQueue_target_uid=uuid.uuid4(),
+            simJobQueue_status='running',
+            simJobQueue_parameter_key=key,
+            f_user_uid=self.user
+        )
+        name = 'coverageSimulation_heartbeat'
+        client.run_container(name, 'handoverimage', ['true'])
+        engine.memory_usage[name] = 4 * GIGABYTE
+        engine.page_cache[name] = 20 * GIGABYTE
+
+        _heartbeat(queue_job, name, client=client)
+        queue_job.refresh_from_db()
+        self.assertEqual(queue_job.simJobQueue_peak_memory, 4 * GIGABYTE)
+        self.assertEqual(estimate_memory('coverage', key), 5 * GIGABYTE)
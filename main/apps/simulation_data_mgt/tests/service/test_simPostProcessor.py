@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services import simJobLifecycle
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import analyzeHandoverResult
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.services.simPostProcessor import SimPostProcessor
+from main.apps.simulation_data_mgt.tests.service.cellStatisticsFixture import write_cell
+
+
+class SimPostProcessorTestCase(SimpleTestCase):
+    def setUp(self):
+        self.result_dir = tempfile.mkdtemp(prefix='post-processor-')
+        self.processor = SimPostProcessor(1)
+
+    def tearDown(self):
+        self.processor.shutdown()
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def test_analyzes_results_in_worker_process(self):
+        """
+        測試流程:
+          1) 工作在另一個行程中執行，分析結果與直接呼叫分析函式相同
+          2) 子行程意外結束時拋出 BrokenProcessPool，下一次工作重新建立行程池
+          3) worker 數為 0 時在呼叫端直接執行
+        """
+        write_cell(self.result_dir, 'ideal', 'cell_0', [1])
+        write_cell(self.result_dir, 'actual', 'cell_0', [3])
+
+        self.assertNotEqual(self.processor.run(os.getpid), os.getpid())
+        self.assertEqual(
+            self.processor.analyze(get_sim_job_type('handover'), self.result_dir),
+            analyzeHandoverResult(self.result_dir)
+        )
+
+        with self.assertRaises(BrokenProcessPool):
+            self.processor.run(os._exit, 1)
+        self.assertNotEqual(self.processor.run(os.getpid), os.getpid())
+
+        self.assertEqual(SimPostProcessor(0).run(os.getpid), os.getpid())
+
+
+class CompleteSimJobTestCase(TestCase):
+    def test_report_failure_keeps_job_completed(self):
+        """
+        測試流程:
+          1) 分析完成後產生 PDF 時行程池中斷（BrokenProcessPool）
+          2) 模擬仍為 completed、SimJob 保留並標記結束，佇列作業標記完成
+        """
+        user = User.objects.create(user_name='report_user', user_password='password',
+                                   user_email='report_user@example.com')
+        coverage = Coverage.objects.create(coverage_name='report', coverage_parameter={},
+                                           coverage_status='processing', f_user_uid=user)
+        queue_job = SimJobQueue.objects.create(simJobQueue_sim_type='coverage',
+                                               simJobQueue_target_uid=coverage.coverage_uid,
+                                               simJobQueue_status='running', f_user_uid=user)
+        sim_type = get_sim_job_type('coverage')
+        sim_job = sim_type.create_sim_job(coverage, timezone.now())
+        post_processor = mock.Mock()
+        post_processor.analyze.return_value = {'coverage': 0.9}
+        post_processor.generate_report.side_effect = BrokenProcessPool('worker died')
+        result_dir = tempfile.mkdtemp(prefix='complete-sim-job-')
+        try:
+            with mock.patch.object(simJobLifecycle, 'get_sim_post_processor', return_value=post_processor):
+                simJobLifecycle._complete_sim_job(queue_job, sim_type, coverage, sim_job, result_dir)
+        finally:
+            shutil.rmtree(result_dir, ignore_errors=True)
+
+        coverage.refresh_from_db()
+        self.assertEqual((coverage.coverage_status, coverage.coverage_simulation_result),
+                         ('completed', {'coverage': 0.9}))
+        sim_job.refresh_from_db()
+        self.assertIsNotNone(sim_job.coverageSimJob_end_time)
+        queue_job.refresh_from_db()
+        self.assertEqual(queue_job.simJobQueue_status, 'completed')
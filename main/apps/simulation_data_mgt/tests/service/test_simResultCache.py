@@ -0,0 +1,165 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.test import TestCase, override_settings
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.models.SimResultCacheModel import SimResultCache, SimResultCacheCounter
+from main.apps.simulation_data_mgt.services import simJobLifecycle
+from main.apps.simulation_data_mgt.services.dockerEngineClient import DockerEngineClient
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.services.simMemoryEstimator import parameter_key
+from main.apps.simulation_data_mgt.services.simResultCache import (
+    CACHE_RESTORED_MESSAGE, evict_results, lookup_result, restore_result, store_result, unshare_result_files
+)
+from main.apps.simulation_data_mgt.tests.service.fakeDockerEngine import FakeDockerEngine
+
+DIGEST = 'sha256:' + 'a' * 64
+
+
+class SimResultCacheTestCase(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='sim-result-cache-')
+        self.settings_override = override_settings(
+            SIM_RESULT_CACHE_ENABLED=True,
+            SIM_RESULT_CACHE_DIR=os.path.join(self.tmpdir, 'cache'),
+            SIM_RESULT_CACHE_MAX_SIZE='1g'
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def make_result_dir(self, name, size=10):
+        result_dir = os.path.join(self.tmpdir, name)
+        os.makedirs(result_dir)
+        with open(os.path.join(result_dir, 'result.csv'), 'w') as f:
+            f.write('x' * size)
+        with open(os.path.join(result_dir, 'coverage_simulation_report.pdf'), 'w') as f:
+            f.write('pdf')
+        return result_dir
+
+    def counter(self, sim_type):
+        return SimResultCacheCounter.objects.get(simResultCacheCounter_sim_type=sim_type)
+
+    def test_store_lookup_and_restore(self):
+        """
+        測試流程:
+          1) 未存入前查詢為 miss
+          2) 存入後相同參數、相同映像檔為 hit，參數順序不同也視為相同
+          3) 映像檔 digest 不同視為不同結果
+          4) 取回的結果目錄與快取共用檔案（硬連結），且不含 PDF 報告
+        """
+        key = parameter_key({'minLatitude': '-60', 'maxLatitude': '60'})
+        self.assertIsNone(lookup_result('coverage', key, DIGEST))
+
+        result_dir = self.make_result_dir('user-a')
+        entry = store_result('coverage', key, DIGEST, result_dir, {'coverage': 0.9})
+        self.assertEqual(entry.simResultCache_size_bytes, 10)
+
+        same_key = parameter_key('{"maxLatitude": "60", "minLatitude": "-60"}')
+        hit = lookup_result('coverage', same_key, DIGEST)
+        self.assertEqual(hit.simResultCache_simulation_result, {'coverage': 0.9})
+        self.assertIsNone(lookup_result('coverage', key, 'sha256:' + 'c' * 64))
+
+        target_dir = os.path.join(self.tmpdir, 'user-b')
+        restore_result(hit, target_dir)
+        self.assertEqual(os.listdir(target_dir), ['result.csv'])
+        self.assertEqual(
+            os.stat(os.path.join(target_dir, 'result.csv')).st_ino,
+            os.stat(os.path.join(hit.simResultCache_result_dir, 'result.csv')).st_ino
+        )
+
+        counter = self.counter('coverage')
+        self.assertEqual((counter.simResultCacheCounter_hit_count, counter.simResultCacheCounter_miss_count), (1, 2))
+        self.assertEqual(SimResultCache.objects.get().simResultCache_hit_count, 1)
+
+    def test_restore_cached_result(self):
+        """
+        測試流程:
+          1) 命中快取的佇列作業取回結果目錄，模擬標記 completed，補上已結束的 SimJob，佇列作業標記完成
+          2) 之後產生 PDF 報告失敗時，模擬與佇列作業仍維持完成，不會改為重新執行
+          3) 取回的檔案與快取共用；交給容器寫入前換成各自的複本，寫入後快取內容不變
+        """
+        user = User.objects.create(user_name='cache_user', user_password='password', user_email='cache_user@example.com')
+        coverage = Coverage.objects.create(coverage_name='cached', coverage_parameter={'minLatitude': '-60'},
+                                           coverage_status='queued', f_user_uid=user)
+        key = parameter_key(coverage.coverage_parameter)
+        store_result('coverage', key, DIGEST, self.make_result_dir('user-a'), {'coverage': 0.9})
+        queue_job = SimJobQueue.objects.create(simJobQueue_sim_type='coverage', simJobQueue_target_uid=coverage.coverage_uid,
+                                               simJobQueue_status='running', simJobQueue_parameter_key=key,
+                                               f_user_uid=user)
+        sim_type = get_sim_job_type('coverage')
+        post_processor = mock.Mock()
+        post_processor.generate_report.side_effect = RuntimeError('report failed')
+
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir)
+        try:
+            with mock.patch.object(simJobLifecycle, 'get_sim_post_processor', return_value=post_processor):
+                simJobLifecycle.restore_cached_result(queue_job, sim_type, coverage,
+                                                      lookup_result('coverage', key, DIGEST))
+            coverage.refresh_from_db()
+            self.assertEqual(coverage.coverage_status, 'completed')
+            self.assertEqual(coverage.coverage_simulation_result, {'coverage': 0.9})
+            sim_jobs = sim_type.sim_job_model.objects.filter(f_coverage_uid=coverage)
+            self.assertEqual(sim_jobs.count(), 1)
+            self.assertIsNotNone(sim_jobs.get().coverageSimJob_end_time)
+            queue_job.refresh_from_db()
+            self.assertEqual((queue_job.simJobQueue_status, queue_job.simJobQueue_message),
+                             ('completed', CACHE_RESTORED_MESSAGE))
+            post_processor.generate_report.assert_called_once()
+
+            result_path = os.path.join(coverage.coverage_data_path, 'result.csv')
+            cached_path = os.path.join(SimResultCache.objects.get().simResultCache_result_dir, 'result.csv')
+            self.assertEqual(os.stat(result_path).st_ino, os.stat(cached_path).st_ino)
+            unshare_result_files(coverage.coverage_data_path)
+            self.assertNotEqual(os.stat(result_path).st_ino, os.stat(cached_path).st_ino)
+            with open(result_path, 'w') as f:
+                f.write('rerun')
+            with open(cached_path) as f:
+                self.assertEqual(f.read(), 'x' * 10)
+        finally:
+            os.chdir(cwd)
+
+    def test_missing_cache_dir_counts_as_miss(self):
+        key = parameter_key({'minLatitude': '-60'})
+        entry = store_result('coverage', key, DIGEST, self.make_result_dir('user-a'), {})
+        shutil.rmtree(entry.simResultCache_result_dir)
+
+        self.assertIsNone(lookup_result('coverage', key, DIGEST))
+        self.assertFalse(SimResultCache.objects.exists())
+
+    def test_evict_least_recently_used(self):
+        """
+        測試流程:
+          1) 存入三筆結果後使用第一筆，使第二筆成為最久未使用
+          2) 大小上限只容得下兩筆時，淘汰第二筆並刪除其目錄
+        """
+        keys = [parameter_key({'index': index}) for index in range(3)]
+        entries = [
+            store_result('coverage', key, DIGEST, self.make_result_dir(f'user-{index}', size=100), {})
+            for index, key in enumerate(keys)
+        ]
+        lookup_result('coverage', keys[0], DIGEST)
+
+        self.assertEqual(evict_results(200), 1)
+        self.assertEqual(
+            set(SimResultCache.objects.values_list('simResultCache_parameter_key', flat=True)),
+            {keys[0], keys[2]}
+        )
+        self.assertFalse(os.path.exists(entries[1].simResultCache_result_dir))
+        self.assertEqual(self.counter('coverage').simResultCacheCounter_eviction_count, 1)
+
+    def test_image_digest(self):
+        engine = FakeDockerEngine().start()
+        client = DockerEngineClient(engine.socket_path)
+        try:
+            self.assertEqual(client.image_digest('handoverimage'), DIGEST)
+            self.assertIsNone(client.image_digest('missingimage'))
+        finally:
+            client.close()
+            engine.stop()
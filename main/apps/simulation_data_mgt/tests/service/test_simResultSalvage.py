@@ -0,0 +1,96 @@
+import json
+import os
+import shutil
+import tempfile
+from django.test import TestCase
+from main.apps.meta_data_mgt.models.HandoverModel import Handover
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.services.simJobTypes import get_sim_job_type
+from main.apps.simulation_data_mgt.services.simResultSalvage import (
+    PARTIAL_STATUS, resumable_cells, salvage_partial_result
+)
+from main.apps.simulation_data_mgt.tests.service.cellStatisticsFixture import write_cell
+
+
+class SimResultSalvageTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='salvage_user',
+            user_password='password',
+            user_email='salvage_user@example.com'
+        )
+        self.handover = Handover.objects.create(
+            handover_name='salvage',
+            handover_parameter={'cell_ut': '4Cell_10UT'},
+            handover_status='processing',
+            f_user_uid=self.user
+        )
+        self.sim_type = get_sim_job_type('handover')
+        self.result_dir = tempfile.mkdtemp(prefix='sim-salvage-')
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def test_salvages_completed_cells(self):
+        """
+        測試流程:
+          1) 4 個 cell 中 ideal 完成 2 個、actual 完成 1 個，另有一個寫到一半的檔案
+          2) 保存部分結果：狀態 partial，結果只包含完成的 cell，覆蓋率以兩個情境都完成的 cell 計算
+          3) 寫到一半的檔案不納入，也不會讓保存失敗
+        """
+        write_cell(self.result_dir, 'ideal', 'cell_0', [1])
+        write_cell(self.result_dir, 'ideal', 'cell_1', [3])
+        write_cell(self.result_dir, 'actual', 'cell_0', [2])
+        broken_dir = os.path.join(self.result_dir, 'actual', 'cell_analysis', 'cell_1')
+        os.makedirs(broken_dir)
+        with open(os.path.join(broken_dir, 'statistics.csv'), 'w') as f:
+            f.write('handover_count,"unterminated\n')
+
+        partial = salvage_partial_result(self.sim_type, self.handover, self.result_dir, 'Simulation timeout')
+        self.handover.refresh_from_db()
+        self.assertEqual(self.handover.handover_status, PARTIAL_STATUS)
+        self.assertEqual(self.handover.handover_data_path, self.result_dir)
+        self.assertEqual(partial['cell_count'], {'ideal': 2, 'actual': 1})
+        self.assertEqual(partial['expected_cell_count'], 4)
+        self.assertEqual(partial['coverage'], 0.25)
+        self.assertEqual(partial['completed_cells'], {'ideal': ['cell_0', 'cell_1'], 'actual': ['cell_0']})
+        result = self.handover.handover_simulation_result
+        self.assertEqual(result['partial']['reason'], 'Simulation timeout')
+        self.assertAlmostEqual(result['handover_simulation_result']['avg_cells_handover_count'], 2.0)
+
+    def test_nothing_to_salvage(self):
+        """
+        測試流程:
+          1) 結果目錄不存在或沒有完成的 cell 時不保存，模擬狀態不變
+          2) 不逐步輸出 cell 的模擬類型不保存
+        """
+        self.assertIsNone(salvage_partial_result(self.sim_type, self.handover,
+                                                 os.path.join(self.result_dir, 'missing'), 'failed'))
+        self.assertIsNone(salvage_partial_result(self.sim_type, self.handover, self.result_dir, 'failed'))
+        write_cell(self.result_dir, 'ideal', 'cell_0', [1])
+        self.assertIsNone(salvage_partial_result(get_sim_job_type('coverage'), self.handover, self.result_dir, 'failed'))
+        self.handover.refresh_from_db()
+        self.assertEqual(self.handover.handover_status, 'processing')
+
+    def test_rerun_skips_completed_cells_with_same_parameter(self):
+        """
+        測試流程:
+          1) 沒有部分結果時不接續
+          2) 以相同參數重新執行：回傳已完成的 cell，並以 completed_cells 傳給模擬腳本
+          3) 參數改變後不接續
+        """
+        write_cell(self.result_dir, 'ideal', 'cell_0', [1])
+        write_cell(self.result_dir, 'actual', 'cell_0', [2])
+        self.assertIsNone(resumable_cells(self.sim_type, self.handover, self.result_dir))
+
+        salvage_partial_result(self.sim_type, self.handover, self.result_dir, 'Simulation timeout')
+        self.handover.refresh_from_db()
+        cells = resumable_cells(self.sim_type, self.handover, self.result_dir)
+        self.assertEqual(cells, {'ideal': ['cell_0'], 'actual': ['cell_0']})
+        command = self.sim_type.simulation_command(self.handover, {'completed_cells': cells})
+        parameter = json.loads(command.split(' ', 1)[1].strip("'"))
+        self.assertEqual(parameter, {'cell_ut': '4Cell_10UT', 'completed_cells': cells})
+        self.assertEqual(self.handover.handover_parameter, {'cell_ut': '4Cell_10UT'})
+
+        self.handover.handover_parameter = {'cell_ut': '8Cell_10UT'}
+        self.assertIsNone(resumable_cells(self.sim_type, self.handover, self.result_dir))
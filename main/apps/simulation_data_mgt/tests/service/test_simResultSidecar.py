@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from main.apps.simulation_data_mgt.services.analyzeHandoverResult import COLUMNS_TO_ANALYZE, analyzeHandoverResult
+from main.apps.simulation_data_mgt.services.analyzeSingleBeamResult import analyzeSingleBeamResult
+from main.apps.simulation_data_mgt.services.cellStatisticsLoader import aggregate_cell_statistics, load_cell_statistics
+from main.apps.simulation_data_mgt.services.simResultSidecar import (
+    MANIFEST_FILE, SIDECAR_FILE, build_result_sidecar, read_cell_sidecar, read_result_csv
+)
+from main.apps.simulation_data_mgt.tests.service.cellStatisticsFixture import write_cell
+
+
+class SimResultSidecarTestCase(SimpleTestCase):
+    def setUp(self):
+        self.result_dir = tempfile.mkdtemp(prefix='sim-sidecar-')
+
+    def tearDown(self):
+        shutil.rmtree(self.result_dir, ignore_errors=True)
+
+    def write_csv(self, relpath, text):
+        path = os.path.join(self.result_dir, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_tables_round_trip(self):
+        """
+        測試流程:
+          1) 結果目錄的 CSV（整數、浮點數、布林、文字與缺值）轉存後，從副本讀出的內容與 pd.read_csv 相同
+          2) 子目錄中的 CSV 也由副本讀取，分析函式的結果不變
+          3) CSV 被改寫後不再使用副本，讀到新的內容
+        """
+        top = self.write_csv('output_build.csv', 'id,name,value,flag,empty\n1,a,1.5,True,\n2,,2.5,False,\n3,c,,True,\n')
+        nested = self.write_csv(os.path.join('ideal', 'gs_analysis', 'gs_1', 'statistics.csv'),
+                                'gs,bitrate_mean\ngs_1,3.25\n')
+        self.write_csv('header_only.csv', 'a,b\n')
+        expected_beam = analyzeSingleBeamResult(self.result_dir)
+
+        manifest = build_result_sidecar(self.result_dir)
+        self.assertEqual(sorted(manifest['files']), sorted([
+            'output_build.csv', 'header_only.csv', os.path.join('ideal', 'gs_analysis', 'gs_1', 'statistics.csv')
+        ]))
+        self.assertTrue(os.path.exists(os.path.join(self.result_dir, SIDECAR_FILE)))
+        for path in (top, nested, os.path.join(self.result_dir, 'header_only.csv')):
+            pd.testing.assert_frame_equal(read_result_csv(path), pd.read_csv(path))
+        # 刪除 CSV 的內容但保留大小與修改時間，確認確實是從副本讀取
+        stat = os.stat(nested)
+        with open(nested, 'w') as f:
+            f.write('x' * stat.st_size)
+        os.utime(nested, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(read_result_csv(nested)['bitrate_mean'].tolist(), [3.25])
+        self.assertEqual(analyzeSingleBeamResult(self.result_dir), expected_beam)
+
+        self.write_csv('output_build.csv', 'id,value\n9,0.5\n')
+        self.assertEqual(read_result_csv(top)['id'].tolist(), [9])
+
+    def test_cell_statistics_from_sidecar(self):
+        """
+        測試流程:
+          1) 所有 cell 合併成一個表格，讀取結果（含缺值與只有標頭的 cell）與讀取 CSV 相同，欄位不齊全的 cell 不納入
+          2) 刪除 CSV 內容後仍可從副本分析，證明分析讀取的是副本
+          3) 新增 cell 後副本失效，改回讀取 CSV
+        """
+        for index in range(6):
+            write_cell(self.result_dir, 'ideal', f'cell_{index}', [index, index + 1])
+            write_cell(self.result_dir, 'actual', f'cell_{index}', [index, ''])
+        write_cell(self.result_dir, 'actual', 'cell_empty', [])
+        write_cell(self.result_dir, 'actual', 'cell_partial', [100], columns=['handover_count'])
+        expected = load_cell_statistics(self.result_dir, COLUMNS_TO_ANALYZE, use_sidecar=False)
+        expected_result = analyzeHandoverResult(self.result_dir)
+
+        manifest = build_result_sidecar(self.result_dir)
+        self.assertEqual(len(manifest['files']), 14)
+        # 逐欄位暫存的檔案在寫入後刪除
+        self.assertFalse([name for name in os.listdir(self.result_dir) if name.endswith('.tmp')])
+        with open(os.path.join(self.result_dir, MANIFEST_FILE)) as f:
+            self.assertEqual(json.load(f)['cell_table'], manifest['cell_table'])
+        sidecar = read_cell_sidecar(self.result_dir, COLUMNS_TO_ANALYZE)
+        self.assertEqual({situation: len(cells) for situation, cells in sidecar.items()}, {'ideal': 6, 'actual': 7})
+        for situation in ('ideal', 'actual'):
+            pd.testing.assert_series_equal(
+                pd.DataFrame(np.vstack([values for _, values in sidecar[situation]]), columns=COLUMNS_TO_ANALYZE).mean(),
+                pd.concat(expected[situation]).mean()
+            )
+            aggregate = aggregate_cell_statistics(self.result_dir, COLUMNS_TO_ANALYZE)[situation]
+            self.assertEqual(aggregate.cell_count, len(expected[situation]))
+
+        for situation in ('ideal', 'actual'):
+            cell_analysis = os.path.join(self.result_dir, situation, 'cell_analysis')
+            for cell in os.listdir(cell_analysis):
+                path = os.path.join(cell_analysis, cell, 'statistics.csv')
+                stat = os.stat(path)
+                with open(path, 'w') as f:
+                    f.write('x' * stat.st_size)
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(analyzeHandoverResult(self.result_dir), expected_result)
+
+        write_cell(self.result_dir, 'ideal', 'cell_new', [1])
+        self.assertIsNone(read_cell_sidecar(self.result_dir, COLUMNS_TO_ANALYZE))
+
+    def test_disabled(self):
+        self.write_csv('output_build.csv', 'a\n1\n')
+        with self.settings(SIM_RESULT_SIDECAR_ENABLED=False):
+            self.assertIsNone(build_result_sidecar(self.result_dir))
+        self.assertFalse(os.path.exists(os.path.join(self.result_dir, SIDECAR_FILE)))
+        self.assertIsNone(build_result_sidecar(os.path.join(self.result_dir, 'missing')))
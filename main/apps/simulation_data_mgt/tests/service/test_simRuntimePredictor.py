@@ -0,0 +1,81 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from main.apps.meta_data_mgt.models.CoverageModel import Coverage
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.CoverageSimJobModel import CoverageSimJob
+from main.apps.simulation_data_mgt.services.simRuntimePredictor import (
+    MIN_TIMEOUT, adaptive_timeout, extract_features, invalidate_runtime_models, predict_runtime
+)
+
+
+class SimRuntimePredictorTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='predictor_user',
+            user_password='password',
+            user_email='predictor_user@example.com'
+        )
+        invalidate_runtime_models()
+
+    def tearDown(self):
+        invalidate_runtime_models()
+
+    def completed_run(self, parameter, seconds):
+        coverage = Coverage.objects.create(
+            coverage_name='history',
+            coverage_parameter=parameter,
+            coverage_status='completed',
+            f_user_uid=self.user
+        )
+        end_time = timezone.now()
+        CoverageSimJob.objects.create(
+            f_coverage_uid=coverage,
+            coverageSimJob_start_time=end_time - timedelta(seconds=seconds),
+            coverageSimJob_end_time=end_time
+        )
+
+    def test_extract_features(self):
+        features = extract_features({
+            'TLE_inputFileName': 'TLE_12P_22Sats_29deg_F7.txt',
+            'simStartTime': '0',
+            'simEndTime': '600',
+            'cell_ut': '31Cell_220UT',
+            'beam': {'beamCount': 4},
+            'handover_strategy': 'MinRange'
+        })
+        self.assertEqual(features['TLE_inputFileName.satellites'], 264)
+        self.assertEqual(features['sim_duration'], 600)
+        self.assertEqual((features['cell_ut.cells'], features['cell_ut.uts']), (31, 220))
+        self.assertEqual(features['beam.beamCount'], 4)
+        self.assertNotIn('handover_strategy', features)
+        self.assertEqual(extract_features('{"simEndTime": "60"}'), {'simEndTime': 60.0})
+
+    def test_predicts_runtime_from_parameters(self):
+        """
+        測試流程:
+          1) 沒有紀錄時無法預測，逾時使用類型原本的 8 小時上限
+          2) 執行時間與 simEndTime 成正比的紀錄，預測較長的模擬需要較長時間
+          3) 逾時為 p99 乘上餘裕，不低於最小值、不超過類型上限；由快取完成的紀錄不列入
+        """
+        self.assertIsNone(predict_runtime('coverage', {'simEndTime': '600'}))
+        self.assertEqual(adaptive_timeout('coverage', {'simEndTime': '600'}), 60 * 60 * 8)
+
+        for sim_end_time in (60, 120, 240, 480, 960):
+            for _ in range(2):
+                self.completed_run({'simStartTime': '0', 'simEndTime': str(sim_end_time)}, sim_end_time)
+        self.completed_run({'simStartTime': '0', 'simEndTime': '60'}, 0)
+        invalidate_runtime_models()
+
+        short = predict_runtime('coverage', {'simStartTime': '0', 'simEndTime': '60'})
+        long = predict_runtime('coverage', {'simStartTime': '0', 'simEndTime': '960'})
+        self.assertLess(short, 120)
+        self.assertGreater(long, 480)
+
+        self.assertEqual(adaptive_timeout('coverage', {'simStartTime': '0', 'simEndTime': '60'}), MIN_TIMEOUT)
+        timeout = adaptive_timeout('coverage', {'simStartTime': '0', 'simEndTime': '960'})
+        self.assertGreater(timeout, long)
+        self.assertLess(timeout, 60 * 60 * 8)
+
+        with override_settings(SIM_JOB_ADAPTIVE_TIMEOUT=False):
+            self.assertEqual(adaptive_timeout('coverage', {'simEndTime': '600'}), 60 * 60 * 8)
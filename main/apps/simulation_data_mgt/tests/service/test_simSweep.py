@@ -0,0 +1,90 @@
+from django.test import TestCase
+from main.apps.meta_data_mgt.models.HandoverModel import Handover
+from main.apps.meta_data_mgt.models.UserModel import User
+from main.apps.simulation_data_mgt.models.SimJobQueueModel import SimJobQueue
+from main.apps.simulation_data_mgt.services.simJobExecutor import SimJobExecutor
+from main.apps.simulation_data_mgt.services.simSweep import create_sweep, expand_axes, sweep_progress
+
+BASE_PARAMETER = {
+    'constellation': 'TLE_6P_22Sats_29deg_F1',
+    'handover_strategy': 'MinRange',
+    'beam': {'beams_per_satellite': 1, 'frequencies_per_satellite': 1}
+}
+
+
+class SimSweepTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            user_name='sweep_user',
+            user_password='password',
+            user_email='sweep_user@example.com'
+        )
+        # 已停止的執行器只會建立佇列紀錄，不會真的領取作業
+        self.executor = SimJobExecutor(max_workers=1, memory_capacity=lambda: None)
+        self.executor.shutdown()
+
+    def test_expand_axes(self):
+        points = expand_axes(BASE_PARAMETER, {
+            'beam.beams_per_satellite': [1, 2],
+            'cell_ut': [5, 10, 15]
+        })
+        self.assertEqual(len(points), 6)
+        values, parameter = points[-1]
+        self.assertEqual(values, {'beam.beams_per_satellite': 2, 'cell_ut': 15})
+        self.assertEqual(parameter['beam'], {'beams_per_satellite': 2, 'frequencies_per_satellite': 1})
+        self.assertEqual(parameter['cell_ut'], 15)
+        self.assertEqual(BASE_PARAMETER['beam']['beams_per_satellite'], 1)
+
+        with self.assertRaises(ValueError):
+            expand_axes(BASE_PARAMETER, {'cell_ut': []})
+
+    def test_create_sweep_and_progress(self):
+        """
+        測試流程:
+          1) 已有一筆參數相同且完成的 handover
+          2) 建立 2 x 2 的 sweep：沿用既有紀錄，只新增並排程其餘 3 筆
+          3) 部分完成後，進度與結果表反映各掃描點的狀態與分析結果
+        """
+        existing = Handover.objects.create(
+            handover_name='existing',
+            handover_parameter=dict(BASE_PARAMETER, beam={'beams_per_satellite': 1, 'frequencies_per_satellite': 1}),
+            handover_status='completed',
+            handover_simulation_result={'avg_handover_count': 3.5},
+            f_user_uid=self.user
+        )
+
+        sweep = create_sweep('handover', 'beam sweep', BASE_PARAMETER, {
+            'beam.beams_per_satellite': [1, 2],
+            'beam.frequencies_per_satellite': [1, 2]
+        }, self.user.user_uid, executor=self.executor)
+
+        self.assertEqual(len(sweep.simSweep_points), 4)
+        self.assertEqual(sweep.simSweep_points[0]['target_uid'], str(existing.handover_uid))
+        self.assertEqual(Handover.objects.filter(f_user_uid=self.user).count(), 4)
+        self.assertEqual(SimJobQueue.objects.filter(simJobQueue_status='queued').count(), 3)
+        created = Handover.objects.get(handover_uid=sweep.simSweep_points[3]['target_uid'])
+        self.assertEqual(created.handover_status, 'queued')
+        self.assertEqual(created.handover_data_path, f"handover/{self.user.user_uid}/{created.handover_uid}")
+
+        failed_uid = sweep.simSweep_points[1]['target_uid']
+        Handover.objects.filter(handover_uid=failed_uid).update(handover_status='simulation_failed')
+        SimJobQueue.objects.filter(simJobQueue_target_uid=failed_uid).update(simJobQueue_status='failed')
+
+        progress = sweep_progress(sweep)
+        self.assertEqual(progress['sweep_status'], 'running')
+        self.assertEqual((progress['finished_count'], progress['completed_count'], progress['progress']), (2, 1, 0.5))
+        self.assertEqual(progress['columns'], [
+            'beam.beams_per_satellite', 'beam.frequencies_per_satellite', 'target_uid', 'status', 'avg_handover_count'
+        ])
+        self.assertEqual(progress['results'][0]['avg_handover_count'], 3.5)
+        self.assertEqual([row['status'] for row in progress['results']],
+                         ['completed', 'simulation_failed', 'queued', 'queued'])
+
+        # 重複建立相同的 sweep 不會新增紀錄，只重新排程失敗的掃描點
+        create_sweep('handover', 'beam sweep', BASE_PARAMETER, {
+            'beam.beams_per_satellite': [1, 2],
+            'beam.frequencies_per_satellite': [1, 2]
+        }, self.user.user_uid, executor=self.executor)
+        self.assertEqual(Handover.objects.filter(f_user_uid=self.user).count(), 4)
+        self.assertEqual(SimJobQueue.objects.filter(simJobQueue_status='queued').count(), 3)
+        self.assertTrue(SimJobQueue.objects.filter(simJobQueue_target_uid=failed_uid, simJobQueue_status='queued').exists())
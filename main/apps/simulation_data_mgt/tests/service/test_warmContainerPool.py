@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import time
+from django.test import SimpleTestCase
+from main.apps.simulation_data_mgt.services.dockerEngineClient import DockerEngineClient
+from main.apps.simulation_data_mgt.services.warmContainerPool import (
+    WarmContainerPool, parse_pool_container_name, pool_result_dir_supported, scratch_dir, settle_result_dir
+)
+from main.apps.simulation_data_mgt.tests.service.fakeDockerEngine import FakeDockerEngine
+
+
+class WarmContainerPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp(prefix='warm-pool-')
+        os.chdir(self.tmpdir)
+        self.engine = FakeDockerEngine().start()
+        self.client = DockerEngineClient(self.engine.socket_path)
+        self.pool = WarmContainerPool(2, idle_timeout=60, images=['handoverimage'], client=self.client,
+                                      owner='testhost:4242')
+
+    def tearDown(self):
+        self.pool.shutdown()
+        self.client.close()
+        self.engine.stop()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def wait_for_idle(self, image, count):
+        for _ in range(50):
+            if self.pool.status()['idle'].get(image, 0) == count:
+                return
+            time.sleep(0.05)
+        self.fail(f"pool did not reach {count} idle containers: {self.pool.status()}")
+
+    def test_runs_jobs_by_exec_and_reuses_containers(self):
+        """
+        測試流程:
+          1) 啟動後預先建立 2 個暖容器，每個容器只掛載自己的暫存目錄，看不到 simulation_result 的其他內容
+          2) 借出容器並以 docker exec 執行：結果目錄（含已完成的檔案）搬到暫存目錄，原位置改為符號連結，
+             輸出指向暫存目錄中的結果，記憶體上限依作業調整
+          3) exec 結束後結果搬回原位，歸還後容器回到閒置狀態並可再借給下一個作業
+          4) 不可重用的容器歸還時直接移除，暫存目錄一併刪除
+        """
+        self.pool.start()
+        self.wait_for_idle('handoverimage', 2)
+        container_name = self.pool.acquire('handoverimage')
+        self.assertEqual(parse_pool_container_name(container_name), 'testhost:4242')
+        container = self.engine.containers[container_name]
+        self.assertEqual(container['HostConfig']['Binds'],
+                         [f"{os.path.abspath(scratch_dir(container_name))}:/root/mercury/simulation_result"])
+
+        result_dir = os.path.join('simulation_result', 'handover_simulation', 'user', 'target')
+        os.makedirs(result_dir)
+        with open(os.path.join(result_dir, 'completed.csv'), 'w') as f:
+            f.write('a\n1\n')
+        exec_id = self.pool.run(container_name, "/root/mercury/shell/simulation_handover_script.sh '{}'",
+                                result_dir, '4g')
+        command = self.engine.execs[exec_id]['ProcessConfig']['arguments'][-1]
+        self.assertIn('ln -s /root/mercury/simulation_result/job /root/mercury/build/service/output', command)
+        self.assertTrue(command.endswith("simulation_handover_script.sh '{}'"))
+        self.assertEqual(container['HostConfig']['Memory'], 4 * 1024 ** 3)
+        self.assertTrue(self.client.inspect_exec(exec_id)['Running'])
+        self.assertTrue(os.path.islink(result_dir))
+        job_dir = os.path.join(scratch_dir(container_name), 'job')
+        self.assertTrue(os.path.exists(os.path.join(job_dir, 'completed.csv')))
+        # 模擬器寫入暫存目錄，執行期間仍可由結果目錄讀取
+        with open(os.path.join(job_dir, 'output.csv'), 'w') as f:
+            f.write('b\n2\n')
+        self.assertEqual(sorted(os.listdir(result_dir)), ['completed.csv', 'output.csv'])
+
+        self.engine.finish_exec(exec_id)
+        self.assertFalse(self.client.inspect_exec(exec_id)['Running'])
+        settle_result_dir(result_dir)
+        settle_result_dir(result_dir)
+        self.assertFalse(os.path.islink(result_dir))
+        self.assertEqual(sorted(os.listdir(result_dir)), ['completed.csv', 'output.csv'])
+        self.assertFalse(os.path.exists(job_dir))
+        self.pool.release(container_name)
+        self.assertEqual(self.pool.status()['busy'], 0)
+        self.wait_for_idle('handoverimage', 2)
+
+        container_name = self.pool.acquire('handoverimage')
+        self.pool.release(container_name, reusable=False)
+        self.assertNotIn(container_name, self.engine.containers)
+        self.assertFalse(os.path.exists(scratch_dir(container_name)))
+
+    def test_evicts_idle_images(self):
+        self.pool.maintain()
+        self.assertEqual(self.pool.status()['idle'], {})
+
+        self.pool.images = []
+        self.pool.acquire('routingimage')  # 第一次使用時沒有暖容器，之後才補充
+        self.pool.maintain()
+        self.assertEqual(self.pool.status()['idle'], {'routingimage': 2})
+
+        self.pool.idle_timeout = 0
+        self.pool.maintain()
+        self.assertEqual(self.pool.status()['idle'], {})
+        self.assertEqual(self.engine.containers, {})
+
+    def test_pool_result_dir_supported(self):
+        self.assertTrue(pool_result_dir_supported('simulation_result/coverage_simulation/u/t'))
+        self.assertFalse(pool_result_dir_supported('/elsewhere/result'))
+        self.assertFalse(pool_result_dir_supported('simulation_result'))
+        self.assertFalse(pool_result_dir_supported('simulation_result/.warm_pool/simPool_x/job'))
+        # 一般目錄或指向暫存目錄以外的符號連結不搬移
+        os.makedirs('elsewhere')
+        os.symlink(os.path.abspath('elsewhere'), 'link')
+        settle_result_dir('link')
+        self.assertTrue(os.path.islink('link'))
+        self.assertIsNone(parse_pool_container_name('coverageSimulation_00000000-0000-0000-0000-000000000001'))
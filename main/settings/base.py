@@ -106,6 +106,73 @@ DATABASES = {
 }
 
 
+# Simulation job executor
+# 同時執行中的模擬作業上限，超過的作業會排隊等待
+SIM_JOB_MAX_WORKERS = int(os.environ.get('SIM_JOB_MAX_WORKERS') or 4)
+# 執行器在沒有新作業時重新查詢佇列的間隔（秒）
+SIM_JOB_POLL_INTERVAL = int(os.environ.get('SIM_JOB_POLL_INTERVAL') or 5)
+# 執行中作業超過此秒數沒有更新 heartbeat，即由其他行程接手監控
+SIM_JOB_HEARTBEAT_TIMEOUT = int(os.environ.get('SIM_JOB_HEARTBEAT_TIMEOUT') or 120)
+# reconciler 比對佇列與 Docker 容器的間隔（秒）
+SIM_JOB_RECONCILE_INTERVAL = int(os.environ.get('SIM_JOB_RECONCILE_INTERVAL') or 60)
+# 各使用者排程的權重，格式為 "<user_uid>:<權重>,..."，未列出的使用者權重為 1
+SIM_JOB_USER_WEIGHTS = {
+    user_uid.strip(): float(weight)
+    for user_uid, weight in (
+        item.split(':', 1) for item in (os.environ.get('SIM_JOB_USER_WEIGHTS') or '').split(',') if ':' in item
+    )
+}
+# 可分配給模擬容器的記憶體總量（例如 400g），未設定時依 Docker 主機記憶體自動計算
+SIM_JOB_MEMORY_CAPACITY = os.environ.get('SIM_JOB_MEMORY_CAPACITY') or ''
+# 排程方式：sjf 依預測執行時間讓短作業優先（每位使用者內），fifo 依排隊時間
+SIM_JOB_SCHEDULING = (os.environ.get('SIM_JOB_SCHEDULING') or 'sjf').lower()
+# 依過去執行時間預測每個作業的逾時時間（不超過類型原本的上限），關閉時一律使用類型上限
+SIM_JOB_ADAPTIVE_TIMEOUT = (os.environ.get('SIM_JOB_ADAPTIVE_TIMEOUT') or 'true').lower() in ('1', 'true', 'yes')
+# 取消作業時同時停止的容器數量上限
+SIM_JOB_CANCEL_CONCURRENCY = int(os.environ.get('SIM_JOB_CANCEL_CONCURRENCY') or 16)
+# handover、gso 等逐 cell 輸出結果的模擬，依 cell 拆成最多幾個容器平行執行，1 表示不拆分
+SIM_JOB_CELL_SHARDS = int(os.environ.get('SIM_JOB_CELL_SHARDS') or 1)
+# 每個分片至少包含的 cell 數，cell 數不足的模擬以較少的分片執行
+SIM_JOB_MIN_CELLS_PER_SHARD = int(os.environ.get('SIM_JOB_MIN_CELLS_PER_SHARD') or 8)
+# 執行結果分析與 PDF 報告的子行程數量，0 表示在監控容器的執行緒中直接執行
+SIM_POSTPROCESS_WORKERS = int(os.environ.get('SIM_POSTPROCESS_WORKERS') or 2)
+# 遠端模擬主機（執行 simJobAgent），格式為 "<名稱>=<url>,..."，例如 "node2=http://10.0.0.2:8600"；
+# 作業依各主機剩餘的記憶體分配，SIM_JOB_MAX_WORKERS 需涵蓋所有主機合計同時執行的作業數
+SIM_JOB_HOSTS = {
+    name.strip(): url.strip()
+    for name, url in (
+        item.split('=', 1) for item in (os.environ.get('SIM_JOB_HOSTS') or '').split(',') if '=' in item
+    )
+}
+# 是否也在 Django 所在的主機執行模擬容器
+SIM_JOB_LOCAL_HOST_ENABLED = (os.environ.get('SIM_JOB_LOCAL_HOST_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+# 與 simJobAgent 溝通的共用驗證 token，agent 啟動時讀取相同的環境變數；使用遠端模擬主機時必須設定，agent 沒有 token 時不啟動
+SIM_AGENT_TOKEN = os.environ.get('SIM_AGENT_TOKEN') or ''
+# Docker Engine API 的 unix socket 路徑
+DOCKER_SOCKET_PATH = os.environ.get('DOCKER_SOCKET_PATH') or '/var/run/docker.sock'
+# 每個模擬器映像檔預先啟動的暖容器數量，0 表示不使用暖容器池
+SIM_JOB_WARM_POOL_SIZE = int(os.environ.get('SIM_JOB_WARM_POOL_SIZE') or 0)
+# 映像檔超過此秒數沒有作業使用時，移除它的閒置暖容器
+SIM_JOB_WARM_POOL_IDLE_TIMEOUT = int(os.environ.get('SIM_JOB_WARM_POOL_IDLE_TIMEOUT') or 600)
+# 啟動時就預先暖機的映像檔，以逗號分隔，其餘映像檔在第一次使用後才建立暖容器
+SIM_JOB_WARM_POOL_IMAGES = [
+    image.strip() for image in (os.environ.get('SIM_JOB_WARM_POOL_IMAGES') or 'handoverimage,routingimage').split(',')
+    if image.strip()
+]
+
+# Simulation result cache
+# 相同類型、參數與模擬器映像檔的模擬直接重用已完成的結果
+SIM_RESULT_CACHE_ENABLED = (os.environ.get('SIM_RESULT_CACHE_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+# 快取結果的存放目錄，與 simulation_result 放在同一個檔案系統時可以使用硬連結
+SIM_RESULT_CACHE_DIR = os.environ.get('SIM_RESULT_CACHE_DIR') or os.path.join('simulation_result', 'cache')
+# 快取總大小上限（例如 200g），超過時淘汰最久未使用的結果
+SIM_RESULT_CACHE_MAX_SIZE = os.environ.get('SIM_RESULT_CACHE_MAX_SIZE') or '200g'
+# 模擬完成後將結果目錄的 CSV 轉存為單一壓縮的欄式檔案（result_sidecar.npz），重新分析與產生 PDF 時優先讀取
+SIM_RESULT_SIDECAR_ENABLED = (os.environ.get('SIM_RESULT_SIDECAR_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+# 結果目錄沒有變動時重用上次的分析結果（存在結果目錄的 analysis_cache.json）
+SIM_ANALYSIS_CACHE_ENABLED = (os.environ.get('SIM_ANALYSIS_CACHE_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings.local')
 
 application = get_wsgi_application()
+
+# 啟動模擬作業執行器與 reconciler，接手行程重啟前仍在執行的模擬容器
+from main.apps.simulation_data_mgt.services.simJobReconciler import start_sim_job_supervisor  # noqa: E402
+
+start_sim_job_supervisor()
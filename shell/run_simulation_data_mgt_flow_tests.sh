@@ -38,4 +38,7 @@ set -e  # 遇到錯誤即停止
 # python main/apps/simulation_data_mgt/tests/flow/test_endToEndRoutingSimJobManager_flow.py
 
 echo "=== Running gsoSimJobManager tests ==="
-python main/apps/simulation_data_mgt/tests/flow/test_gsoSimJobManager_flow.py
\ No newline at end of file
+python main/apps/simulation_data_mgt/tests/flow/test_gsoSimJobManager_flow.py
+
+# echo "=== Running simJobQueueManager tests ==="
+# python main/apps/simulation_data_mgt/tests/flow/test_simJobQueueManager_flow.py
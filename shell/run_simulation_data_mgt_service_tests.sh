@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+set -e  # 遇到錯誤即停止
+
+echo "=== Running simulation_data_mgt service tests ==="
+python manage.py test main.apps.simulation_data_mgt.tests.service